@@ -6,7 +6,8 @@ SECTION_AGENT = 'agent'
 
 CHECK_TRANSITIONS_DELAY = Property(SECTION_AGENT, 'agent.check_transitions.delay', float, 1.0)
 """
-An agent evaluates periodically all the transitions from the current state to check if someone is satisfied.
+An agent evaluates periodically all the transitions from the current state to check if someone is satisfied (see
+:obj:`~besser.agent.CHECK_TRANSITIONS_POLLING`).
 
 This property sets the delay between each transitions evaluation, in seconds.
 
@@ -15,4 +16,63 @@ name: ``agent.check_transitions.delay``
 type: ``float``
 
 default value: ``1``
-"""
\ No newline at end of file
+"""
+
+CHECK_TRANSITIONS_POLLING = Property(SECTION_AGENT, 'agent.check_transitions.polling', bool, False)
+"""
+Whether to evaluate the transitions of the current state periodically (every
+:obj:`~besser.agent.CHECK_TRANSITIONS_DELAY` seconds) or not.
+
+When disabled, the transitions are only evaluated when something that can affect them happens: an event is received,
+the session moves to a new state, a session variable used in a
+:class:`~besser.agent.library.transition.conditions.VariableOperationMatcher` condition is set, or a timer registered
+with :meth:`~besser.agent.core.session.Session.add_timer` expires. States with condition-based transitions whose
+condition function cannot be tracked (i.e., defined with :meth:`~besser.agent.core.state.State.when_condition`) are
+still evaluated periodically.
+
+name: ``agent.check_transitions.polling``
+
+type: ``bool``
+
+default value: ``False``
+"""
+
+SESSION_SCHEDULER = Property(SECTION_AGENT, 'agent.session_scheduler', bool, False)
+"""
+By default, each session runs its own thread with a dedicated event loop, where its transitions are evaluated. When this
+property is enabled, all the agent sessions are instead multiplexed onto a shared pool of event loops (see
+:class:`~besser.agent.core.session_scheduler.SessionScheduler`). Each session is always assigned to the same loop, so
+the events of a session are still processed in order.
+
+Note that a state body that blocks (e.g., waiting for an LLM response) delays the other sessions sharing its loop.
+
+name: ``agent.session_scheduler``
+
+type: ``bool``
+
+default value: ``False``
+"""
+
+SESSION_SCHEDULER_LOOPS = Property(SECTION_AGENT, 'agent.session_scheduler.loops', int, 4)
+"""
+The number of event loops (each one running in its own thread) of the session scheduler. Only used if
+:obj:`~besser.agent.SESSION_SCHEDULER` is enabled.
+
+name: ``agent.session_scheduler.loops``
+
+type: ``int``
+
+default value: ``4``
+"""
+
+CHAT_HISTORY_BUFFER_SIZE = Property(SECTION_AGENT, 'agent.chat_history.buffer_size', int, 100)
+"""
+The number of most recent messages of each session kept in memory. The chat history requests (e.g., from LLMs or RAG)
+that fit in this buffer are served without querying the monitoring database. Set it to 0 to disable the buffer.
+
+name: ``agent.chat_history.buffer_size``
+
+type: ``int``
+
+default value: ``100``
+"""
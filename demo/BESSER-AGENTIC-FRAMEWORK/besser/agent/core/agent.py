@@ -6,6 +6,7 @@ from configparser import ConfigParser
 from datetime import datetime
 from typing import Any, Callable, get_type_hints
 
+from besser.agent import SESSION_SCHEDULER, SESSION_SCHEDULER_LOOPS
 from besser.agent.core.transition.event import Event
 from besser.agent.core.message import Message, MessageType
 from besser.agent.core.entity.entity import Entity
@@ -14,6 +15,7 @@ from besser.agent.core.intent.intent_parameter import IntentParameter
 from besser.agent.core.property import Property
 from besser.agent.core.processors.processor import Processor
 from besser.agent.core.session import Session
+from besser.agent.core.session_scheduler import SessionScheduler
 from besser.agent.core.state import State
 from besser.agent.core.transition.transition import Transition
 from besser.agent.db import DB_MONITORING
@@ -53,6 +55,8 @@ class Agent:
         _default_ic_config (IntentClassifierConfiguration): the intent classifier configuration used by default for the
             agent states
         _sessions (dict[str, Session]): The agent sessions
+        _session_scheduler (SessionScheduler or None): The pool of event loops shared by the agent sessions, if the
+            :obj:`~besser.agent.SESSION_SCHEDULER` property is enabled. Otherwise, each session runs its own event loop
         _trained (bool): Whether the agent has been trained or not. It must be trained before it starts its execution.
         _monitoring_db (MonitoringDB): The monitoring component of the agent that communicates with a database to store
             usage information for later visualization or analysis
@@ -80,6 +84,7 @@ class Agent:
         self._config: ConfigParser = ConfigParser()
         self._default_ic_config: IntentClassifierConfiguration = SimpleIntentClassifierConfiguration()
         self._sessions: dict[str, Session] = {}
+        self._session_scheduler: SessionScheduler or None = None
         self._trained: bool = False
         self._monitoring_db: MonitoringDB = None
         self.states: list[State] = []
@@ -403,9 +408,14 @@ class Agent:
             self._monitoring_db.connect_to_db(self)
             if self._monitoring_db.connected:
                 self._monitoring_db.initialize_db()
+                self._monitoring_db.start_writer(self)
+                self._monitoring_db.start_compaction(self)
             if not self._monitoring_db.connected and self._persist_sessions:
                 logger.warning(f'Agent {self._name} persistence of sessions is enabled, but the monitoring database is not connected. Sessions will not be persisted.')
                 self._persist_sessions = False
+        if self.get_property(SESSION_SCHEDULER):
+            self._session_scheduler = SessionScheduler(self.get_property(SESSION_SCHEDULER_LOOPS))
+            self._session_scheduler.start()
         self._run_platforms()
         # self._run_event_thread()
         if sleep:
@@ -422,11 +432,17 @@ class Agent:
         """Stop the agent execution."""
         logger.info(f'Stopping agent {self._name}')
         self._stop_platforms()
-        if self.get_property(DB_MONITORING) and self._monitoring_db.connected:
-            self._monitoring_db.close_connection()
-
+        # Sessions are closed first, so their pending variables are persisted
         for session_id in list(self._sessions.keys()):
             self.close_session(session_id)
+        if self.get_property(DB_MONITORING) and self._monitoring_db.connected:
+            # Write the records that are still in the write-behind queue
+            self._monitoring_db.flush()
+            self._monitoring_db.close_connection()
+        if self._session_scheduler is not None:
+            self._session_scheduler.stop()
+            self._session_scheduler = None
+        self._nlp_engine.stop()
 
     def reset(self, session_id: str) -> Session or None:
         """Reset the agent current state and memory for the specified session. Then, restart the agent again for this session.
@@ -459,7 +475,7 @@ class Agent:
         if event.is_broadcasted():
             for session in self._sessions.values():
                 session.events.appendleft(event)
-                session._event_loop.call_soon_threadsafe(session.manage_transition)
+                session.call_manage_transition()
         else:
             session = self._sessions[event.session_id]
             session.events.appendleft(event)
@@ -596,6 +612,7 @@ class Agent:
         while self._sessions[session_id]._agent_connections:
             agent_connection = next(iter(self._sessions[session_id]._agent_connections.values()))
             agent_connection.close()
+        self._sessions[session_id].flush()
         self._sessions[session_id]._stop_event_thread()
         del self._sessions[session_id]
     def _load_user_profile_into_session(self, session: Session) -> None:
@@ -647,6 +664,7 @@ class Agent:
                         _set_keys_from_profile(item)
 
         _set_keys_from_profile(profile)
+        session.flush()
 
     def delete_session(self, session_id: str) -> None:
         """Delete an existing agent session.
@@ -813,9 +831,7 @@ class Agent:
             predicted_intent (IntentClassifierPrediction): the intent prediction
         """
         if self.get_property(DB_MONITORING) and self._monitoring_db.connected:
-            thread = threading.Thread(target=self._monitoring_db.insert_intent_prediction,
-                                      args=(session, session.current_state, predicted_intent))
-            thread.start()
+            self._monitoring_db.queue_intent_prediction(session, session.current_state, predicted_intent)
 
     def _monitoring_db_insert_transition(self, session: Session, transition: Transition) -> None:
         """Insert a transition record into the monitoring database.
@@ -824,8 +840,7 @@ class Agent:
             session (Session): the session of the current user
         """
         if self.get_property(DB_MONITORING) and self._monitoring_db.connected:
-            thread = threading.Thread(target=self._monitoring_db.insert_transition, args=(session, transition))
-            thread.start()
+            self._monitoring_db.queue_transition(session, transition)
 
     def _monitoring_db_insert_chat(self, session: Session, message: Message) -> None:
         """Insert a message record into the monitoring database.
@@ -834,8 +849,7 @@ class Agent:
             session (Session): the session of the current user
         """
         if self.get_property(DB_MONITORING) and self._monitoring_db.connected:
-            thread = threading.Thread(target=self._monitoring_db.insert_chat, args=(session, message))
-            thread.start()
+            self._monitoring_db.queue_chat(session, message)
 
     def _monitoring_db_insert_event(self, event: Event) -> None:
         """Insert an event record into the monitoring database.
@@ -848,5 +862,4 @@ class Agent:
                 session = None
             else:
                 session = self._sessions[event.session_id]
-            thread = threading.Thread(target=self._monitoring_db.insert_event, args=(session, event))
-            thread.start()
+            self._monitoring_db.queue_event(session, event)
@@ -1,10 +1,35 @@
+import asyncio
+import hashlib
+import json
+from concurrent.futures import Future
+
 from besser.agent.core.processors.processor import Processor
+from besser.agent.exceptions.logger import logger
 from besser.agent.nlp.llm.llm import LLM
 from besser.agent.core.agent import Agent
 from besser.agent.core.session import Session
 from besser.agent.nlp.nlp_engine import NLPEngine
 
 
+def profile_fingerprint(user_model: dict, context: str = None, llm_context: list[str] = None) -> str:
+    """Get the fingerprint of a user profile, i.e., a hash that is the same for all the users with the same profile.
+
+    Args:
+        user_model (dict): the user model
+        context (str): additional context of the adaptation, that is part of the fingerprint
+        llm_context (list[str]): the context the LLM adds to the adaptation requests (i.e., its global context and the
+            user context of the session), that is part of the fingerprint
+
+    Returns:
+        str: the user profile fingerprint
+    """
+    profile = [context, user_model]
+    if llm_context and any(llm_context):
+        profile.append(llm_context)
+    profile = json.dumps(profile, sort_keys=True, default=str)
+    return hashlib.sha256(profile.encode('utf-8')).hexdigest()
+
+
 class UserAdaptationProcessor(Processor):
     """The UserAdaptationProcessor takes into account the user's profile and adapts the agent's responses to fit the
     profile. The goal is to increase the user experience.
@@ -12,11 +37,21 @@ class UserAdaptationProcessor(Processor):
     This processor leverages LLMs to adapt the messages given a user profile. For static profiles, an adaptation will be
     done once. If the profile changes, then an adapation will be triggered again.
 
+    The adapted messages are stored in the NLPEngine response cache (see
+    :class:`~besser.agent.nlp.llm.llm_response_cache.LLMResponseCache`) by LLM, profile fingerprint (see
+    :func:`profile_fingerprint`, which includes the LLM global context and the session's LLM user context) and message,
+    so each message is adapted only once for all the users with the same profile. The messages the agent will send
+    (e.g., the static replies of its states) can be given to the processor to adapt them in advance for each new profile
+    (see :meth:`prewarm`), several messages per LLM request.
+
     Args:
         agent (Agent): The agent the processor belongs to
         llm_name (str): the name of the LLM to use.
         context (str): additional context to improve the adaptation. should include information about the agent itself
         and the task it should accomplish
+        messages (list[str]): the messages the agent will send, to adapt them in advance for each user profile
+        prewarm (bool): whether to adapt the given messages in the background when a user model is added
+        batch_size (int): the maximum number of messages adapted in a single LLM request
 
     Attributes:
         agent (Agent): The agent the processor belongs to
@@ -24,22 +59,44 @@ class UserAdaptationProcessor(Processor):
         _context (str): additional context to improve the adaptation. should include information about the agent itself
         and the task it should accomplish
         _user_model (dict): dictionary containing the user models
+        _user_contexts (dict[str, str]): The adaptation context (i.e., the system message sent to the LLM) of each
+            session, built when its user model is added
+        _messages (dict[str, None]): The messages adapted in advance for each profile (the ones given to the processor
+            or to :meth:`prewarm`), in insertion order (used as an ordered set)
+        _prewarm (bool): Whether to adapt the messages in advance in the background when a user model is added
+        _batch_size (int): The maximum number of messages adapted in a single LLM request
+        _prewarm_futures (dict[str, concurrent.futures.Future]): The running background adaptations, by profile
+            fingerprint
     """
-    def __init__(self, agent: 'Agent', llm_name: str, context: str = None):
+    def __init__(
+            self,
+            agent: 'Agent',
+            llm_name: str,
+            context: str = None,
+            messages: list[str] = None,
+            prewarm: bool = False,
+            batch_size: int = 10
+    ):
         super().__init__(agent=agent, agent_messages=True)
         self._llm_name: str = llm_name
         self._nlp_engine: 'NLPEngine' = agent.nlp_engine
         self._user_model: dict = {}
+        self._user_contexts: dict[str, str] = {}
         if context:
             self._context = context
         else:
             self._context = "You are an agent."
+        self._messages: dict[str, None] = dict.fromkeys(messages or [])
+        self._prewarm: bool = prewarm
+        self._batch_size: int = max(1, batch_size)
+        self._prewarm_futures: dict[str, Future] = {}
 
     # TODO: add capability to improve/change prompt of context
     def process(self, session: 'Session', message: str) -> str:
         """Method to process a message and adapt its content based on a given user model.
 
-        The stored user model will be fetched and sent as part of the context.
+        The stored user model will be fetched and sent as part of the context. If the message is being adapted in
+        advance for the user profile (see :meth:`prewarm`), that adaptation is awaited.
 
         Args:
             session (Session): the current session
@@ -48,25 +105,150 @@ class UserAdaptationProcessor(Processor):
         Returns:
             str: the processed message
         """
-        llm: LLM = self._nlp_engine._llms[self._llm_name]
-        user_context = f"{self._context}\n\
-                You are capable of adapting your predefined answers based on a given user profile.\
-                Your goal is to increase the user experience by adapting the messages based on the different attributes of the user\
-                profile as best as possible and take all the attributes into account.\
-                You are free to adapt the messages in any way you like.\
-                The user should relate more. This is the user's profile\n \
-                {str(self._user_model[session.id])}"
-        prompt = f"You need to adapt this message: {message}\n Only respond with the adapted message!"
-        llm_response: str = llm.predict(prompt, session=session, system_message=user_context)
-        return llm_response
+        future = self._prewarm_futures.get(self._fingerprint(session))
+        if future is not None and not future.done() and message in self._messages:
+            try:
+                future.result()
+            except Exception:
+                pass  # The message is adapted again below
+        return self.adapt_messages(session, [message])[0]
 
     def add_user_model(self, session: 'Session', user_model: dict) -> None:
         """Method to store the user model internally.
 
-        The user model shall be stored internally.
+        The user model shall be stored internally. If prewarming is enabled, the messages given to the processor are
+        adapted to the user profile in the background.
 
         Args:
             session (Session): the current session
             user_model (dict): the user model of a given user
         """
         self._user_model[session.id] = user_model
+        self._user_contexts[session.id] = f"{self._context}\n\
+                You are capable of adapting your predefined answers based on a given user profile.\
+                Your goal is to increase the user experience by adapting the messages based on the different attributes of the user\
+                profile as best as possible and take all the attributes into account.\
+                You are free to adapt the messages in any way you like.\
+                The user should relate more. This is the user's profile\n \
+                {str(user_model)}"
+        if self._prewarm and self._messages:
+            self.prewarm(session)
+
+    def prewarm(self, session: 'Session', messages: list[str] = None) -> Future:
+        """Adapt messages to the user profile of a session in the background, so they are already adapted when the agent
+        sends them.
+
+        Args:
+            session (Session): the session, whose user model must have been added
+            messages (list[str]): the messages to adapt, which are also adapted in advance for the next profiles. If
+                none are provided, the messages given to the processor (or to previous calls) are adapted
+
+        Returns:
+            concurrent.futures.Future: the background adaptation, whose result is the list of adapted messages
+        """
+        fingerprint = self._fingerprint(session)
+        future = self._prewarm_futures.get(fingerprint)
+        if future is not None and not future.done():
+            return future
+        if messages is None:
+            messages = list(self._messages)
+        else:
+            self._messages.update(dict.fromkeys(messages))
+        llm_client = self._nlp_engine.llm_client
+        future = asyncio.run_coroutine_threadsafe(self.aadapt_messages(session, messages), llm_client.loop)
+        self._prewarm_futures[fingerprint] = future
+        future.add_done_callback(lambda f: self._prewarm_done(fingerprint, f))
+        return future
+
+    def _fingerprint(self, session: 'Session') -> str:
+        """Get the profile fingerprint of a session. It includes the context the LLM adds to the adaptation requests of
+        the session, which can change at any time (e.g., with :meth:`~besser.agent.nlp.llm.llm.LLM.add_user_context`).
+
+        Args:
+            session (Session): the session, whose user model must have been added
+
+        Returns:
+            str: the profile fingerprint
+        """
+        llm: LLM = self._nlp_engine._llms[self._llm_name]
+        llm_context = [llm._global_context, llm._user_context.get(session.id)]
+        return profile_fingerprint(self._user_model[session.id], self._context, llm_context)
+
+    def _prewarm_done(self, fingerprint: str, future: Future) -> None:
+        """Remove a finished background adaptation.
+
+        Args:
+            fingerprint (str): the profile fingerprint
+            future (concurrent.futures.Future): the background adaptation
+        """
+        if self._prewarm_futures.get(fingerprint) is future:
+            del self._prewarm_futures[fingerprint]
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f'[UserAdaptationProcessor] The messages could not be adapted in advance: {future.exception()}')
+
+    def adapt_messages(self, session: 'Session', messages: list[str]) -> list[str]:
+        """Adapt several messages to the user profile of a session. The messages that are not in the response cache
+        are adapted in as few LLM requests as possible (see ``batch_size``).
+
+        Args:
+            session (Session): the session, whose user model must have been added
+            messages (list[str]): the messages to adapt
+
+        Returns:
+            list[str]: the adapted messages, in the same order
+        """
+        return self._nlp_engine.llm_client.run(self.aadapt_messages(session, messages))
+
+    async def aadapt_messages(self, session: 'Session', messages: list[str]) -> list[str]:
+        """Adapt several messages to the user profile of a session asynchronously (see :meth:`adapt_messages`).
+
+        Args:
+            session (Session): the session, whose user model must have been added
+            messages (list[str]): the messages to adapt
+
+        Returns:
+            list[str]: the adapted messages, in the same order
+        """
+        fingerprint = self._fingerprint(session)
+        response_cache = self._nlp_engine.response_cache
+        # Similar messages may contain different values (e.g., names or numbers), so only the same message is looked up
+        adapted_messages = {
+            message: response_cache.get(self._llm_name, message, fingerprint, semantic=False)
+            for message in messages
+        }
+        pending = [message for message, adapted_message in adapted_messages.items() if adapted_message is None]
+        batches = [pending[i:i + self._batch_size] for i in range(0, len(pending), self._batch_size)]
+        for batch, adapted_batch in zip(batches, await asyncio.gather(*(self._adapt(session, batch) for batch in batches))):
+            for message, adapted_message in zip(batch, adapted_batch):
+                adapted_messages[message] = adapted_message
+                response_cache.put(self._llm_name, message, adapted_message, fingerprint)
+        return [adapted_messages[message] for message in messages]
+
+    async def _adapt(self, session: 'Session', messages: list[str]) -> list[str]:
+        """Request the LLM to adapt messages to the user profile of a session, in a single request. If the LLM does not
+        answer with the expected list of messages, they are adapted one by one.
+
+        Args:
+            session (Session): the session, whose user model must have been added
+            messages (list[str]): the messages to adapt
+
+        Returns:
+            list[str]: the adapted messages, in the same order
+        """
+        llm: LLM = self._nlp_engine._llms[self._llm_name]
+        user_context = self._user_contexts[session.id]
+        if len(messages) == 1:
+            prompt = f"You need to adapt this message: {messages[0]}\n Only respond with the adapted message!"
+            return [await llm.apredict(prompt, session=session, system_message=user_context)]
+        prompt = f"You need to adapt each of these messages, given as a JSON list: {json.dumps(messages)}\n \
+                Only respond with a JSON list containing the adapted messages, in the same order!"
+        llm_response: str = await llm.apredict(prompt, session=session, system_message=user_context)
+        try:
+            adapted_messages = json.loads(llm_response[llm_response.index('['):llm_response.rindex(']') + 1])
+            if len(adapted_messages) == len(messages) and all(isinstance(m, str) for m in adapted_messages):
+                return adapted_messages
+        except (AttributeError, TypeError, ValueError):
+            pass
+        logger.warning(f'[UserAdaptationProcessor] The LLM did not adapt the {len(messages)} messages in a single '
+                       f'request. Adapting them one by one.')
+        return [adapted[0] for adapted in await asyncio.gather(*(self._adapt(session, [m]) for m in messages))]
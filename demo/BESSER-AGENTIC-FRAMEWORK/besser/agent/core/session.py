@@ -4,13 +4,12 @@ import threading
 import time
 from asyncio import TimerHandle
 from collections import deque
-from typing import Any, TYPE_CHECKING
+from typing import Any, TYPE_CHECKING, Iterable, Iterator
 from datetime import datetime
 
-from pandas import DataFrame
 from websocket import WebSocketApp
 
-from besser.agent import CHECK_TRANSITIONS_DELAY
+from besser.agent import CHECK_TRANSITIONS_DELAY, CHECK_TRANSITIONS_POLLING, CHAT_HISTORY_BUFFER_SIZE
 from besser.agent.core.transition.event import Event
 from besser.agent.core.transition.transition import Transition
 from besser.agent.library.transition.conditions import IntentMatcher
@@ -45,13 +44,25 @@ class Session:
         _platform (str): The platform where the session has been created
         _current_state (str): The current state in the agent for this session
         _dictionary (str): Storage of private data for this session
+        _dirty_keys (set[str]): The keys of the private data storage that have been set or deleted since the last time
+            it was persisted (see :meth:`flush`)
+        _dirty_lock (threading.Lock): Lock to update the dirty keys from different threads
         _event (Any or None): The last event to trigger a transition.
         _events (deque[Any]): The queue of received external events to process
         _event_loop (asyncio.AbstractEventLoop): The loop in charge of managing incoming events
-        _event_thread (threading.Thread): The thread where the event loop is running
+        _event_thread (threading.Thread): The thread where the event loop is running. It is None if the event loop is
+            shared with other sessions (see :class:`~besser.agent.core.session_scheduler.SessionScheduler`)
         _timer_handle (TimerHandle): Handler of scheduled calls on the event loop
+        _timers (list[TimerHandle]): Handlers of the transition evaluations registered with :meth:`add_timer`. They are
+            cancelled when the session moves to another state
         _agent_connections (dict[str, WebSocketApp]): WebSocket client connections to other agent's WebSocket platforms.
             These connections enable an agent to send messages to other agents.
+        _history (deque[Message]): The most recent messages of the session (see
+            :obj:`~besser.agent.CHAT_HISTORY_BUFFER_SIZE`)
+        _history_lock (threading.Lock): Lock to access the history buffer from different threads
+        _history_loaded (bool): Whether the history buffer has been filled with the messages stored in the monitoring
+            database or not
+        _history_complete (bool): Whether the history buffer contains the whole session history or not
     """
 
     def __init__(
@@ -65,12 +76,19 @@ class Session:
         self._platform: 'Platform' = platform
         self._current_state: 'State' = self._agent.initial_state()
         self._dictionary: dict[str, Any] = {}
+        self._dirty_keys: set[str] = set()
+        self._dirty_lock: threading.Lock = threading.Lock()
         self._event: Event = None
         self._events: deque[Event] = deque()
         self._event_loop: asyncio.AbstractEventLoop or None = None
         self._event_thread: threading.Thread or None = None
         self._timer_handle: TimerHandle = None
+        self._timers: list[TimerHandle] = []
         self._agent_connections: dict[str, WebSocketApp] = {}
+        self._history: deque[Message] = deque(maxlen=max(0, self._agent.get_property(CHAT_HISTORY_BUFFER_SIZE)))
+        self._history_lock: threading.Lock = threading.Lock()
+        self._history_loaded: bool = False
+        self._history_complete: bool = False
 
     @property
     def id(self):
@@ -116,13 +134,59 @@ class Session:
 
     def manage_transition(self) -> None:
         """Evaluate the session's current state transitions, where one could be satisfied and triggered."""
+        if self._event_loop is None:
+            # The session was closed while this call was scheduled
+            return
         self.current_state.check_transitions(self)
-        # The delay is in seconds
-        delay = self._agent.get_property(CHECK_TRANSITIONS_DELAY)
-        self._timer_handle = self._event_loop.call_later(delay, self.manage_transition)
+        # Persist the variables set in transition conditions or fallback bodies
+        self.flush()
+        if self._event_loop is None:
+            return
+        if self._agent.get_property(CHECK_TRANSITIONS_POLLING) or self.current_state.requires_polling():
+            # The delay is in seconds
+            delay = self._agent.get_property(CHECK_TRANSITIONS_DELAY)
+            self._timer_handle = self._event_loop.call_later(delay, self.manage_transition)
+        else:
+            # The next evaluation will be triggered by an event, a variable update or a timer
+            self._timer_handle = None
+
+    def add_timer(self, delay: float) -> None:
+        """Schedule an evaluation of the current state transitions after some delay.
+
+        This is useful for transitions whose condition depends on time (e.g., a timeout) when the transitions are not
+        periodically evaluated (see :obj:`~besser.agent.CHECK_TRANSITIONS_POLLING`). The timer is cancelled if the
+        session moves to another state before it expires.
+
+        Args:
+            delay (float): the delay, in seconds
+        """
+        if self._event_loop is None:
+            logger.warning(f'Cannot add a timer to session {self.id}: its event loop is not running')
+            return
+
+        def register_timer():
+            self._timers.append(self._event_loop.call_later(delay, self.manage_transition))
+
+        self._event_loop.call_soon_threadsafe(register_timer)
+
+    def _cancel_timers(self) -> None:
+        """Cancel the transition evaluations registered with :meth:`add_timer`."""
+        for timer in self._timers:
+            timer.cancel()
+        self._timers = []
 
     def _run_event_thread(self) -> None:
-        """Start the thread managing external events"""
+        """Start the thread managing external events.
+
+        If the agent has a session scheduler, the session is attached to one of its shared event loops instead of
+        starting a new thread.
+        """
+        scheduler = self._agent._session_scheduler
+        if scheduler is not None:
+            logger.debug(f'Attaching session {self.id} to the session scheduler')
+            self._event_loop = scheduler.get_loop(self.id)
+            self._event_loop.call_soon_threadsafe(self.manage_transition)
+            return
         self._event_loop = asyncio.new_event_loop()
 
         def start_event_loop():
@@ -137,52 +201,155 @@ class Session:
         thread.start()
 
     def _stop_event_thread(self) -> None:
-        """Stop the thread managing external events"""
+        """Stop the thread managing external events.
+
+        If the session runs in a shared event loop, the loop is not stopped: the session's scheduled calls are cancelled
+        and the session is detached from it.
+        """
+        if self._event_thread is None:
+            def detach():
+                if self._timer_handle:
+                    self._timer_handle.cancel()
+                    self._timer_handle = None
+                self._cancel_timers()
+                self._event_loop = None
+
+            self._agent._session_scheduler.run_in_loop(self._event_loop, detach)
+            return
         self._event_loop.stop()
         self._event_thread.join()
         self._event_loop = None
         self._event_thread = None
+        self._timers = []
+
+    def _monitoring_db_available(self) -> bool:
+        return self._agent.get_property(DB_MONITORING) and self._agent._monitoring_db.connected
+
+    @staticmethod
+    def _chat_rows_to_messages(rows: list) -> list[Message]:
+        return [
+            Message(t=get_message_type(row.type), content=row.content, is_user=row.is_user, timestamp=row.timestamp)
+            for row in rows
+        ]
+
+    def _load_history(self) -> None:
+        """Fill the history buffer with the latest messages stored in the monitoring database. It is only done once,
+        and it must be called holding the history lock."""
+        if self._history_loaded:
+            return
+        if self._monitoring_db_available():
+            rows = self._agent._monitoring_db.select_chat_page(self, limit=self._history.maxlen, latest=True)
+            self._history.clear()
+            self._history.extend(self._chat_rows_to_messages(rows))
+            self._history_complete = len(rows) < self._history.maxlen
+        else:
+            # Without database, the buffer is the only record of the session history
+            self._history_complete = True
+        self._history_loaded = True
 
     def get_chat_history(self, n: int = None, until_timestamp: datetime = None) -> list[Message]:
         """Get the history of messages between this session and its agent.
 
+        The most recent messages are kept in memory (see :obj:`~besser.agent.CHAT_HISTORY_BUFFER_SIZE`), so the
+        monitoring database is only queried when the requested messages are not in the buffer.
+
         Args:
             n (int or None): the number of messages to get (from the most recents). If none is provided, gets all the
                 messages
+            until_timestamp (datetime or None): if provided, gets only the messages up to this timestamp
 
         Returns:
             list[Message]: the conversation history
         """
-        chat_history: list[Message] = []
-        if self._agent.get_property(DB_MONITORING) and self._agent._monitoring_db.connected:
-            chat_df: DataFrame = self._agent._monitoring_db.select_chat(self, n=n, until_timestamp=until_timestamp)
-            for i, row in chat_df.iterrows():
-                t = get_message_type(row['type'])
-                chat_history.append(Message(t=t, content=row['content'], is_user=row['is_user'], timestamp=row['timestamp']))
-        else:
-            logger.warning('Could not retrieve the chat history from the database.')
-        return chat_history
+        if until_timestamp is None and self._history.maxlen:
+            with self._history_lock:
+                self._load_history()
+                if self._history_complete or (n and n <= len(self._history)):
+                    chat_history = list(self._history)
+                    return chat_history[-n:] if n else chat_history
+        if self._monitoring_db_available():
+            rows = self._agent._monitoring_db.select_chat_page(
+                self, limit=n, until_timestamp=until_timestamp, latest=True
+            )
+            return self._chat_rows_to_messages(rows)
+        logger.warning('Could not retrieve the chat history from the database.')
+        return []
+
+    def iter_chat_history(self, page_size: int = 100, until_timestamp: datetime = None) -> Iterator[list[Message]]:
+        """Iterate over the whole history of messages between this session and its agent, in pages.
+
+        The pages are retrieved from the monitoring database one at a time (in chronological order), so the whole
+        history is never loaded in memory at once.
+
+        Args:
+            page_size (int): the maximum number of messages of each page
+            until_timestamp (datetime or None): if provided, gets only the messages up to this timestamp
+
+        Returns:
+            Iterator[list[Message]]: the pages of messages
+        """
+        if not self._monitoring_db_available():
+            with self._history_lock:
+                chat_history = [
+                    message for message in self._history
+                    if until_timestamp is None or message.timestamp <= until_timestamp
+                ]
+            for i in range(0, len(chat_history), page_size):
+                yield chat_history[i:i + page_size]
+            return
+        monitoring_db = self._agent._monitoring_db
+        # Messages not written in the database yet, taken before reading it so none is missed
+        pending = monitoring_db.select_pending_chat(self, until_timestamp)
+        cursor = None
+        while True:
+            rows = monitoring_db.select_chat_page(
+                self, limit=page_size, cursor=cursor, until_timestamp=until_timestamp
+            )
+            if len(rows) < page_size:
+                # Last page: the pending messages go after it
+                rows = monitoring_db.merge_pending_chat(rows, pending)
+                for i in range(0, len(rows), page_size):
+                    yield self._chat_rows_to_messages(rows[i:i + page_size])
+                return
+            yield self._chat_rows_to_messages(rows)
+            # Pending messages written in the meantime are already in this page
+            written = {(row.timestamp, row.is_user, row.type) for row in rows}
+            pending = [record for record in pending if (record.timestamp, record.is_user, record.type) not in written]
+            cursor = (rows[-1].timestamp, rows[-1].id)
 
     def save_message(self, message: Message) -> None:
-        """Save a message in the dedicated chat DB
+        """Save a message in the dedicated chat DB, and in the session history buffer.
 
         Args:
             message (Message): the message to save
         """
         self._agent._monitoring_db_insert_chat(self, message)
+        if not self._history.maxlen:
+            return
+        with self._history_lock:
+            if len(self._history) == self._history.maxlen:
+                # The oldest message is dropped from the buffer
+                self._history_complete = False
+            # Messages are stored as strings, the same way they are retrieved from the database
+            self._history.append(Message(t=message.type, content=str(message.content), is_user=message.is_user,
+                                         timestamp=message.timestamp))
 
     def set(self, key: str, value: Any) -> None:
         """Set an entry to the session private data storage.
 
+        The entry is not persisted immediately: all the entries set during a turn are persisted together when the state
+        body finishes (see :meth:`flush`).
+
         Args:
             key (str): the entry key
             value (Any): the entry value
         """
         self._dictionary[key] = value
-        try:
-            self._agent._monitoring_db_store_session_variables(self)
-        except Exception as e:
-            logger.error(f"Failed to store session variables to the database for session {self.id}: {e}", exc_info=True)
+        with self._dirty_lock:
+            self._dirty_keys.add(key)
+        if self._event_loop is not None and key in self._current_state.watched_variables():
+            # The new value could satisfy a transition condition
+            self.call_manage_transition()
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get an entry of the session private data storage.
@@ -211,6 +378,25 @@ class Session:
         except Exception as e:
             logger.error(f"Failed to delete key '{key}' from session {self.id}: {e}", exc_info=True)
             return None
+        with self._dirty_lock:
+            self._dirty_keys.add(key)
+
+    def flush(self) -> None:
+        """Persist the session private data storage in the monitoring database, if any entry has been set or deleted
+        since the last time it was persisted.
+
+        It is automatically called after running a state body, so the entries set in a body are persisted with a single
+        write. Call it explicitly to persist the entries immediately.
+        """
+        with self._dirty_lock:
+            if not self._dirty_keys:
+                return
+            self._dirty_keys = set()
+        try:
+            self._agent._monitoring_db_store_session_variables(self)
+        except Exception as e:
+            logger.error(f"Failed to store session variables to the database for session {self.id}: {e}", exc_info=True)
+
     def get_dictionary(self) -> dict[str, Any]:
         """
         Returns the private data dictionary for this session.
@@ -233,6 +419,7 @@ class Session:
         # TODO: STORE EVENT IN DB (CALL event.store_in_db())
         if any(transition.dest is global_state for global_state in self._agent.global_state_component):
             self.set("prev_state", self.current_state)
+        self._cancel_timers()
         self._current_state = transition.dest
         self._current_state.run(self)
         self.call_manage_transition()
@@ -246,6 +433,21 @@ class Session:
         # Multi-platform
         self._platform.reply(self, message)
 
+    def reply_stream(self, chunks: Iterable[str]) -> str:
+        """An agent message is sent to the session platform while it is being generated (e.g., the chunks of
+        :meth:`~besser.agent.nlp.llm.llm.LLM.stream`), so the user can read it as soon as possible.
+
+        Platforms that do not support streaming send the complete message at the end (see
+        :meth:`~besser.agent.platforms.platform.Platform.reply_stream`).
+
+        Args:
+            chunks (Iterable[str]): the chunks of the agent reply
+
+        Returns:
+            str: the complete agent reply
+        """
+        return self._platform.reply_stream(self, chunks)
+
     def create_agent_connection(self, url) -> None:
         """Create a WebSocket connection to a specific WebSocket URL.
 
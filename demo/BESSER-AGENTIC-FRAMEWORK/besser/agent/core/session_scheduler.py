@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import zlib
+from concurrent.futures import Future
+from typing import Callable
+
+from besser.agent.exceptions.logger import logger
+
+
+class SessionScheduler:
+    """A pool of event loops shared by all the sessions of an agent.
+
+    Instead of running a dedicated thread and event loop for each session, the sessions are distributed (sharded by
+    session id) among a fixed number of event loops, each one running in its own thread. A session is always assigned
+    to the same loop, and since a loop runs its callbacks one after another, the events of a session are processed in
+    the same order they were received.
+
+    Args:
+        num_loops (int): the number of event loops of the pool
+
+    Attributes:
+        _num_loops (int): The number of event loops of the pool
+        _loops (list[asyncio.AbstractEventLoop]): The event loops of the pool
+        _threads (list[threading.Thread]): The threads where the event loops are running
+        _lock (threading.Lock): Lock to start/stop the pool from different threads
+    """
+
+    def __init__(self, num_loops: int):
+        if num_loops < 1:
+            raise ValueError(f'A session scheduler needs at least 1 event loop, got {num_loops}')
+        self._num_loops: int = num_loops
+        self._loops: list[asyncio.AbstractEventLoop] = []
+        self._threads: list[threading.Thread] = []
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def num_loops(self):
+        """int: The number of event loops of the pool."""
+        return self._num_loops
+
+    @property
+    def running(self):
+        """bool: Whether the event loops of the pool are running or not."""
+        return bool(self._loops)
+
+    def start(self) -> None:
+        """Start the event loops of the pool, each one in a new thread. Does nothing if they are already running."""
+        with self._lock:
+            if self._loops:
+                return
+            for i in range(self._num_loops):
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=self._run_loop, args=(loop, i), name=f'session-scheduler-{i}',
+                                          daemon=True)
+                self._loops.append(loop)
+                self._threads.append(thread)
+                thread.start()
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, index: int) -> None:
+        """Run an event loop of the pool until it is stopped.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): the event loop to run
+            index (int): the index of the loop in the pool
+        """
+        logger.debug(f'Starting session scheduler event loop {index}')
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+        loop.close()
+        logger.debug(f'Session scheduler event loop {index} stopped')
+
+    def stop(self) -> None:
+        """Stop all the event loops of the pool and wait for their threads to finish."""
+        with self._lock:
+            for loop in self._loops:
+                loop.call_soon_threadsafe(loop.stop)
+            for thread in self._threads:
+                if thread is not threading.current_thread():
+                    thread.join()
+            self._loops = []
+            self._threads = []
+
+    def get_loop(self, session_id: str) -> asyncio.AbstractEventLoop:
+        """Get the event loop assigned to a session. The pool is started if it was not running.
+
+        The assignment is deterministic: a session id is always mapped to the same loop.
+
+        Args:
+            session_id (str): the session id
+
+        Returns:
+            asyncio.AbstractEventLoop: the event loop of the session
+        """
+        if not self._loops:
+            self.start()
+        return self._loops[zlib.crc32(session_id.encode('utf-8')) % self._num_loops]
+
+    def run_in_loop(self, loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> None:
+        """Run a callback in a pool event loop and wait until it has been executed.
+
+        If it is called from the loop's own thread, the callback is run immediately.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): the event loop where the callback must run
+            callback (Callable[[], None]): the callback to run
+        """
+        index = self._loops.index(loop) if loop in self._loops else None
+        if index is None or self._threads[index] is threading.current_thread() or not loop.is_running():
+            callback()
+            return
+        future: Future = Future()
+
+        def run_callback():
+            try:
+                callback()
+                future.set_result(None)
+            except Exception as e:
+                future.set_exception(e)
+
+        loop.call_soon_threadsafe(run_callback)
+        future.result()
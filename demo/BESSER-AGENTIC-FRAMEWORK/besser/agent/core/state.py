@@ -1,6 +1,5 @@
 import inspect
 import traceback
-from collections import deque
 from typing import Any, Callable, TYPE_CHECKING, Union
 
 from besser.agent.core.transition.event import Event
@@ -24,6 +23,20 @@ if TYPE_CHECKING:
     from besser.agent.core.agent import Agent
 
 
+def _is_user_message(event: Event) -> bool:
+    """Check if an event is a message sent by a human user (i.e., a ReceiveTextEvent or a ReceiveJSONEvent with a
+    message).
+
+    Args:
+        event (Event): the event to check
+
+    Returns:
+        bool: true if the event is a user message, false otherwise
+    """
+    return (isinstance(event, ReceiveTextEvent) and event.human) or \
+        (isinstance(event, ReceiveJSONEvent) and event.contains_message and event.human)
+
+
 class State:
     """The State core component of an agent.
 
@@ -48,6 +61,12 @@ class State:
             intent)
         _ic_config (IntentClassifierConfiguration): the intent classifier configuration of the state
         _transition_counter (int): Count the number of transitions of this state. Used to name the transitions.
+        _intent_transitions (dict[str, list[int]]): Lookup table from intent names to the (sorted) indices of the
+            transitions triggered by them (i.e., transitions with a ReceiveTextEvent and an IntentMatcher condition)
+        _non_intent_transitions (list[int]): The (sorted) indices of the transitions that are not in the intent
+            transitions lookup table
+        _has_event_transitions (bool): Whether some transition of the state waits for an event
+        _intent_transitions_size (int): The number of transitions when the intent transitions lookup table was built
         intents (list[Intent]): The state intents, i.e. those that can be matched from a specific state
         transitions (list[Transition]): The state's transitions to other states
     """
@@ -68,6 +87,10 @@ class State:
             ic_config = SimpleIntentClassifierConfiguration()
         self._ic_config: IntentClassifierConfiguration = ic_config
         self._transition_counter: int = 0
+        self._intent_transitions: dict[str, list[int]] = {}
+        self._non_intent_transitions: list[int] = []
+        self._has_event_transitions: bool = False
+        self._intent_transitions_size: int = -1
         self.intents: list[Intent] = []
         self.transitions: list[Transition] = []
 
@@ -279,6 +302,63 @@ class State:
         transition_builder.with_condition(function=file_type, params={'allowed_types': allowed_types})
         return transition_builder
 
+    def watched_variables(self) -> set[str]:
+        """Get the names of the session variables that are evaluated in the state's transition conditions (through
+        :class:`~besser.agent.library.transition.conditions.VariableOperationMatcher` conditions).
+
+        Setting one of these variables may trigger a transition, so the transitions must be evaluated again.
+
+        Returns:
+            set[str]: the names of the watched variables
+        """
+        variables: set[str] = set()
+        for transition in self.transitions:
+            if transition.condition is None:
+                continue
+            for condition in transition.condition.atomic_conditions():
+                if isinstance(condition, VariableOperationMatcher):
+                    variables.add(condition.var_name)
+        return variables
+
+    def requires_polling(self) -> bool:
+        """Check if the state transitions must be evaluated periodically.
+
+        This is the case of the transitions that are not triggered by an event and have a condition that is not only
+        based on session variables (e.g., a custom condition function, which could depend on anything).
+
+        Returns:
+            bool: true if some transition of the state must be periodically evaluated, false otherwise
+        """
+        for transition in self.transitions:
+            if transition.is_event() or transition.condition is None:
+                continue
+            for condition in transition.condition.atomic_conditions():
+                if not isinstance(condition, VariableOperationMatcher):
+                    return True
+        return False
+
+    def _get_intent_transitions(self) -> tuple[dict[str, list[int]], list[int]]:
+        """Get the lookup table from intent names to the indices of the transitions triggered by them, together with
+        the indices of the rest of transitions. They are built once, and rebuilt only if new transitions are added to
+        the state.
+
+        Returns:
+            tuple[dict[str, list[int]], list[int]]: the intent transitions lookup table and the non-intent transitions
+        """
+        if self._intent_transitions_size != len(self.transitions):
+            intent_transitions: dict[str, list[int]] = {}
+            non_intent_transitions: list[int] = []
+            for i, transition in enumerate(self.transitions):
+                if isinstance(transition.event, ReceiveTextEvent) and isinstance(transition.condition, IntentMatcher):
+                    intent_transitions.setdefault(transition.condition.intent.name, []).append(i)
+                else:
+                    non_intent_transitions.append(i)
+            self._intent_transitions = intent_transitions
+            self._non_intent_transitions = non_intent_transitions
+            self._has_event_transitions = any(transition.is_event() for transition in self.transitions)
+            self._intent_transitions_size = len(self.transitions)
+        return self._intent_transitions, self._non_intent_transitions
+
     def check_transitions(self, session: Session) -> None:
         """Check the state transitions and triggers the one that is satisfied.
 
@@ -287,6 +367,9 @@ class State:
         For a given transition expecting an event to happen, the first event matching will be used (and removed from the
         session queue of events).
 
+        The intent of each received message is predicted once, and only the transitions of the predicted intents are
+        evaluated (together with the transitions that are not triggered by an intent).
+
         If a user message event is received but does not match the transition, run the fallback body (and the event is
         removed from the session queue of events)
 
@@ -295,34 +378,65 @@ class State:
         """
         last_event = session.event
         run_fallback = False
-        for i, next_transition in enumerate(self.transitions):
+        intent_transitions, non_intent_transitions = self._get_intent_transitions()
+        # The events are taken from the queue in the order they are checked
+        events: list[Event] = []
+        while self._has_event_transitions and session.events:
+            event = session.events.pop()
+            # The intent of each message is predicted only once in this state (it is memoized in the event)
+            if isinstance(event, ReceiveTextEvent):
+                event.predict_intent(session)
+            elif isinstance(event, ReceiveJSONEvent) and event.contains_message:
+                event.predict_intent(session)
+            events.append(event)
+        predicted_intents: set[str] = {event.predicted_intent.intent.name for event in events
+                                       if getattr(event, 'predicted_intent', None) is not None}
+        if predicted_intents:
+            candidates = sorted(set(non_intent_transitions).union(
+                *(intent_transitions.get(intent_name, ()) for intent_name in predicted_intents)))
+        else:
+            candidates = non_intent_transitions
+        for i in candidates:
+            next_transition = self.transitions[i]
             if next_transition.is_event():
-                # TODO: Decide policy to remove events
-                fallback_deque = deque()
-                while session.events:
-                    session.event = session.events.pop()
-                    if isinstance(session.event, ReceiveTextEvent):
-                        session.event.predict_intent(session)
-                    elif isinstance(session.event, ReceiveJSONEvent) and session.event.contains_message:
-                        session.event.predict_intent(session)
-                    if next_transition.evaluate(session, session.event):
+                transition_intent = None
+                if isinstance(next_transition.event, ReceiveTextEvent) and isinstance(next_transition.condition, IntentMatcher):
+                    transition_intent = next_transition.condition.intent.name
+                for j, event in enumerate(events):
+                    predicted_intent = getattr(event, 'predicted_intent', None)
+                    if transition_intent is not None and \
+                            (predicted_intent is None or predicted_intent.intent.name != transition_intent):
+                        # Only the transitions of the event's predicted intent need to be evaluated
+                        continue
+                    session.event = event
+                    if next_transition.evaluate(session, event):
                         session.move(next_transition)
+                        checked_events = events[:j]
+                        if i == len(self.transitions)-1:
+                            # The user messages checked by the last transition are not kept
+                            checked_events = [e for e in checked_events if not _is_user_message(e)]
                         # TODO: Make this configurable (we can consider remove all the previously checked events)
-                        session.events.extend(fallback_deque)  # We restore the queue but with the matched event removed
+                        # We restore the queue but with the matched event removed
+                        session.events.extend(reversed(checked_events + events[j+1:]))
                         return
-                    if (isinstance(session.event, ReceiveTextEvent) and session.event.human) or (isinstance(session.event, ReceiveJSONEvent) and session.event.contains_message and session.event.human):
-                        # There is a ReceiveTextEvent or ReceiveJSONEvent (with message) and we couldn't match any transition so far
-                        run_fallback = True
-                        if i < len(self.transitions)-1:
-                            # We only append ReceiveTextEvent or ReceiveJSONEvent (human with message) if we didn't finish checking all transitions
-                            fallback_deque.appendleft(session.event)
-                    else:
-                        fallback_deque.appendleft(session.event)
-                session.events.extend(fallback_deque)
+            elif next_transition.is_condition_true(session):
+                session.move(next_transition)
+                session.events.extend(reversed(events))
+                return
+        # TODO: Decide policy to remove events
+        fallback_events: list[Event] = []
+        for event in events:
+            if _is_user_message(event):
+                # There is a ReceiveTextEvent or ReceiveJSONEvent (with message) and we couldn't match any transition
+                run_fallback = True
+                session.event = event
+                if not self.transitions[-1].is_event():
+                    # ReceiveTextEvent or ReceiveJSONEvent (human with message) are only kept if the last transition
+                    # does not wait for an event
+                    fallback_events.append(event)
             else:
-                if next_transition.is_condition_true(session):
-                    session.move(next_transition)
-                    return
+                fallback_events.append(event)
+        session.events.extend(reversed(fallback_events))
         if run_fallback:
             # There was one or more transitions with ReceiveMessageEvent and one ReceiveMessageEvent (human)
             # that didn't match any transition
@@ -349,5 +463,7 @@ class State:
             logger.error(f"An error occurred while executing '{self._body.__name__}' of state '{self._name}' in agent '"
                          f"{self._agent.name}'. See the attached exception:")
             traceback.print_exc()
+        # Persist all the session variables set in the body at once
+        session.flush()
         # Reset current event
         # session.event = None  # If we remove the event, if there is an automatic or condition-based transition, we lose the event
@@ -24,6 +24,14 @@ class Condition:
     def __call__(self, session: 'Session') -> bool:
         return self.function(session)
 
+    def atomic_conditions(self) -> list['Condition']:
+        """Get the atomic conditions that compose this condition.
+
+        Returns:
+            list[Condition]: the atomic conditions (the condition itself, unless it is a composition of conditions)
+        """
+        return [self]
+
     def __str__(self):
         if isinstance(self.function, functools.partial):
             return self.function.func.__name__
@@ -39,6 +47,8 @@ class Conjunction(Condition):
         cond2 (Condition): the second condition of the conjunction
 
     Attributes:
+        cond1 (Condition): the first condition of the conjunction
+        cond2 (Condition): the second condition of the conjunction
         log (str): the log message of the conjunction condition
     """
 
@@ -46,7 +56,17 @@ class Conjunction(Condition):
         def conjunction(session: Session) -> bool:
             return cond1.function(session) and cond2.function(session)
         super().__init__(conjunction)
+        self.cond1: Condition = cond1
+        self.cond2: Condition = cond2
         self.log: str = f"{cond1} and {cond2}"
 
+    def atomic_conditions(self) -> list[Condition]:
+        """Get the atomic conditions that compose this conjunction.
+
+        Returns:
+            list[Condition]: the atomic conditions of both sides of the conjunction
+        """
+        return self.cond1.atomic_conditions() + self.cond2.atomic_conditions()
+
     def __str__(self):
         return self.log
@@ -80,3 +80,98 @@ type: ``str``
 
 default value: ``None``
 """
+
+DB_MONITORING_BATCH_SIZE = Property(SECTION_DB, 'db.monitoring.batch_size', int, 100)
+"""
+The records of the monitoring database are not written one by one, but put in a queue and written in batches by a
+single writer thread. This property sets the maximum number of records written (and committed) in a single batch.
+
+name: ``db.monitoring.batch_size``
+
+type: ``int``
+
+default value: ``100``
+"""
+
+DB_MONITORING_FLUSH_INTERVAL = Property(SECTION_DB, 'db.monitoring.flush_interval', float, 0.5)
+"""
+The maximum time (in seconds) a record waits in the monitoring database queue before being written.
+
+name: ``db.monitoring.flush_interval``
+
+type: ``float``
+
+default value: ``0.5``
+"""
+
+DB_MONITORING_QUEUE_SIZE = Property(SECTION_DB, 'db.monitoring.queue_size', int, 10000)
+"""
+The maximum number of records waiting in the monitoring database queue. When the queue is full, the agent waits until
+there is room for new records.
+
+name: ``db.monitoring.queue_size``
+
+type: ``int``
+
+default value: ``10000``
+"""
+
+DB_MONITORING_POOL_SIZE = Property(SECTION_DB, 'db.monitoring.pool_size', int, 5)
+"""
+The number of connections kept open in the monitoring database connection pool.
+
+name: ``db.monitoring.pool_size``
+
+type: ``int``
+
+default value: ``5``
+"""
+
+DB_MONITORING_MAX_OVERFLOW = Property(SECTION_DB, 'db.monitoring.max_overflow', int, 10)
+"""
+The number of connections that can be opened beyond the monitoring database pool size when all the pooled connections
+are in use.
+
+name: ``db.monitoring.max_overflow``
+
+type: ``int``
+
+default value: ``10``
+"""
+
+DB_MONITORING_CACHE_TTL = Property(SECTION_DB, 'db.monitoring.cache_ttl', float, 30.0)
+"""
+The time (in seconds) the results of the monitoring database aggregation queries (used by the monitoring dashboard) are
+cached. If it is 0, the results are not cached.
+
+name: ``db.monitoring.cache_ttl``
+
+type: ``float``
+
+default value: ``30.0``
+"""
+
+DB_MONITORING_RETENTION_DAYS = Property(SECTION_DB, 'db.monitoring.retention_days', int, 0)
+"""
+The number of days the records of the monitoring database are kept in the main tables. Older records are periodically
+moved to the archive tables (the per-minute rollups used by the monitoring dashboard are kept). If it is 0, records are
+never archived.
+
+name: ``db.monitoring.retention_days``
+
+type: ``int``
+
+default value: ``0``
+"""
+
+DB_MONITORING_COMPACTION_INTERVAL = Property(SECTION_DB, 'db.monitoring.compaction_interval', float, 3600.0)
+"""
+The time (in seconds) between two runs of the job that archives the old records of the monitoring database (see
+``db.monitoring.retention_days``).
+
+name: ``db.monitoring.compaction_interval``
+
+type: ``float``
+
+default value: ``3600.0``
+"""
@@ -1,11 +1,14 @@
-from datetime import datetime
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any, Optional
 
 import json
 import pandas as pd
 from sqlalchemy import Connection, create_engine, Column, String, Integer, UniqueConstraint, ForeignKey, DateTime, \
-    Float, MetaData, insert, Table, select, Executable, CursorResult, desc, Boolean
-from sqlalchemy.dialects.postgresql import JSONB
+    Float, MetaData, insert, Table, select, Executable, CursorResult, desc, Boolean, Engine, bindparam, text, Row, \
+    and_, or_, func, Select, Index, inspect, cast, literal_column, union_all
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 from sqlalchemy.orm import declarative_base
 
 from besser.agent.core.message import Message
@@ -15,7 +18,12 @@ from besser.agent.core.transition.event import Event
 from besser.agent.core.transition.transition import Transition
 from besser.agent.exceptions.logger import logger
 from besser.agent.db import DB_MONITORING_DIALECT, DB_MONITORING_PORT, DB_MONITORING_HOST, DB_MONITORING_DATABASE, \
-    DB_MONITORING_USERNAME, DB_MONITORING_PASSWORD
+    DB_MONITORING_USERNAME, DB_MONITORING_PASSWORD, DB_MONITORING_BATCH_SIZE, DB_MONITORING_FLUSH_INTERVAL, \
+    DB_MONITORING_QUEUE_SIZE, DB_MONITORING_POOL_SIZE, DB_MONITORING_MAX_OVERFLOW, DB_MONITORING_CACHE_TTL, \
+    DB_MONITORING_RETENTION_DAYS, DB_MONITORING_COMPACTION_INTERVAL
+from besser.agent.db.monitoring_db_cache import MonitoringDBCache
+from besser.agent.db.monitoring_db_writer import MonitoringDBWriter
+from besser.agent.library.intent.intent_library import fallback_intent
 from besser.agent.library.transition.events.base_events import ReceiveMessageEvent, ReceiveFileEvent
 from besser.agent.library.transition.events.github_webhooks_events import GitHubEvent
 from besser.agent.library.transition.events.gitlab_webhooks_events import GitLabEvent
@@ -44,19 +52,226 @@ TABLE_CHAT = 'chat'
 TABLE_EVENT = 'event'
 """The name of the database table that contains the event records"""
 
+TABLE_USER_PROFILES = 'user_profiles'
+"""The name of the database table that contains the user profiles (not created by the monitoring database)"""
+
+TABLE_CHAT_ROLLUP = 'chat_rollup'
+"""The name of the database table that contains the number of messages per minute"""
+
+TABLE_TRANSITION_ROLLUP = 'transition_rollup'
+"""The name of the database table that contains the number of transitions per minute"""
+
+TABLE_INTENT_PREDICTION_ROLLUP = 'intent_prediction_rollup'
+"""The name of the database table that contains the number of intent predictions per minute"""
+
+TABLE_EVENT_ROLLUP = 'event_rollup'
+"""The name of the database table that contains the number of events per minute"""
+
+ARCHIVE_SUFFIX = '_archive'
+"""The suffix of the names of the database tables where the old records are archived"""
+
+TIME_BUCKETS = ('minute', 'hour', 'day', 'week', 'month')
+"""The time buckets available to group records by time in the aggregation queries"""
+
+Base = declarative_base()
+"""The declarative base of the monitoring database tables"""
+
+
+class TableSession(Base):
+    __tablename__ = TABLE_SESSION
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    agent_name = Column(String, nullable=False)
+    session_id = Column(String, nullable=False)
+    platform_name = Column(String, nullable=False)
+    timestamp = Column(DateTime, nullable=False)
+    variables = Column(String, nullable=True)
+    __table_args__ = (
+        UniqueConstraint('agent_name', 'session_id'),
+    )
+
+
+class TableIntentPrediction(Base):
+    __tablename__ = TABLE_INTENT_PREDICTION
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(Integer, ForeignKey(f'{TABLE_SESSION}.id'), nullable=False)
+    message = Column(String, nullable=False)
+    timestamp = Column(DateTime, nullable=False)
+    intent_classifier = Column(String, nullable=False)
+    intent = Column(String, nullable=False)
+    score = Column(Float, nullable=False)
+    __table_args__ = (
+        Index(f'ix_{TABLE_INTENT_PREDICTION}_session_id_timestamp', 'session_id', 'timestamp'),
+        Index(f'ix_{TABLE_INTENT_PREDICTION}_timestamp', 'timestamp'),
+    )
+
+
+class TableParameter(Base):
+    __tablename__ = TABLE_PARAMETER
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    intent_prediction_id = Column(Integer, ForeignKey(f'{TABLE_INTENT_PREDICTION}.id'), nullable=False)
+    name = Column(String, nullable=False)
+    value = Column(String)
+    info = Column(String)
+    __table_args__ = (
+        Index(f'ix_{TABLE_PARAMETER}_intent_prediction_id', 'intent_prediction_id'),
+    )
+
+
+class TableTransition(Base):
+    __tablename__ = TABLE_TRANSITION
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(Integer, ForeignKey(f'{TABLE_SESSION}.id'), nullable=False)
+    source_state = Column(String, nullable=False)
+    dest_state = Column(String, nullable=False)
+    event = Column(String, nullable=True)
+    condition = Column(String, nullable=True)
+    timestamp = Column(DateTime, nullable=False)
+    __table_args__ = (
+        Index(f'ix_{TABLE_TRANSITION}_session_id_timestamp', 'session_id', 'timestamp'),
+        Index(f'ix_{TABLE_TRANSITION}_timestamp', 'timestamp'),
+    )
+
+
+class TableChat(Base):
+    __tablename__ = TABLE_CHAT
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(Integer, ForeignKey(f'{TABLE_SESSION}.id'), nullable=False)
+    type = Column(String, nullable=False)
+    content = Column(JSONB, nullable=False)  # JSONB allows to handle the dictionary (TTS messages)
+    is_user = Column(Boolean, nullable=False)
+    timestamp = Column(DateTime, nullable=False)
+    __table_args__ = (
+        Index(f'ix_{TABLE_CHAT}_session_id_timestamp', 'session_id', 'timestamp'),
+        Index(f'ix_{TABLE_CHAT}_timestamp', 'timestamp'),
+    )
+
+
+class TableEvent(Base):
+    __tablename__ = TABLE_EVENT
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(Integer, ForeignKey(f'{TABLE_SESSION}.id'), nullable=True)
+    event = Column(String, nullable=False)
+    info = Column(String, nullable=True)
+    timestamp = Column(DateTime, nullable=False)
+    __table_args__ = (
+        Index(f'ix_{TABLE_EVENT}_session_id_timestamp', 'session_id', 'timestamp'),
+        Index(f'ix_{TABLE_EVENT}_timestamp', 'timestamp'),
+    )
+
+
+class TableChatRollup(Base):
+    __tablename__ = TABLE_CHAT_ROLLUP
+    minute = Column(DateTime, primary_key=True)
+    agent_name = Column(String, primary_key=True)
+    is_user = Column(Boolean, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+class TableTransitionRollup(Base):
+    __tablename__ = TABLE_TRANSITION_ROLLUP
+    minute = Column(DateTime, primary_key=True)
+    agent_name = Column(String, primary_key=True)
+    source_state = Column(String, primary_key=True)
+    dest_state = Column(String, primary_key=True)
+    event = Column(String, primary_key=True)
+    condition = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+class TableIntentPredictionRollup(Base):
+    __tablename__ = TABLE_INTENT_PREDICTION_ROLLUP
+    minute = Column(DateTime, primary_key=True)
+    agent_name = Column(String, primary_key=True)
+    intent = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False)
+    score_sum = Column(Float, nullable=False)
+
+
+class TableEventRollup(Base):
+    __tablename__ = TABLE_EVENT_ROLLUP
+    minute = Column(DateTime, primary_key=True)
+    agent_name = Column(String, primary_key=True)  # Empty for events not associated to a session
+    event = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+ROLLUPS: dict[str, tuple[str, tuple[str, ...], tuple[str, ...]]] = {
+    TABLE_CHAT: (TABLE_CHAT_ROLLUP, ('is_user',), ()),
+    TABLE_TRANSITION: (TABLE_TRANSITION_ROLLUP, ('source_state', 'dest_state', 'event', 'condition'), ()),
+    TABLE_INTENT_PREDICTION: (TABLE_INTENT_PREDICTION_ROLLUP, ('intent',), ('score',)),
+    TABLE_EVENT: (TABLE_EVENT_ROLLUP, ('event',), ()),
+}
+"""The rollup of each monitoring database table, as a tuple (rollup table name, grouping columns, summed columns). Each
+rollup record contains the number of records (and the sum of the summed columns, in ``<column>_sum``) of an agent with
+the same grouping column values in a minute."""
+
+
+def _archive_table(table: Table) -> Table:
+    """Define the table where the old records of a monitoring database table are archived. It has the same columns, but
+    no foreign keys, so the archived records do not depend on the records of other tables."""
+    columns = [Column(c.name, c.type, primary_key=c.primary_key, autoincrement=False, nullable=c.nullable)
+               for c in table.columns]
+    archive_name = f'{table.name}{ARCHIVE_SUFFIX}'
+    indexes = [Index(f'ix_{archive_name}_session_id_timestamp', 'session_id', 'timestamp')] \
+        if 'session_id' in table.c and 'timestamp' in table.c else []
+    return Table(archive_name, Base.metadata, *columns, *indexes)
+
+
+ARCHIVED_TABLES: tuple[str, ...] = (TABLE_PARAMETER, TABLE_INTENT_PREDICTION, TABLE_CHAT, TABLE_TRANSITION, TABLE_EVENT)
+"""The monitoring database tables whose old records are archived (see :meth:`MonitoringDB.compact`), in archiving order
+(the records referencing other records go first)"""
+
+for _table_name in ARCHIVED_TABLES:
+    _archive_table(Base.metadata.tables[_table_name])
+
+
+PendingChatRecord = namedtuple('PendingChatRecord', ['id', 'type', 'content', 'is_user', 'timestamp'])
+"""A chat record that is in the write-behind queue (i.e., not written in the database yet). It has the same fields as
+the chat records read with :meth:`MonitoringDB.select_chat_page`, but its id is None."""
+
 
 class MonitoringDB:
     """This class is an interface to connect to a database where user interactions with the agent are stored to monitor
     the agent for later analysis.
 
+    The database schema (see :obj:`Base`) and the statements that are run on every user interaction are built once, and
+    every operation takes a connection from the engine's connection pool.
+
+    Every record inserted in the chat, transition, intent prediction and event tables also updates their per-minute
+    rollup tables (see :obj:`ROLLUPS`), which answer most of the aggregation queries of the monitoring dashboard without
+    reading the raw records. Raw records older than a retention period can be moved to archive tables (see
+    :meth:`compact`).
+
     Attributes:
-        conn (sqlalchemy.Connection): The connection to the monitoring database
+        engine (sqlalchemy.Engine): The engine of the monitoring database, which holds a pool of connections
         connected (bool): Whether there is an active connection to the monitoring database or not
+        writer (MonitoringDBWriter or None): The write-behind queue where the monitoring records are put to be written
+            in batches. If it is not running, the records are inserted immediately
+        _tables (dict[str, sqlalchemy.Table]): The monitoring database tables, by name
+        _statements (dict[str, sqlalchemy.Executable]): Reusable statements, with bound parameters
+        _session_db_ids (dict[tuple[str, str, str], int]): Cache of the database ids of the sessions, by (agent name,
+            platform name, session id)
+        _cache (MonitoringDBCache): Cache of the results of the aggregation queries
+        _compaction_thread (threading.Thread or None): The thread that periodically archives the old records
+        _compaction_stop (threading.Event): Event to stop the compaction thread
     """
 
     def __init__(self):
-        self.conn: Connection = None
+        self.engine: Engine = None
         self.connected: bool = False
+        self.writer: MonitoringDBWriter or None = None
+        self._tables: dict[str, Table] = dict(Base.metadata.tables)
+        self._statements: dict[str, Executable] = {}
+        self._session_db_ids: dict[tuple[str, str, str], int] = {}
+        self._cache: MonitoringDBCache = MonitoringDBCache(ttl=DB_MONITORING_CACHE_TTL.default_value)
+        self._compaction_thread: threading.Thread or None = None
+        self._compaction_stop: threading.Event = threading.Event()
+        self._build_statements()
+
+    @property
+    def cache(self) -> MonitoringDBCache:
+        """MonitoringDBCache: The cache of the results of the aggregation queries."""
+        return self._cache
 
     def connect_to_db(self, agent: 'Agent') -> None:
         """Connect to the monitoring database.
@@ -72,78 +287,353 @@ class MonitoringDB:
             port = agent.get_property(DB_MONITORING_PORT)
             database = agent.get_property(DB_MONITORING_DATABASE)
             url = f"{dialect}://{username}:{password}@{host}:{port}/{database}"
-            engine = create_engine(url)
-            self.conn = engine.connect()
-            self.connected = True
+            self.connect_to_url(
+                url,
+                pool_size=agent.get_property(DB_MONITORING_POOL_SIZE),
+                max_overflow=agent.get_property(DB_MONITORING_MAX_OVERFLOW)
+            )
+            self._cache.ttl = agent.get_property(DB_MONITORING_CACHE_TTL)
         except Exception as e:
             logger.error(f"An error occurred while trying to connect to the monitoring DB in agent '{agent.name}'. "
                           f"See the attached exception:")
             logger.error(e)
 
+    def connect_to_url(self, url: str, pool_size: int = 5, max_overflow: int = 10) -> None:
+        """Connect to the monitoring database given its URL.
+
+        Args:
+            url (str): the database URL
+            pool_size (int): the number of connections kept open in the connection pool
+            max_overflow (int): the number of connections that can be opened beyond the pool size when all pooled
+                connections are in use
+        """
+        self.engine = create_engine(url, pool_size=pool_size, max_overflow=max_overflow, pool_pre_ping=True)
+        with self.engine.connect():
+            # Check that the database is reachable
+            pass
+        self.connected = True
+
     def initialize_db(self) -> None:
-        """Initialize the monitoring database, creating the tables if necessary."""
-        Base = declarative_base()  # Define a declarative base
-
-        # Define the table schemas
-        class TableSession(Base):
-            __tablename__ = TABLE_SESSION
-            id = Column(Integer, primary_key=True, autoincrement=True)
-            agent_name = Column(String, nullable=False)
-            session_id = Column(String, nullable=False)
-            platform_name = Column(String, nullable=False)
-            timestamp = Column(DateTime, nullable=False)
-            variables = Column(String, nullable=True)
-            __table_args__ = (
-                UniqueConstraint('agent_name', 'session_id'),
+        """Initialize the monitoring database, creating the tables and indexes if necessary.
+
+        If the rollup tables did not exist, they are computed from the existing records (see :meth:`rebuild_rollups`).
+        """
+        inspector = inspect(self.engine)
+        missing_rollups = not all(inspector.has_table(rollup_name) for rollup_name, _, _ in ROLLUPS.values())
+        Base.metadata.create_all(self.engine)
+        # Indexes of tables created by a previous version of the monitoring database
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
+        if missing_rollups:
+            self.rebuild_rollups()
+
+    def _build_statements(self) -> None:
+        """Build the statements that are run on every user interaction. Their parameters are bound on execution, so
+        each statement is compiled only once."""
+        table_session = self._tables[TABLE_SESSION]
+        table_transition = self._tables[TABLE_TRANSITION]
+        session_filter = (
+            table_session.c.agent_name == bindparam('b_agent_name'),
+            table_session.c.platform_name == bindparam('b_platform_name'),
+            table_session.c.session_id == bindparam('b_session_id'),
+        )
+        self._statements = {
+            'select_session': select(table_session).where(*session_filter),
+            'select_session_id': select(table_session.c.id).where(*session_filter),
+            'select_session_variables': select(table_session.c.variables).where(*session_filter),
+            'update_session_variables': table_session.update().where(*session_filter).values(
+                variables=bindparam('b_variables')
+            ),
+            'select_last_state': (
+                select(table_transition.c.dest_state)
+                .join(table_session, table_transition.c.session_id == table_session.c.id)
+                .where(*session_filter)
+                .order_by(desc(table_transition.c.timestamp))
+                .limit(1)
+            ),
+        }
+        table_transition_archive = self._tables[f'{TABLE_TRANSITION}{ARCHIVE_SUFFIX}']
+        self._statements['select_last_archived_state'] = (
+            select(table_transition_archive.c.dest_state)
+            .join(table_session, table_transition_archive.c.session_id == table_session.c.id)
+            .where(*session_filter)
+            .order_by(desc(table_transition_archive.c.timestamp))
+            .limit(1)
+        )
+        for table_name, table in self._tables.items():
+            self._statements[f'insert_{table_name}'] = insert(table)
+        for rollup_name, _, sum_columns in ROLLUPS.values():
+            rollup = self._tables[rollup_name]
+            stmt = pg_insert(rollup)
+            updated_values = {'count': rollup.c.count + stmt.excluded.count}
+            for column in sum_columns:
+                updated_values[f'{column}_sum'] = rollup.c[f'{column}_sum'] + stmt.excluded[f'{column}_sum']
+            self._statements[f'upsert_{rollup_name}'] = stmt.on_conflict_do_update(
+                index_elements=[column.name for column in rollup.primary_key.columns],
+                set_=updated_values
             )
 
-        class TableIntentPrediction(Base):
-            __tablename__ = TABLE_INTENT_PREDICTION
-            id = Column(Integer, primary_key=True, autoincrement=True)
-            session_id = Column(Integer, ForeignKey(f'{TABLE_SESSION}.id'), nullable=False)
-            message = Column(String, nullable=False)
-            timestamp = Column(DateTime, nullable=False)
-            intent_classifier = Column(String, nullable=False)
-            intent = Column(String, nullable=False)
-            score = Column(Float, nullable=False)
-
-        class TableParameter(Base):
-            __tablename__ = TABLE_PARAMETER
-            id = Column(Integer, primary_key=True, autoincrement=True)
-            intent_prediction_id = Column(Integer, ForeignKey(f'{TABLE_INTENT_PREDICTION}.id'), nullable=False)
-            name = Column(String, nullable=False)
-            value = Column(String)
-            info = Column(String)
-
-        class TableTransition(Base):
-            __tablename__ = TABLE_TRANSITION
-            id = Column(Integer, primary_key=True, autoincrement=True)
-            session_id = Column(Integer, ForeignKey(f'{TABLE_SESSION}.id'), nullable=False)
-            source_state = Column(String, nullable=False)
-            dest_state = Column(String, nullable=False)
-            event = Column(String, nullable=True)
-            condition = Column(String, nullable=True)
-            timestamp = Column(DateTime, nullable=False)
-
-        class TableChat(Base):
-            __tablename__ = TABLE_CHAT
-            id = Column(Integer, primary_key=True, autoincrement=True)
-            session_id = Column(Integer, ForeignKey(f'{TABLE_SESSION}.id'), nullable=False)
-            type = Column(String, nullable=False)
-            content = Column(JSONB, nullable=False)  # JSONB allows to handle the dictionary (TTS messages)
-            is_user = Column(Boolean, nullable=False)
-            timestamp = Column(DateTime, nullable=False)
-
-        class TableEvent(Base):
-            __tablename__ = TABLE_EVENT
-            id = Column(Integer, primary_key=True, autoincrement=True)
-            session_id = Column(Integer, ForeignKey(f'{TABLE_SESSION}.id'), nullable=True)
-            event = Column(String, nullable=False)
-            info = Column(String, nullable=True)
-            timestamp = Column(DateTime, nullable=False)
-
-        Base.metadata.create_all(self.conn)
-        self.conn.commit()
+    @staticmethod
+    def _session_params(agent_name: str, platform_name: str, session_id: str) -> dict[str, str]:
+        """Get the parameters that identify a session in the reusable statements.
+
+        Args:
+            agent_name (str): the agent name
+            platform_name (str): the platform name
+            session_id (str): the session id
+
+        Returns:
+            dict[str, str]: the statement parameters
+        """
+        return {'b_agent_name': agent_name, 'b_platform_name': platform_name, 'b_session_id': session_id}
+
+    @staticmethod
+    def _session_key(session: Session) -> tuple[str, str, str]:
+        return session._agent.name, session.platform.__class__.__name__, session.id
+
+    def get_table_schema(self, table_name: str) -> Table or None:
+        """Get a table of the monitoring database. Tables that are not defined in the monitoring database schema are
+        reflected from the database (only once).
+
+        Args:
+            table_name (str): the table name
+
+        Returns:
+            sqlalchemy.Table or None: the table, or None if it does not exist
+        """
+        if table_name not in self._tables:
+            try:
+                self._tables[table_name] = Table(table_name, MetaData(), autoload_with=self.engine)
+            except Exception as e:
+                logger.error(f"Table '{table_name}' not found in the monitoring DB: {e}")
+                return None
+        return self._tables[table_name]
+
+    def get_session_db_id(self, session: Session, conn: Connection = None) -> int or None:
+        """Get the database id of a session (i.e., the primary key of its record in the session table). Ids are cached
+        after the first lookup.
+
+        Args:
+            session (Session): the session
+            conn (sqlalchemy.Connection): the connection to use. If none is provided, one is taken from the pool
+
+        Returns:
+            int or None: the session database id, or None if the session is not in the database
+        """
+        key = self._session_key(session)
+        if key in self._session_db_ids:
+            return self._session_db_ids[key]
+        stmt = self._statements['select_session_id']
+        if conn is None:
+            with self.engine.connect() as pooled_conn:
+                result = pooled_conn.execute(stmt, self._session_params(*key)).first()
+        else:
+            result = conn.execute(stmt, self._session_params(*key)).first()
+        if result is None:
+            return None
+        self._session_db_ids[key] = int(result[0])
+        return self._session_db_ids[key]
+
+    def forget_session(self, session: Session) -> None:
+        """Remove a session from the cache of session database ids (e.g., when it is deleted from the database).
+
+        Args:
+            session (Session): the session to forget
+        """
+        self._session_db_ids.pop(self._session_key(session), None)
+
+    def update_rollups(
+            self,
+            conn: Connection,
+            table_name: str,
+            records: list[tuple[str or None, dict[str, Any]]],
+            removed: bool = False
+    ) -> None:
+        """Add a set of new records to the rollup table of their table (see :obj:`ROLLUPS`), or subtract a set of
+        deleted records from it. It must be called in the same transaction that inserts (or deletes) the records.
+
+        Args:
+            conn (sqlalchemy.Connection): the connection of the transaction that inserts the records
+            table_name (str): the name of the table where the records are inserted
+            records (list[tuple[str or None, dict[str, Any]]]): the inserted records, with the name of the agent they
+                belong to (None if they do not belong to a session)
+            removed (bool): whether the records are deleted instead of inserted. The rollup records left empty are
+                deleted
+        """
+        if table_name not in ROLLUPS or not records:
+            return
+        rollup_name, group_columns, sum_columns = ROLLUPS[table_name]
+        sign = -1 if removed else 1
+        deltas: dict[tuple, list] = {}
+        for agent_name, row in records:
+            key = (
+                row['timestamp'].replace(second=0, microsecond=0),
+                agent_name or '',
+                *('' if row.get(column) is None else row[column] for column in group_columns)
+            )
+            delta = deltas.setdefault(key, [0] + [0.0] * len(sum_columns))
+            delta[0] += sign
+            for i, column in enumerate(sum_columns):
+                delta[i + 1] += sign * row[column]
+        rollup_rows = []
+        # Rows are always upserted in the same order, so concurrent transactions do not deadlock
+        for key, delta in sorted(deltas.items()):
+            rollup_row = {'minute': key[0], 'agent_name': key[1], 'count': delta[0]}
+            rollup_row.update(zip(group_columns, key[2:]))
+            rollup_row.update((f'{column}_sum', value) for column, value in zip(sum_columns, delta[1:]))
+            rollup_rows.append(rollup_row)
+        conn.execute(self._statements[f'upsert_{rollup_name}'], rollup_rows)
+        if removed:
+            rollup = self._tables[rollup_name]
+            conn.execute(rollup.delete().where(
+                rollup.c.minute.in_(sorted({key[0] for key in deltas})), rollup.c.count <= 0
+            ))
+
+    def rebuild_rollups(self) -> None:
+        """Compute the rollup tables (see :obj:`ROLLUPS`) from the records of the monitoring database, including the
+        archived ones."""
+        table_session = self._tables[TABLE_SESSION]
+        try:
+            with self.engine.begin() as conn:
+                for table_name, (rollup_name, group_columns, sum_columns) in ROLLUPS.items():
+                    table = self._tables[table_name]
+                    archive = self._tables[f'{table_name}{ARCHIVE_SUFFIX}']
+                    columns = ['session_id', 'timestamp', *group_columns, *sum_columns]
+                    records = union_all(
+                        select(*(table.c[column] for column in columns)),
+                        select(*(archive.c[column] for column in columns)),
+                    ).subquery()
+                    # Empty strings are rendered inline, so the same expressions can be used in the GROUP BY clause
+                    empty = literal_column("''")
+                    group_by = [
+                        self._date_trunc('minute', records.c.timestamp).label('minute'),
+                        func.coalesce(table_session.c.agent_name, empty).label('agent_name'),
+                        *(func.coalesce(records.c[column], empty).label(column) if table.c[column].nullable
+                          else records.c[column] for column in group_columns),
+                    ]
+                    stmt = (
+                        select(
+                            *group_by,
+                            func.count().label('count'),
+                            *(func.sum(records.c[column]).label(f'{column}_sum') for column in sum_columns),
+                        )
+                        .select_from(records.outerjoin(table_session, records.c.session_id == table_session.c.id))
+                        .group_by(*group_by)
+                    )
+                    rollup = self._tables[rollup_name]
+                    conn.execute(rollup.delete())
+                    conn.execute(rollup.insert().from_select([column.name for column in stmt.selected_columns], stmt))
+        except Exception as e:
+            logger.error(f'Error computing the rollup tables of the monitoring DB: {e}')
+
+    def compact(self, retention_days: int) -> dict[str, int]:
+        """Move the records older than a retention period from the chat, transition, intent prediction, parameter and
+        event tables to their archive tables (see :obj:`ARCHIVED_TABLES`). The rollup tables are not modified.
+
+        Note that the aggregation queries that are answered with the rollup tables (see :meth:`_use_rollups`) still
+        count the archived records, while the ones that read the raw records (i.e., filtered by session or by a time
+        range that is not made of whole minutes) only count the records that have not been archived.
+
+        Args:
+            retention_days (int): the number of days the records are kept in the main tables
+
+        Returns:
+            dict[str, int]: the number of archived records of each table
+        """
+        cutoff = datetime.now() - timedelta(days=retention_days)
+        table_intent_prediction = self._tables[TABLE_INTENT_PREDICTION]
+        archived = {}
+        # Pending records must be written, so they are not inserted after their intent prediction is archived
+        self.flush()
+        for table_name in ARCHIVED_TABLES:
+            table = self._tables[table_name]
+            archive = self._tables[f'{table_name}{ARCHIVE_SUFFIX}']
+            if table_name == TABLE_PARAMETER:
+                condition = table.c.intent_prediction_id.in_(
+                    select(table_intent_prediction.c.id).where(table_intent_prediction.c.timestamp < cutoff)
+                )
+            else:
+                condition = table.c.timestamp < cutoff
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(archive.insert().from_select(
+                        [column.name for column in table.columns], select(table).where(condition)
+                    ))
+                    archived[table_name] = conn.execute(table.delete().where(condition)).rowcount
+            except Exception as e:
+                logger.error(f"Error archiving the old records of table '{table_name}' in the monitoring DB: {e}")
+                # The next tables are not archived, since their records may be referenced by the current one
+                break
+        if any(archived.values()):
+            logger.info(f'Archived monitoring DB records older than {cutoff}: {archived}')
+        return archived
+
+    def start_compaction(self, agent: 'Agent') -> None:
+        """Start the thread that periodically archives the old records of the monitoring database (see
+        :meth:`compact`), if a retention period is set.
+
+        Args:
+            agent (Agent): The agent that contains the database-related properties.
+        """
+        retention_days = agent.get_property(DB_MONITORING_RETENTION_DAYS)
+        if retention_days <= 0 or (self._compaction_thread is not None and self._compaction_thread.is_alive()):
+            return
+        interval = agent.get_property(DB_MONITORING_COMPACTION_INTERVAL)
+        self._compaction_stop.clear()
+
+        def run_compaction() -> None:
+            while True:
+                self.compact(retention_days)
+                if self._compaction_stop.wait(interval):
+                    return
+
+        self._compaction_thread = threading.Thread(target=run_compaction, name='monitoring-db-compaction', daemon=True)
+        self._compaction_thread.start()
+
+    def stop_compaction(self) -> None:
+        """Stop the thread that periodically archives the old records of the monitoring database."""
+        if self._compaction_thread is None:
+            return
+        self._compaction_stop.set()
+        self._compaction_thread.join()
+        self._compaction_thread = None
+
+    def start_writer(self, agent: 'Agent') -> None:
+        """Start the write-behind queue of the monitoring database.
+
+        Args:
+            agent (Agent): The agent that contains the database-related properties.
+        """
+        if self.writer is None:
+            self.writer = MonitoringDBWriter(
+                self,
+                batch_size=agent.get_property(DB_MONITORING_BATCH_SIZE),
+                flush_interval=agent.get_property(DB_MONITORING_FLUSH_INTERVAL),
+                queue_size=agent.get_property(DB_MONITORING_QUEUE_SIZE),
+            )
+        self.writer.start()
+
+    def flush(self) -> None:
+        """Wait until all the records queued (in the write-behind queue) before the call have been written."""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def _insert_record(self, table_name: str, row: dict[str, Any], agent_name: str or None) -> None:
+        """Insert a record into a table of the monitoring database and add it to the table's rollup, in the same
+        transaction.
+
+        Args:
+            table_name (str): the table name
+            row (dict[str, Any]): the record
+            agent_name (str or None): the name of the agent the record belongs to
+        """
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(self._statements[f'insert_{table_name}'], row)
+                self.update_rollups(conn, table_name, [(agent_name, row)])
+        except Exception as e:
+            logger.error(e)
 
     def insert_session(self, session: Session) -> None:
         """Insert a new session record into the sessions table of the monitoring database.
@@ -151,15 +641,14 @@ class MonitoringDB:
         Args:
             session (Session): the session to insert into the database
         """
-        table = Table(TABLE_SESSION, MetaData(), autoload_with=self.conn)
-        stmt = insert(table).values(
-            agent_name=session._agent.name,
-            session_id=session.id,
-            platform_name=session.platform.__class__.__name__,
-            timestamp=datetime.now(),
-            variables="{}"
-        )
-        self.run_statement(stmt)
+        self.run_statement(self._statements[f'insert_{TABLE_SESSION}'], {
+            'agent_name': session._agent.name,
+            'session_id': session.id,
+            'platform_name': session.platform.__class__.__name__,
+            'timestamp': datetime.now(),
+            'variables': "{}",
+        })
+
     def store_session_variables(self, session: Session) -> None:
         """
         Stores the current session variables (dictionary) as a JSON string in the monitoring database,
@@ -168,36 +657,32 @@ class MonitoringDB:
         Args:
             session (Session): The session whose variables should be stored.
         """
-        table = Table(TABLE_SESSION, MetaData(), autoload_with=self.conn)
         session_dict = session.get_dictionary()
         json_variables = json.dumps(session_dict)
-        stmt = (
-            table.update()
-            .where(
-                table.c.agent_name == session._agent.name,
-                table.c.platform_name == session.platform.__class__.__name__,
-                table.c.session_id == session.id
-            )
-            .values(variables=json_variables)
-        )
-        self.run_statement(stmt)
+        params = self._session_params(*self._session_key(session))
+        params['b_variables'] = json_variables
+        self.run_statement(self._statements['update_session_variables'], params)
 
     def load_session_variables(self, session: Session) -> None:
         """
         Loads the session variables from the monitoring database, transforms the JSON string into a dictionary,
-        and sets each key-value pair in the session using session.set(key, value).
+        and sets each key-value pair in the session private data storage. The loaded entries are not marked to be
+        persisted again.
 
         Args:
             session (Session): The session whose variables should be loaded.
         """
-        session_entry = self.select_session(session)
-        if session_entry.empty:
+        with self.engine.connect() as conn:
+            result = conn.execute(
+                self._statements['select_session_variables'],
+                self._session_params(*self._session_key(session))
+            ).first()
+        if result is None:
             return
-        variables_json = session_entry.iloc[0]['variables']
+        variables_json = result[0]
         try:
             variables_dict = json.loads(variables_json) if variables_json else {}
-            for key, value in variables_dict.items():
-                session.set(key, value)
+            session._dictionary.update(variables_dict)
         except Exception as e:
             logger.error(f"Error loading session variables: {e}")
 
@@ -219,9 +704,12 @@ class MonitoringDB:
         # where `information` is a JSON-encoded text column. Use the session id as the
         # username lookup key.
         try:
-            table = Table('user_profiles', MetaData(), autoload_with=self.conn)
+            table = self.get_table_schema(TABLE_USER_PROFILES)
+            if table is None:
+                return None
             stmt = select(table.c.information).where(table.c.username == session.id)
-            result = self.conn.execute(stmt).first()
+            with self.engine.connect() as conn:
+                result = conn.execute(stmt).first()
             if not result:
                 return None
             info_text = result[0]
@@ -240,62 +728,106 @@ class MonitoringDB:
             logger.error(f"Error getting user profile from monitoring DB: {e}")
             return None
 
-    def insert_intent_prediction(
+    def _intent_prediction_rows(
             self,
             session: Session,
             state: State,
             predicted_intent: IntentClassifierPrediction
-    ) -> None:
-        """Insert a new intent prediction record into the intent predictions table of the monitoring database.
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """Create an intent prediction record and its parameter records (without the session and intent prediction ids).
 
         Args:
-            session (Session): the session containing the predicted intent to insert into the database
-            state (State): the state where the intent prediction took place (the session's current state may have
-                changed since the intent prediction, so we need it as argument)
+            session (Session): the session containing the predicted intent
+            state (State): the state where the intent prediction took place
             predicted_intent (IntentClassifierPrediction): the intent prediction
+
+        Returns:
+            tuple[dict[str, Any], list[dict[str, Any]]]: the intent prediction record and its parameter records
         """
-        table = Table(TABLE_INTENT_PREDICTION, MetaData(), autoload_with=self.conn)
-        session_entry = self.select_session(session)
         if state not in session._agent.nlp_engine._intent_classifiers and predicted_intent.intent.name == 'fallback_intent':
             intent_classifier = 'None'
         elif isinstance(session._agent.nlp_engine._intent_classifiers[state], LLMIntentClassifier):
             intent_classifier = state.ic_config.llm_name
         else:
-            intent_classifier = session._agent.nlp_engine._intent_classifiers[state].__class__.__name__,
-        stmt = insert(table).values(
-            session_id=int(session_entry['id'][0]),
-            message=predicted_intent.matched_sentence,
-            timestamp=datetime.now(),
-            intent_classifier=intent_classifier,
-            intent=predicted_intent.intent.name,
-            score=float(predicted_intent.score)
-        )
-        result = self.conn.execute(stmt.returning(table.c.id))  # Not committed until all parameters have been inserted
-        intent_prediction_id = int(result.fetchone()[0])
-        table = Table(TABLE_PARAMETER, MetaData(), autoload_with=self.conn)
-        rows_to_insert = [
+            intent_classifier = session._agent.nlp_engine._intent_classifiers[state].__class__.__name__
+        row = {
+            'message': predicted_intent.matched_sentence,
+            'timestamp': datetime.now(),
+            'intent_classifier': intent_classifier,
+            'intent': predicted_intent.intent.name,
+            'score': float(predicted_intent.score),
+        }
+        parameter_rows = [
             {
-                'intent_prediction_id': intent_prediction_id,
                 'name': matched_parameter.name,
                 'value': matched_parameter.value,
                 'info': str(matched_parameter.info),
             } for matched_parameter in predicted_intent.matched_parameters
         ]
-        if rows_to_insert:
-            stmt = insert(table).values(rows_to_insert)
-            self.run_statement(stmt)
-        else:
-            self.conn.commit()
+        return row, parameter_rows
 
-    def insert_transition(self, session: Session, transition: Transition) -> None:
-        """Insert a new transition record into the transitions table of the monitoring database.
+    def insert_intent_prediction(
+            self,
+            session: Session,
+            state: State,
+            predicted_intent: IntentClassifierPrediction
+    ) -> None:
+        """Insert a new intent prediction record into the intent predictions table of the monitoring database.
 
         Args:
-            session (Session): the session the transition belongs to
-            transition (Transition): the transition to insert into the database
+            session (Session): the session containing the predicted intent to insert into the database
+            state (State): the state where the intent prediction took place (the session's current state may have
+                changed since the intent prediction, so we need it as argument)
+            predicted_intent (IntentClassifierPrediction): the intent prediction
+        """
+        table = self._tables[TABLE_INTENT_PREDICTION]
+        row, parameter_rows = self._intent_prediction_rows(session, state, predicted_intent)
+        try:
+            # The intent prediction and its parameters are committed together
+            with self.engine.begin() as conn:
+                row['session_id'] = self.get_session_db_id(session, conn)
+                result = conn.execute(insert(table).returning(table.c.id), row)
+                intent_prediction_id = int(result.fetchone()[0])
+                rows_to_insert = [
+                    {'intent_prediction_id': intent_prediction_id, **parameter_row} for parameter_row in parameter_rows
+                ]
+                if rows_to_insert:
+                    conn.execute(self._statements[f'insert_{TABLE_PARAMETER}'], rows_to_insert)
+                self.update_rollups(conn, TABLE_INTENT_PREDICTION, [(session._agent.name, row)])
+        except Exception as e:
+            logger.error(e)
+
+    def queue_intent_prediction(
+            self,
+            session: Session,
+            state: State,
+            predicted_intent: IntentClassifierPrediction
+    ) -> None:
+        """Put a new intent prediction record in the write-behind queue (or insert it immediately if the queue is not
+        running).
+
+        Args:
+            session (Session): the session containing the predicted intent to insert into the database
+            state (State): the state where the intent prediction took place
+            predicted_intent (IntentClassifierPrediction): the intent prediction
+        """
+        if self.writer is None or not self.writer.running:
+            self.insert_intent_prediction(session, state, predicted_intent)
+            return
+        row, parameter_rows = self._intent_prediction_rows(session, state, predicted_intent)
+        self.writer.put(TABLE_INTENT_PREDICTION, row, session,
+                        children=(TABLE_PARAMETER, 'intent_prediction_id', parameter_rows))
+
+    @staticmethod
+    def _transition_row(transition: Transition) -> dict[str, Any]:
+        """Create a transition record (without the session id).
+
+        Args:
+            transition (Transition): the transition
+
+        Returns:
+            dict[str, Any]: the transition record
         """
-        table = Table(TABLE_TRANSITION, MetaData(), autoload_with=self.conn)
-        session_entry = self.select_session(session)
         if transition.is_event():
             event = transition.event.name
         else:
@@ -304,15 +836,54 @@ class MonitoringDB:
             condition = str(transition.condition)
         else:
             condition = ''
-        stmt = insert(table).values(
-            session_id=int(session_entry['id'][0]),
-            source_state=transition.source.name,
-            dest_state=transition.dest.name,
-            event=event,
-            condition=condition,
-            timestamp=datetime.now(),
-        )
-        self.run_statement(stmt)
+        return {
+            'source_state': transition.source.name,
+            'dest_state': transition.dest.name,
+            'event': event,
+            'condition': condition,
+            'timestamp': datetime.now(),
+        }
+
+    def insert_transition(self, session: Session, transition: Transition) -> None:
+        """Insert a new transition record into the transitions table of the monitoring database.
+
+        Args:
+            session (Session): the session the transition belongs to
+            transition (Transition): the transition to insert into the database
+        """
+        row = self._transition_row(transition)
+        row['session_id'] = self.get_session_db_id(session)
+        self._insert_record(TABLE_TRANSITION, row, session._agent.name)
+
+    def queue_transition(self, session: Session, transition: Transition) -> None:
+        """Put a new transition record in the write-behind queue (or insert it immediately if the queue is not
+        running).
+
+        Args:
+            session (Session): the session the transition belongs to
+            transition (Transition): the transition to insert into the database
+        """
+        if self.writer is None or not self.writer.running:
+            self.insert_transition(session, transition)
+            return
+        self.writer.put(TABLE_TRANSITION, self._transition_row(transition), session)
+
+    @staticmethod
+    def _chat_row(message: Message) -> dict[str, Any]:
+        """Create a chat record (without the session id).
+
+        Args:
+            message (Message): the message
+
+        Returns:
+            dict[str, Any]: the chat record
+        """
+        return {
+            'type': message.type.value,
+            'content': str(message.content),
+            'is_user': message.is_user,
+            'timestamp': message.timestamp,
+        }
 
     def insert_chat(self, session: Session, message: Message) -> None:
         """Insert a new record into the chat table of the monitoring database.
@@ -321,31 +892,32 @@ class MonitoringDB:
             session (Session): the session the transition belongs to
             message (Message): the message to insert into the database
         """
-        table = Table(TABLE_CHAT, MetaData(), autoload_with=self.conn)
-        session_entry = self.select_session(session)
-        stmt = insert(table).values(
-            session_id=int(session_entry['id'][0]),
-            type=message.type.value,
-            content=str(message.content),
-            is_user=message.is_user,
-            timestamp=message.timestamp,
-        )
-        self.run_statement(stmt)
+        row = self._chat_row(message)
+        row['session_id'] = self.get_session_db_id(session)
+        self._insert_record(TABLE_CHAT, row, session._agent.name)
 
-    def insert_event(self, session: Session or None, event: Event) -> None:
-        """Insert a new record into the event table of the monitoring database.
+    def queue_chat(self, session: Session, message: Message) -> None:
+        """Put a new chat record in the write-behind queue (or insert it immediately if the queue is not running).
 
         Args:
-            session (Session or None): the session the event belongs to, or None if the event is not associated to a
-                session
-            event (Event): the event to insert into the database
+            session (Session): the session the message belongs to
+            message (Message): the message to insert into the database
+        """
+        if self.writer is None or not self.writer.running:
+            self.insert_chat(session, message)
+            return
+        self.writer.put(TABLE_CHAT, self._chat_row(message), session)
+
+    @staticmethod
+    def _event_row(event: Event) -> dict[str, Any]:
+        """Create an event record (without the session id).
+
+        Args:
+            event (Event): the event
+
+        Returns:
+            dict[str, Any]: the event record
         """
-        # TODO: We need to store agent id for broadcasted events
-        table = Table(TABLE_EVENT, MetaData(), autoload_with=self.conn)
-        if session is not None:
-            session_id = int(self.select_session(session)['id'][0])
-        else:
-            session_id = None
         if isinstance(event, ReceiveMessageEvent):
             info = event.message
         elif isinstance(event, ReceiveFileEvent):
@@ -356,13 +928,40 @@ class MonitoringDB:
             info = {'category': event._category, 'action': event.action, 'payload': event.payload}
         else:
             info = ''
-        stmt = insert(table).values(
-            session_id=session_id,
-            event=event.name,
-            info=str(info),
-            timestamp=datetime.now()
-        )
-        self.run_statement(stmt)
+        return {
+            'event': event.name,
+            'info': str(info),
+            'timestamp': datetime.now(),
+        }
+
+    def insert_event(self, session: Session or None, event: Event) -> None:
+        """Insert a new record into the event table of the monitoring database.
+
+        Args:
+            session (Session or None): the session the event belongs to, or None if the event is not associated to a
+                session
+            event (Event): the event to insert into the database
+        """
+        # TODO: We need to store agent id for broadcasted events
+        row = self._event_row(event)
+        row['session_id'] = self.get_session_db_id(session) if session is not None else None
+        self._insert_record(TABLE_EVENT, row, session._agent.name if session is not None else None)
+
+    def queue_event(self, session: Session or None, event: Event) -> None:
+        """Put a new event record in the write-behind queue (or insert it immediately if the queue is not running).
+
+        Args:
+            session (Session or None): the session the event belongs to, or None if the event is not associated to a
+                session
+            event (Event): the event to insert into the database
+        """
+        if self.writer is None or not self.writer.running:
+            self.insert_event(session, event)
+            return
+        row = self._event_row(event)
+        if session is None:
+            row['session_id'] = None
+        self.writer.put(TABLE_EVENT, row, session)
 
     def select_session(self, session: Session) -> pd.DataFrame:
         """Retrieves a session record from the sessions table of the database.
@@ -374,13 +973,13 @@ class MonitoringDB:
             pandas.DataFrame: the session record, should be a 1 row DataFrame
 
         """
-        table = Table(TABLE_SESSION, MetaData(), autoload_with=self.conn)
-        stmt = select(table).where(
-            table.c.agent_name == session._agent.name,
-            table.c.platform_name == session.platform.__class__.__name__,
-            table.c.session_id == session.id
-        )
-        return pd.read_sql_query(stmt, self.conn)
+        with self.engine.connect() as conn:
+            return pd.read_sql_query(
+                self._statements['select_session'],
+                conn,
+                params=self._session_params(*self._session_key(session))
+            )
+
     def session_exists(self, agent_name: str, platform_name: str, session_id: str) -> bool:
         """
         Checks whether there is an entry with the given agent_name, platform_name, and session_id in the sessions table.
@@ -393,52 +992,55 @@ class MonitoringDB:
         Returns:
             bool: True if the session exists, False otherwise.
         """
-        table = Table(TABLE_SESSION, MetaData(), autoload_with=self.conn)
-        stmt = select(table).where(
-            table.c.agent_name == agent_name,
-            table.c.platform_name == platform_name,
-            table.c.session_id == session_id
-        )
-        result = self.conn.execute(stmt)
-        return result.first() is not None
+        with self.engine.connect() as conn:
+            result = conn.execute(
+                self._statements['select_session_id'],
+                self._session_params(agent_name, platform_name, session_id)
+            )
+            return result.first() is not None
 
     def delete_session(self, session: Session) -> None:
         """
         Deletes the session information, chat messages, and transitions related to the given session from the monitoring database.
 
+        The archived chat messages and transitions of the session are deleted too, and all of them are subtracted from
+        the rollup tables, so the aggregation queries stop counting them.
+
         Args:
             session (Session): The session to delete.
         """
+        # Pending records of the session must be written before deleting it
+        self.flush()
         # Get session DB id
-        table_session = Table(TABLE_SESSION, MetaData(), autoload_with=self.conn)
-        stmt_session_id = select(table_session.c.id).where(
-            table_session.c.agent_name == session._agent.name,
-            table_session.c.platform_name == session.platform.__class__.__name__,
-            table_session.c.session_id == session.id
-        )
-        result_session_id = self.conn.execute(stmt_session_id).first()
-        if not result_session_id:
+        session_db_id = self.get_session_db_id(session)
+        self.forget_session(session)
+        if session_db_id is None:
             logger.error(f"Session not found for deletion: {session.id}")
             return
-        session_db_id = result_session_id[0]
-
-        # Delete chat messages
-        table_chat = Table(TABLE_CHAT, MetaData(), autoload_with=self.conn)
-        stmt_delete_chat = table_chat.delete().where(table_chat.c.session_id == session_db_id)
-        self.run_statement(stmt_delete_chat)
-
-        # Delete transitions
-        table_transition = Table(TABLE_TRANSITION, MetaData(), autoload_with=self.conn)
-        stmt_delete_transition = table_transition.delete().where(table_transition.c.session_id == session_db_id)
-        self.run_statement(stmt_delete_transition)
-
-        # Delete session itself
-        stmt_delete_session = table_session.delete().where(table_session.c.id == session_db_id)
-        self.run_statement(stmt_delete_session)
-    
+
+        table_session = self._tables[TABLE_SESSION]
+        try:
+            with self.engine.begin() as conn:
+                # Delete chat messages and transitions (and their archived records)
+                for table_name in (TABLE_CHAT, TABLE_TRANSITION):
+                    _, group_columns, sum_columns = ROLLUPS[table_name]
+                    for table in (self._tables[table_name], self._tables[f'{table_name}{ARCHIVE_SUFFIX}']):
+                        condition = table.c.session_id == session_db_id
+                        columns = [table.c[column] for column in ('timestamp', *group_columns, *sum_columns)]
+                        records = conn.execute(select(*columns).where(condition)).mappings().fetchall()
+                        self.update_rollups(conn, table_name, [(session._agent.name, record) for record in records],
+                                            removed=True)
+                        conn.execute(table.delete().where(condition))
+                # Delete session itself
+                conn.execute(table_session.delete().where(table_session.c.id == session_db_id))
+        except Exception as e:
+            logger.error(e)
+
+
     def get_last_state_of_session(self, agent_name: str, platform_name: str, session_id: str) -> str | None:
         """
-        Retrieves the last dest_state for a given session from the transition table.
+        Retrieves the last dest_state for a given session from the transition table (or from its archive table, if the
+        session has been inactive for longer than the retention period).
 
         Args:
             agent_name (str): The agent name.
@@ -448,27 +1050,11 @@ class MonitoringDB:
         Returns:
             str | None: The last dest_state value, or None if not found.
         """
-        # Get session id
-        table_session = Table(TABLE_SESSION, MetaData(), autoload_with=self.conn)
-        stmt_session = select(table_session.c.id).where(
-            table_session.c.agent_name == agent_name,
-            table_session.c.platform_name == platform_name,
-            table_session.c.session_id == session_id
-        )
-        result_session = self.conn.execute(stmt_session).first()
-        if not result_session:
-            return None
-        session_db_id = result_session[0]
-
-        # Get last dest_state from transition table
-        table_transition = Table(TABLE_TRANSITION, MetaData(), autoload_with=self.conn)
-        stmt_transition = (
-            select(table_transition.c.dest_state)
-            .where(table_transition.c.session_id == session_db_id)
-            .order_by(desc(table_transition.c.timestamp))
-            .limit(1)
-        )
-        result_transition = self.conn.execute(stmt_transition).first()
+        params = self._session_params(agent_name, platform_name, session_id)
+        with self.engine.connect() as conn:
+            result_transition = conn.execute(self._statements['select_last_state'], params).first()
+            if result_transition is None:
+                result_transition = conn.execute(self._statements['select_last_archived_state'], params).first()
         return result_transition[0] if result_transition else None
 
     def select_chat(
@@ -479,6 +1065,9 @@ class MonitoringDB:
     ) -> pd.DataFrame:
         """Retrieves chat records from the chat table of the database for a given session.
 
+        The session's records that are still in the write-behind queue are included (with a null id), so the history is
+        complete without waiting for the queue to be written.
+
         Args:
             session (Session): the session to get chat records from the database
             n (Optional[int]): the number of latest chat records to retrieve. If None, retrieves all records.
@@ -486,12 +1075,13 @@ class MonitoringDB:
         Returns:
             pandas.DataFrame: the chat records for the given session
         """
-
-        table = Table(TABLE_CHAT, MetaData(), autoload_with=self.conn)
-        session_entry = self.select_session(session)
+        # Taken before reading the database, so a record written in the meantime is not missed (but it can be in both)
+        pending = self.select_pending_chat(session, until_timestamp)
+        table = self._tables[TABLE_CHAT]
+        session_db_id = self.get_session_db_id(session)
 
         base_stmt = select(table).where(
-            table.c.session_id == int(session_entry["id"][0])
+            table.c.session_id == session_db_id
         )
 
         if until_timestamp is not None:
@@ -510,40 +1100,591 @@ class MonitoringDB:
             # all rows, ordered chronologically
             stmt = base_stmt.order_by(table.c.timestamp, table.c.id)
 
-        return pd.read_sql_query(stmt, self.conn)
+        with self.engine.connect() as conn:
+            df = pd.read_sql_query(stmt, conn)
+        if not pending:
+            return df
+        written = {(pd.Timestamp(row.timestamp), row.is_user, row.type) for row in df.itertuples()}
+        pending_df = pd.DataFrame([
+            {'id': None, 'session_id': session_db_id, 'type': record.type, 'content': record.content,
+             'is_user': record.is_user, 'timestamp': record.timestamp}
+            for record in pending if (pd.Timestamp(record.timestamp), record.is_user, record.type) not in written
+        ])
+        if pending_df.empty:
+            return df
+        df = pd.concat([df, pending_df], ignore_index=True).sort_values('timestamp', kind='stable')
+        df['id'] = df['id'].astype('Int64')
+        if n:
+            df = df.tail(n)
+        return df.reset_index(drop=True)
+
+    def select_chat_page(
+            self,
+            session: Session,
+            limit: Optional[int] = None,
+            cursor: Optional[tuple[datetime, int]] = None,
+            until_timestamp: Optional[datetime] = None,
+            latest: bool = False,
+    ) -> list[Row]:
+        """Retrieves a page of chat records from the chat table of the database for a given session, using keyset
+        pagination on the (timestamp, id) pair of the records.
+
+        Unlike :meth:`select_chat`, the records are not loaded into a DataFrame.
 
-    def run_statement(self, stmt: Executable) -> CursorResult[Any] | None:
-        """Executes a SQL statement.
+        When retrieving the latest records without cursor (i.e., the page that ends at the most recent record), the
+        session's records that are still in the write-behind queue are included (as :class:`PendingChatRecord`, see
+        :meth:`select_pending_chat`), so the page is up to date without waiting for the queue to be written.
+
+        Args:
+            session (Session): the session to get chat records from the database
+            limit (Optional[int]): the maximum number of records to retrieve. If None, retrieves all records.
+            cursor (Optional[tuple[datetime, int]]): the (timestamp, id) of a record. If provided, retrieves only the
+                records after it (or before it, if ``latest`` is true)
+            until_timestamp (Optional[datetime]): if provided, retrieves only chat records up to this timestamp.
+            latest (bool): whether to retrieve the latest records (i.e., the page that ends at the cursor) or the oldest
+                ones (i.e., the page that starts at the cursor)
+
+        Returns:
+            list[sqlalchemy.Row]: the chat records (with id, type, content, is_user and timestamp), in chronological
+            order
+        """
+        # Taken before reading the database, so a record written in the meantime is not missed (but it can be in both)
+        pending = self.select_pending_chat(session, until_timestamp) if cursor is None and latest else []
+        session_db_id = self.get_session_db_id(session)
+        if session_db_id is None:
+            return pending[-limit:] if limit else pending
+        table = self._tables[TABLE_CHAT]
+        stmt = select(
+            table.c.id, table.c.type, table.c.content, table.c.is_user, table.c.timestamp
+        ).where(table.c.session_id == session_db_id)
+        if until_timestamp is not None:
+            stmt = stmt.where(table.c.timestamp <= until_timestamp)
+        if cursor is not None:
+            cursor_timestamp, cursor_id = cursor
+            if latest:
+                stmt = stmt.where(or_(
+                    table.c.timestamp < cursor_timestamp,
+                    and_(table.c.timestamp == cursor_timestamp, table.c.id < cursor_id)
+                ))
+            else:
+                stmt = stmt.where(or_(
+                    table.c.timestamp > cursor_timestamp,
+                    and_(table.c.timestamp == cursor_timestamp, table.c.id > cursor_id)
+                ))
+        if latest:
+            stmt = stmt.order_by(desc(table.c.timestamp), desc(table.c.id))
+        else:
+            stmt = stmt.order_by(table.c.timestamp, table.c.id)
+        if limit:
+            stmt = stmt.limit(limit)
+        with self.engine.connect() as conn:
+            rows = conn.execute(stmt).fetchall()
+        if latest:
+            rows.reverse()
+        if pending:
+            rows = self.merge_pending_chat(rows, pending)
+            if limit:
+                rows = rows[-limit:]
+        return rows
+
+    def select_pending_chat(
+            self,
+            session: Session,
+            until_timestamp: Optional[datetime] = None
+    ) -> list[PendingChatRecord]:
+        """Retrieves the chat records of a session that are in the write-behind queue, i.e., that have not been written
+        in the database yet. It does not wait for the queue to be written.
+
+        Args:
+            session (Session): the session to get the pending chat records from
+            until_timestamp (Optional[datetime]): if provided, retrieves only chat records up to this timestamp.
+
+        Returns:
+            list[PendingChatRecord]: the pending chat records, in the order they were queued
+        """
+        if self.writer is None:
+            return []
+        return [
+            PendingChatRecord(None, row['type'], row['content'], row['is_user'], row['timestamp'])
+            for row in self.writer.pending(TABLE_CHAT, session)
+            if until_timestamp is None or row['timestamp'] <= until_timestamp
+        ]
+
+    @staticmethod
+    def merge_pending_chat(rows: list, pending: list[PendingChatRecord]) -> list:
+        """Add pending chat records (see :meth:`select_pending_chat`) to chat records read from the database. The
+        pending records that were written before the database was read (i.e., that are already in the rows) are
+        skipped.
+
+        Args:
+            rows (list): the chat records read from the database, in chronological order
+            pending (list[PendingChatRecord]): the pending chat records, retrieved before reading the database
+
+        Returns:
+            list: the chat records, in chronological order
+        """
+        written = {(row.timestamp, row.is_user, row.type) for row in rows}
+        records = [record for record in pending if (record.timestamp, record.is_user, record.type) not in written]
+        if not records:
+            return rows
+        # The sort is stable, so the database records keep their order
+        return sorted([*rows, *records], key=lambda record: record.timestamp)
+
+    def run_statement(
+            self,
+            stmt: Executable,
+            params: dict[str, Any] | list[dict[str, Any]] | None = None
+    ) -> CursorResult[Any] | None:
+        """Executes a SQL statement in its own transaction, using a connection from the pool.
 
         Args:
             stmt (sqlalchemy.Executable): the SQL statement
+            params (dict[str, Any] | list[dict[str, Any]] | None): the statement parameters, if any
 
         Returns:
             sqlalchemy.CursorResult[Any] | None: the result of the SQL statement
         """
         try:
-            result = self.conn.execute(stmt)
-            self.conn.commit()
-            return result
+            with self.engine.begin() as conn:
+                return conn.execute(stmt, params)
         except Exception as e:
             logger.error(e)
-            self.conn.rollback()
             return None
 
-    def get_table(self, table_name: str) -> pd.DataFrame:
+    def get_table(self, table_name: str, limit: Optional[int] = None) -> pd.DataFrame:
         """Gets all the content of a database table (i.e., SELECT * FROM table_name).
 
         Args:
             table_name: the name of the table
+            limit (Optional[int]): if provided, retrieves only the latest ``limit`` records of the table
 
         Returns:
             pandas.DataFrame: the table in a dataframe
         """
-        query = f"SELECT * FROM {table_name}"
-        return pd.read_sql_query(query, self.conn)
+        if table_name in self._tables:
+            table = self._tables[table_name]
+            query = select(table)
+            if limit:
+                query = query.order_by(desc(table.c.id)).limit(limit)
+        else:
+            query = text(f"SELECT * FROM {table_name}")
+        with self.engine.connect() as conn:
+            return pd.read_sql_query(query, conn)
+
+    def _read_aggregation(self, key: tuple, stmt: Executable) -> pd.DataFrame:
+        """Run an aggregation query, or get its result from the cache if it was run recently.
+
+        Args:
+            key (tuple): the cache key (the query name and its arguments)
+            stmt (sqlalchemy.Executable): the aggregation query
+
+        Returns:
+            pandas.DataFrame: the query result
+        """
+        def read() -> pd.DataFrame:
+            with self.engine.connect() as conn:
+                return pd.read_sql_query(stmt, conn)
+
+        return self._cache.get_or_compute(key, read)
+
+    def _filter_records(
+            self,
+            stmt: Select,
+            table: Table,
+            agent_names: Optional[list[str]] = None,
+            session_ids: Optional[list[str]] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ) -> Select:
+        """Filter the records of a query by the agents and sessions they belong to and by their timestamp. The session
+        table is only joined when filtering by agents or sessions.
+
+        Args:
+            stmt (sqlalchemy.Select): the query
+            table (sqlalchemy.Table): the table of the records, which must have the session_id and timestamp columns
+            agent_names (Optional[list[str]]): if provided, only the records of these agents are selected
+            session_ids (Optional[list[str]]): if provided, only the records of these sessions are selected
+            start (Optional[datetime]): if provided, only the records from this time on are selected
+            end (Optional[datetime]): if provided, only the records before this time are selected
+
+        Returns:
+            sqlalchemy.Select: the filtered query
+        """
+        if agent_names or session_ids:
+            table_session = self._tables[TABLE_SESSION]
+            if table is not table_session:
+                stmt = stmt.join(table_session, table.c.session_id == table_session.c.id)
+            if agent_names:
+                stmt = stmt.where(table_session.c.agent_name.in_(agent_names))
+            if session_ids:
+                stmt = stmt.where(table_session.c.session_id.in_(session_ids))
+        if start is not None:
+            stmt = stmt.where(table.c.timestamp >= start)
+        if end is not None:
+            stmt = stmt.where(table.c.timestamp < end)
+        return stmt
+
+    @staticmethod
+    def _use_rollups(
+            session_ids: Optional[list[str]] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ) -> bool:
+        """Check whether an aggregation query can be answered with the per-minute rollup tables (see :obj:`ROLLUPS`),
+        i.e., when it is not filtered by session and its time range is made of whole minutes.
+
+        Args:
+            session_ids (Optional[list[str]]): the sessions the records are filtered by
+            start (Optional[datetime]): the start of the time range of the records
+            end (Optional[datetime]): the end of the time range of the records
+
+        Returns:
+            bool: whether the rollup tables can be used
+        """
+        return not session_ids and all(t is None or (t.second == 0 and t.microsecond == 0) for t in (start, end))
+
+    @staticmethod
+    def _filter_rollup(
+            stmt: Select,
+            rollup: Table,
+            agent_names: Optional[list[str]] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ) -> Select:
+        """Filter the records of a rollup table query by agent and time range.
+
+        Args:
+            stmt (sqlalchemy.Select): the query
+            rollup (sqlalchemy.Table): the rollup table
+            agent_names (Optional[list[str]]): if provided, only the records of these agents are selected
+            start (Optional[datetime]): if provided, only the records from this minute on are selected
+            end (Optional[datetime]): if provided, only the records before this minute are selected
+
+        Returns:
+            sqlalchemy.Select: the filtered query
+        """
+        stmt = stmt.select_from(rollup)
+        if agent_names:
+            stmt = stmt.where(rollup.c.agent_name.in_(agent_names))
+        if start is not None:
+            stmt = stmt.where(rollup.c.minute >= start)
+        if end is not None:
+            stmt = stmt.where(rollup.c.minute < end)
+        return stmt
+
+    @staticmethod
+    def _date_trunc(bucket: str, column):
+        """Truncate a timestamp column to a time bucket (one of :obj:`TIME_BUCKETS`). The bucket is rendered inline, so
+        the same expression can be used in the SELECT and GROUP BY clauses."""
+        if bucket not in TIME_BUCKETS:
+            raise ValueError(f"Invalid time bucket '{bucket}', it must be one of {TIME_BUCKETS}")
+        return func.date_trunc(literal_column(f"'{bucket}'"), column)
+
+    @staticmethod
+    def _aggregation_key(name: str, *args) -> tuple:
+        """Create the cache key of an aggregation query. List arguments are sorted, so the same filters selected in a
+        different order share the same result."""
+        return (name,) + tuple(tuple(sorted(arg)) if isinstance(arg, list) else arg for arg in args)
+
+    def get_agent_names(self) -> list[str]:
+        """Get the names of the agents that have sessions in the monitoring database.
+
+        Returns:
+            list[str]: the agent names
+        """
+        table = self._tables[TABLE_SESSION]
+        stmt = select(table.c.agent_name).distinct().order_by(table.c.agent_name)
+        return self._read_aggregation(self._aggregation_key('agent_names'), stmt)['agent_name'].tolist()
+
+    def get_session_ids(self, agent_names: Optional[list[str]] = None) -> list[str]:
+        """Get the ids of the sessions stored in the monitoring database.
+
+        Args:
+            agent_names (Optional[list[str]]): if provided, only the sessions of these agents are selected
+
+        Returns:
+            list[str]: the session ids
+        """
+        table = self._tables[TABLE_SESSION]
+        stmt = self._filter_records(select(table.c.session_id).distinct(), table, agent_names)
+        return self._read_aggregation(self._aggregation_key('session_ids', agent_names), stmt)['session_id'].tolist()
+
+    def count_sessions(
+            self,
+            agent_names: Optional[list[str]] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ) -> int:
+        """Count the sessions stored in the monitoring database.
+
+        Args:
+            agent_names (Optional[list[str]]): if provided, only the sessions of these agents are counted
+            start (Optional[datetime]): if provided, only the sessions created from this time on are counted
+            end (Optional[datetime]): if provided, only the sessions created before this time are counted
+
+        Returns:
+            int: the number of sessions
+        """
+        table = self._tables[TABLE_SESSION]
+        stmt = self._filter_records(select(func.count().label('count')).select_from(table), table, agent_names,
+                                    start=start, end=end)
+        result = self._read_aggregation(self._aggregation_key('count_sessions', agent_names, start, end), stmt)
+        return int(result['count'].iloc[0])
+
+    def count_messages(
+            self,
+            agent_names: Optional[list[str]] = None,
+            session_ids: Optional[list[str]] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ) -> dict[bool, int]:
+        """Count the messages stored in the chat table, grouped by sender.
+
+        Args:
+            agent_names (Optional[list[str]]): if provided, only the messages of these agents are counted
+            session_ids (Optional[list[str]]): if provided, only the messages of these sessions are counted
+            start (Optional[datetime]): if provided, only the messages from this time on are counted
+            end (Optional[datetime]): if provided, only the messages before this time are counted
+
+        Returns:
+            dict[bool, int]: the number of user (True) and agent (False) messages
+        """
+        if self._use_rollups(session_ids, start, end):
+            rollup = self._tables[TABLE_CHAT_ROLLUP]
+            stmt = select(rollup.c.is_user, cast(func.sum(rollup.c.count), Integer).label('count'))
+            stmt = self._filter_rollup(stmt, rollup, agent_names, start, end).group_by(rollup.c.is_user)
+        else:
+            table = self._tables[TABLE_CHAT]
+            stmt = select(table.c.is_user, func.count().label('count')).select_from(table)
+            stmt = self._filter_records(stmt, table, agent_names, session_ids, start, end).group_by(table.c.is_user)
+        result = self._read_aggregation(
+            self._aggregation_key('count_messages', agent_names, session_ids, start, end), stmt
+        )
+        counts = {True: 0, False: 0}
+        for is_user, count in zip(result['is_user'], result['count']):
+            counts[bool(is_user)] = int(count)
+        return counts
+
+    def get_message_histogram(
+            self,
+            bucket: str = 'hour',
+            agent_names: Optional[list[str]] = None,
+            session_ids: Optional[list[str]] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """Count the messages stored in the chat table, grouped by time bucket and sender.
+
+        Args:
+            bucket (str): the time bucket size, one of :obj:`TIME_BUCKETS`
+            agent_names (Optional[list[str]]): if provided, only the messages of these agents are counted
+            session_ids (Optional[list[str]]): if provided, only the messages of these sessions are counted
+            start (Optional[datetime]): if provided, only the messages from this time on are counted
+            end (Optional[datetime]): if provided, only the messages before this time are counted
+
+        Returns:
+            pandas.DataFrame: the message counts, with the columns bucket (the start time of the bucket), is_user and
+            count, in chronological order
+        """
+        if self._use_rollups(session_ids, start, end):
+            rollup = self._tables[TABLE_CHAT_ROLLUP]
+            time_bucket = self._date_trunc(bucket, rollup.c.minute).label('bucket')
+            stmt = select(time_bucket, rollup.c.is_user, cast(func.sum(rollup.c.count), Integer).label('count'))
+            stmt = self._filter_rollup(stmt, rollup, agent_names, start, end)
+            stmt = stmt.group_by(time_bucket, rollup.c.is_user).order_by(time_bucket)
+        else:
+            table = self._tables[TABLE_CHAT]
+            time_bucket = self._date_trunc(bucket, table.c.timestamp).label('bucket')
+            stmt = select(time_bucket, table.c.is_user, func.count().label('count')).select_from(table)
+            stmt = self._filter_records(stmt, table, agent_names, session_ids, start, end)
+            stmt = stmt.group_by(time_bucket, table.c.is_user).order_by(time_bucket)
+        return self._read_aggregation(
+            self._aggregation_key('message_histogram', bucket, agent_names, session_ids, start, end), stmt
+        )
+
+    def count_intents(
+            self,
+            agent_names: Optional[list[str]] = None,
+            session_ids: Optional[list[str]] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """Count the intent predictions stored in the intent prediction table, grouped by intent.
+
+        Args:
+            agent_names (Optional[list[str]]): if provided, only the predictions of these agents are counted
+            session_ids (Optional[list[str]]): if provided, only the predictions of these sessions are counted
+            start (Optional[datetime]): if provided, only the predictions from this time on are counted
+            end (Optional[datetime]): if provided, only the predictions before this time are counted
+
+        Returns:
+            pandas.DataFrame: the intent counts, with the columns intent, count and avg_score, from the most to the
+            least predicted intent
+        """
+        if self._use_rollups(session_ids, start, end):
+            rollup = self._tables[TABLE_INTENT_PREDICTION_ROLLUP]
+            count = cast(func.sum(rollup.c.count), Integer).label('count')
+            avg_score = (cast(func.sum(rollup.c.score_sum), Float) / func.sum(rollup.c.count)).label('avg_score')
+            stmt = self._filter_rollup(select(rollup.c.intent, count, avg_score), rollup, agent_names, start, end)
+            stmt = stmt.group_by(rollup.c.intent).order_by(desc(count), rollup.c.intent)
+        else:
+            table = self._tables[TABLE_INTENT_PREDICTION]
+            count = func.count().label('count')
+            stmt = select(table.c.intent, count, func.avg(table.c.score).label('avg_score')).select_from(table)
+            stmt = self._filter_records(stmt, table, agent_names, session_ids, start, end)
+            stmt = stmt.group_by(table.c.intent).order_by(desc(count), table.c.intent)
+        return self._read_aggregation(
+            self._aggregation_key('count_intents', agent_names, session_ids, start, end), stmt
+        )
+
+    def get_matched_intents_ratio(
+            self,
+            agent_names: Optional[list[str]] = None,
+            session_ids: Optional[list[str]] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ) -> tuple[int, int]:
+        """Count the intent predictions that matched an intent and the ones that did not (i.e., the fallback intent).
+
+        Args:
+            agent_names (Optional[list[str]]): if provided, only the predictions of these agents are counted
+            session_ids (Optional[list[str]]): if provided, only the predictions of these sessions are counted
+            start (Optional[datetime]): if provided, only the predictions from this time on are counted
+            end (Optional[datetime]): if provided, only the predictions before this time are counted
+
+        Returns:
+            tuple[int, int]: the number of matched and fallback intent predictions
+        """
+        if self._use_rollups(session_ids, start, end):
+            rollup = self._tables[TABLE_INTENT_PREDICTION_ROLLUP]
+            stmt = select(
+                func.coalesce(func.sum(rollup.c.count), 0).label('total'),
+                func.coalesce(func.sum(rollup.c.count).filter(rollup.c.intent == fallback_intent.name), 0).label('fallback'),
+            )
+            stmt = self._filter_rollup(stmt, rollup, agent_names, start, end)
+        else:
+            table = self._tables[TABLE_INTENT_PREDICTION]
+            stmt = select(
+                func.count().label('total'),
+                func.count().filter(table.c.intent == fallback_intent.name).label('fallback'),
+            ).select_from(table)
+            stmt = self._filter_records(stmt, table, agent_names, session_ids, start, end)
+        result = self._read_aggregation(
+            self._aggregation_key('matched_intents_ratio', agent_names, session_ids, start, end), stmt
+        )
+        total = int(result['total'].iloc[0])
+        fallback = int(result['fallback'].iloc[0])
+        return total - fallback, fallback
+
+    def get_intent_predictions(
+            self,
+            intent: str,
+            agent_names: Optional[list[str]] = None,
+            session_ids: Optional[list[str]] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+            limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Get the latest intent predictions of an intent.
+
+        Args:
+            intent (str): the intent name
+            agent_names (Optional[list[str]]): if provided, only the predictions of these agents are selected
+            session_ids (Optional[list[str]]): if provided, only the predictions of these sessions are selected
+            start (Optional[datetime]): if provided, only the predictions from this time on are selected
+            end (Optional[datetime]): if provided, only the predictions before this time are selected
+            limit (Optional[int]): the maximum number of predictions to retrieve. If None, retrieves all of them.
+
+        Returns:
+            pandas.DataFrame: the intent predictions, with the columns timestamp, message, score and intent_classifier,
+            from the most recent to the oldest
+        """
+        table = self._tables[TABLE_INTENT_PREDICTION]
+        stmt = select(table.c.timestamp, table.c.message, table.c.score, table.c.intent_classifier)
+        stmt = self._filter_records(stmt.where(table.c.intent == intent), table, agent_names, session_ids, start, end)
+        stmt = stmt.order_by(desc(table.c.timestamp), desc(table.c.id))
+        if limit:
+            stmt = stmt.limit(limit)
+        return self._read_aggregation(
+            self._aggregation_key('intent_predictions', intent, agent_names, session_ids, start, end, limit), stmt
+        )
+
+    def count_events(
+            self,
+            agent_names: Optional[list[str]] = None,
+            session_ids: Optional[list[str]] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """Count the events stored in the event table, grouped by event name.
+
+        Note that broadcasted events (not associated to any session) are only counted when not filtering by agents or
+        sessions.
+
+        Args:
+            agent_names (Optional[list[str]]): if provided, only the events of these agents are counted
+            session_ids (Optional[list[str]]): if provided, only the events of these sessions are counted
+            start (Optional[datetime]): if provided, only the events from this time on are counted
+            end (Optional[datetime]): if provided, only the events before this time are counted
+
+        Returns:
+            pandas.DataFrame: the event counts, with the columns event and count, from the most to the least frequent
+            event
+        """
+        if self._use_rollups(session_ids, start, end):
+            rollup = self._tables[TABLE_EVENT_ROLLUP]
+            count = cast(func.sum(rollup.c.count), Integer).label('count')
+            stmt = self._filter_rollup(select(rollup.c.event, count), rollup, agent_names, start, end)
+            stmt = stmt.group_by(rollup.c.event).order_by(desc(count), rollup.c.event)
+        else:
+            table = self._tables[TABLE_EVENT]
+            count = func.count().label('count')
+            stmt = select(table.c.event, count).select_from(table)
+            stmt = self._filter_records(stmt, table, agent_names, session_ids, start, end)
+            stmt = stmt.group_by(table.c.event).order_by(desc(count), table.c.event)
+        return self._read_aggregation(
+            self._aggregation_key('count_events', agent_names, session_ids, start, end), stmt
+        )
+
+    def count_transitions(
+            self,
+            agent_names: Optional[list[str]] = None,
+            session_ids: Optional[list[str]] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """Count the transitions stored in the transition table, grouped by edge of the state machine (i.e., source
+        state, destination state, event and condition).
+
+        Args:
+            agent_names (Optional[list[str]]): if provided, only the transitions of these agents are counted
+            session_ids (Optional[list[str]]): if provided, only the transitions of these sessions are counted
+            start (Optional[datetime]): if provided, only the transitions from this time on are counted
+            end (Optional[datetime]): if provided, only the transitions before this time are counted
+
+        Returns:
+            pandas.DataFrame: the transition counts, with the columns source_state, dest_state, event, condition and
+            count
+        """
+        if self._use_rollups(session_ids, start, end):
+            rollup = self._tables[TABLE_TRANSITION_ROLLUP]
+            edge = (rollup.c.source_state, rollup.c.dest_state, rollup.c.event, rollup.c.condition)
+            stmt = select(*edge, cast(func.sum(rollup.c.count), Integer).label('count'))
+            stmt = self._filter_rollup(stmt, rollup, agent_names, start, end).group_by(*edge)
+        else:
+            table = self._tables[TABLE_TRANSITION]
+            edge = (table.c.source_state, table.c.dest_state, table.c.event, table.c.condition)
+            stmt = select(*edge, func.count().label('count')).select_from(table)
+            stmt = self._filter_records(stmt, table, agent_names, session_ids, start, end).group_by(*edge)
+        return self._read_aggregation(
+            self._aggregation_key('count_transitions', agent_names, session_ids, start, end), stmt
+        )
 
     def close_connection(self) -> None:
-        """Close the connection to the monitoring database"""
-        self.conn.close()
-        self.conn.engine.dispose()
+        """Close the connection to the monitoring database, writing the pending records of the write-behind queue
+        first."""
+        self.stop_compaction()
+        if self.writer is not None:
+            self.writer.stop()
+        self.engine.dispose()
         self.connected = False
@@ -0,0 +1,81 @@
+import copy
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+
+class MonitoringDBCache:
+    """A cache of the results of the monitoring database aggregation queries, with expiration time.
+
+    The monitoring dashboard runs the same aggregation queries every time a page is rendered. Their results are kept
+    here for a short time, so the database is queried at most once per query and time-to-live period.
+
+    Args:
+        ttl (float): the time (in seconds) a result is kept in the cache. If it is 0, the cache is disabled
+
+    Attributes:
+        _ttl (float): The time (in seconds) a result is kept in the cache
+        _entries (dict[Hashable, tuple[float, Any]]): The cached results, with their insertion time
+        _lock (threading.Lock): Lock to access the cache from different threads
+        _stats (dict[str, int]): The cache metrics
+    """
+
+    def __init__(self, ttl: float):
+        self._ttl: float = max(0.0, ttl)
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._stats: dict[str, int] = {'hits': 0, 'misses': 0}
+
+    @property
+    def ttl(self) -> float:
+        """float: The time (in seconds) a result is kept in the cache."""
+        return self._ttl
+
+    @ttl.setter
+    def ttl(self, ttl: float) -> None:
+        """Set the time (in seconds) a result is kept in the cache. The cached results are removed."""
+        self._ttl = max(0.0, ttl)
+        self.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """dict[str, int]: The cache metrics:
+
+        - hits: number of results found in the cache
+        - misses: number of results not found in the cache (i.e., queries run in the database)
+        - size: number of results currently in the cache
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        return stats
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Get a result from the cache. If it is not there (or it expired), compute it and store it.
+
+        Args:
+            key (Hashable): the result key (i.e., the query name and its arguments)
+            compute (Callable[[], Any]): the function that computes the result (i.e., runs the query)
+
+        Returns:
+            Any: a copy of the result
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self._ttl:
+                self._stats['hits'] += 1
+                return copy.copy(entry[1])
+            self._stats['misses'] += 1
+        result = compute()
+        if self._ttl > 0:
+            with self._lock:
+                self._entries[key] = (time.monotonic(), result)
+                # Remove the expired results, so the cache does not grow with every filter combination
+                self._entries = {k: v for k, v in self._entries.items() if now - v[0] <= self._ttl}
+        return copy.copy(result)
+
+    def clear(self) -> None:
+        """Remove all the results from the cache."""
+        with self._lock:
+            self._entries.clear()
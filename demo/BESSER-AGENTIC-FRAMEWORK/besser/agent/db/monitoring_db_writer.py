@@ -0,0 +1,326 @@
+import queue
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Connection, insert
+
+from besser.agent.exceptions.logger import logger
+
+if TYPE_CHECKING:
+    from besser.agent.core.session import Session
+    from besser.agent.db.monitoring_db import MonitoringDB
+
+class _Flush:
+    """Queue marker to write the current batch without waiting for the flush interval. Its event is set once all the
+    records queued before it have been written."""
+
+    def __init__(self):
+        self.done: threading.Event = threading.Event()
+
+
+_STOP = object()
+"""Queue marker to stop the writer thread"""
+
+
+class MonitoringDBWriter:
+    """A write-behind queue for the monitoring database.
+
+    Instead of inserting each record as soon as it is created, records are put in a bounded queue that is drained by a
+    single writer thread. The writer groups the queued records into batches (one multi-row INSERT per table, plus the
+    update of the table's per-minute rollup) and commits once per batch. When the queue is full, the producers wait until there is room for their records (backpressure).
+
+    Args:
+        monitoring_db (MonitoringDB): the monitoring database the records are written to
+        batch_size (int): the maximum number of records written in a single batch
+        flush_interval (float): the maximum time (in seconds) a record waits in the queue before being written
+        queue_size (int): the maximum number of records waiting to be written
+
+    Attributes:
+        _monitoring_db (MonitoringDB): The monitoring database the records are written to
+        _batch_size (int): The maximum number of records written in a single batch
+        _flush_interval (float): The maximum time (in seconds) a record waits in the queue before being written
+        _queue (queue.Queue): The queue of records waiting to be written
+        _thread (threading.Thread): The writer thread
+        _conn (sqlalchemy.Connection): The writer's own connection to the monitoring database, taken from the engine's
+            connection pool
+        _stats (dict[str, int]): The writer metrics
+        _stats_lock (threading.Lock): Lock to update the writer metrics
+        _pending (dict[tuple, deque[tuple]]): The records of each table and session that have not been written yet
+            (queued or being written), in queue order
+        _pending_lock (threading.Lock): Lock to access the pending records
+    """
+
+    def __init__(self, monitoring_db: 'MonitoringDB', batch_size: int, flush_interval: float, queue_size: int):
+        self._monitoring_db: 'MonitoringDB' = monitoring_db
+        self._batch_size: int = max(1, batch_size)
+        self._flush_interval: float = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._thread: threading.Thread or None = None
+        self._conn: Connection or None = None
+        self._stats: dict[str, int] = {
+            'queued': 0,
+            'written': 0,
+            'failed': 0,
+            'batches': 0,
+            'blocked': 0,
+            'max_pending': 0,
+        }
+        self._stats_lock: threading.Lock = threading.Lock()
+        self._pending: dict[tuple, deque[tuple]] = {}
+        self._pending_lock: threading.Lock = threading.Lock()
+
+    @property
+    def running(self):
+        """bool: Whether the writer thread is running or not."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """dict[str, int]: The writer metrics:
+
+        - queued: number of records put in the queue
+        - written: number of records written in the database
+        - failed: number of records that could not be written
+        - batches: number of batches committed
+        - blocked: number of times a producer had to wait because the queue was full
+        - pending: number of records currently waiting in the queue
+        - max_pending: maximum number of records that have been waiting in the queue at the same time
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['pending'] = self._queue.qsize()
+        return stats
+
+    def start(self) -> None:
+        """Start the writer thread, with its own connection to the monitoring database."""
+        if self.running:
+            return
+        self._conn = self._monitoring_db.engine.connect()
+        self._thread = threading.Thread(target=self._run, name='monitoring-db-writer', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write all the pending records and stop the writer thread."""
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self._conn.close()
+        self._conn = None
+
+    def put(
+            self,
+            table_name: str,
+            row: dict[str, Any],
+            session: 'Session' or None = None,
+            children: tuple[str, str, list[dict[str, Any]]] or None = None
+    ) -> None:
+        """Put a record in the queue to be written. If the queue is full, wait until there is room for it.
+
+        Args:
+            table_name (str): the name of the table where the record is inserted
+            row (dict[str, Any]): the record values (except the session id)
+            session (Session or None): the session the record belongs to. Its database id is set in the record's
+                ``session_id`` column when it is written
+            children (tuple[str, str, list[dict[str, Any]]] or None): records (of another table) that reference this
+                record, as a tuple (table name, foreign key column, records). They are inserted after this record, with
+                its id set in the foreign key column
+        """
+        item = (table_name, row, session, children)
+        if session is not None:
+            # Tracked before being queued, so the record is always either pending or written
+            with self._pending_lock:
+                self._pending.setdefault(self._pending_key(table_name, session), deque()).append(item)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._stats_lock:
+                self._stats['blocked'] += 1
+            self._queue.put(item)
+        with self._stats_lock:
+            self._stats['queued'] += 1
+            self._stats['max_pending'] = max(self._stats['max_pending'], self._queue.qsize())
+
+    def pending(self, table_name: str, session: 'Session') -> list[dict[str, Any]]:
+        """Get the records of a session that have not been written yet in a table (they are queued or being written).
+
+        A record may be written at any time after this call, so the caller must take into account that it can be both
+        pending and in the database.
+
+        Args:
+            table_name (str): the table name
+            session (Session): the session
+
+        Returns:
+            list[dict[str, Any]]: the pending records (without the session id), in the order they were queued
+        """
+        with self._pending_lock:
+            items = self._pending.get(self._pending_key(table_name, session))
+            return [row for _, row, _, _ in items] if items else []
+
+    def _pending_key(self, table_name: str, session: 'Session') -> tuple:
+        return (table_name, *self._monitoring_db._session_key(session))
+
+    def _release(self, batch: list[tuple]) -> None:
+        """Stop tracking the records of a batch as pending, once it has been written (or has failed).
+
+        Args:
+            batch (list[tuple]): the records of the batch
+        """
+        with self._pending_lock:
+            for item in batch:
+                table_name, _, session, _ = item
+                if session is None:
+                    continue
+                key = self._pending_key(table_name, session)
+                items = self._pending.get(key)
+                if not items:
+                    continue
+                if items[0] is item:
+                    items.popleft()
+                else:
+                    try:
+                        items.remove(item)
+                    except ValueError:
+                        pass
+                if not items:
+                    del self._pending[key]
+
+    def flush(self) -> None:
+        """Wait until all the records queued before the call have been written. Records queued afterward (e.g., by
+        other sessions) are not waited for."""
+        if not self.running:
+            return
+        marker = _Flush()
+        self._queue.put(marker)
+        marker.done.wait()
+
+    def _run(self) -> None:
+        """Writer thread loop: take records from the queue and write them in batches."""
+        stop = False
+        while not stop:
+            items = [self._queue.get()]
+            batch = []
+            if items[0] is _STOP:
+                stop = True
+            elif not isinstance(items[0], _Flush):
+                batch.append(items[0])
+                deadline = time.monotonic() + self._flush_interval
+                while len(batch) < self._batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    items.append(item)
+                    if item is _STOP:
+                        stop = True
+                        break
+                    if isinstance(item, _Flush):
+                        break
+                    batch.append(item)
+            if batch:
+                self._write_batch(batch)
+                self._release(batch)
+            for item in items:
+                if isinstance(item, _Flush):
+                    item.done.set()
+                self._queue.task_done()
+        # Release the flushes queued after the stop marker
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _Flush):
+                item.done.set()
+            self._queue.task_done()
+
+    def _write_batch(self, batch: list[tuple]) -> None:
+        """Write a batch of records and commit it. If the batch fails (e.g., a record has an invalid value), it is
+        rolled back and its records are written one by one, so only the invalid records are lost.
+
+        Args:
+            batch (list[tuple]): the records to write
+        """
+        try:
+            failed = self._insert_records(batch)
+            self._conn.commit()
+        except Exception as e:
+            self._conn.rollback()
+            if len(batch) > 1:
+                logger.warning(f'Error writing a batch of {len(batch)} records in the monitoring DB, writing them one '
+                               f'by one: {e}')
+                failed = sum(self._write_record(item) for item in batch)
+            else:
+                logger.error(f'Error writing a record in the {batch[0][0]} table of the monitoring DB: {e}')
+                failed = 1
+        with self._stats_lock:
+            self._stats['written'] += len(batch) - failed
+            self._stats['failed'] += failed
+            self._stats['batches'] += 1
+
+    def _write_record(self, item: tuple) -> int:
+        """Write a single record and commit it.
+
+        Args:
+            item (tuple): the record to write
+
+        Returns:
+            int: 1 if the record could not be written, 0 otherwise
+        """
+        try:
+            failed = self._insert_records([item])
+            self._conn.commit()
+            return failed
+        except Exception as e:
+            logger.error(f'Error writing a record in the {item[0]} table of the monitoring DB: {e}')
+            self._conn.rollback()
+            return 1
+
+    def _insert_records(self, batch: list[tuple]) -> int:
+        """Insert records (without committing), with one INSERT statement per table.
+
+        Args:
+            batch (list[tuple]): the records to insert
+
+        Returns:
+            int: the number of records discarded because their session is not in the monitoring DB
+        """
+        rows_by_table: dict[str, list[tuple[dict, tuple or None, str or None]]] = {}
+        failed = 0
+        for table_name, row, session, children in batch:
+            if session is not None:
+                session_db_id = self._monitoring_db.get_session_db_id(session, self._conn)
+                if session_db_id is None:
+                    logger.error(f"Session {session.id} not found in the monitoring DB, discarding {table_name} record")
+                    failed += 1
+                    continue
+                row = {**row, 'session_id': session_db_id}
+            agent_name = session._agent.name if session is not None else None
+            rows_by_table.setdefault(table_name, []).append((row, children, agent_name))
+        for table_name, entries in rows_by_table.items():
+            table = self._monitoring_db.get_table_schema(table_name)
+            rows = [row for row, _, _ in entries]
+            self._monitoring_db.update_rollups(
+                self._conn, table_name, [(agent_name, row) for row, _, agent_name in entries]
+            )
+            if not any(children for _, children, _ in entries):
+                self._conn.execute(insert(table), rows)
+                continue
+            result = self._conn.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), rows)
+            ids = [int(r[0]) for r in result.fetchall()]
+            child_rows: dict[tuple[str, str], list[dict]] = {}
+            for (_, children, _), row_id in zip(entries, ids):
+                if not children:
+                    continue
+                child_table_name, foreign_key, records = children
+                child_rows.setdefault((child_table_name, foreign_key), []).extend(
+                    {**record, foreign_key: row_id} for record in records
+                )
+            for (child_table_name, _), records in child_rows.items():
+                if records:
+                    self._conn.execute(insert(self._monitoring_db.get_table_schema(child_table_name)), records)
+        return failed
@@ -2,11 +2,10 @@ import atexit
 from configparser import ConfigParser
 from typing import Any
 
-from sqlalchemy import create_engine
-
 from besser.agent.core.property import Property
 from besser.agent.db import DB_MONITORING_DIALECT, DB_MONITORING_HOST, DB_MONITORING_PORT, DB_MONITORING_DATABASE, \
-    DB_MONITORING_USERNAME, DB_MONITORING_PASSWORD
+    DB_MONITORING_USERNAME, DB_MONITORING_PASSWORD, DB_MONITORING_POOL_SIZE, DB_MONITORING_MAX_OVERFLOW, \
+    DB_MONITORING_CACHE_TTL
 from besser.agent.db.monitoring_db import MonitoringDB
 from besser.agent.exceptions.logger import logger
 
@@ -45,8 +44,12 @@ def connect_to_db(config_path: str):
             username = get_property(config, DB_MONITORING_USERNAME)
             password = get_property(config, DB_MONITORING_PASSWORD)
             url = f"{dialect}://{username}:{password}@{host}:{port}/{database}"
-            engine = create_engine(url)
-            monitoring_db.conn = engine.connect()
+            monitoring_db.connect_to_url(
+                url,
+                pool_size=get_property(config, DB_MONITORING_POOL_SIZE),
+                max_overflow=get_property(config, DB_MONITORING_MAX_OVERFLOW)
+            )
+            monitoring_db.cache.ttl = get_property(config, DB_MONITORING_CACHE_TTL)
             atexit.register(close_connection, monitoring_db)
             logger.info('Connected to DB')
             return monitoring_db
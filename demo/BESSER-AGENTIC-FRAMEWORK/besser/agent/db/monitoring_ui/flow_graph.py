@@ -2,36 +2,24 @@ import streamlit as st
 import streamlit.components.v1 as components
 from pyvis.network import Network
 
-from besser.agent.db.monitoring_db import MonitoringDB, TABLE_TRANSITION, TABLE_SESSION
-from besser.agent.db.monitoring_ui.home import agent_filter, session_filter
+from besser.agent.db.monitoring_db import MonitoringDB
+from besser.agent.db.monitoring_ui.home import agent_filter, session_filter, time_filter
 
 
 def flow_graph(monitoring_db: MonitoringDB):
     st.header('Flow Graph')
     agent_names = agent_filter(monitoring_db)
-    table_transition = monitoring_db.get_table(TABLE_TRANSITION)
-    table_session = monitoring_db.get_table(TABLE_SESSION)
-    if agent_names:
-        # Filter the tables by the specified agents
-        table_session = table_session[table_session['agent_name'].isin(agent_names)]
-        table_transition = table_transition[table_transition['session_id'].isin(table_session['id'])]
-    
-    session_ids = session_filter(monitoring_db)
-    if session_ids:
-        # Filter the tables by the specified sessions
-        table_session = table_session[table_session['session_id'].isin(session_ids)]
-        table_transition = table_transition[table_transition['session_id'].isin(table_session['id'])]
+    session_ids = session_filter(monitoring_db, agent_names)
+    start, end = time_filter()
+    # The transitions are counted per edge in the database
+    transition_counts = monitoring_db.count_transitions(agent_names, session_ids, start, end)
 
     nt = Network("700px", "100%", notebook=True, directed=True)
     state_set = set()
     transition_dict = {}
     # TODO: Initial states in another colour, set group=2 in add_node()
     # TODO: SET PHYSICS ATTRS: gravitationalConstant to -12000 and springLength to 200
-    for i, transition in table_transition.iterrows():
-        source_state = transition['source_state']
-        dest_state = transition['dest_state']
-        event = transition['event']
-        condition = transition['condition']
+    for source_state, dest_state, event, condition, count in transition_counts.itertuples(index=False):
         if event and condition:
             info = f'{event}, {condition}'
         elif event:
@@ -46,10 +34,8 @@ def flow_graph(monitoring_db: MonitoringDB):
         if dest_state not in state_set:
             state_set.add(dest_state)
             nt.add_node(dest_state, group=1)
-        if (source_state, dest_state, event, info) not in transition_dict:
-            transition_dict[(source_state, dest_state, event, info)] = 1
-        else:
-            transition_dict[(source_state, dest_state, event, info)] += 1
+        key = (source_state, dest_state, event, info)
+        transition_dict[key] = transition_dict.get(key, 0) + int(count)
     if transition_dict:
         max_count = max(transition_dict.values())
         for (source_state, dest_state, event, info), count in transition_dict.items():
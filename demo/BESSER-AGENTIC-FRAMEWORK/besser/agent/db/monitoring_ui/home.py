@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from datetime import datetime, time, timedelta
+
 import streamlit as st
 
-from besser.agent.db.monitoring_db import MonitoringDB, TABLE_INTENT_PREDICTION, TABLE_SESSION, TABLE_CHAT, TABLE_EVENT
+from besser.agent.db.monitoring_db import MonitoringDB, TIME_BUCKETS
 from besser.agent.exceptions.logger import logger
 
 try:
@@ -15,45 +17,36 @@ except ImportError:
 def home(monitoring_db: MonitoringDB):
     st.header('Home')
     agent_names = agent_filter(monitoring_db)
+    start, end = time_filter()
     col1, col2 = st.columns(2)
     with col1:
-        messages_data(monitoring_db, agent_names)
+        messages_data(monitoring_db, agent_names, start, end)
         # TOTAL NUM OF EVENTS (HISTOGRAM/ DONUT)
         # see utterances x each intent (with params), selectbox
 
     with col2:
-        # put a slider at the top to filter the time
-        intent_histogram(monitoring_db, agent_names)
-        get_matched_intents_ratio(monitoring_db, agent_names)
-        event_distribution(monitoring_db, agent_names)
-
-
-def event_distribution(monitoring_db, agent_names):
-    table_event = monitoring_db.get_table(TABLE_EVENT)
-    if agent_names:
-        table_session = monitoring_db.get_table(TABLE_SESSION)
-        # Filter the tables by the specified agents
-        table_session = table_session[table_session['agent_name'].isin(agent_names)]
-        table_event = table_event[table_event['session_id'].isin(table_session['id'])]
-    fig = px.histogram(table_event, x='event', color='event', title='Events')
+        intent_histogram(monitoring_db, agent_names, start, end)
+        get_matched_intents_ratio(monitoring_db, agent_names, start, end)
+        event_distribution(monitoring_db, agent_names, start, end)
+
+
+def event_distribution(monitoring_db, agent_names, start=None, end=None):
+    event_counts = monitoring_db.count_events(agent_names, start=start, end=end)
+    fig = px.bar(event_counts, x='event', y='count', color='event', title='Events')
     st.plotly_chart(fig, use_container_width=True)
 
 
-def messages_data(monitoring_db, agent_names):
-    table_chat = monitoring_db.get_table(TABLE_CHAT)
-    table_session = monitoring_db.get_table(TABLE_SESSION)
-    if agent_names:
-        # Filter the tables by the specified agents
-        table_session = table_session[table_session['agent_name'].isin(agent_names)]
-        table_chat = table_chat[table_chat['session_id'].isin(table_session['id'])]
-    total_messages = len(table_chat)
-    total_sessions = len(table_session)
-    total_user_messages = len(table_chat[table_chat['is_user'] == True])
-    total_agent_messages = len(table_chat[table_chat['is_user'] == False])
+def messages_data(monitoring_db, agent_names, start=None, end=None):
+    message_counts = monitoring_db.count_messages(agent_names, start=start, end=end)
+    total_sessions = monitoring_db.count_sessions(agent_names, start=start, end=end)
+    total_user_messages = message_counts[True]
+    total_agent_messages = message_counts[False]
+    total_messages = total_user_messages + total_agent_messages
 
     st.info(f'**Total sessions: {total_sessions}**')
     st.info(f'**Total messages: {total_messages} ({total_user_messages} user and {total_agent_messages} agent)**')
-    st.info(f'**Messages per session: {round(total_messages/total_sessions, 3)} ({round(total_user_messages/total_sessions, 3)} user and {round(total_agent_messages/total_sessions, 3)} agent)**')
+    if total_sessions:
+        st.info(f'**Messages per session: {round(total_messages/total_sessions, 3)} ({round(total_user_messages/total_sessions, 3)} user and {round(total_agent_messages/total_sessions, 3)} agent)**')
 
     data = {'names': ['User', 'Agent'], 'values': [total_user_messages, total_agent_messages]}
     # TODO: SHOW ANOTHER CHART PER TYPE OF MESSAGE (STR, FILE...)
@@ -63,31 +56,37 @@ def messages_data(monitoring_db, agent_names):
                  title='Total messages')
     st.plotly_chart(fig, use_container_width=True)
 
-    fig = px.histogram(table_chat, x='timestamp', color='is_user', title='Number of messages', nbins=40)
+    bucket = st.selectbox('Group messages by', TIME_BUCKETS, index=TIME_BUCKETS.index('hour'))
+    message_histogram = monitoring_db.get_message_histogram(bucket, agent_names, start=start, end=end)
+    fig = px.bar(message_histogram, x='bucket', y='count', color='is_user', title='Number of messages')
     st.plotly_chart(fig, use_container_width=True)
 
 
 def agent_filter(monitoring_db: MonitoringDB):
-    agents = monitoring_db.get_table(TABLE_SESSION)['agent_name'].unique()
+    agents = monitoring_db.get_agent_names()
     agent_names = st.multiselect(label='Select one or more agents', options=agents, placeholder='All agents')
     return agent_names
 
-def session_filter(monitoring_db: MonitoringDB):
-    sessions = monitoring_db.get_table(TABLE_SESSION)['session_id'].unique()
+
+def session_filter(monitoring_db: MonitoringDB, agent_names=None):
+    sessions = monitoring_db.get_session_ids(agent_names)
     session_ids = st.multiselect(label='Select one or more sessions', options=sessions, placeholder='All sessions')
     return session_ids
 
 
-def get_matched_intents_ratio(monitoring_db: MonitoringDB, agent_names=[]):
-    table_intent_prediction = monitoring_db.get_table(TABLE_INTENT_PREDICTION)
-    if agent_names:
-        table_session = monitoring_db.get_table(TABLE_SESSION)
-        # Filter the tables by the specified agents
-        table_session = table_session[table_session['agent_name'].isin(agent_names)]
-        table_intent_prediction = table_intent_prediction[table_intent_prediction['session_id'].isin(table_session['id'])]
-    value_counts = table_intent_prediction['intent'].value_counts()
-    fallback_count = value_counts['fallback_intent'] if 'fallback_intent' in value_counts else 0
-    intent_matched_count = len(table_intent_prediction) - fallback_count
+def time_filter():
+    dates = st.date_input(label='Select a time range', value=(), help='All the time if empty')
+    start = end = None
+    if len(dates) > 0:
+        start = datetime.combine(dates[0], time.min)
+    if len(dates) > 1:
+        # The end date is included in the time range
+        end = datetime.combine(dates[1], time.min) + timedelta(days=1)
+    return start, end
+
+
+def get_matched_intents_ratio(monitoring_db: MonitoringDB, agent_names=None, start=None, end=None):
+    intent_matched_count, fallback_count = monitoring_db.get_matched_intents_ratio(agent_names, start=start, end=end)
     data = {'names': ['Matched', 'Fallback'], 'values': [intent_matched_count, fallback_count]}
     fig = px.pie(data, values='values', names='names',
                  #color_discrete_sequence=['blue', 'red'],
@@ -96,12 +95,7 @@ def get_matched_intents_ratio(monitoring_db: MonitoringDB, agent_names=[]):
     st.plotly_chart(fig, use_container_width=True)
 
 
-def intent_histogram(monitoring_db: MonitoringDB, agent_names=[]):
-    table_intent_prediction = monitoring_db.get_table(TABLE_INTENT_PREDICTION)
-    if agent_names:
-        table_session = monitoring_db.get_table(TABLE_SESSION)
-        # Filter the tables by the specified agents
-        table_session = table_session[table_session['agent_name'].isin(agent_names)]
-        table_intent_prediction = table_intent_prediction[table_intent_prediction['session_id'].isin(table_session['id'])]
-    fig = px.histogram(table_intent_prediction, x='intent', color='intent', title='Histogram of Intents')
+def intent_histogram(monitoring_db: MonitoringDB, agent_names=None, start=None, end=None):
+    intent_counts = monitoring_db.count_intents(agent_names, start=start, end=end)
+    fig = px.bar(intent_counts, x='intent', y='count', color='intent', title='Histogram of Intents')
     st.plotly_chart(fig, use_container_width=True)
@@ -1,21 +1,21 @@
 import streamlit as st
 
 
-from besser.agent.db.monitoring_db import MonitoringDB, TABLE_INTENT_PREDICTION, TABLE_SESSION
-from besser.agent.db.monitoring_ui.home import agent_filter
+from besser.agent.db.monitoring_db import MonitoringDB
+from besser.agent.db.monitoring_ui.home import agent_filter, time_filter
 
 
 def intent_details(monitoring_db: MonitoringDB):
     st.header('Intent details')
     agent_names = agent_filter(monitoring_db)
-    table_intent_prediction = monitoring_db.get_table(TABLE_INTENT_PREDICTION)
-    if agent_names:
-        table_session = monitoring_db.get_table(TABLE_SESSION)
-        # Filter the tables by the specified agents
-        table_session = table_session[table_session['agent_name'].isin(agent_names)]
-        table_intent_prediction = table_intent_prediction[
-            table_intent_prediction['session_id'].isin(table_session['id'])]
-    intent = st.selectbox('Select an intent', table_intent_prediction['intent'].unique())
-    table_intent_prediction = table_intent_prediction[table_intent_prediction['intent'] == intent]
-    st.subheader(f'Average score: {table_intent_prediction["score"].mean()}')
-    st.dataframe(table_intent_prediction[['timestamp', 'message', 'score', 'intent_classifier']], use_container_width=True)
+    start, end = time_filter()
+    intent_counts = monitoring_db.count_intents(agent_names, start=start, end=end)
+    intent = st.selectbox('Select an intent', intent_counts['intent'])
+    if intent is None:
+        st.warning('There is no data for the selected agents')
+        return
+    intent_count = intent_counts[intent_counts['intent'] == intent].iloc[0]
+    st.subheader(f'Average score: {intent_count["avg_score"]}')
+    limit = st.number_input('Number of messages', min_value=1, value=min(int(intent_count['count']), 1000))
+    table_intent_prediction = monitoring_db.get_intent_predictions(intent, agent_names, start=start, end=end, limit=limit)
+    st.dataframe(table_intent_prediction, use_container_width=True)
@@ -50,6 +50,9 @@ def main():
         st.session_state['monitoring_db'] = connect_to_db(config_path)
     with st.sidebar:
         page = sidebar_menu()
+        if st.button('Refresh data'):
+            if st.session_state['monitoring_db'] is not None:
+                st.session_state['monitoring_db'].cache.clear()
         if st.button('Reconnect'):
             close_connection(st.session_state['monitoring_db'])
             st.session_state['monitoring_db'] = connect_to_db(config_path)
@@ -6,22 +6,24 @@ from besser.agent.db.monitoring_ui.utils import filter_df
 
 
 def table_overview(monitoring_db: MonitoringDB):
+    # Only the latest records of each table are loaded
+    limit = st.number_input('Number of records per table', min_value=1, value=1000)
 
     st.subheader(f'Table {TABLE_CHAT}')
-    st.dataframe(filter_df(monitoring_db.get_table(TABLE_CHAT), TABLE_CHAT), use_container_width=True)
+    st.dataframe(filter_df(monitoring_db.get_table(TABLE_CHAT, limit), TABLE_CHAT), use_container_width=True)
 
     st.subheader(f'Table {TABLE_SESSION}')
-    st.dataframe(filter_df(monitoring_db.get_table(TABLE_SESSION), TABLE_SESSION), use_container_width=True)
+    st.dataframe(filter_df(monitoring_db.get_table(TABLE_SESSION, limit), TABLE_SESSION), use_container_width=True)
 
     st.subheader(f'Table {TABLE_EVENT}')
-    st.dataframe(filter_df(monitoring_db.get_table(TABLE_EVENT), TABLE_EVENT), use_container_width=True)
+    st.dataframe(filter_df(monitoring_db.get_table(TABLE_EVENT, limit), TABLE_EVENT), use_container_width=True)
 
     st.subheader(f'Table {TABLE_INTENT_PREDICTION}')
-    st.dataframe(filter_df(monitoring_db.get_table(TABLE_INTENT_PREDICTION), TABLE_INTENT_PREDICTION), use_container_width=True)
+    st.dataframe(filter_df(monitoring_db.get_table(TABLE_INTENT_PREDICTION, limit), TABLE_INTENT_PREDICTION), use_container_width=True)
 
     st.subheader(f'Table {TABLE_PARAMETER}')
-    st.dataframe(filter_df(monitoring_db.get_table(TABLE_PARAMETER), TABLE_PARAMETER), use_container_width=True)
+    st.dataframe(filter_df(monitoring_db.get_table(TABLE_PARAMETER, limit), TABLE_PARAMETER), use_container_width=True)
 
     st.subheader(f'Table {TABLE_TRANSITION}')
-    st.dataframe(filter_df(monitoring_db.get_table(TABLE_TRANSITION), TABLE_TRANSITION), use_container_width=True)
+    st.dataframe(filter_df(monitoring_db.get_table(TABLE_TRANSITION, limit), TABLE_TRANSITION), use_container_width=True)
 
@@ -139,3 +139,30 @@ class StreamlitDatabaseException(Exception):
             f"The required property '{missing_property}' is missing in the Streamlit database configuration. If you want to persist users in streamlit, please make sure to set all the necessary database connection properties in the configuration file.\n"
         )
         super().__init__(message)
+
+
+class LLMRequestError(Exception):
+    """Error of a request to an LLM provider.
+
+    Args:
+        provider (str): the LLM provider name
+        message (str): the error message
+        status (int or None): the HTTP status code of the response, or None if no response was received (e.g., a
+            connection error or a timeout)
+        retry_after (float or None): the time (in seconds) the provider asked to wait before retrying the request
+    """
+
+    retryable_statuses = (408, 409, 425, 429, 500, 502, 503, 504)
+
+    def __init__(self, provider: str, message: str, status: int = None, retry_after: float = None):
+        self.provider: str = provider
+        self.status: int or None = status
+        self.retry_after: float or None = retry_after
+        status_message = f' with status {status}' if status is not None else ''
+        super().__init__(f"{provider} request failed{status_message}: {message}")
+
+    @property
+    def retryable(self) -> bool:
+        """bool: Whether the request can be retried, i.e., the error is temporary (connection errors, timeouts, rate
+        limits and server errors)."""
+        return self.status is None or self.status in self.retryable_statuses
@@ -28,6 +28,11 @@ class IntentMatcher(Condition):
         super().__init__(partial(intent_matched, params={'intent': intent}))
         self._intent: Intent = intent
 
+    @property
+    def intent(self):
+        """Intent: The target intent."""
+        return self._intent
+
     def __str__(self):
         return f"Intent Matching - {self._intent.name}"
 
@@ -66,6 +71,11 @@ class VariableOperationMatcher(Condition):
         self._operation: Callable[[Any, Any], bool] = operation
         self._target: Any = target
 
+    @property
+    def var_name(self):
+        """str: The name of the variable to evaluate."""
+        return self._var_name
+
     def __str__(self):
         return f"{self._var_name} " \
                f"{self._operation.__name__} " \
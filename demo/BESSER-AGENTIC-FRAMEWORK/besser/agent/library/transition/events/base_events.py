@@ -102,28 +102,33 @@ class ReceiveTextEvent(ReceiveMessageEvent):
     Attributes:
         _name (str): the name of the event
         predicted_intent (IntentClassifierPrediction): the predicted intent for the event message
+        _predicted_intents (dict[str, IntentClassifierPrediction]): the predicted intents for the event message, by
+            the name of the state where they were predicted
     """
 
     def __init__(self, text: str = None, session_id: str = None, human: bool = False):
         super().__init__(message=text, session_id=session_id, human=human)
         self._name = 'receive_message_text'
         self.predicted_intent: IntentClassifierPrediction = None
+        self._predicted_intents: dict[str, IntentClassifierPrediction] = {}
 
     def log(self):
         return f'{self._name} ({self.message})'
 
     def predict_intent(self, session: 'Session') -> None:
-        """Predict the intent of the event message, only if it has not been done yet or if the session moved to another
-        agent state.
+        """Predict the intent of the event message, only if it has not been done yet in the session's current agent
+        state. The predictions are memoized by state.
 
         Args:
             session (Session): the user session
         """
-        if self.predicted_intent is None or self.predicted_intent.state != session.current_state.name:
-            self.predicted_intent = session._agent._nlp_engine.predict_intent(session)
-            logger.info(f'Detected intent: {self.predicted_intent.intent.name}')
-            for parameter in self.predicted_intent.matched_parameters:
+        state_name = session.current_state.name
+        if state_name not in self._predicted_intents:
+            self._predicted_intents[state_name] = session._agent._nlp_engine.predict_intent(session)
+            logger.info(f'Detected intent: {self._predicted_intents[state_name].intent.name}')
+            for parameter in self._predicted_intents[state_name].matched_parameters:
                 logger.info(f"Parameter '{parameter.name}': {parameter.value}, info = {parameter.info}")
+        self.predicted_intent = self._predicted_intents[state_name]
 
 
 class ReceiveJSONEvent(ReceiveMessageEvent):
@@ -139,6 +144,8 @@ class ReceiveJSONEvent(ReceiveMessageEvent):
         json (dict): the received JSON payload
         predicted_intent (IntentClassifierPrediction): the predicted intent for the event message
         contains_message (bool): indicates if the JSON payload contains a 'message' field
+        _predicted_intents (dict[str, IntentClassifierPrediction]): the predicted intents for the event message, by
+            the name of the state where they were predicted
     """
 
     def __init__(self, payload: dict = None, session_id: str = None, human: bool = False):
@@ -156,20 +163,23 @@ class ReceiveJSONEvent(ReceiveMessageEvent):
         self.json = payload
         self._name = 'receive_message_json'
         self.predicted_intent: IntentClassifierPrediction = None
+        self._predicted_intents: dict[str, IntentClassifierPrediction] = {}
         super().__init__(message=message, session_id=session_id, human=human)
 
     def predict_intent(self, session: 'Session') -> None:
-        """Predict the intent of the event message, only if it has not been done yet or if the session moved to another
-        agent state.
+        """Predict the intent of the event message, only if it has not been done yet in the session's current agent
+        state. The predictions are memoized by state.
 
         Args:
             session (Session): the user session
         """
-        if self.predicted_intent is None or self.predicted_intent.state != session.current_state.name:
-            self.predicted_intent = session._agent._nlp_engine.predict_intent(session)
-            logger.info(f'Detected intent: {self.predicted_intent.intent.name}')
-            for parameter in self.predicted_intent.matched_parameters:
+        state_name = session.current_state.name
+        if state_name not in self._predicted_intents:
+            self._predicted_intents[state_name] = session._agent._nlp_engine.predict_intent(session)
+            logger.info(f'Detected intent: {self._predicted_intents[state_name].intent.name}')
+            for parameter in self._predicted_intents[state_name].matched_parameters:
                 logger.info(f"Parameter '{parameter.name}': {parameter.value}, info = {parameter.info}")
+        self.predicted_intent = self._predicted_intents[state_name]
 
 class ReceiveFileEvent(Event):
     """Event for receiving files.
@@ -79,6 +79,176 @@ type: ``float``
 default value: ``0.4``
 """
 
+NLP_TRAINING_WORKERS = Property(SECTION_NLP, 'nlp.training.workers', int, 1)
+"""
+The number of processes used to train the intent classifiers of the agent states. With more than 1 worker, the
+PyTorch-based intent classifiers of different states are trained in parallel (each one in a worker process), which
+reduces the agent start-up time when there are many states. With 1 worker, they are trained one after another.
+
+name: ``nlp.training.workers``
+
+type: ``int``
+
+default value: ``1``
+"""
+
+NLP_INTENT_CACHE_SIZE = Property(SECTION_NLP, 'nlp.intent_cache.size', int, 1024)
+"""
+The maximum number of intent predictions kept in the intent prediction cache. When a state receives a message it has
+already received before (e.g., a button option), the cached prediction is used instead of running the intent
+classifier again. Set it to 0 to disable the cache.
+
+name: ``nlp.intent_cache.size``
+
+type: ``int``
+
+default value: ``1024``
+"""
+
+NLP_INTENT_CACHE_TTL = Property(SECTION_NLP, 'nlp.intent_cache.ttl', float, 3600.0)
+"""
+The time (in seconds) an intent prediction is kept in the intent prediction cache.
+
+name: ``nlp.intent_cache.ttl``
+
+type: ``float``
+
+default value: ``3600.0``
+"""
+
+NLP_PREPROCESSING_CACHE_SIZE = Property(SECTION_NLP, 'nlp.preprocessing.cache_size', int, 1024)
+"""
+The maximum number of preprocessed (see ``nlp.pre_processing``) and tokenized user messages kept in memory, so a message
+is only processed once even if it is classified by several intent classifiers. Set it to 0 to disable it.
+
+name: ``nlp.preprocessing.cache_size``
+
+type: ``int``
+
+default value: ``1024``
+"""
+
+NLP_LLM_MAX_CONNECTIONS = Property(SECTION_NLP, 'nlp.llm.max_connections', int, 100)
+"""
+The maximum number of simultaneous HTTP connections of the pooled HTTP client shared by the LLMs of the agent.
+
+name: ``nlp.llm.max_connections``
+
+type: ``int``
+
+default value: ``100``
+"""
+
+NLP_LLM_MAX_CONCURRENCY = Property(SECTION_NLP, 'nlp.llm.max_concurrency', int, 8)
+"""
+The maximum number of requests sent at the same time to each LLM provider (e.g., OpenAI, HuggingFace, Replicate).
+Additional requests wait until a running one finishes.
+
+name: ``nlp.llm.max_concurrency``
+
+type: ``int``
+
+default value: ``8``
+"""
+
+NLP_LLM_MAX_RETRIES = Property(SECTION_NLP, 'nlp.llm.max_retries', int, 3)
+"""
+The maximum number of times an LLM request is retried after a temporary error (connection errors, timeouts, rate limits
+and server errors).
+
+name: ``nlp.llm.max_retries``
+
+type: ``int``
+
+default value: ``3``
+"""
+
+NLP_LLM_RETRY_BACKOFF = Property(SECTION_NLP, 'nlp.llm.retry_backoff', float, 1.0)
+"""
+The base time (in seconds) to wait before retrying a failed LLM request. It is doubled after each retry. If the provider
+specifies how long to wait (i.e., the ``Retry-After`` header of a rate limit response), that time is used instead, and
+the other requests to the same provider wait as well.
+
+name: ``nlp.llm.retry_backoff``
+
+type: ``float``
+
+default value: ``1.0``
+"""
+
+NLP_LLM_TIMEOUT = Property(SECTION_NLP, 'nlp.llm.timeout', float, 120.0)
+"""
+The maximum time (in seconds) an LLM request can take. Requests exceeding it are retried.
+
+name: ``nlp.llm.timeout``
+
+type: ``float``
+
+default value: ``120.0``
+"""
+
+NLP_LLM_COALESCE_REQUESTS = Property(SECTION_NLP, 'nlp.llm.coalesce_requests', bool, True)
+"""
+Whether to coalesce identical LLM requests. If several sessions send the same request (same LLM, parameters and
+prompt) while it is in progress, only one request is sent to the provider and all of them get its answer.
+
+name: ``nlp.llm.coalesce_requests``
+
+type: ``bool``
+
+default value: ``True``
+"""
+
+NLP_RESPONSE_CACHE_SIZE = Property(SECTION_NLP, 'nlp.response_cache.size', int, 1024)
+"""
+The maximum number of LLM responses kept in the response cache. The RAG answers, the LLM-based intent classifications
+and the user adaptations of the agent messages are cached by LLM, system prompt and (normalized) prompt, so a prompt
+that has already been answered (e.g., a usual question of a FAQ agent) is not sent to the LLM again. The cache is
+enabled by default; set it to 0 to disable it.
+
+name: ``nlp.response_cache.size``
+
+type: ``int``
+
+default value: ``1024``
+"""
+
+NLP_RESPONSE_CACHE_TTL = Property(SECTION_NLP, 'nlp.response_cache.ttl', float, 3600.0)
+"""
+The time (in seconds) an LLM response is kept in the response cache.
+
+name: ``nlp.response_cache.ttl``
+
+type: ``float``
+
+default value: ``3600.0``
+"""
+
+NLP_RESPONSE_CACHE_PATH = Property(SECTION_NLP, 'nlp.response_cache.path', str, None)
+"""
+The path of the SQLite database file where the response cache is stored, so the cached responses are kept after the
+agent is restarted. If it is not set, the responses are only kept in memory.
+
+name: ``nlp.response_cache.path``
+
+type: ``str``
+
+default value: ``None``
+"""
+
+NLP_RESPONSE_CACHE_SIMILARITY_THRESHOLD = Property(SECTION_NLP, 'nlp.response_cache.similarity_threshold', float, 0.95)
+"""
+The minimum cosine similarity between the embeddings of 2 prompts to consider them the same prompt in the response
+cache. It is only used if the response cache has an embedding function (see
+:class:`~besser.agent.nlp.llm.llm_response_cache.LLMResponseCache`).
+
+name: ``nlp.response_cache.similarity_threshold``
+
+type: ``float``
+
+default value: ``0.95``
+"""
+
 
 OPENAI_API_KEY = Property(SECTION_NLP, 'nlp.openai.api_key', str, None)
 """
@@ -58,3 +58,18 @@ class IntentClassifier(ABC):
             list[IntentClassifierPrediction]: the list of predictions made by the intent classifier.
         """
         pass
+
+    def predict_batch(self, messages: list[str]) -> list[list[IntentClassifierPrediction]]:
+        """Predict the intents of a list of messages.
+
+        By default, each message is predicted separately. Intent classifiers that can run many predictions at once
+        (e.g., in a single forward pass of a neural network) should override this method.
+
+        Args:
+            messages (list[str]): the messages to predict the intent
+
+        Returns:
+            list[list[IntentClassifierPrediction]]: the list of predictions made by the intent classifier for each
+            message, in the same order as the messages
+        """
+        return [self.predict(message) for message in messages]
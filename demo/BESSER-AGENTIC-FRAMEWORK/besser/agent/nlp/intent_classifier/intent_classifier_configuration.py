@@ -35,6 +35,14 @@ class SimpleIntentClassifierConfiguration(IntentClassifierConfiguration):
             all predictions equals to 1) and 'softmax' (sum of all predictions can be different of 1). Defaults to
             'sigmoid'
         lr (float): Learning rate for the optimizer
+        batch_window (float): Maximum time (in seconds) a prediction waits to be run together (in a single batch) with the
+            predictions requested concurrently by other sessions. Only used by the 'pytorch' framework. 0 disables the
+            batching of concurrent predictions
+        batch_size (int or None): Number of training sentences in each training batch. If None, the framework default
+            is used (2 for 'pytorch')
+        early_stopping_patience (int): Number of epochs without improvement of the training loss after which the
+            training stops. 0 disables early stopping, running all the epochs
+        early_stopping_min_delta (float): Minimum decrease of the training loss to be considered an improvement
 
     Attributes:
         framework (str): The framework to implement the Simple Intent Classifier ('tensorflow' or 'pytorch'). Defaults
@@ -51,6 +59,14 @@ class SimpleIntentClassifierConfiguration(IntentClassifierConfiguration):
             all predictions equals to 1) and 'softmax' (sum of all predictions can be different of 1). Defaults to
             'sigmoid'
         lr (float): Learning rate for the optimizer
+        batch_window (float): Maximum time (in seconds) a prediction waits to be run together (in a single batch) with the
+            predictions requested concurrently by other sessions. Only used by the 'pytorch' framework. 0 disables the
+            batching of concurrent predictions
+        batch_size (int or None): Number of training sentences in each training batch. If None, the framework default
+            is used (2 for 'pytorch')
+        early_stopping_patience (int): Number of epochs without improvement of the training loss after which the
+            training stops. 0 disables early stopping, running all the epochs
+        early_stopping_min_delta (float): Minimum decrease of the training loss to be considered an improvement
     """
 
     def __init__(
@@ -64,6 +80,10 @@ class SimpleIntentClassifierConfiguration(IntentClassifierConfiguration):
             check_exact_prediction_match: bool = True,
             activation_last_layer: str = 'sigmoid',
             lr: float = 0.001,
+            batch_window: float = 0.0,
+            batch_size: int or None = None,
+            early_stopping_patience: int = 0,
+            early_stopping_min_delta: float = 1e-4,
     ):
         super().__init__()
         if framework not in ['pytorch', 'tensorflow']:
@@ -81,6 +101,10 @@ class SimpleIntentClassifierConfiguration(IntentClassifierConfiguration):
         self.check_exact_prediction_match: bool = check_exact_prediction_match
         self.activation_last_layer: str = activation_last_layer
         self.lr: float = lr
+        self.batch_window: float = batch_window
+        self.batch_size: int or None = batch_size
+        self.early_stopping_patience: int = early_stopping_patience
+        self.early_stopping_min_delta: float = early_stopping_min_delta
 
 
 class LLMIntentClassifierConfiguration(IntentClassifierConfiguration):
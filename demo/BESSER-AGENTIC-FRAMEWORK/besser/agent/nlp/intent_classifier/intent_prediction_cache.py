@@ -0,0 +1,124 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+from besser.agent.nlp.intent_classifier.intent_classifier_prediction import IntentClassifierPrediction
+
+
+def normalize_message(message: str) -> str:
+    """Normalize a user message to be used as an intent prediction cache key.
+
+    Leading, trailing and repeated whitespaces are removed. The letter case is kept, since the values of the matched
+    parameters are taken from the original message.
+
+    Args:
+        message (str): the user message
+
+    Returns:
+        str: the normalized message
+    """
+    return ' '.join(message.split())
+
+
+class IntentPredictionCache:
+    """A LRU cache of intent predictions with expiration time.
+
+    The NLPEngine stores here the best intent prediction of each message received in each state, so a message that has
+    already been received in a state (e.g., a button option or a usual answer like "yes") is not classified again.
+
+    Args:
+        max_size (int): the maximum number of predictions in the cache. The least recently used predictions are evicted
+            when it is full. If it is 0, the cache is disabled
+        ttl (float or None): the time (in seconds) a prediction is kept in the cache. If None, predictions do not expire
+
+    Attributes:
+        _max_size (int): The maximum number of predictions in the cache
+        _ttl (float or None): The time (in seconds) a prediction is kept in the cache
+        _entries (OrderedDict[Hashable, tuple[float, IntentClassifierPrediction]]): The cached predictions, with their
+            insertion time, from the least to the most recently used
+        _lock (threading.Lock): Lock to access the cache from different threads
+        _stats (dict[str, int]): The cache metrics
+    """
+
+    def __init__(self, max_size: int, ttl: float or None = None):
+        self._max_size: int = max(0, max_size)
+        self._ttl: float or None = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, IntentClassifierPrediction]] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._stats: dict[str, int] = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @property
+    def enabled(self):
+        """bool: Whether the cache is enabled or not."""
+        return self._max_size > 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """dict[str, int]: The cache metrics:
+
+        - hits: number of predictions found in the cache
+        - misses: number of predictions not found in the cache
+        - evictions: number of predictions removed because the cache was full or they expired
+        - size: number of predictions currently in the cache
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        return stats
+
+    def get(self, key: Hashable) -> IntentClassifierPrediction or None:
+        """Get a prediction from the cache.
+
+        Args:
+            key (Hashable): the prediction key
+
+        Returns:
+            IntentClassifierPrediction or None: a copy of the cached prediction, or None if it is not in the cache
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._ttl is not None and time.monotonic() - entry[0] > self._ttl:
+                del self._entries[key]
+                self._stats['evictions'] += 1
+                entry = None
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            prediction = entry[1]
+        return self._copy(prediction)
+
+    def put(self, key: Hashable, prediction: IntentClassifierPrediction) -> None:
+        """Store a prediction in the cache.
+
+        Args:
+            key (Hashable): the prediction key
+            prediction (IntentClassifierPrediction): the prediction
+        """
+        if not self.enabled:
+            return
+        prediction = self._copy(prediction)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), prediction)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self) -> None:
+        """Remove all the predictions from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _copy(prediction: IntentClassifierPrediction) -> IntentClassifierPrediction:
+        """Copy a prediction, so the cached one is not modified by whoever uses it (e.g., setting its state)."""
+        prediction_copy = copy.copy(prediction)
+        if prediction.matched_parameters is not None:
+            prediction_copy.matched_parameters = list(prediction.matched_parameters)
+        return prediction_copy
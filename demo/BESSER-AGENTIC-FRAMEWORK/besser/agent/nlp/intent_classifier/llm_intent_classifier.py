@@ -152,11 +152,22 @@ The output format is JSON, not List.
             llm_name = self._state.ic_config.llm_name
             parameters = self._state.ic_config.parameters
             llm = self._nlp_engine._llms[llm_name]
+            response_cache = self._nlp_engine.response_cache
+            # The prompt without the message identifies the classification task (i.e., the state intents)
+            system_prompt = f'{self._generate_prompt("")}\n{parameters}'
+            # A similar message may have different parameter values, so only the same message is looked up
+            semantic = not any(intent.parameters for intent in self._state.intents)
+            cached_response = response_cache.get(llm_name, message, system_prompt, semantic=semantic)
+            if cached_response is not None:
+                return self.default_json_to_intent_classifier_predictions(message, cached_response)
             intent_classifier_results: list[IntentClassifierPrediction] = llm.intent_classification(
                 intent_classifier=self,
                 message=prompt,
                 parameters=parameters
             )
+            response_cache.put(
+                llm_name, message, self.intent_classifier_predictions_to_json(intent_classifier_results), system_prompt
+            )
         except Exception as _:
             logger.error(f"An error occurred while predicting the intent in state '{self._state.name}' with LLM "
                           f"Intent Classifier '{self._state.ic_config.llm_name}'. See the attached exception:")
@@ -164,6 +175,29 @@ The output format is JSON, not List.
             intent_classifier_results: list[IntentClassifierPrediction] = []
         return intent_classifier_results
 
+    @staticmethod
+    def intent_classifier_predictions_to_json(
+            intent_classifier_predictions: list[IntentClassifierPrediction]
+    ) -> dict:
+        """Convert a list of intent classifier predictions to the JSON structure generated by the LLM (see
+        :meth:`default_json_to_intent_classifier_predictions`).
+
+        Args:
+            intent_classifier_predictions (list[IntentClassifierPrediction]): the intent classifier predictions
+
+        Returns:
+            dict: the JSON containing the intent predictions
+        """
+        return {
+            prediction.intent.name: {
+                'score': prediction.score,
+                'parameters': {
+                    parameter.name: parameter.value for parameter in prediction.matched_parameters or []
+                    if parameter.value is not None
+                }
+            } for prediction in intent_classifier_predictions
+        }
+
     def default_json_to_intent_classifier_predictions(
             self,
             message: str,
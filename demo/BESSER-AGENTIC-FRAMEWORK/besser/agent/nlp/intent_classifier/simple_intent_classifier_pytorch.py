@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Callable
 import numpy as np
 
 from besser.agent import nlp
@@ -9,7 +13,7 @@ from besser.agent.exceptions.logger import logger
 from besser.agent.nlp.intent_classifier.intent_classifier import IntentClassifier
 from besser.agent.nlp.intent_classifier.intent_classifier_prediction import IntentClassifierPrediction
 from besser.agent.nlp.ner.ner_prediction import NERPrediction
-from besser.agent.nlp.preprocessing.text_preprocessing import process_text, tokenize
+from besser.agent.nlp.preprocessing.text_preprocessing import tokenize
 
 from collections import Counter
 
@@ -21,7 +25,7 @@ try:
     import torch
     import torch.optim as optim
     from torch import nn
-    from torch.utils.data import DataLoader, Dataset
+    from torch.utils.data import DataLoader, Dataset, TensorDataset
 except ImportError:
     logger.warning("torch dependencies in SimpleIntentClassifierTorch could not be imported. You can install them from the "
                    "requirements/requirements-torch.txt file")
@@ -81,6 +85,162 @@ class TextDataset(Dataset):
         return torch.tensor(tokens, dtype=torch.long), torch.tensor(label, dtype=torch.long)
 
 
+DEFAULT_BATCH_SIZE = 2
+"""The default number of training sentences in each training batch."""
+
+
+def train_text_classifier(
+        model: TextClassifier,
+        inputs: list[list[int]],
+        labels: list[int],
+        num_epochs: int,
+        lr: float,
+        batch_size: int,
+        early_stopping_patience: int = 0,
+        early_stopping_min_delta: float = 0.0,
+) -> tuple[dict, int]:
+    """Train a text classifier model.
+
+    The inputs are already tokenized and padded, so this function does not depend on the agent and can be run in another
+    process (see :meth:`NLPEngine.train() <besser.agent.nlp.nlp_engine.NLPEngine.train>`).
+
+    Args:
+        model (TextClassifier): the model to train
+        inputs (list[list[int]]): the padded training sequences
+        labels (list[int]): the encoded label of each training sequence
+        num_epochs (int): the maximum number of epochs
+        lr (float): the learning rate of the optimizer
+        batch_size (int): the number of training sequences in each batch
+        early_stopping_patience (int): the number of epochs without improvement of the training loss after which the
+            training stops. 0 disables early stopping
+        early_stopping_min_delta (float): the minimum decrease of the training loss to be considered an improvement
+
+    Returns:
+        tuple[dict, int]: the trained model state dictionary and the number of epochs run
+    """
+    dataset = TensorDataset(torch.tensor(inputs, dtype=torch.long), torch.tensor(labels, dtype=torch.long))
+    dataloader = DataLoader(dataset, batch_size=batch_size, shuffle=True)
+    criterion = nn.CrossEntropyLoss()
+    optimizer = optim.Adam(model.parameters(), lr=lr)
+
+    model.train()
+    best_loss = float('inf')
+    epochs_without_improvement = 0
+    epochs_run = 0
+    for epoch in range(num_epochs):
+        total_loss = 0
+        for texts, batch_labels in dataloader:
+            optimizer.zero_grad()
+            outputs = model(texts)
+            loss = criterion(outputs, batch_labels)
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item()
+        epochs_run = epoch + 1
+        epoch_loss = total_loss / len(dataloader)
+        if early_stopping_patience > 0:
+            if epoch_loss < best_loss - early_stopping_min_delta:
+                best_loss = epoch_loss
+                epochs_without_improvement = 0
+            else:
+                epochs_without_improvement += 1
+                if epochs_without_improvement >= early_stopping_patience:
+                    break
+    model.eval()
+    return model.state_dict(), epochs_run
+
+
+class PredictionMicroBatcher:
+    """Groups the predictions requested concurrently (e.g., by different sessions) into batches.
+
+    The batches are run by a dedicated worker thread: when a prediction is requested, the worker waits for a short time
+    window, during which other requests can join the batch, and then runs all the batch predictions at once. The
+    window ends early when the batch is full. The requesters only wait for their own result, so no agent thread
+    sleeps for the window. When a prediction is requested from a thread running an event loop (e.g., a shared
+    scheduler loop, where the sessions' events are handled one after the other), the batch is run right away, since
+    no other session of that loop could join it and waiting would stall the whole loop.
+
+    Args:
+        predict_batch (Callable[[list[str]], list]): the function that runs the predictions of a batch of messages
+        window (float): the maximum time (in seconds) a batch waits for other requests
+        max_batch_size (int): the maximum number of predictions of a batch
+
+    Attributes:
+        _predict_batch (Callable[[list[str]], list]): The function that runs the predictions of a batch of messages
+        _window (float): The maximum time (in seconds) a batch waits for other requests
+        _max_batch_size (int): The maximum number of predictions of a batch
+        _pending (list[tuple[str, Future]]): The messages of the current batch, with the futures of their results
+        _run_now (bool): Whether the current batch must be run without waiting for the rest of the window
+        _condition (threading.Condition): Condition to access the current batch from different threads and to notify
+            the worker of new requests
+        _worker (threading.Thread or None): The thread running the batches, started with the first request
+    """
+
+    def __init__(self, predict_batch: Callable[[list[str]], list], window: float, max_batch_size: int = 64):
+        self._predict_batch: Callable[[list[str]], list] = predict_batch
+        self._window: float = window
+        self._max_batch_size: int = max_batch_size
+        self._pending: list[tuple[str, Future]] = []
+        self._run_now: bool = False
+        self._condition: threading.Condition = threading.Condition()
+        self._worker: threading.Thread or None = None
+
+    def predict(self, message: str):
+        """Run the prediction of a message in the current batch, and wait for its result.
+
+        Args:
+            message (str): the message to predict
+
+        Returns:
+            the prediction result of the message
+        """
+        future: Future = Future()
+        with self._condition:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='PredictionMicroBatcher', daemon=True)
+                self._worker.start()
+            self._pending.append((message, future))
+            if _in_event_loop():
+                self._run_now = True
+            self._condition.notify()
+        return future.result()
+
+    def _run(self) -> None:
+        """Run the batches of predictions as they are requested (run by the worker thread)."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                deadline = time.monotonic() + self._window
+                while not self._run_now and len(self._pending) < self._max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._pending[:self._max_batch_size]
+                self._pending = self._pending[self._max_batch_size:]
+                self._run_now = self._run_now and bool(self._pending)
+            try:
+                results = self._predict_batch([batch_message for batch_message, _ in batch])
+                for (_, batch_future), result in zip(batch, results):
+                    batch_future.set_result(result)
+            except Exception as e:
+                for _, batch_future in batch:
+                    batch_future.set_exception(e)
+
+
+def _in_event_loop() -> bool:
+    """Check if the current thread is running an asyncio event loop.
+
+    Returns:
+        bool: true if the current thread is running an event loop, false otherwise
+    """
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
 class SimpleIntentClassifierTorch(IntentClassifier):
     """A Simple Pytorch-based Intent Classifier.
 
@@ -93,6 +253,8 @@ class SimpleIntentClassifierTorch(IntentClassifier):
     Attributes:
         _model (`torch.nn.Module <https://pytorch.org/docs/stable/generated/torch.nn.Module>`_):
             The intent classifier language model
+        _batcher (PredictionMicroBatcher or None): Groups concurrent predictions into batches, if the state's intent
+            classifier configuration has a batch window
 
     See Also:
         :class:`~besser.agent.nlp.intent_classifier.intent_classifier_configuration.SimpleIntentClassifierConfiguration`.
@@ -126,6 +288,10 @@ class SimpleIntentClassifierTorch(IntentClassifier):
         self.__vocab: dict[str, int] = {}
         """The vocabulary of the intent classifier (i.e., all known tokens)."""
 
+        self.__training_sequence_index: dict[tuple[int, ...], list[int]] = {}
+        """Hash index of the training sequences, mapping each sequence to the labels of the training sentences with that
+        sequence (used to check exact matches)."""
+
         for intent in self._state.intents:
             intent.process_training_sentences(self._nlp_engine)
             index_intent = self._state.intents.index(intent)
@@ -145,11 +311,10 @@ class SimpleIntentClassifierTorch(IntentClassifier):
         self.__vocab = {word: idx for idx, (word, _) in enumerate(Counter(all_tokens).items(), 1)}
         self.__vocab[SimpleIntentClassifierTorch.PAD] = 0
         self.__vocab[SimpleIntentClassifierTorch.UNK] = len(self.__vocab)
-        for training_sentence in self.__total_training_sentences:
-            self.__total_training_sequences.append([
-                self.__vocab.get(token, self.__vocab[SimpleIntentClassifierTorch.UNK])
-                for token in tokenize(training_sentence, language)
-            ])
+        for i, training_sentence in enumerate(self.__total_training_sentences):
+            training_sequence = self._to_sequence(training_sentence, language)
+            self.__total_training_sequences.append(training_sequence)
+            self.__training_sequence_index.setdefault(tuple(training_sequence), []).append(self.__total_labels[i])
 
         # Model Initialization
         self._model = TextClassifier(
@@ -160,82 +325,156 @@ class SimpleIntentClassifierTorch(IntentClassifier):
             pad_idx=self.__vocab[SimpleIntentClassifierTorch.PAD],
             activation_last_layer=self._state.ic_config.activation_last_layer
         )
+        self._batcher: PredictionMicroBatcher or None = None
+        if getattr(self._state.ic_config, 'batch_window', 0) > 0:
+            self._batcher = PredictionMicroBatcher(self.predict_batch, self._state.ic_config.batch_window)
+
+    def _to_sequence(self, sentence: str, language: str, memoize: bool = False) -> list[int]:
+        """Convert a sentence into a sequence of vocabulary indices.
+
+        Args:
+            sentence (str): the sentence
+            language (str): the sentence language
+            memoize (bool): whether to use the tokens memoized by the NLPEngine text preprocessor (for user messages,
+                not for training sentences)
+
+        Returns:
+            list[int]: the sentence sequence
+        """
+        unk = self.__vocab[SimpleIntentClassifierTorch.UNK]
+        if memoize:
+            tokens = self._nlp_engine.text_preprocessor.tokenize(sentence, language)
+        else:
+            tokens = tokenize(sentence, language)
+        return [self.__vocab.get(token, unk) for token in tokens]
+
+    def _exact_match_prediction(self, sequence: list[int], intents: list[Intent]) -> np.ndarray or None:
+        """Get the prediction of a sequence that is exactly equal to a training sequence of one of the given intents.
+
+        Args:
+            sequence (list[int]): the sequence to predict
+            intents (list[Intent]): the intents that can be predicted
+
+        Returns:
+            numpy.ndarray or None: a prediction with full confidence on the matched intent, or None if there is no exact
+            match
+        """
+        for intent_label in self.__training_sequence_index.get(tuple(sequence), []):
+            if self.__intent_label_mapping[intent_label] in intents:
+                # We set to 1 the corresponding intent with full confidence and to zero all the others
+                prediction = np.zeros(len(self._state.intents))
+                np.put(prediction, intent_label, 1.0, mode='raise')
+                # We don't check if there is more than one intent that could be the exact match
+                # as this would be an inconsistency in the agent definition anyway
+                return prediction
+        return None
+
+    def training_job(self) -> tuple:
+        """Get the arguments to train the intent classifier model with :func:`train_text_classifier`.
+
+        The training sentences are tokenized and padded only once, so the training job does not need the agent and can
+        be run in another process.
+
+        Returns:
+            tuple: the arguments of :func:`train_text_classifier`
+        """
+        max_num_tokens: int = self._state.ic_config.input_max_num_tokens
+        pad: int = self.__vocab[SimpleIntentClassifierTorch.PAD]
+        inputs = [
+            sequence[:max_num_tokens] + [pad] * (max_num_tokens - len(sequence))
+            for sequence in self.__total_training_sequences
+        ]
+        batch_size = self._state.ic_config.batch_size or DEFAULT_BATCH_SIZE
+        return (
+            self._model,
+            inputs,
+            [int(label) for label in self.__total_labels_encoded],
+            self._state.ic_config.num_epochs,
+            self._state.ic_config.lr,
+            batch_size,
+            self._state.ic_config.early_stopping_patience,
+            self._state.ic_config.early_stopping_min_delta,
+        )
+
+    def load_training_result(self, result: tuple[dict, int]) -> None:
+        """Load the result of a training job run in another process (see :meth:`training_job`).
+
+        Args:
+            result (tuple[dict, int]): the trained model state dictionary and the number of epochs run
+        """
+        state_dict, epochs_run = result
+        self._model.load_state_dict(state_dict)
+        self._model.eval()
+        logger.debug(f"Intent classifier in {self._state.name} trained for {epochs_run} epochs")
 
     def train(self) -> None:
-        # Dataset and DataLoader
-        dataset = TextDataset(
-            self.__total_training_sentences,
-            self.__total_labels_encoded,
-            self.__vocab,
-            self._state.ic_config.input_max_num_tokens,
-            self._nlp_engine.get_property(nlp.NLP_LANGUAGE)
-        )
-        dataloader = DataLoader(dataset, batch_size=2, shuffle=True)
-        criterion = nn.CrossEntropyLoss()
-        optimizer = optim.Adam(self._model.parameters(), lr=self._state.ic_config.lr)
-
-        self._model.train()
-        for epoch in range(self._state.ic_config.num_epochs):
-            total_loss = 0
-            for texts, labels in dataloader:
-                optimizer.zero_grad()
-                outputs = self._model(texts)
-                loss = criterion(outputs, labels)
-                loss.backward()
-                optimizer.step()
-                total_loss += loss.item()
-            # logger.info(f"Epoch {epoch + 1}/{self._state.ic_config.num_epochs}, Loss: {total_loss / len(dataloader):.4f}")
+        _, epochs_run = train_text_classifier(*self.training_job())
+        logger.debug(f"Intent classifier in {self._state.name} trained for {epochs_run} epochs")
 
     def predict(self, message: str) -> list[IntentClassifierPrediction]:
-        message = process_text(message, self._nlp_engine)
-        intent_classifier_results: list[IntentClassifierPrediction] = []
-        language: str = self._nlp_engine.get_property(nlp.NLP_LANGUAGE)
+        if self._batcher is not None:
+            return self._batcher.predict(message)
+        return self.predict_batch([message])[0]
 
-        # We try to replace all potential entity value with the corresponding entity name
-        ner_prediction: NERPrediction = self._state.agent.nlp_engine.ner.predict(self._state, message)
-        for (ner_sentence, intents) in ner_prediction.ner_sentences.items():
-            run_full_prediction: bool = True
-            self._model.eval()
-            tokens = tokenize(message, language)
-            tokens = [self.__vocab.get(token, self.__vocab[SimpleIntentClassifierTorch.UNK]) for token in tokens]
-            tokens = tokens[:self._state.ic_config.input_max_num_tokens]
-
-            if self._state.ic_config.discard_oov_sentences and all(token == self.__vocab[SimpleIntentClassifierTorch.UNK] for token in tokens):
-                # The sentence to predict consists of only out of vocabulary tokens,
-                # so we can automatically assign a zero probability to all classes
-                prediction = np.zeros(len(self._state.intents))
-                run_full_prediction = False  # no need to go ahead with the full NN-based prediction
-            elif self._state.ic_config.check_exact_prediction_match:
-                # We check if there is an exact match with one of the training sentences
-                for i, training_sequence in enumerate(self.__total_training_sequences):
-                    intent_label = self.__total_labels[i]
-                    if np.array_equal(tokens, training_sequence) \
-                            and self.__intent_label_mapping[intent_label] in intents:
-                        run_full_prediction = False
-                        # We set to 1 the corresponding intent with full confidence and to zero all the
-                        prediction = np.zeros(len(self._state.intents))
-                        np.put(prediction, intent_label, 1.0, mode='raise')
-                        # We don't check if there is more than one intent that could be the exact match
-                        # as this would be an inconsistency in the agent definition anyway
-                        break
+    def predict_batch(self, messages: list[str]) -> list[list[IntentClassifierPrediction]]:
+        """Predict the intents of a list of messages.
 
-            if run_full_prediction:
-                tokens = tokens + [self.__vocab[SimpleIntentClassifierTorch.PAD]] * (self._state.ic_config.input_max_num_tokens - len(tokens))
-                input_tensor = torch.tensor(tokens, dtype=torch.long).unsqueeze(0)
-                with torch.no_grad():
-                    output = self._model(input_tensor)
-                    prediction = output.squeeze().tolist()
-                    if isinstance(prediction, float):
-                        prediction = [prediction]
+        All the sentences to predict (i.e., the NER sentences of all messages) that are not resolved by the
+        out-of-vocabulary or exact match checks are padded and run in a single forward pass of the model.
 
+        Args:
+            messages (list[str]): the messages to predict the intent
+
+        Returns:
+            list[list[IntentClassifierPrediction]]: the list of predictions made by the intent classifier for each
+            message, in the same order as the messages
+        """
+        language: str = self._nlp_engine.get_property(nlp.NLP_LANGUAGE)
+        max_num_tokens: int = self._state.ic_config.input_max_num_tokens
+        unk: int = self.__vocab[SimpleIntentClassifierTorch.UNK]
+        pad: int = self.__vocab[SimpleIntentClassifierTorch.PAD]
+        # (message index, NER sentence, intents, matched parameters, prediction, index in the model input batch)
+        entries: list[tuple] = []
+        model_inputs: list[list[int]] = []
+        for message_index, message in enumerate(messages):
+            message = self._nlp_engine.text_preprocessor.process_text(message)
+            # We try to replace all potential entity value with the corresponding entity name
+            ner_prediction: NERPrediction = self._state.agent.nlp_engine.ner.predict(self._state, message)
+            for (ner_sentence, intents) in ner_prediction.ner_sentences.items():
+                tokens = self._to_sequence(ner_sentence, language, memoize=True)[:max_num_tokens]
+                prediction = None
+                if self._state.ic_config.discard_oov_sentences and all(token == unk for token in tokens):
+                    # The sentence to predict consists of only out of vocabulary tokens,
+                    # so we can automatically assign a zero probability to all classes
+                    prediction = np.zeros(len(self._state.intents))
+                elif self._state.ic_config.check_exact_prediction_match:
+                    # We check if there is an exact match with one of the training sentences
+                    prediction = self._exact_match_prediction(tokens, intents)
+                batch_index = None
+                if prediction is None:
+                    # The sentence goes to the full NN-based prediction
+                    batch_index = len(model_inputs)
+                    model_inputs.append(tokens + [pad] * (max_num_tokens - len(tokens)))
+                entries.append((message_index, ner_sentence, intents, ner_prediction.intent_matched_parameters,
+                                prediction, batch_index))
+
+        outputs: list[list[float]] = []
+        if model_inputs:
+            input_tensor = torch.tensor(model_inputs, dtype=torch.long)
+            with torch.inference_mode():
+                outputs = self._model(input_tensor).tolist()
+
+        intent_classifier_results: list[list[IntentClassifierPrediction]] = [[] for _ in messages]
+        for message_index, ner_sentence, intents, intent_matched_parameters, prediction, batch_index in entries:
+            if batch_index is not None:
+                prediction = outputs[batch_index]
             for intent in intents:
                 # It is impossible to have a duplicated intent in another ner_sentence
                 intent_index = self._state.intents.index(intent)
-                intent_classifier_results.append(IntentClassifierPrediction(
+                intent_classifier_results[message_index].append(IntentClassifierPrediction(
                     intent,
                     prediction[intent_index],
                     ner_sentence,
-                    ner_prediction.intent_matched_parameters[intent]
+                    intent_matched_parameters[intent]
                 ))
-
         return intent_classifier_results
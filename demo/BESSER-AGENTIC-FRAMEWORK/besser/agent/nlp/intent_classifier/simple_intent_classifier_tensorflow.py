@@ -8,7 +8,6 @@ from besser.agent.exceptions.logger import logger
 from besser.agent.nlp.intent_classifier.intent_classifier import IntentClassifier
 from besser.agent.nlp.intent_classifier.intent_classifier_prediction import IntentClassifierPrediction
 from besser.agent.nlp.ner.ner_prediction import NERPrediction
-from besser.agent.nlp.preprocessing.text_preprocessing import process_text
 
 if TYPE_CHECKING:
     from besser.agent.core.state import State
@@ -16,6 +15,7 @@ if TYPE_CHECKING:
 
 try:
     from keras import Sequential
+    from keras.callbacks import EarlyStopping
     from keras.layers import TextVectorization, Dense, Embedding, GlobalAveragePooling1D
     from keras.losses import SparseCategoricalCrossentropy
     from keras.optimizers import Adam
@@ -99,14 +99,24 @@ class SimpleIntentClassifierTF(IntentClassifier):
             metrics=['accuracy']
         )
 
+        callbacks = []
+        if self._state.ic_config.early_stopping_patience > 0:
+            callbacks.append(EarlyStopping(
+                monitor='loss',
+                patience=self._state.ic_config.early_stopping_patience,
+                min_delta=self._state.ic_config.early_stopping_min_delta
+            ))
         history = self._model.fit(
             np.array(self.__total_training_sequences),
             np.array(self.__total_labels_training_sentences),
-            epochs=self._state.ic_config.num_epochs, verbose=0
+            epochs=self._state.ic_config.num_epochs,
+            batch_size=self._state.ic_config.batch_size,
+            callbacks=callbacks,
+            verbose=0
         )
 
     def predict(self, message: str) -> list[IntentClassifierPrediction]:
-        message = process_text(message, self._nlp_engine)
+        message = self._nlp_engine.text_preprocessor.process_text(message)
         intent_classifier_results: list[IntentClassifierPrediction] = []
 
         # We try to replace all potential entity value with the corresponding entity name
@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, AsyncIterator, Iterator
 
 from besser.agent.exceptions.logger import logger
 from besser.agent.nlp.intent_classifier.intent_classifier_prediction import IntentClassifierPrediction
@@ -91,6 +92,111 @@ class LLM(ABC):
         logger.warning(f'Chat not implemented in {self.__class__.__name__}')
         return None
 
+    async def apredict(self, message: str, parameters: dict = None, session: 'Session' = None,
+                       system_message: str = None) -> str:
+        """Make a prediction asynchronously, i.e., generate an output without blocking the caller's event loop.
+
+        LLMs requesting an external API implement it with non-blocking requests through the NLPEngine
+        :class:`~besser.agent.nlp.llm.llm_client.LLMClient`, and their :meth:`predict` waits for it. By default, it
+        runs :meth:`predict` in a worker thread.
+
+        Args:
+            message (Any): the LLM input text
+            session (Session): the ongoing session, can be None if no context needs to be applied
+            parameters (dict): the LLM parameters to use in the prediction. If none is provided, the default LLM
+                parameters will be used
+            system_message (str): system message to give high priority context to the LLM
+
+        Returns:
+            str: the LLM output
+        """
+        return await asyncio.to_thread(self.predict, message, parameters, session, system_message)
+
+    async def achat(self, session: 'Session', parameters: dict = None, system_message: str = None) -> str:
+        """Make a prediction asynchronously, providing the chat history to the LLM (see :meth:`chat`).
+
+        By default, it runs :meth:`chat` in a worker thread.
+
+        Args:
+            session (Session): the user session
+            parameters (dict): the LLM parameters. If none is provided, the RAG's default value will be used
+            system_message (str): system message to give high priority context to the LLM
+
+        Returns:
+            str: the LLM output
+        """
+        return await asyncio.to_thread(self.chat, session, parameters, system_message)
+
+    def stream(self, message: str, parameters: dict = None, session: 'Session' = None,
+               system_message: str = None) -> Iterator[str]:
+        """Make a prediction, getting the output while it is generated (e.g., token by token). The output chunks can
+        be sent to the user as soon as they are available with :meth:`~besser.agent.core.session.Session.reply_stream`.
+
+        By default, the output of :meth:`predict` is returned as a single chunk.
+
+        Args:
+            message (Any): the LLM input text
+            session (Session): the ongoing session, can be None if no context needs to be applied
+            parameters (dict): the LLM parameters to use in the prediction. If none is provided, the default LLM
+                parameters will be used
+            system_message (str): system message to give high priority context to the LLM
+
+        Returns:
+            Iterator[str]: the LLM output chunks
+        """
+        yield self.predict(message, parameters, session, system_message)
+
+    async def astream(self, message: str, parameters: dict = None, session: 'Session' = None,
+                      system_message: str = None) -> AsyncIterator[str]:
+        """Make a prediction asynchronously, getting the output while it is generated (see :meth:`stream`).
+
+        By default, the output of :meth:`apredict` is returned as a single chunk.
+
+        Args:
+            message (Any): the LLM input text
+            session (Session): the ongoing session, can be None if no context needs to be applied
+            parameters (dict): the LLM parameters to use in the prediction. If none is provided, the default LLM
+                parameters will be used
+            system_message (str): system message to give high priority context to the LLM
+
+        Returns:
+            AsyncIterator[str]: the LLM output chunks
+        """
+        yield await self.apredict(message, parameters, session, system_message)
+
+    def chat_stream(self, session: 'Session', parameters: dict = None, system_message: str = None) -> Iterator[str]:
+        """Make a prediction providing the chat history to the LLM (see :meth:`chat`), getting the output while it is
+        generated (see :meth:`stream`).
+
+        By default, the output of :meth:`chat` is returned as a single chunk.
+
+        Args:
+            session (Session): the user session
+            parameters (dict): the LLM parameters. If none is provided, the RAG's default value will be used
+            system_message (str): system message to give high priority context to the LLM
+
+        Returns:
+            Iterator[str]: the LLM output chunks
+        """
+        yield self.chat(session, parameters, system_message)
+
+    async def achat_stream(self, session: 'Session', parameters: dict = None,
+                           system_message: str = None) -> AsyncIterator[str]:
+        """Make a prediction asynchronously providing the chat history to the LLM (see :meth:`chat`), getting the
+        output while it is generated (see :meth:`stream`).
+
+        By default, the output of :meth:`achat` is returned as a single chunk.
+
+        Args:
+            session (Session): the user session
+            parameters (dict): the LLM parameters. If none is provided, the RAG's default value will be used
+            system_message (str): system message to give high priority context to the LLM
+
+        Returns:
+            AsyncIterator[str]: the LLM output chunks
+        """
+        yield await self.achat(session, parameters, system_message)
+
     def intent_classification(
             self,
             intent_classifier: 'LLMIntentClassifier',
@@ -0,0 +1,449 @@
+import asyncio
+import contextlib
+import inspect
+import json
+import random
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Coroutine, Hashable, Iterator, TypeVar
+
+import aiohttp
+
+from besser.agent.exceptions.exceptions import LLMRequestError
+from besser.agent.exceptions.logger import logger
+
+T = TypeVar('T')
+
+_END_OF_STREAM = object()
+
+
+class _StreamError:
+    """An exception raised while producing the items of a stream, forwarded to the consumer of the stream."""
+
+    def __init__(self, error: BaseException):
+        self.error: BaseException = error
+
+
+class LLMClient:
+    """The asynchronous client the LLMs of an agent use to send their requests.
+
+    The client runs its own event loop in a background thread, so LLM requests do not block the threads of the agent
+    sessions (synchronous callers just wait for their own request). All requests share:
+
+    - A pooled HTTP client (and any other provider client registered with :meth:`resource`), so connections are reused.
+    - A concurrency limit per provider. Requests exceeding it wait until a running one finishes.
+    - Retries with exponential backoff for temporary errors (:class:`~besser.agent.exceptions.exceptions.LLMRequestError`
+      with a retryable status). When a provider asks to wait (i.e., a rate limit with ``Retry-After``), all the requests to
+      that provider wait.
+    - Request coalescing (singleflight): identical requests sent while one of them is in progress are not sent again,
+      they all get the result of the first one.
+
+    Args:
+        max_connections (int): the maximum number of simultaneous connections of the pooled HTTP client
+        max_concurrency (int): the maximum number of simultaneous requests per provider
+        max_retries (int): the maximum number of retries of a request after a temporary error
+        retry_backoff (float): the base time (in seconds) to wait before retrying a request, doubled after each retry
+        timeout (float): the maximum time (in seconds) a request can take
+        coalesce (bool): whether to coalesce identical requests or not
+
+    Attributes:
+        _max_connections (int): The maximum number of simultaneous connections of the pooled HTTP client
+        _max_concurrency (int): The maximum number of simultaneous requests per provider
+        _max_retries (int): The maximum number of retries of a request after a temporary error
+        _retry_backoff (float): The base time (in seconds) to wait before retrying a request
+        _timeout (float): The maximum time (in seconds) a request can take
+        _coalesce (bool): Whether to coalesce identical requests or not
+        _loop (asyncio.AbstractEventLoop or None): The event loop running the requests, started on the first request
+        _thread (threading.Thread or None): The thread running the event loop
+        _lock (threading.Lock): Lock to start and stop the event loop from different threads
+        _resources (dict[Hashable, Any]): The shared clients living in the event loop (e.g., the pooled HTTP client)
+        _semaphores (dict[str, asyncio.Semaphore]): The concurrency limit of each provider
+        _retry_at (dict[str, float]): The (event loop) time at which each rate-limited provider can receive requests
+            again
+        _in_flight (dict[Hashable, asyncio.Task]): The requests in progress, by request key
+        _stats (dict[str, int]): The client metrics
+    """
+
+    def __init__(
+            self,
+            max_connections: int = 100,
+            max_concurrency: int = 8,
+            max_retries: int = 3,
+            retry_backoff: float = 1.0,
+            timeout: float = 120.0,
+            coalesce: bool = True
+    ):
+        self._max_connections: int = max(1, max_connections)
+        self._max_concurrency: int = max(1, max_concurrency)
+        self._max_retries: int = max(0, max_retries)
+        self._retry_backoff: float = max(0.0, retry_backoff)
+        self._timeout: float = timeout
+        self._coalesce: bool = coalesce
+        self._loop: asyncio.AbstractEventLoop or None = None
+        self._thread: threading.Thread or None = None
+        self._lock: threading.Lock = threading.Lock()
+        self._resources: dict[Hashable, Any] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._retry_at: dict[str, float] = {}
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        self._stats: dict[str, int] = {'requests': 0, 'coalesced': 0, 'retries': 0, 'errors': 0}
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """dict[str, int]: The client metrics:
+
+        - requests: number of requests received
+        - coalesced: number of requests that got the result of an identical request in progress
+        - retries: number of retries after temporary errors
+        - errors: number of failed requests
+        - in_flight: number of requests currently in progress
+        """
+        stats = dict(self._stats)
+        stats['in_flight'] = len(self._in_flight)
+        return stats
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """asyncio.AbstractEventLoop: The event loop running the requests. It is started if it is not running."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run_loop, args=(loop,), name='LLMClient', daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        """Run an event loop in the current thread until it is stopped."""
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine in the client event loop and wait for its result. This is the synchronous facade of the
+        asynchronous LLM methods (e.g., :meth:`~besser.agent.nlp.llm.llm.LLM.predict` runs
+        :meth:`~besser.agent.nlp.llm.llm.LLM.apredict`), so they can be used from the state bodies.
+
+        Args:
+            coroutine (Coroutine[Any, Any, T]): the coroutine to run
+
+        Returns:
+            T: the coroutine result
+        """
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError('LLMClient.run can not be called from the LLMClient event loop, await the coroutine '
+                               'instead')
+        future: Future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+        return future.result()
+
+    async def resource(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """Get a shared client that lives in the client event loop (e.g., the pooled HTTP client or an SDK client of a
+        provider). It is created the first time it is requested, and closed when the client stops.
+
+        Args:
+            key (Hashable): the resource key
+            factory (Callable[[], T]): the function that creates the resource. It is called within the event loop
+
+        Returns:
+            T: the resource
+        """
+        if self._resources.get(key) is None:
+            self._resources[key] = factory()
+        return self._resources[key]
+
+    async def http_session(self) -> aiohttp.ClientSession:
+        """Get the pooled HTTP client shared by all the LLMs.
+
+        Returns:
+            aiohttp.ClientSession: the HTTP client
+        """
+        return await self.resource('http_session', lambda: aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self._max_connections),
+            timeout=aiohttp.ClientTimeout(total=self._timeout)
+        ))
+
+    async def post_json(self, provider: str, url: str, payload: dict, headers: dict = None) -> Any:
+        """Send a JSON POST request with the pooled HTTP client, and get the JSON response.
+
+        Errors are raised as :class:`~besser.agent.exceptions.exceptions.LLMRequestError`, so they can be retried when
+        the request is run with :meth:`request`.
+
+        Args:
+            provider (str): the LLM provider name
+            url (str): the request URL
+            payload (dict): the request body
+            headers (dict): the request headers
+
+        Returns:
+            Any: the response body
+        """
+        session = await self.http_session()
+        try:
+            async with session.post(url, json=payload, headers=headers) as response:
+                if response.status >= 400:
+                    raise LLMRequestError(
+                        provider,
+                        await response.text(),
+                        status=response.status,
+                        retry_after=parse_retry_after(response.headers.get('Retry-After'))
+                    )
+                return await response.json(content_type=None)
+        except aiohttp.ClientError as e:
+            raise LLMRequestError(provider, str(e)) from e
+
+    async def request(self, provider: str, key: Hashable or None, call: Callable[[], Awaitable[T]]) -> T:
+        """Send a request to an LLM provider, within the provider concurrency limit and with retries.
+
+        If it is called from another event loop, the request is still run (and awaited) in the client event loop.
+
+        Args:
+            provider (str): the LLM provider name
+            key (Hashable or None): the request key. Requests with the same key (e.g., the same LLM, parameters and
+                prompt) sent while one of them is in progress are coalesced. If None, the request is not coalesced
+            call (Callable[[], Awaitable[T]]): the function sending the request. It is called once per attempt
+
+        Returns:
+            T: the request result
+        """
+        loop = self.loop
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is not loop:
+            return await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(self.request(provider, key, call), loop)
+            )
+        self._stats['requests'] += 1
+        if key is None or not self._coalesce:
+            return await self._send(provider, call)
+        key = (provider, key)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = loop.create_task(self._send(provider, call))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._request_done(key, t))
+        else:
+            self._stats['coalesced'] += 1
+        # A cancelled caller does not cancel the request, since other callers may be waiting for it
+        return await asyncio.shield(task)
+
+    def _request_done(self, key: Hashable, task: asyncio.Task) -> None:
+        """Remove a finished request from the requests in progress."""
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            # Retrieve the exception, so it is not reported as unhandled if all the callers were cancelled
+            task.exception()
+
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        """Get the concurrency limit of a provider."""
+        return self._semaphores.setdefault(provider, asyncio.Semaphore(self._max_concurrency))
+
+    async def _send(self, provider: str, call: Callable[[], Awaitable[T]], limited: bool = True) -> T:
+        """Send a request, within the provider concurrency limit and with retries (see :meth:`request`).
+
+        Args:
+            provider (str): the LLM provider name
+            call (Callable[[], Awaitable[T]]): the function sending the request
+            limited (bool): whether each attempt must take a slot of the provider concurrency limit (False if the
+                caller already has one)
+
+        Returns:
+            T: the request result
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(provider) if limited else contextlib.nullcontext()
+        attempt = 0
+        while True:
+            delay = self._retry_at.get(provider, 0) - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(call(), self._timeout)
+                except asyncio.TimeoutError:
+                    error = LLMRequestError(provider, f'no response after {self._timeout} seconds')
+                except LLMRequestError as e:
+                    error = e
+                except Exception:
+                    self._stats['errors'] += 1
+                    raise
+            if not error.retryable or attempt >= self._max_retries:
+                self._stats['errors'] += 1
+                raise error
+            if error.retry_after is not None:
+                delay = error.retry_after
+                # The provider is rate limiting us: the other requests to it must wait as well
+                self._retry_at[provider] = max(self._retry_at.get(provider, 0), loop.time() + delay)
+            else:
+                delay = self._retry_backoff * 2 ** attempt + random.uniform(0, self._retry_backoff)
+            attempt += 1
+            self._stats['retries'] += 1
+            logger.warning(f'{error}. Retrying in {delay:.1f} seconds ({attempt}/{self._max_retries})')
+            await asyncio.sleep(delay)
+
+    async def stream(self, provider: str, call: Callable[[], Awaitable[AsyncIterable[T]]]) -> AsyncIterator[T]:
+        """Send a streaming request to an LLM provider (e.g., a completion returned token by token), and iterate over
+        its items.
+
+        The request takes a slot of the provider concurrency limit until the stream ends. It is retried if it fails
+        before the stream is open, and it is never coalesced. It must be iterated within the client event loop (see
+        :meth:`iterate` and :meth:`aiterate`).
+
+        Args:
+            provider (str): the LLM provider name
+            call (Callable[[], Awaitable[AsyncIterable[T]]]): the function sending the request and returning the stream
+
+        Returns:
+            AsyncIterator[T]: the stream items
+        """
+        self._stats['requests'] += 1
+        async with self._semaphore(provider):
+            stream = await self._send(provider, call, limited=False)
+            try:
+                async for item in stream:
+                    yield item
+            finally:
+                close = getattr(stream, 'aclose', None) or getattr(stream, 'close', None)
+                if close is not None and inspect.iscoroutinefunction(close):
+                    await close()
+
+    @staticmethod
+    async def _forward(items: AsyncIterable[T], put: Callable[[Any], None]) -> None:
+        """Iterate over an asynchronous iterable, passing its items (and its end or error) to a consumer."""
+        try:
+            async for item in items:
+                put(item)
+        except Exception as e:
+            put(_StreamError(e))
+        else:
+            put(_END_OF_STREAM)
+
+    def iterate(self, items: AsyncIterable[T]) -> Iterator[T]:
+        """Iterate synchronously over an asynchronous iterable (e.g., an LLM stream), which runs in the client event
+        loop. This is the synchronous facade of the LLM streaming methods (e.g.,
+        :meth:`~besser.agent.nlp.llm.llm.LLM.stream`).
+
+        If the iteration stops before the end, the asynchronous iteration is cancelled.
+
+        Args:
+            items (AsyncIterable[T]): the asynchronous iterable
+
+        Returns:
+            Iterator[T]: the items, as soon as they are available
+        """
+        loop = self.loop
+        if threading.current_thread() is self._thread:
+            raise RuntimeError('LLMClient.iterate can not be called from the LLMClient event loop, use async for '
+                               'instead')
+        buffer: queue.Queue = queue.Queue()
+        future: Future = asyncio.run_coroutine_threadsafe(self._forward(items, buffer.put), loop)
+        try:
+            while True:
+                item = buffer.get()
+                if item is _END_OF_STREAM:
+                    return
+                if isinstance(item, _StreamError):
+                    raise item.error
+                yield item
+        finally:
+            future.cancel()
+
+    async def aiterate(self, items: AsyncIterable[T]) -> AsyncIterator[T]:
+        """Iterate over an asynchronous iterable (e.g., an LLM stream) from any event loop. The iterable runs in the
+        client event loop.
+
+        Args:
+            items (AsyncIterable[T]): the asynchronous iterable
+
+        Returns:
+            AsyncIterator[T]: the items, as soon as they are available
+        """
+        loop = self.loop
+        running_loop = asyncio.get_running_loop()
+        if running_loop is loop:
+            async for item in items:
+                yield item
+            return
+        buffer: asyncio.Queue = asyncio.Queue()
+        future: Future = asyncio.run_coroutine_threadsafe(
+            self._forward(items, lambda item: running_loop.call_soon_threadsafe(buffer.put_nowait, item)),
+            loop
+        )
+        try:
+            while True:
+                item = await buffer.get()
+                if item is _END_OF_STREAM:
+                    return
+                if isinstance(item, _StreamError):
+                    raise item.error
+                yield item
+        finally:
+            future.cancel()
+
+    async def _close_resources(self) -> None:
+        """Close the shared clients."""
+        for key, resource in self._resources.items():
+            close = getattr(resource, 'close', None)
+            try:
+                if close is not None and inspect.iscoroutinefunction(close):
+                    await close()
+                elif close is not None:
+                    close()
+            except Exception as e:
+                logger.error(f'Error closing the LLMClient resource {key}: {e}')
+        self._resources.clear()
+
+    def stop(self) -> None:
+        """Stop the client: close the shared clients and stop the event loop. It is started again if a new request
+        is sent."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_resources(), loop).result(timeout=5)
+        except Exception as e:
+            logger.error(f'Error stopping the LLMClient: {e}')
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        self._semaphores.clear()
+        self._retry_at.clear()
+        self._in_flight.clear()
+
+
+def parse_retry_after(value: str or None) -> float or None:
+    """Parse the value of a ``Retry-After`` HTTP header.
+
+    Args:
+        value (str or None): the header value (only the delay-seconds format is supported)
+
+    Returns:
+        float or None: the time (in seconds) to wait, or None if the header is missing or invalid
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def request_key(*parts: Any) -> str:
+    """Create the key of an LLM request, used to coalesce identical requests.
+
+    Args:
+        *parts (Any): the request elements (e.g., the LLM name, its parameters and the prompt messages)
+
+    Returns:
+        str: the request key
+    """
+    return json.dumps(parts, sort_keys=True, default=str)
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import requests
 from typing import TYPE_CHECKING
 
 from besser.agent import nlp
 from besser.agent.exceptions.logger import logger
 from besser.agent.nlp.intent_classifier.intent_classifier_prediction import IntentClassifierPrediction
 from besser.agent.nlp.llm.llm import LLM
+from besser.agent.nlp.llm.llm_client import request_key
 from besser.agent.nlp.utils import find_json
 
 if TYPE_CHECKING:
@@ -28,6 +28,9 @@ class LLMHuggingFaceAPI(LLM):
     ``text2text-generation`` tasks (`more info <https://huggingface.co/tasks/text-generation>`_), but there could be
     exceptions for other tasks (which have not been tested in this class).
 
+    Requests are sent asynchronously through the NLPEngine :class:`~besser.agent.nlp.llm.llm_client.LLMClient`, which
+    handles the pooled HTTP connections, concurrency limits, retries and coalescing of identical requests.
+
     Args:
         agent (Agent): the agent the LLM belongs to
         name (str): the LLM name
@@ -46,6 +49,8 @@ class LLMHuggingFaceAPI(LLM):
         _user_context (dict): user specific context to be provided to the LLM for each request
     """
 
+    provider: str = 'huggingface'
+
     def __init__(self, agent: 'Agent', name: str, parameters: dict, num_previous_messages: int = 1,
                  global_context: str = None):
         super().__init__(agent, name, parameters, global_context=global_context)
@@ -71,7 +76,22 @@ class LLMHuggingFaceAPI(LLM):
         pass
 
     def predict(self, message: str, parameters: dict = None, session: 'Session' = None, system_message: str = None) -> str:
-        """Make a prediction, i.e., generate an output.
+        """Make a prediction, i.e., generate an output. It waits for the result of :meth:`apredict`.
+
+        Args:
+            message (Any): the LLM input text
+            parameters (dict): the LLM parameters to use in the prediction. If none is provided, the default LLM
+                parameters will be used
+            system_message (str): system message to give high priority context to the LLM
+
+        Returns:
+            str: the LLM output
+        """
+        return self._nlp_engine.llm_client.run(self.apredict(message, parameters, session, system_message))
+
+    async def apredict(self, message: str, parameters: dict = None, session: 'Session' = None,
+                       system_message: str = None) -> str:
+        """Make a prediction asynchronously, i.e., generate an output.
 
         Runs the `Text Generation Inference API task
         <https://huggingface.co/docs/api-inference/detailed_parameters#text-generation-task>`_
@@ -102,8 +122,12 @@ class LLMHuggingFaceAPI(LLM):
         if context_messages != "":
             message = context_messages + message
         payload = {"inputs": message, "parameters": parameters}
-        response = requests.post(api_url, headers=headers, json=payload)
-        return response.json()[0]['generated_text']
+
+        async def call() -> str:
+            response = await self._nlp_engine.llm_client.post_json(self.provider, api_url, payload, headers=headers)
+            return response[0]['generated_text']
+
+        return await self._nlp_engine.llm_client.request(self.provider, request_key(api_url, payload), call)
 
     def intent_classification(
             self,
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Iterator
+
+from besser.agent.core.message import MessageType, Message
+from besser.agent.exceptions.exceptions import LLMRequestError
+from besser.agent.nlp.llm.llm import LLM
+from besser.agent.nlp.llm.llm_client import request_key
+
+if TYPE_CHECKING:
+    from besser.agent.core.agent import Agent
+    from besser.agent.core.session import Session
+
+
+class LLMMock(LLM):
+    """A local LLM that simulates an LLM provider API, for tests and benchmarks.
+
+    It does not generate text: it returns predefined answers after a simulated latency. Requests go through the NLPEngine
+    :class:`~besser.agent.nlp.llm.llm_client.LLMClient` like the requests of any other LLM provider, so its concurrency
+    limits, retries and request coalescing can be tested without network access.
+
+    Args:
+        agent (Agent): the agent the LLM belongs to
+        name (str): the LLM name
+        parameters (dict): the LLM parameters
+        answer (Callable[[str], str] or str): the answer to every prompt, or a function that generates the answer of a
+            prompt. By default, the answer repeats the prompt
+        latency (float): the time (in seconds) every request takes
+        token_latency (float): in streaming requests, the time (in seconds) it takes to generate each word of the answer
+        failures (int): the number of requests that fail (rate limited) before the mock starts to answer
+        num_previous_messages (int): for the chat functionality, the number of previous messages of the conversation
+            to add to the prompt context (must be > 0)
+        global_context (str): the global context to be provided to the LLM for each request
+
+    Attributes:
+        _nlp_engine (NLPEngine): the NLPEngine that handles the NLP processes of the agent the LLM belongs to
+        name (str): the LLM name
+        parameters (dict): the LLM parameters
+        answer (Callable[[str], str] or str): the answer to every prompt, or a function that generates the answer of a
+            prompt
+        latency (float): the time (in seconds) every request takes
+        token_latency (float): in streaming requests, the time (in seconds) it takes to generate each word of the answer
+        failures (int): the number of requests that will fail (rate limited) before the mock starts to answer
+        num_previous_messages (int): for the chat functionality, the number of previous messages of the conversation
+            to add to the prompt context (must be > 0)
+        num_requests (int): the number of requests the mock has received (i.e., that reached the simulated provider)
+        _global_context (str): the global context to be provided to the LLM for each request
+        _user_context (dict): user specific context to be provided to the LLM for each request
+    """
+
+    provider: str = 'mock'
+
+    def __init__(
+            self,
+            agent: 'Agent',
+            name: str = 'mock',
+            parameters: dict = None,
+            answer: Callable[[str], str] or str = None,
+            latency: float = 0.0,
+            token_latency: float = 0.0,
+            failures: int = 0,
+            num_previous_messages: int = 1,
+            global_context: str = None
+    ):
+        super().__init__(agent, name, parameters or {}, global_context=global_context)
+        self.answer: Callable[[str], str] or str = answer
+        self.latency: float = latency
+        self.token_latency: float = token_latency
+        self.failures: int = failures
+        self.num_previous_messages: int = num_previous_messages
+        self.num_requests: int = 0
+
+    def initialize(self) -> None:
+        pass
+
+    def _prompt(self, message: str, session: 'Session' = None, system_message: str = None) -> str:
+        """Get the prompt of a request, i.e., the message preceded by the contexts."""
+        context_messages = ""
+        if self._global_context:
+            context_messages = f"{self._global_context}\n"
+        if session and session.id in self._user_context:
+            context_messages = context_messages + f"{self._user_context[session.id]}\n"
+        if system_message:
+            context_messages = context_messages + f"{system_message}\n"
+        return context_messages + message
+
+    async def _answer(self, prompt: str) -> str:
+        """Simulate the provider answer to a prompt."""
+        self.num_requests += 1
+        await asyncio.sleep(self.latency)
+        if self.failures > 0:
+            self.failures -= 1
+            raise LLMRequestError(self.provider, 'rate limit reached', status=429, retry_after=0)
+        if self.answer is None:
+            return prompt
+        if callable(self.answer):
+            return self.answer(prompt)
+        return self.answer
+
+    async def _request(self, prompt: str, parameters: dict) -> str:
+        """Send a request to the simulated provider.
+
+        Args:
+            prompt (str): the prompt
+            parameters (dict): the LLM parameters
+
+        Returns:
+            str: the LLM output
+        """
+        return await self._nlp_engine.llm_client.request(
+            self.provider, request_key(self.name, prompt, parameters), lambda: self._answer(prompt)
+        )
+
+    async def _stream(self, prompt: str) -> AsyncIterator[str]:
+        """Send a streaming request to the simulated provider. It must be iterated within the LLM client event loop.
+
+        Args:
+            prompt (str): the prompt
+
+        Returns:
+            AsyncIterator[str]: the LLM output, word by word
+        """
+        async def words(answer: str) -> AsyncIterator[str]:
+            for word in re.findall(r'\s*\S+|\s+', answer):
+                await asyncio.sleep(self.token_latency)
+                yield word
+
+        async def call() -> AsyncIterator[str]:
+            return words(await self._answer(prompt))
+
+        async for word in self._nlp_engine.llm_client.stream(self.provider, call):
+            yield word
+
+    def predict(self, message: str, parameters: dict = None, session: 'Session' = None, system_message: str = None) -> str:
+        return self._nlp_engine.llm_client.run(self.apredict(message, parameters, session, system_message))
+
+    async def apredict(self, message: str, parameters: dict = None, session: 'Session' = None,
+                       system_message: str = None) -> str:
+        return await self._request(self._prompt(message, session, system_message), parameters or self.parameters)
+
+    def chat(self, session: 'Session', parameters: dict = None, system_message: str = None) -> str:
+        return self._nlp_engine.llm_client.run(self.achat(session, parameters, system_message))
+
+    async def achat(self, session: 'Session', parameters: dict = None, system_message: str = None) -> str:
+        if self.num_previous_messages <= 0:
+            raise ValueError('The number of previous messages to send to the LLM must be > 0')
+        chat_history: list[Message] = await asyncio.to_thread(session.get_chat_history, n=self.num_previous_messages)
+        message = '\n'.join(
+            f"{'User' if message.is_user else 'Assistant'}: {message.content}"
+            for message in chat_history
+            if message.type in [MessageType.STR, MessageType.LOCATION, MessageType.JSON]
+        )
+        return await self._request(self._prompt(message, session, system_message), parameters or self.parameters)
+
+    def stream(self, message: str, parameters: dict = None, session: 'Session' = None,
+               system_message: str = None) -> Iterator[str]:
+        return self._nlp_engine.llm_client.iterate(self.astream(message, parameters, session, system_message))
+
+    async def astream(self, message: str, parameters: dict = None, session: 'Session' = None,
+                      system_message: str = None) -> AsyncIterator[str]:
+        prompt = self._prompt(message, session, system_message)
+        async for word in self._nlp_engine.llm_client.aiterate(self._stream(prompt)):
+            yield word
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, AsyncIterator, Iterator
 
 from besser.agent import nlp
 from besser.agent.core.message import MessageType, Message
+from besser.agent.exceptions.exceptions import LLMRequestError
 from besser.agent.exceptions.logger import logger
 from besser.agent.nlp.intent_classifier.intent_classifier_prediction import IntentClassifierPrediction
 from besser.agent.nlp.llm.llm import LLM
+from besser.agent.nlp.llm.llm_client import parse_retry_after, request_key
 
 if TYPE_CHECKING:
     from besser.agent.core.agent import Agent
@@ -15,7 +18,7 @@ if TYPE_CHECKING:
     from besser.agent.nlp.intent_classifier.llm_intent_classifier import LLMIntentClassifier
 
 try:
-    from openai import OpenAI
+    from openai import APIConnectionError, APIStatusError, AsyncOpenAI, OpenAI
 except ImportError:
     logger.warning("openai dependencies in LLMOpenAI could not be imported. You can install them from the "
                    "requirements/requirements-llm.txt file")
@@ -24,6 +27,9 @@ except ImportError:
 class LLMOpenAI(LLM):
     """An LLM wrapper for OpenAI's LLMs through its API.
 
+    Requests are sent asynchronously through the NLPEngine :class:`~besser.agent.nlp.llm.llm_client.LLMClient`, which
+    handles the concurrency limits, retries and coalescing of identical requests.
+
     Args:
         agent (Agent): the agent the LLM belongs to
         name (str): the LLM name
@@ -42,8 +48,11 @@ class LLMOpenAI(LLM):
             :class:`~besser.agent.db.monitoring_db.MonitoringDB`.
         _global_context (str): the global context to be provided to the LLM for each request
         _user_context (dict): user specific context to be provided to the LLM for each request
+        client (OpenAI): the synchronous OpenAI client
     """
 
+    provider: str = 'openai'
+
     def __init__(self, agent: 'Agent', name: str, parameters: dict, num_previous_messages: int = 1,
                  global_context: str = None):
         super().__init__(agent, name, parameters, global_context=global_context)
@@ -69,48 +78,140 @@ class LLMOpenAI(LLM):
     def initialize(self) -> None:
         self.client = OpenAI(api_key=self._nlp_engine.get_property(nlp.OPENAI_API_KEY))
 
-    def predict(self, message: str, parameters: dict = None, session: 'Session' = None, system_message: str = None) -> str:
-        messages = []
+    async def _async_client(self) -> AsyncOpenAI:
+        """Get the asynchronous OpenAI client, shared by all the LLMOpenAI of the agent with the same API key."""
+        api_key = self._nlp_engine.get_property(nlp.OPENAI_API_KEY)
+        # Retries are handled by the LLMClient
+        return await self._nlp_engine.llm_client.resource(
+            (self.provider, api_key),
+            lambda: AsyncOpenAI(api_key=api_key, max_retries=0)
+        )
+
+    async def _create_completion(self, messages: list[dict], parameters: dict, coalesce: bool = True, **kwargs) -> str:
+        """Send a chat completion request to the OpenAI API.
+
+        Args:
+            messages (list[dict]): the prompt messages
+            parameters (dict): the LLM parameters
+            coalesce (bool): whether the request can be coalesced with identical requests in progress
+            **kwargs: other arguments of the request (e.g., the response format)
+
+        Returns:
+            str: the content of the LLM answer
+        """
+        async def call() -> str:
+            client = await self._async_client()
+            try:
+                response = await client.chat.completions.create(
+                    model=self.name,
+                    messages=messages,
+                    **kwargs,
+                    **parameters,
+                )
+            except (APIStatusError, APIConnectionError) as e:
+                raise self._request_error(e) from e
+            return response.choices[0].message.content
+
+        key = request_key(self.name, messages, parameters, kwargs) if coalesce else None
+        return await self._nlp_engine.llm_client.request(self.provider, key, call)
+
+    async def _stream_completion(self, messages: list[dict], parameters: dict) -> AsyncIterator[str]:
+        """Send a streaming chat completion request to the OpenAI API. It must be iterated within the LLM client
+        event loop.
+
+        Args:
+            messages (list[dict]): the prompt messages
+            parameters (dict): the LLM parameters
+
+        Returns:
+            AsyncIterator[str]: the content of the LLM answer, chunk by chunk
+        """
+        async def call():
+            client = await self._async_client()
+            try:
+                return await client.chat.completions.create(
+                    model=self.name,
+                    messages=messages,
+                    stream=True,
+                    **parameters,
+                )
+            except (APIStatusError, APIConnectionError) as e:
+                raise self._request_error(e) from e
+
+        async for chunk in self._nlp_engine.llm_client.stream(self.provider, call):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def _request_error(self, error: APIStatusError or APIConnectionError) -> LLMRequestError:
+        """Convert an OpenAI API error into an LLMRequestError, so the LLM client can retry the request."""
+        if isinstance(error, APIStatusError):
+            return LLMRequestError(self.provider, error.message, status=error.status_code,
+                                   retry_after=parse_retry_after(error.response.headers.get('retry-after')))
+        return LLMRequestError(self.provider, error.message)
+
+    def _context_messages(self, session: 'Session' = None, system_message: str = None) -> list[dict]:
+        """Get the system messages with the global, user-specific and request-specific contexts."""
+        context_messages = []
         if self._global_context:
-            messages.append({"role": "system", "content": self._global_context})
+            context_messages.append({"role": "system", "content": self._global_context})
         if session and session.id in self._user_context:
-            messages.append({"role": "system", "content": self._user_context[session.id]})
+            context_messages.append({"role": "system", "content": self._user_context[session.id]})
         if system_message:
-            messages.append({"role": "system", "content": system_message})
-        messages.append({"role": "user", "content": message})
-        if not parameters:
-            parameters = self.parameters
-        response = self.client.chat.completions.create(
-            model=self.name,
-            messages=messages,
-            **parameters,
-        )
-        return response.choices[0].message.content
+            context_messages.append({"role": "system", "content": system_message})
+        return context_messages
 
-    def chat(self, session: 'Session', parameters: dict = None, system_message: str = None) -> str:
-        if not parameters:
-            parameters = self.parameters
+    async def _chat_messages(self, session: 'Session', system_message: str = None) -> list[dict]:
+        """Get the prompt messages of a chat request: the contexts and the chat history of the session."""
         if self.num_previous_messages <= 0:
             raise ValueError('The number of previous messages to send to the LLM must be > 0')
-        chat_history: list[Message] = session.get_chat_history(n=self.num_previous_messages)
+        # The chat history is read from the database, so it must not block the event loop
+        chat_history: list[Message] = await asyncio.to_thread(session.get_chat_history, n=self.num_previous_messages)
         messages = [
             {'role': 'user' if message.is_user else 'assistant', 'content': message.content}
             for message in chat_history
             if message.type in [MessageType.STR, MessageType.LOCATION, MessageType.JSON]
         ]
-        context_messages = []
-        if self._global_context:
-            context_messages.append({"role": "system", "content": self._global_context})
-        if session and session.id in self._user_context:
-            context_messages.append({"role": "system", "content": self._user_context[session.id]})
-        if system_message:
-            context_messages.append({"role": "system", "content": system_message})
-        response = self.client.chat.completions.create(
-            model=self.name,
-            messages=context_messages + messages,
-            **parameters,
-        )
-        return response.choices[0].message.content
+        return self._context_messages(session, system_message) + messages
+
+    def predict(self, message: str, parameters: dict = None, session: 'Session' = None, system_message: str = None) -> str:
+        return self._nlp_engine.llm_client.run(self.apredict(message, parameters, session, system_message))
+
+    async def apredict(self, message: str, parameters: dict = None, session: 'Session' = None,
+                       system_message: str = None) -> str:
+        messages = self._context_messages(session, system_message)
+        messages.append({"role": "user", "content": message})
+        return await self._create_completion(messages, parameters or self.parameters)
+
+    def stream(self, message: str, parameters: dict = None, session: 'Session' = None,
+               system_message: str = None) -> Iterator[str]:
+        return self._nlp_engine.llm_client.iterate(self.astream(message, parameters, session, system_message))
+
+    async def astream(self, message: str, parameters: dict = None, session: 'Session' = None,
+                      system_message: str = None) -> AsyncIterator[str]:
+        messages = self._context_messages(session, system_message)
+        messages.append({"role": "user", "content": message})
+        async for chunk in self._nlp_engine.llm_client.aiterate(
+                self._stream_completion(messages, parameters or self.parameters)
+        ):
+            yield chunk
+
+    def chat(self, session: 'Session', parameters: dict = None, system_message: str = None) -> str:
+        return self._nlp_engine.llm_client.run(self.achat(session, parameters, system_message))
+
+    async def achat(self, session: 'Session', parameters: dict = None, system_message: str = None) -> str:
+        messages = await self._chat_messages(session, system_message)
+        return await self._create_completion(messages, parameters or self.parameters)
+
+    def chat_stream(self, session: 'Session', parameters: dict = None, system_message: str = None) -> Iterator[str]:
+        return self._nlp_engine.llm_client.iterate(self.achat_stream(session, parameters, system_message))
+
+    async def achat_stream(self, session: 'Session', parameters: dict = None,
+                           system_message: str = None) -> AsyncIterator[str]:
+        messages = await self._chat_messages(session, system_message)
+        async for chunk in self._nlp_engine.llm_client.aiterate(
+                self._stream_completion(messages, parameters or self.parameters)
+        ):
+            yield chunk
 
     def intent_classification(
             self,
@@ -120,15 +221,14 @@ class LLMOpenAI(LLM):
     ) -> list[IntentClassifierPrediction]:
         if not parameters:
             parameters = self.parameters
-        response = self.client.chat.completions.create(
-            model=self.name,
+        answer = self._nlp_engine.llm_client.run(self._create_completion(
             messages=[
                 {"role": "user", "content": message}
             ],
-            response_format={"type": "json_object"},
-            **parameters
-        )
-        response_json = json.loads(response.choices[0].message.content)
+            parameters=parameters,
+            response_format={"type": "json_object"}
+        ))
+        response_json = json.loads(answer)
         return intent_classifier.default_json_to_intent_classifier_predictions(
             message=message,
             response_json=response_json
@@ -7,6 +7,7 @@ from besser.agent import nlp
 from besser.agent.exceptions.logger import logger
 from besser.agent.nlp.intent_classifier.intent_classifier_prediction import IntentClassifierPrediction
 from besser.agent.nlp.llm.llm import LLM
+from besser.agent.nlp.llm.llm_client import request_key
 from besser.agent.nlp.utils import find_json
 
 if TYPE_CHECKING:
@@ -24,6 +25,9 @@ except ImportError:
 class LLMReplicate(LLM):
     """An LLM wrapper for Replicate's LLMs through its API.
 
+    Requests are sent asynchronously through the NLPEngine :class:`~besser.agent.nlp.llm.llm_client.LLMClient`, which
+    handles the concurrency limits and coalescing of identical requests.
+
     Args:
         agent (Agent): the agent the LLM belongs to
         name (str): the LLM name
@@ -42,6 +46,8 @@ class LLMReplicate(LLM):
         _user_context (dict): user specific context to be provided to the LLM for each request
     """
 
+    provider: str = 'replicate'
+
     def __init__(self, agent: 'Agent', name: str, parameters: dict, num_previous_messages: int = 1,
                  global_context: str = None):
         super().__init__(agent, name, parameters, global_context=global_context)
@@ -67,7 +73,32 @@ class LLMReplicate(LLM):
         if 'REPLICATE_API_TOKEN' not in os.environ:
             os.environ['REPLICATE_API_TOKEN'] = self._nlp_engine.get_property(nlp.REPLICATE_API_KEY)
 
+    async def _run(self, parameters: dict) -> str:
+        """Run the model in Replicate.
+
+        Args:
+            parameters (dict): the model input, including the prompt
+
+        Returns:
+            str: the LLM output
+        """
+        async def call() -> str:
+            client = await self._nlp_engine.llm_client.resource(
+                (self.provider, os.environ.get('REPLICATE_API_TOKEN')),
+                lambda: replicate.Client(api_token=os.environ.get('REPLICATE_API_TOKEN'))
+            )
+            answer = await client.async_run(self.name, input=parameters)
+            if hasattr(answer, '__aiter__'):
+                return ''.join([token async for token in answer])
+            return ''.join(answer)
+
+        return await self._nlp_engine.llm_client.request(self.provider, request_key(self.name, parameters), call)
+
     def predict(self, message: str, parameters: dict = None, session: 'Session' = None, system_message: str = None) -> str:
+        return self._nlp_engine.llm_client.run(self.apredict(message, parameters, session, system_message))
+
+    async def apredict(self, message: str, parameters: dict = None, session: 'Session' = None,
+                       system_message: str = None) -> str:
         if not parameters:
             parameters = self.parameters.copy()
         else:
@@ -82,12 +113,7 @@ class LLMReplicate(LLM):
         if context_messages != "":
             message = context_messages + message
         parameters['prompt'] = message
-        answer = replicate.run(
-            self.name,
-            input=parameters,
-        )
-        answer = ''.join(answer)
-        return answer
+        return await self._run(parameters)
 
     def intent_classification(
             self,
@@ -100,11 +126,7 @@ class LLMReplicate(LLM):
         else:
             parameters = parameters.copy()
         parameters['prompt'] = message
-        answer = replicate.run(
-            self.name,
-            input=parameters,
-        )
-        answer = ''.join(answer)
+        answer = self._nlp_engine.llm_client.run(self._run(parameters))
         response_json = find_json(answer)
         return intent_classifier.default_json_to_intent_classifier_predictions(
             message=message,
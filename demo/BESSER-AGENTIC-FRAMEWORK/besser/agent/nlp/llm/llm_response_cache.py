@@ -0,0 +1,368 @@
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+import numpy as np
+
+from besser.agent.exceptions.logger import logger
+
+ResponseCacheKey = tuple[str, str, str]
+"""The key of a cached response: the LLM name, the hash of the system prompt and the normalized prompt."""
+
+
+def normalize_prompt(prompt: str, ignore_case: bool = False) -> str:
+    """Normalize a prompt to be used as a response cache key.
+
+    Leading, trailing and repeated whitespaces are removed. The letter case is kept unless ``ignore_case`` is true,
+    since the response may depend on it (e.g., the parameter values extracted by an LLM-based intent classifier).
+
+    Args:
+        prompt (str): the prompt
+        ignore_case (bool): whether to ignore the letter case
+
+    Returns:
+        str: the normalized prompt
+    """
+    prompt = ' '.join(prompt.split())
+    return prompt.lower() if ignore_case else prompt
+
+
+def hash_system_prompt(system_prompt: str or None) -> str:
+    """Hash a system prompt (i.e., everything but the prompt that determines the LLM response, like the instructions or
+    the context) to be used as a response cache key.
+
+    Args:
+        system_prompt (str or None): the system prompt
+
+    Returns:
+        str: the system prompt hash
+    """
+    return hashlib.sha256((system_prompt or '').encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """A LRU cache of LLM responses with expiration time.
+
+    The NLPEngine stores here the LLM responses of the RAG, the LLM-based intent classifiers and the user adaptation
+    processor, so a prompt that has already been answered is not sent to the LLM again (e.g., the usual questions of a
+    FAQ agent).
+
+    Responses are looked up by LLM name, system prompt and normalized prompt (see :func:`normalize_prompt`). If an
+    embedding function is set, a prompt with the same LLM name and system prompt whose embedding is similar enough
+    (cosine similarity) to the embedding of the requested prompt is also a hit.
+
+    If a path is provided, the responses are also stored in a SQLite database, so they are kept after the agent is
+    restarted.
+
+    Args:
+        max_size (int): the maximum number of responses in the cache. The least recently used responses are evicted
+            when it is full. If it is 0, the cache is disabled
+        ttl (float or None): the time (in seconds) a response is kept in the cache. If None, responses do not expire
+        path (str or None): the path of the SQLite database file where the responses are stored. If None, the responses
+            are only kept in memory
+        embedding_function (Callable[[str], list[float]] or None): the function that computes the embedding of a
+            prompt, for the similarity lookup. If None, only the exact prompts are looked up
+        similarity_threshold (float): the minimum cosine similarity between the embeddings of 2 prompts to consider
+            that they are the same prompt
+
+    Attributes:
+        embedding_function (Callable[[str], list[float]] or None): The function that computes the embedding of a
+            prompt, for the similarity lookup. If None, only the exact prompts are looked up
+        similarity_threshold (float): The minimum cosine similarity between the embeddings of 2 prompts to consider
+            that they are the same prompt
+        _max_size (int): The maximum number of responses in the cache
+        _ttl (float or None): The time (in seconds) a response is kept in the cache
+        _path (str or None): The path of the SQLite database file where the responses are stored
+        _entries (OrderedDict[ResponseCacheKey, tuple[float, Any, numpy.ndarray or None]]): The cached responses, with
+            their insertion time (as a timestamp) and the normalized embedding of their prompt, from the least to the
+            most recently used
+        _embeddings (OrderedDict[ResponseCacheKey, numpy.ndarray]): The embeddings computed in the last lookups that
+            were a miss, so they are not computed again when the response is stored
+        _connection (sqlite3.Connection or None): The connection to the SQLite database, opened when it is needed
+        _lock (threading.Lock): Lock to access the cache from different threads
+        _stats (dict[str, int]): The cache metrics
+    """
+
+    def __init__(
+            self,
+            max_size: int,
+            ttl: float or None = None,
+            path: str or None = None,
+            embedding_function: Callable[[str], list[float]] or None = None,
+            similarity_threshold: float = 0.95
+    ):
+        self.embedding_function: Callable[[str], list[float]] or None = embedding_function
+        self.similarity_threshold: float = similarity_threshold
+        self._max_size: int = max(0, max_size)
+        self._ttl: float or None = ttl
+        self._path: str or None = path
+        self._entries: OrderedDict[ResponseCacheKey, tuple[float, Any, np.ndarray or None]] = OrderedDict()
+        self._embeddings: OrderedDict[ResponseCacheKey, np.ndarray] = OrderedDict()
+        self._connection: sqlite3.Connection or None = None
+        self._lock: threading.Lock = threading.Lock()
+        self._stats: dict[str, int] = {'hits': 0, 'semantic_hits': 0, 'misses': 0, 'evictions': 0}
+        if self.enabled and path:
+            self._load()
+
+    @property
+    def enabled(self):
+        """bool: Whether the cache is enabled or not."""
+        return self._max_size > 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """dict[str, int]: The cache metrics:
+
+        - hits: number of responses found in the cache (including the semantic hits)
+        - semantic_hits: number of responses found in the cache for a similar prompt (not the same one)
+        - misses: number of responses not found in the cache
+        - evictions: number of responses removed because the cache was full or they expired
+        - size: number of responses currently in the cache
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        return stats
+
+    @staticmethod
+    def key(llm_name: str, prompt: str, system_prompt: str = None, ignore_case: bool = False) -> ResponseCacheKey:
+        """Get the cache key of a response.
+
+        Args:
+            llm_name (str): the name of the LLM that generates the response
+            prompt (str): the prompt
+            system_prompt (str): everything else that determines the response (e.g., the instructions or the context)
+            ignore_case (bool): whether to ignore the letter case of the prompt (see :func:`normalize_prompt`)
+
+        Returns:
+            ResponseCacheKey: the response key
+        """
+        return llm_name, hash_system_prompt(system_prompt), normalize_prompt(prompt, ignore_case)
+
+    def get(
+            self,
+            llm_name: str,
+            prompt: str,
+            system_prompt: str = None,
+            semantic: bool = True,
+            ignore_case: bool = False
+    ) -> Any or None:
+        """Get a response from the cache.
+
+        Args:
+            llm_name (str): the name of the LLM that generates the response
+            prompt (str): the prompt
+            system_prompt (str): everything else that determines the response (e.g., the instructions or the context)
+            semantic (bool): whether to look up similar prompts as well (if there is an embedding function) or only
+                the same prompt. Disable it when the response depends on the exact prompt values (e.g., the parameters
+                of an intent)
+            ignore_case (bool): whether to ignore the letter case of the prompt (see :func:`normalize_prompt`). It
+                must be the same when the response is stored
+
+        Returns:
+            Any or None: a copy of the cached response, or None if it is not in the cache
+        """
+        if not self.enabled:
+            return None
+        key = self.key(llm_name, prompt, system_prompt, ignore_case)
+        with self._lock:
+            response = self._get(key)
+            if response is not None:
+                self._stats['hits'] += 1
+                return copy.deepcopy(response)
+        if semantic and self.embedding_function is not None:
+            embedding = self._embed(key[2])
+            with self._lock:
+                self._embeddings[key] = embedding
+                while len(self._embeddings) > self._max_size:
+                    self._embeddings.popitem(last=False)
+                similar_key = self._most_similar(key, embedding)
+                response = self._get(similar_key) if similar_key is not None else None
+                if response is not None:
+                    self._stats['hits'] += 1
+                    self._stats['semantic_hits'] += 1
+                    return copy.deepcopy(response)
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def put(
+            self,
+            llm_name: str,
+            prompt: str,
+            response: Any,
+            system_prompt: str = None,
+            ignore_case: bool = False
+    ) -> None:
+        """Store a response in the cache.
+
+        Args:
+            llm_name (str): the name of the LLM that generated the response
+            prompt (str): the prompt
+            response (Any): the response. It must be JSON serializable if the responses are stored in a database
+            system_prompt (str): everything else that determined the response (e.g., the instructions or the context)
+            ignore_case (bool): whether to ignore the letter case of the prompt (see :func:`normalize_prompt`)
+        """
+        if not self.enabled or response is None:
+            return
+        key = self.key(llm_name, prompt, system_prompt, ignore_case)
+        embedding = None
+        if self.embedding_function is not None:
+            with self._lock:
+                embedding = self._embeddings.pop(key, None)
+            if embedding is None:
+                embedding = self._embed(key[2])
+        response = copy.deepcopy(response)
+        created = time.time()
+        with self._lock:
+            self._entries[key] = (created, response, embedding)
+            self._entries.move_to_end(key)
+            evicted = []
+            while len(self._entries) > self._max_size:
+                evicted.append(self._entries.popitem(last=False)[0])
+                self._stats['evictions'] += 1
+            if self._path:
+                self._store(key, created, response, embedding, evicted)
+
+    def clear(self) -> None:
+        """Remove all the responses from the cache (and from its database)."""
+        with self._lock:
+            self._entries.clear()
+            self._embeddings.clear()
+            if self._path:
+                with self._connect():
+                    self._connection.execute('DELETE FROM llm_response_cache')
+
+    def close(self) -> None:
+        """Close the connection to the cache database. It is opened again when a response is stored."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _get(self, key: ResponseCacheKey) -> Any or None:
+        """Get a response from the cache, removing it if it has expired. The lock must be held.
+
+        Args:
+            key (ResponseCacheKey): the response key
+
+        Returns:
+            Any or None: the cached response, or None if it is not in the cache
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._ttl is not None and time.time() - entry[0] > self._ttl:
+            del self._entries[key]
+            self._stats['evictions'] += 1
+            if self._path:
+                self._store(None, None, None, None, [key])
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _most_similar(self, key: ResponseCacheKey, embedding: np.ndarray) -> ResponseCacheKey or None:
+        """Get the cached response with the most similar prompt to the given one, among the responses of the same LLM and
+        system prompt. The lock must be held.
+
+        Args:
+            key (ResponseCacheKey): the key of the requested response
+            embedding (numpy.ndarray): the normalized embedding of the requested prompt
+
+        Returns:
+            ResponseCacheKey or None: the key of the response with the most similar prompt, or None if no prompt is
+            similar enough
+        """
+        candidates = [
+            (candidate_key, entry[2]) for candidate_key, entry in self._entries.items()
+            if candidate_key[:2] == key[:2] and entry[2] is not None and entry[2].shape == embedding.shape
+        ]
+        if not candidates:
+            return None
+        similarities = np.stack([candidate[1] for candidate in candidates]) @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        return candidates[best][0]
+
+    def _embed(self, prompt: str) -> np.ndarray:
+        """Compute the normalized embedding of a prompt.
+
+        Args:
+            prompt (str): the normalized prompt
+
+        Returns:
+            numpy.ndarray: the embedding, with norm 1
+        """
+        embedding = np.asarray(self.embedding_function(prompt), dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else embedding
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connect to the cache database (if not connected yet), creating it if necessary.
+
+        Returns:
+            sqlite3.Connection: the connection to the cache database
+        """
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._path, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            with self._connection:
+                self._connection.execute(
+                    'CREATE TABLE IF NOT EXISTS llm_response_cache ('
+                    'llm_name TEXT NOT NULL, system_hash TEXT NOT NULL, prompt TEXT NOT NULL, response TEXT NOT NULL, '
+                    'embedding BLOB, created REAL NOT NULL, PRIMARY KEY (llm_name, system_hash, prompt))'
+                )
+        return self._connection
+
+    def _load(self) -> None:
+        """Load the responses that have not expired from the cache database."""
+        with self._connect():
+            if self._ttl is not None:
+                self._connection.execute('DELETE FROM llm_response_cache WHERE created < ?', (time.time() - self._ttl,))
+        rows = self._connection.execute(
+            'SELECT llm_name, system_hash, prompt, response, embedding, created FROM llm_response_cache '
+            'ORDER BY created DESC LIMIT ?', (self._max_size,)
+        ).fetchall()
+        for llm_name, system_hash, prompt, response, embedding, created in reversed(rows):
+            if embedding is not None:
+                embedding = np.frombuffer(embedding, dtype=np.float32)
+            self._entries[(llm_name, system_hash, prompt)] = (created, json.loads(response), embedding)
+        logger.info(f'[LLMResponseCache] Loaded {len(self._entries)} responses from {self._path}')
+
+    def _store(
+            self,
+            key: ResponseCacheKey or None,
+            created: float or None,
+            response: Any,
+            embedding: np.ndarray or None,
+            evicted: list[ResponseCacheKey]
+    ) -> None:
+        """Store a response in the cache database and delete the evicted ones. The lock must be held.
+
+        Args:
+            key (ResponseCacheKey or None): the key of the response to store, or None to only delete responses
+            created (float or None): the time (as a timestamp) the response was stored in the cache
+            response (Any): the response
+            embedding (numpy.ndarray or None): the normalized embedding of the response prompt
+            evicted (list[ResponseCacheKey]): the keys of the responses to delete
+        """
+        try:
+            with self._connect():
+                if key is not None:
+                    self._connection.execute(
+                        'INSERT OR REPLACE INTO llm_response_cache VALUES (?, ?, ?, ?, ?, ?)',
+                        (*key, json.dumps(response), embedding.tobytes() if embedding is not None else None, created)
+                    )
+                if evicted:
+                    self._connection.executemany(
+                        'DELETE FROM llm_response_cache WHERE llm_name = ? AND system_hash = ? AND prompt = ?', evicted
+                    )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.error(f'[LLMResponseCache] The response could not be stored in {self._path}: {e}')
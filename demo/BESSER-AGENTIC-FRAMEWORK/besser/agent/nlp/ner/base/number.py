@@ -8,15 +8,17 @@ from besser.agent import nlp
 if TYPE_CHECKING:
     from besser.agent.nlp.nlp_engine import NLPEngine
 
+# Negative/positive numbers with optional point/comma followed by more digits
+number_regex = re.compile(r'(\b|[-+])\d+\.?\d*([.,]\d+)?\b')
+"""Regex that matches numbers"""
+
 
 def ner_number(sentence: str, nlp_engine: 'NLPEngine') -> tuple[str, str, dict]:
     # First, we parse any number in the sentence expressed in natural language (e.g. "five") to actual numbers
     language = nlp_engine.get_property(nlp.NLP_LANGUAGE)
     sentence = alpha2digit(sentence, lang=language)
 
-    # Negative/positive numbers with optional point/comma followed by more digits
-    regex = re.compile(r'(\b|[-+])\d+\.?\d*([.,]\d+)?\b')
-    search = regex.search(sentence)
+    search = number_regex.search(sentence)
     if search is None:
         return None, None, None
     matched_frag = search.group(0)
@@ -0,0 +1,148 @@
+import re
+from collections import deque
+from typing import Generic, TypeVar
+
+T = TypeVar('T')
+
+
+def _is_word_char(c: str) -> bool:
+    """Check if a character is a word character (i.e., it matches the ``\\w`` regex)."""
+    return c.isalnum() or c == '_'
+
+
+class EntityValueMatcher(Generic[T]):
+    """A multi-pattern matcher of entity values (Aho-Corasick automaton).
+
+    The matcher is built once from a set of values, and then it finds all of them in a text with a single scan, no
+    matter how many values there are. Values are matched case-insensitively and only as whole words (i.e., as the
+    ``\\bvalue\\b`` regex would do), or when they are equal to the whole text.
+
+    Overlapping matches are resolved as if the values were replaced one by one in the text, from the longest to the
+    shortest one: each value is matched only once, at its first occurrence that does not overlap a longer value.
+
+    Args:
+        values (dict[str, T]): the values to match, each one with some data that is returned when it is matched
+
+    Attributes:
+        _values (list[tuple[str, T]]): The values and their data, by value id
+        _priority (list[int]): The value ids, from the highest to the lowest priority
+        _goto (list[dict[str, int]]): The transitions of each node of the automaton
+        _fail (list[int]): The failure link of each node of the automaton
+        _output (list[list[int]]): The ids of the values that end in each node of the automaton
+    """
+
+    def __init__(self, values: dict[str, T]):
+        self._values: list[tuple[str, T]] = [(value, data) for value, data in values.items() if value]
+        self._priority: list[int] = sorted(
+            range(len(self._values)),
+            key=lambda i: (len(self._values[i][0]), self._values[i][0].casefold()),
+            reverse=True
+        )
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[int]] = [[]]
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _build(self) -> None:
+        """Build the automaton: the trie of the (lowercase) values and the failure links."""
+        for value_id, (value, _) in enumerate(self._values):
+            node = 0
+            for c in value.lower():
+                next_node = self._goto[node].get(c)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][c] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].append(value_id)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fail = self._fail[node]
+                while fail and c not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_node] = self._goto[fail].get(c, 0)
+                self._output[next_node] = self._output[next_node] + self._output[self._fail[next_node]]
+
+    def _occurrences(self, text: str) -> dict[int, list[tuple[int, int]]]:
+        """Find all the whole-word occurrences of the values in a text.
+
+        Args:
+            text (str): the text, with the same length as its lowercase version
+
+        Returns:
+            dict[int, list[tuple[int, int]]]: the (start, end) positions of the occurrences of each value id, from left
+            to right
+        """
+        occurrences: dict[int, list[tuple[int, int]]] = {}
+        n = len(text)
+        node = 0
+        for i, c in enumerate(text.lower()):
+            while node and c not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(c, 0)
+            for value_id in self._output[node]:
+                value = self._values[value_id][0]
+                start, end = i + 1 - len(value), i + 1
+                whole_text = start == 0 and end == n
+                if whole_text or (
+                        (start > 0 and _is_word_char(text[start - 1])) != _is_word_char(value[0])
+                        and (end < n and _is_word_char(text[end])) != _is_word_char(value[-1])
+                ):
+                    occurrences.setdefault(value_id, []).append((start, end))
+        for positions in occurrences.values():
+            positions.sort()
+        return occurrences
+
+    def match(self, text: str) -> list[tuple[int, int, str, T]]:
+        """Find the values in a text.
+
+        Args:
+            text (str): the text
+
+        Returns:
+            list[tuple[int, int, str, T]]: the matches, as tuples (start, end, value, data), from left to right
+        """
+        if not self._values:
+            return []
+        if len(text.lower()) != len(text):
+            # Some characters change their length when lowercased, so positions can not be mapped
+            return self._match_regex(text)
+        occurrences = self._occurrences(text)
+        covered = bytearray(len(text))
+        matches: list[tuple[int, int, str, T]] = []
+        for value_id in self._priority:
+            for start, end in occurrences.get(value_id, ()):
+                if not any(covered[start:end]):
+                    covered[start:end] = b'\x01' * (end - start)
+                    value, data = self._values[value_id]
+                    matches.append((start, end, value, data))
+                    break
+        matches.sort(key=lambda m: m[0])
+        return matches
+
+    def _match_regex(self, text: str) -> list[tuple[int, int, str, T]]:
+        """Find the values in a text, one by one with regular expressions. Slower fallback of :meth:`match`."""
+        covered = bytearray(len(text))
+        matches: list[tuple[int, int, str, T]] = []
+        for value_id in self._priority:
+            value, data = self._values[value_id]
+            if value.lower() == text.lower():
+                spans = [(0, len(text))]
+            else:
+                regex = re.compile(r'\b' + re.escape(value) + r'\b', re.IGNORECASE)
+                spans = [m.span() for m in regex.finditer(text)]
+            for start, end in spans:
+                if not any(covered[start:end]):
+                    covered[start:end] = b'\x01' * (end - start)
+                    matches.append((start, end, value, data))
+                    break
+        matches.sort(key=lambda m: m[0])
+        return matches
@@ -8,11 +8,11 @@ from besser.agent.core.state import State
 from besser.agent.library.entity.base_entities import BaseEntities, ordered_base_entities
 from besser.agent.nlp.ner.base.datetime import ner_datetime
 from besser.agent.nlp.ner.base.number import ner_number
+from besser.agent.nlp.ner.entity_value_matcher import EntityValueMatcher
 from besser.agent.nlp.ner.matched_parameter import MatchedParameter
 from besser.agent.nlp.ner.ner import NER
 from besser.agent.nlp.ner.ner_prediction import NERPrediction
-from besser.agent.nlp.utils import find_first_temp, replace_temp_value_in_sentence, replace_value_in_sentence, \
-    value_in_sentence
+from besser.agent.nlp.utils import replace_value_in_sentence
 
 if TYPE_CHECKING:
     from besser.agent.core.agent import Agent
@@ -119,9 +119,17 @@ class SimpleNER(NER):
     It can find an entity value in a user message only with exact matching (i.e. slight variations on an entity value
     within a user message will make the NER fail)
 
+    The custom entity values of each intent are compiled into a matcher when the NER is trained, so a message is
+    scanned once to find all of them, no matter how many entity values there are.
+
     Args:
         nlp_engine (NLPEngine): the NLPEngine that handles the NLP processes of the agent
         agent (Agent): the agent the NER belongs to
+
+    Attributes:
+        _matchers (dict[tuple[Intent, bool], EntityValueMatcher]): The custom entity value matcher of each intent, for
+            the original and the processed entity values. The values of each matcher are the ones returned by
+            :func:`get_custom_entity_values_dict`
     """
     def __init__(
             self,
@@ -129,61 +137,73 @@ class SimpleNER(NER):
             agent
     ):
         super().__init__(nlp_engine, agent)
+        self._matchers: dict[tuple[Intent, bool], EntityValueMatcher[tuple[list[IntentParameter], str]]] = {}
 
     def train(self) -> None:
         for entity in self._agent.entities:
             entity.process_entity_entries(self._nlp_engine)
+        self._matchers = {}
+        processed_values = self._use_processed_values()
+        for intent in self._agent.intents:
+            self._get_matcher(intent, processed_values)
+
+    def _use_processed_values(self) -> bool:
+        """Whether to match the processed entity values or the original ones."""
+        # Other conditions may be necessary to use the processed entity values
+        return bool(self._nlp_engine.get_property(nlp.NLP_PRE_PROCESSING))
+
+    def _get_matcher(
+            self,
+            intent: Intent,
+            processed_values: bool
+    ) -> EntityValueMatcher[tuple[list[IntentParameter], str]]:
+        """Get the custom entity value matcher of an intent, building it if it does not exist yet.
+
+        Args:
+            intent (Intent): the intent
+            processed_values (bool): whether to match the entities processed values or not
+
+        Returns:
+            EntityValueMatcher[tuple[list[IntentParameter], str]]: the matcher
+        """
+        key = (intent, processed_values)
+        matcher = self._matchers.get(key)
+        if matcher is None:
+            matcher = EntityValueMatcher(get_custom_entity_values_dict(intent, processed_values))
+            self._matchers[key] = matcher
+        return matcher
 
     def predict(self, state: State, message: str) -> NERPrediction:
         ner_prediction: NERPrediction = NERPrediction()
+        processed_values = self._use_processed_values()
         for intent in state.intents:
             intent_matches: list[MatchedParameter] = []
-            ner_sentence: str = message
             # Match custom entities
-            processed_values: bool
-            pre_processing = self._nlp_engine.get_property(nlp.NLP_PRE_PROCESSING)
-            if pre_processing:
-                # Other conditions may be necessary to use the processed entity values
-                processed_values = True
-            else:
-                processed_values = False
-            all_entity_values: dict[str, tuple[list[IntentParameter], str]] = \
-                get_custom_entity_values_dict(intent, processed_values)
-            temps: dict[str, tuple[list[IntentParameter], str]] = {}
-            temp_template = r'/temp{}/'
-            temp_count = 1
-            for value, (intent_parameters, entry_value) in sorted(all_entity_values.items(),
-                                                            key=lambda x: (len(x[0]), x[0].casefold()), reverse=True):
-                # TODO: This approach doesn't allow 2 repetitions of the same value in a sentence
-                # entry_value are all entry values of the entity
-                # value can be an entry value (i.e. value == entry_value)
-                # or a synonym of an entry value (i.e. value is a synonym of entry_value)
-                # value can be processed
-                if value_in_sentence(value, ner_sentence):
-                    temp_n = temp_template.format(temp_count)
-                    temp_count += 1
-                    ner_sentence = replace_value_in_sentence(ner_sentence, value, temp_n)
-                    temps[temp_n] = (intent_parameters, entry_value)
-
+            matcher = self._get_matcher(intent, processed_values)
+            ner_sentence_parts: list[str] = []
+            last_end = 0
             intent_parameters_done: list[IntentParameter] = []
-            while len(temps) > 0:
-                # We get the temp that appears first in the sentence,
-                # and replace it by the 1st entity reference, in order of declaration in the agent definition
-                temp = find_first_temp(ner_sentence)
-                (intent_parameters, value) = temps[temp]
+            # TODO: This approach doesn't allow 2 repetitions of the same value in a sentence
+            for start, end, _, (intent_parameters, value) in matcher.match(message):
+                # Each matched value is replaced by the 1st entity reference, in order of declaration in the agent
+                # definition
                 intent_parameter = next(
                     (e for e in intent_parameters if e not in intent_parameters_done),
                     None
                 )
                 if intent_parameter is None:
                     # We found 2 values of the same intent_parameter.entity, but there can be only 1
-                    ner_sentence = replace_temp_value_in_sentence(ner_sentence, temp, value)
+                    repl = value
                     # VALUE IS THE ORIGINAL (woman => Will write Femení!!!)
                 else:
                     intent_parameters_done.append(intent_parameter)
-                    ner_sentence = replace_temp_value_in_sentence(ner_sentence, temp, intent_parameter.entity.name.upper())
+                    repl = intent_parameter.entity.name.upper()
                     intent_matches.append(MatchedParameter(intent_parameter.name, value, {}))
-                temps.pop(temp)
+                ner_sentence_parts.append(message[last_end:start])
+                ner_sentence_parts.append(repl)
+                last_end = end
+            ner_sentence_parts.append(message[last_end:])
+            ner_sentence: str = ''.join(ner_sentence_parts)
 
             # Match base/system entities (after custom entities)
             base_entity_intent_parameters: list[IntentParameter] = [e for e in intent.parameters if
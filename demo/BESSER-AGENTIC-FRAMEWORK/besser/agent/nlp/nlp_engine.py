@@ -1,5 +1,8 @@
 import inspect
+import multiprocessing
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # Hide Tensorflow logs
 
@@ -18,11 +21,15 @@ from besser.agent.nlp.intent_classifier.intent_classifier_prediction import (
     IntentClassifierPrediction,
     fallback_intent_prediction,
 )
+from besser.agent.nlp.intent_classifier.intent_prediction_cache import IntentPredictionCache, normalize_message
 from besser.agent.nlp.intent_classifier.llm_intent_classifier import LLMIntentClassifier
 from besser.agent.nlp.llm.llm import LLM
+from besser.agent.nlp.llm.llm_client import LLMClient
+from besser.agent.nlp.llm.llm_response_cache import LLMResponseCache
 from besser.agent.nlp.ner.ner import NER
 from besser.agent.nlp.ner.simple_ner import SimpleNER
 from besser.agent.nlp.preprocessing.pipelines import lang_map
+from besser.agent.nlp.preprocessing.text_preprocessor import TextPreprocessor
 from besser.agent.nlp.rag.rag import RAG
 from besser.agent.nlp.speech2text.speech2text import Speech2Text
 from besser.agent.nlp.text2speech.text2speech import Text2Speech
@@ -32,6 +39,28 @@ if TYPE_CHECKING:
     from besser.agent.core.state import State
 
 
+def _init_training_worker() -> None:
+    """Initialize a training worker process. Each worker uses a single thread, since there are many of them running in
+    parallel."""
+    import torch
+    torch.set_num_threads(1)
+
+
+def _timed_training(train_function, job: tuple) -> tuple[Any, float]:
+    """Run a training job in a worker process, measuring its duration.
+
+    Args:
+        train_function: the training function
+        job (tuple): the training function arguments
+
+    Returns:
+        tuple[Any, float]: the training result and the training time (in seconds)
+    """
+    start = time.perf_counter()
+    result = train_function(*job)
+    return result, time.perf_counter() - start
+
+
 class NLPEngine:
     """The NLP Engine of an agent.
 
@@ -54,6 +83,18 @@ class NLPEngine:
             system of the NLPEngine. The user language is set by the user, defaults to english. Keys are the language
             names and values are the Text2Speech system itself.
         _rag (RAG): The RAG system of the NLPEngine
+        _intent_cache (IntentPredictionCache or None): The cache of intent predictions, created when the NLPEngine is
+            initialized
+        _intent_classifiers_version (int): The version of the intent classifiers, increased every time they are
+            trained. It is part of the intent prediction cache keys
+        _training_times (dict[str, float]): The time (in seconds) it took to train the intent classifier of each
+            state, by state name
+        _text_preprocessor (TextPreprocessor or None): The text preprocessing service, created when the NLPEngine is
+            initialized
+        _llm_client (LLMClient or None): The asynchronous client the LLMs use to send their requests, created when an
+            LLM needs it
+        _response_cache (LLMResponseCache or None): The cache of LLM responses, created when it is used for the first
+            time
     """
 
     def __init__(self, agent: "Agent"):
@@ -64,12 +105,64 @@ class NLPEngine:
         self._language_to_speech2text_module: dict[str, Speech2Text] = {}
         self._language_to_text2speech_module: dict[str, Text2Speech] = {}
         self._rag: RAG = None
+        self._intent_cache: IntentPredictionCache or None = None
+        self._intent_classifiers_version: int = 0
+        self._training_times: dict[str, float] = {}
+        self._text_preprocessor: TextPreprocessor or None = None
+        self._llm_client: LLMClient or None = None
+        self._response_cache: LLMResponseCache or None = None
 
     @property
     def ner(self):
         """NER: NLPEngine NER component."""
         return self._ner
 
+    @property
+    def training_times(self):
+        """dict[str, float]: The time (in seconds) it took to train the intent classifier of each state, by state
+        name."""
+        return self._training_times
+
+    @property
+    def text_preprocessor(self):
+        """TextPreprocessor or None: NLPEngine text preprocessing service."""
+        return self._text_preprocessor
+
+    @property
+    def llm_client(self):
+        """LLMClient: NLPEngine asynchronous client for LLM requests. It is created the first time it is used."""
+        if self._llm_client is None:
+            self._llm_client = LLMClient(
+                max_connections=self.get_property(nlp.NLP_LLM_MAX_CONNECTIONS),
+                max_concurrency=self.get_property(nlp.NLP_LLM_MAX_CONCURRENCY),
+                max_retries=self.get_property(nlp.NLP_LLM_MAX_RETRIES),
+                retry_backoff=self.get_property(nlp.NLP_LLM_RETRY_BACKOFF),
+                timeout=self.get_property(nlp.NLP_LLM_TIMEOUT),
+                coalesce=self.get_property(nlp.NLP_LLM_COALESCE_REQUESTS)
+            )
+        return self._llm_client
+
+    @property
+    def response_cache(self):
+        """LLMResponseCache: NLPEngine cache of LLM responses. It is created the first time it is used.
+
+        To also find the responses of similar prompts, set its
+        :attr:`~besser.agent.nlp.llm.llm_response_cache.LLMResponseCache.embedding_function`.
+        """
+        if self._response_cache is None:
+            self._response_cache = LLMResponseCache(
+                max_size=self.get_property(nlp.NLP_RESPONSE_CACHE_SIZE),
+                ttl=self.get_property(nlp.NLP_RESPONSE_CACHE_TTL),
+                path=self.get_property(nlp.NLP_RESPONSE_CACHE_PATH),
+                similarity_threshold=self.get_property(nlp.NLP_RESPONSE_CACHE_SIMILARITY_THRESHOLD)
+            )
+        return self._response_cache
+
+    @property
+    def intent_cache(self):
+        """IntentPredictionCache or None: NLPEngine intent prediction cache."""
+        return self._intent_cache
+
     def initialize(self) -> None:
         """Initialize the NLPEngine."""
         if self.get_property(nlp.NLP_LANGUAGE) in lang_map.values():
@@ -101,6 +194,19 @@ class NLPEngine:
                     self._intent_classifiers[state] = LLMIntentClassifier(self, state)
         # TODO: Only instantiate the NER if asked (maybe an agent does not need NER), via agent properties
         self._ner = SimpleNER(self, self._agent)
+        self._intent_cache = IntentPredictionCache(
+            max_size=self.get_property(nlp.NLP_INTENT_CACHE_SIZE),
+            ttl=self.get_property(nlp.NLP_INTENT_CACHE_TTL)
+        )
+        self._text_preprocessor = TextPreprocessor(self, self.get_property(nlp.NLP_PREPROCESSING_CACHE_SIZE))
+
+    def stop(self) -> None:
+        """Stop the NLPEngine services (i.e., the LLM client and the response cache database connection)."""
+        if self._llm_client is not None:
+            self._llm_client.stop()
+            self._llm_client = None
+        if self._response_cache is not None:
+            self._response_cache.close()
 
     def get_property(self, prop: Property) -> Any:
         """Get a NLP property's value from the NLPEngine's agent.
@@ -116,21 +222,73 @@ class NLPEngine:
         return self._agent.get_property(prop)
 
     def train(self) -> None:
-        """Train the NLP components of the NLPEngine."""
+        """Train the NLP components of the NLPEngine. The intent prediction cache is invalidated."""
+        self._intent_classifiers_version += 1
+        if self._intent_cache is not None:
+            self._intent_cache.clear()
         self._ner.train()
         logger.info(f"NER successfully trained.")
+        self._training_times = {}
+        parallel_classifiers = {}
+        workers: int = self.get_property(nlp.NLP_TRAINING_WORKERS)
+        if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            # Only PyTorch models can be trained in a worker process, since their training does not depend on the agent
+            from besser.agent.nlp.intent_classifier.simple_intent_classifier_pytorch import SimpleIntentClassifierTorch
+            parallel_classifiers = {
+                state: intent_classifier for state, intent_classifier in self._intent_classifiers.items()
+                if state.intents and isinstance(intent_classifier, SimpleIntentClassifierTorch)
+            }
+        if len(parallel_classifiers) > 1:
+            self._train_in_parallel(parallel_classifiers, workers)
+        else:
+            parallel_classifiers = {}
         for state, intent_classifier in self._intent_classifiers.items():
+            if state in parallel_classifiers:
+                continue
             if not state.intents:
                 logger.info(
                     f"Intent classifier in {state.name} not trained (no intents found)."
                 )
             else:
+                start = time.perf_counter()
                 intent_classifier.train()
-                logger.info(f"Intent classifier in {state.name} successfully trained.")
+                self._training_times[state.name] = time.perf_counter() - start
+                logger.info(f"Intent classifier in {state.name} successfully trained "
+                            f"({self._training_times[state.name]:.2f}s).")
+
+    def _train_in_parallel(self, intent_classifiers: dict['State', IntentClassifier], workers: int) -> None:
+        """Train PyTorch-based intent classifiers in parallel, each one in a worker process.
+
+        The training sentences are tokenized in this process, so the workers only run the model training.
+
+        Args:
+            intent_classifiers (dict[State, IntentClassifier]): the intent classifiers to train, by state
+            workers (int): the maximum number of worker processes
+        """
+        from besser.agent.nlp.intent_classifier.simple_intent_classifier_pytorch import train_text_classifier
+        start = time.perf_counter()
+        # Fork, so the workers do not re-import the agent's main module
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=min(workers, len(intent_classifiers)), mp_context=context,
+                                 initializer=_init_training_worker) as executor:
+            futures = {
+                state: executor.submit(_timed_training, train_text_classifier, intent_classifier.training_job())
+                for state, intent_classifier in intent_classifiers.items()
+            }
+            for state, future in futures.items():
+                result, training_time = future.result()
+                intent_classifiers[state].load_training_result(result)
+                self._training_times[state.name] = training_time
+                logger.info(f"Intent classifier in {state.name} successfully trained ({training_time:.2f}s).")
+        logger.info(f"{len(intent_classifiers)} intent classifiers trained in parallel in "
+                    f"{time.perf_counter() - start:.2f}s.")
 
     def predict_intent(self, session: Session) -> IntentClassifierPrediction:
         """Predict the intent of a user message.
 
+        The predictions are cached by state and message (see :class:`IntentPredictionCache
+        <besser.agent.nlp.intent_classifier.intent_prediction_cache.IntentPredictionCache>`).
+
         Args:
             session (Session): the user session
 
@@ -138,9 +296,33 @@ class NLPEngine:
             IntentClassifierPrediction: the intent prediction
         """
         message: str = session.event.message
-        fallback_intent = fallback_intent_prediction(message)
         if not session.current_state.intents:
+            fallback_intent = fallback_intent_prediction(message)
+            fallback_intent.state = session.current_state.name
             return fallback_intent
+        cache_key = None
+        if self._intent_cache is not None and self._intent_cache.enabled and isinstance(message, str):
+            cache_key = (session.current_state.name, normalize_message(message), self._intent_classifiers_version)
+            cached_prediction = self._intent_cache.get(cache_key)
+            if cached_prediction is not None:
+                cached_prediction.state = session.current_state.name
+                return cached_prediction
+        best_intent_prediction = self._classify_intent(session, message)
+        if cache_key is not None:
+            self._intent_cache.put(cache_key, best_intent_prediction)
+        return best_intent_prediction
+
+    def _classify_intent(self, session: Session, message: str) -> IntentClassifierPrediction:
+        """Run the intent classifier of the session's current state on a user message.
+
+        Args:
+            session (Session): the user session
+            message (str): the user message
+
+        Returns:
+            IntentClassifierPrediction: the best intent prediction, or the fallback intent prediction
+        """
+        fallback_intent = fallback_intent_prediction(message)
         intent_classifier = self._intent_classifiers[session.current_state]
         # TODO: check if state is different to run prediction
         intent_classifier_predictions: list[IntentClassifierPrediction] = (
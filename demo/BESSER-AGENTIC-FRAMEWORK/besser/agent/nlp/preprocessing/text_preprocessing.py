@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from nltk import word_tokenize
@@ -9,6 +10,9 @@ from besser.agent.nlp.preprocessing.pipelines import create_or_get_stemmer, lang
 if TYPE_CHECKING:
     from besser.agent.nlp.nlp_engine import NLPEngine
 
+word_regex = re.compile(r'^\w+$')
+"""Regex that matches alphanumeric words"""
+
 
 def tokenize(text: str, language: str = 'en') -> list[str]:
     """Tokenize a text (i.e., split into tokens)
@@ -25,7 +29,7 @@ def tokenize(text: str, language: str = 'en') -> list[str]:
     return [
         token.lower()
         for token in word_tokenize(text, language=language)
-        if re.match(r'^\w+$', token)  # Keeps only alphanumeric words (removes punctuation)
+        if word_regex.match(token)  # Keeps only alphanumeric words (removes punctuation)
     ]
 
 
@@ -68,12 +72,17 @@ def stem_text(text: str, language: str) -> str:
     return joined_string
 
 
+@lru_cache(maxsize=1)
+def get_lux_tokenizer():
+    """Get the Luxembourgish spaCy pipeline used to tokenize texts. It is created only once."""
+    from spacy.lang.lb import Luxembourgish
+    return Luxembourgish()
+
+
 def lemmatize_lux_text(text: str) -> str:
     import spellux
-    from spacy.lang.lb import Luxembourgish
 
-    nlp = Luxembourgish()
-    doc = nlp(text)
+    doc = get_lux_tokenizer()(text)
     tokens = []
     for token in doc: 
         tokens.append(token.text)
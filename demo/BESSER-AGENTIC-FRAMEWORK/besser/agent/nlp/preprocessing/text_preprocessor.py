@@ -0,0 +1,82 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable
+
+from besser.agent import nlp
+from besser.agent.nlp.preprocessing.text_preprocessing import process_text, tokenize
+
+if TYPE_CHECKING:
+    from besser.agent.nlp.nlp_engine import NLPEngine
+
+
+class TextPreprocessor:
+    """The text preprocessing service of an NLPEngine.
+
+    A user message is preprocessed (i.e., stemmed or lemmatized) by every intent classifier that predicts its intent,
+    and the resulting sentences are tokenized again by the classifiers. This service memoizes the processed and
+    tokenized forms of the most recent texts, so each message is only processed once.
+
+    Args:
+        nlp_engine (NLPEngine): the NLPEngine the preprocessor belongs to
+        cache_size (int): the maximum number of processed and tokenized texts kept in memory. If it is 0, texts are not
+            memoized
+
+    Attributes:
+        _nlp_engine (NLPEngine): The NLPEngine the preprocessor belongs to
+        _process_text (Callable[[str, bool, str], str]): The memoized text processing function, by text,
+            pre-processing property and language
+        _tokenize (Callable[[str, str], tuple[str, ...]]): The memoized tokenization function, by text and language
+    """
+
+    def __init__(self, nlp_engine: 'NLPEngine', cache_size: int):
+        self._nlp_engine: 'NLPEngine' = nlp_engine
+        cache_size = max(0, cache_size)
+        self._process_text: Callable[[str, bool, str], str] = lru_cache(maxsize=cache_size)(self._process_text_uncached)
+        self._tokenize: Callable[[str, str], tuple[str, ...]] = lru_cache(maxsize=cache_size)(
+            lambda text, language: tuple(tokenize(text, language))
+        )
+
+    @property
+    def stats(self) -> dict[str, dict[str, int]]:
+        """dict[str, dict[str, int]]: The hits, misses and size of the processed text and the tokenized text caches."""
+        return {
+            name: {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+            for name, info in (('process_text', self._process_text.cache_info()),
+                               ('tokenize', self._tokenize.cache_info()))
+        }
+
+    def _process_text_uncached(self, text: str, pre_processing: bool, language: str) -> str:
+        # The property values are part of the cache key, so changing them does not return outdated results
+        return process_text(text, self._nlp_engine)
+
+    def process_text(self, text: str) -> str:
+        """Preprocess a text according to the NLPEngine properties (see
+        :func:`~besser.agent.nlp.preprocessing.text_preprocessing.process_text`).
+
+        Args:
+            text (str): the text to preprocess
+
+        Returns:
+            str: the preprocessed text
+        """
+        return self._process_text(
+            text,
+            self._nlp_engine.get_property(nlp.NLP_PRE_PROCESSING),
+            self._nlp_engine.get_property(nlp.NLP_LANGUAGE)
+        )
+
+    def tokenize(self, text: str, language: str = 'en') -> list[str]:
+        """Tokenize a text (see :func:`~besser.agent.nlp.preprocessing.text_preprocessing.tokenize`).
+
+        Args:
+            text (str): the text to tokenize
+            language (str): the text language (defaults to english)
+
+        Returns:
+            list[str]: list of tokens
+        """
+        return list(self._tokenize(text, language))
+
+    def clear(self) -> None:
+        """Remove all the memoized texts."""
+        self._process_text.cache_clear()
+        self._tokenize.cache_clear()
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from besser.agent.exceptions.logger import logger
 import os
-from typing import TYPE_CHECKING
+import uuid
+from typing import TYPE_CHECKING, Iterator
 
 from besser.agent.core.message import Message, MessageType
 from besser.agent.nlp.llm.llm import LLM
@@ -91,6 +92,10 @@ class RAG:
         k (int): number of chunks to retrieve from the vector store
         num_previous_messages (int): number of previous messages of the conversation to add to the LLM prompt context.
             Necessary a connection to :class:`~besser.agent.db.monitoring_db.MonitoringDB`.
+        _vector_store_generation (int): the number of times the vector store content has changed (see
+            :meth:`invalidate_cache`), part of the cache key of the answers
+        _vector_store_token (str): random identifier of the vector store, part of the cache key of the answers when
+            its content can not be identified (so they are not reused after a restart)
     """
 
     DEFAULT_LLM_PROMPT = "You are an assistant for question-answering tasks. Based on the previous messages in the conversation (if provided), and additional context retrieved from a database (if provided), answer the user question. If you don't know the answer, just say that you don't know. Note that if the question refers to a previous message, you may have to ignore the context since it is retrieved from the database based only on the question (the retrieval does not take into account the previous messages). Use three sentences maximum and keep the answer concise"
@@ -114,6 +119,8 @@ class RAG:
         self.llm_prompt = llm_prompt
         self.k: int = k
         self.num_previous_messages: int = num_previous_messages
+        self._vector_store_generation: int = 0
+        self._vector_store_token: str = uuid.uuid4().hex
         self._nlp_engine._rag = self
 
     def load_pdfs(self, path: str) -> int:
@@ -134,9 +141,34 @@ class RAG:
         chunked_documents = self.splitter.split_documents(documents)
         n_chunks = len(chunked_documents)
         self.vector_store.add_documents(chunked_documents)
+        self.invalidate_cache()
         logger.info(f'[RAG] Added {n_chunks} chunks to RAG\'s vector store. Total: {len(self.vector_store.get()["documents"])}')
         return n_chunks
 
+    def invalidate_cache(self) -> None:
+        """Stop using the cached answers (see :meth:`run`), since they may not be valid for the current content of the
+        vector store. It is called when documents are loaded with :meth:`load_pdfs`; call it after modifying the vector
+        store in any other way.
+        """
+        self._vector_store_generation += 1
+
+    def _vector_store_version(self) -> str:
+        """Get the identifier of the vector store content, for the cache key of the answers.
+
+        For vector stores with a collection (e.g., Chroma), it is made of the collection name and its number of
+        documents, so the cached answers are still valid after a restart (if the cache is persisted) as long as the
+        collection does not change. Otherwise, a random identifier of this RAG is used instead.
+
+        Returns:
+            str: the vector store version
+        """
+        collection = getattr(self.vector_store, '_collection', None)
+        try:
+            identity = f'{collection.name}:{collection.count()}'
+        except Exception:
+            identity = self._vector_store_token
+        return f'{type(self.vector_store).__name__}:{identity}:{self._vector_store_generation}'
+
     def run_retrieval(self, question: str, k: int = None) -> list[Document]:
         """Run retrieval. Given a query, return the `k` most relevant documents (i.e., chunks) from the RAG's vector store.
 
@@ -198,6 +230,10 @@ class RAG:
     ) -> RAGMessage:
         """Run the RAG engine.
 
+        If the answer does not depend on the chat history (i.e., no previous messages are added to the LLM prompt), it is
+        stored in the NLPEngine response cache (see :class:`~besser.agent.nlp.llm.llm_response_cache.LLMResponseCache`),
+        so the next time the same question is received, neither the retrieval nor the LLM are run.
+
         Args:
             session (Session): the session of the user that started this request. Must be provided if the chat history
                 wants to be added as context to the LLM prompt.
@@ -213,6 +249,145 @@ class RAG:
         Returns:
             RAGMessage: the resulting RAG message
         """
+        cached_message = self._get_cached(message, session, llm_prompt, llm_name, k, num_previous_messages)
+        if cached_message is not None:
+            return cached_message
+        llm_name, prompt, docs = self._prepare(message, session, llm_prompt, llm_name, k, num_previous_messages)
+        llm: LLM = self._nlp_engine._llms[llm_name]
+        llm_response: str = llm.predict(prompt)
+        rag_message = RAGMessage(llm_name=llm_name, question=message, answer=llm_response, docs=docs)
+        self._put_cached(rag_message, session, llm_prompt, k, num_previous_messages)
+        return rag_message
+
+    def run_stream(
+            self,
+            message: str,
+            session: 'Session' = None,
+            llm_prompt: str = None,
+            llm_name: str = None,
+            k: int = None,
+            num_previous_messages: int = None
+    ) -> tuple[RAGMessage, Iterator[str]]:
+        """Run the RAG engine, getting the LLM answer while it is generated (see
+        :meth:`~besser.agent.nlp.llm.llm.LLM.stream`).
+
+        The answer chunks can be sent to the user as soon as they are available with
+        :meth:`~besser.agent.platforms.websocket.websocket_platform.WebSocketPlatform.reply_rag_stream`.
+
+        Args:
+            session (Session): the session of the user that started this request. Must be provided if the chat history
+                wants to be added as context to the LLM prompt.
+            message (str): the message to be used as RAG query
+            llm_prompt (str): the prompt containing the detailed instructions for the answer generation by the LLM. If
+                none is provided, the RAG's default value will be used
+            llm_name (str): the name of the LLM to use. If none is provided, the RAG's default value will be used
+            k (int): the number of (top) documents to get. If none is provided, the RAG's default value will be used
+            num_previous_messages (int): number of previous messages of the conversation to add to the LLM prompt
+                context. If none is provided, the RAG's default value will be used. Necessary a connection to
+                :class:`~besser.agent.db.monitoring_db.MonitoringDB`.
+
+        Returns:
+            tuple[RAGMessage, Iterator[str]]: the resulting RAG message, and the chunks of its answer. The answer of the
+            RAG message is set when all the chunks have been iterated
+        """
+        cached_message = self._get_cached(message, session, llm_prompt, llm_name, k, num_previous_messages)
+        if cached_message is not None:
+            return cached_message, iter([cached_message.answer])
+        llm_name, prompt, docs = self._prepare(message, session, llm_prompt, llm_name, k, num_previous_messages)
+        llm: LLM = self._nlp_engine._llms[llm_name]
+        rag_message = RAGMessage(llm_name=llm_name, question=message, answer=None, docs=docs)
+
+        def answer_chunks() -> Iterator[str]:
+            chunks = []
+            for chunk in llm.stream(prompt):
+                chunks.append(chunk)
+                yield chunk
+            rag_message.answer = ''.join(chunks)
+            self._put_cached(rag_message, session, llm_prompt, k, num_previous_messages)
+
+        return rag_message, answer_chunks()
+
+    def _cache_system_prompt(
+            self,
+            session: 'Session' = None,
+            llm_prompt: str = None,
+            k: int = None,
+            num_previous_messages: int = None
+    ) -> str or None:
+        """Get the system prompt of a RAG execution for the NLPEngine response cache (see
+        :class:`~besser.agent.nlp.llm.llm_response_cache.LLMResponseCache`), i.e., the LLM prompt, the number of
+        retrieved documents and the vector store version (see :meth:`_vector_store_version`).
+
+        Returns:
+            str or None: the system prompt, or None if the answer can not be cached because it depends on the chat
+            history
+        """
+        if session and (num_previous_messages or self.num_previous_messages) > 0:
+            return None
+        return f'{llm_prompt or self.llm_prompt}\n\nk={k or self.k}\nvector_store={self._vector_store_version()}'
+
+    def _get_cached(
+            self,
+            message: str,
+            session: 'Session' = None,
+            llm_prompt: str = None,
+            llm_name: str = None,
+            k: int = None,
+            num_previous_messages: int = None
+    ) -> RAGMessage or None:
+        """Get the result of a RAG execution from the NLPEngine response cache, so neither the retrieval nor the
+        answer generation are run again for a question that has already been answered (see :meth:`run`).
+
+        Returns:
+            RAGMessage or None: the cached RAG message, or None if it is not in the cache
+        """
+        system_prompt = self._cache_system_prompt(session, llm_prompt, k, num_previous_messages)
+        if not message or system_prompt is None:
+            return None
+        llm_name = llm_name or self.llm_name
+        # The answer does not depend on the letter case of the question
+        cached_response = self._nlp_engine.response_cache.get(llm_name, message, system_prompt, ignore_case=True)
+        if cached_response is None:
+            return None
+        docs = [Document(page_content=doc['content'], metadata=doc['metadata']) for doc in cached_response['docs']]
+        return RAGMessage(llm_name=llm_name, question=message, answer=cached_response['answer'], docs=docs)
+
+    def _put_cached(
+            self,
+            rag_message: RAGMessage,
+            session: 'Session' = None,
+            llm_prompt: str = None,
+            k: int = None,
+            num_previous_messages: int = None
+    ) -> None:
+        """Store the result of a RAG execution in the NLPEngine response cache (see :meth:`run`)."""
+        system_prompt = self._cache_system_prompt(session, llm_prompt, k, num_previous_messages)
+        if not rag_message.question or system_prompt is None:
+            return
+        rag_message_dict = rag_message.to_dict()
+        self._nlp_engine.response_cache.put(
+            rag_message.llm_name,
+            rag_message.question,
+            {'answer': rag_message_dict['answer'], 'docs': rag_message_dict['docs']},
+            system_prompt,
+            ignore_case=True
+        )
+
+    def _prepare(
+            self,
+            message: str,
+            session: 'Session' = None,
+            llm_prompt: str = None,
+            llm_name: str = None,
+            k: int = None,
+            num_previous_messages: int = None
+    ) -> tuple[str, str, list[Document]]:
+        """Retrieve the documents of a RAG execution and create the LLM prompt (see :meth:`run`).
+
+        Returns:
+            tuple[str, str, list[langchain_core.documents.base.Document]]: the name of the LLM to use, the LLM prompt
+            and the retrieved documents
+        """
         if not message and not session:
             raise ValueError('RAG Run: Must provide either a message or a session')
         if not llm_name:
@@ -225,6 +400,4 @@ class RAG:
             history = []
         docs: list[Document] = self.run_retrieval(question=message, k=k)
         prompt = self.create_prompt(history=history, docs=docs, question=message, llm_prompt=llm_prompt)
-        llm: LLM = self._nlp_engine._llms[llm_name]
-        llm_response: str = llm.predict(prompt)
-        return RAGMessage(llm_name=llm_name, question=message, answer=llm_response, docs=docs)
+        return llm_name, prompt, docs
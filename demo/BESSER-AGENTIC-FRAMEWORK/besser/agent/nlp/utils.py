@@ -1,31 +1,61 @@
 import json
 import re
+from functools import lru_cache
+
+REGEX_CACHE_SIZE = 4096
+"""The maximum number of compiled regexes kept in each regex cache"""
+
+temp_regex = re.compile(r'/temp[0-9]+/')
+"""Regex that matches temporary values in a sentence"""
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def get_value_regex(value: str, left_boundary: bool = True) -> re.Pattern:
+    """Get the (case-insensitive) regex that matches a value as a whole word. Regexes are compiled only once.
+
+    Args:
+        value (str): the value
+        left_boundary (bool): whether the value must start at a word boundary or not
+
+    Returns:
+        re.Pattern: the compiled regex
+    """
+    if left_boundary:
+        return re.compile(r'\b' + re.escape(value) + r'\b', re.IGNORECASE)
+    return re.compile(re.escape(value) + r'\b', re.IGNORECASE)
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def get_temp_regex(frag: str) -> re.Pattern:
+    """Get the (case-insensitive) regex of a temporary value. Regexes are compiled only once.
+
+    Args:
+        frag (str): the temporary value
+
+    Returns:
+        re.Pattern: the compiled regex
+    """
+    return re.compile(frag, re.IGNORECASE)
 
 
 def value_in_sentence(value: str, sentence: str) -> bool:
-    regex = re.compile(r'\b' + re.escape(value) + r'\b', re.IGNORECASE)
-    return value.lower() == sentence.lower() or (regex.search(sentence) is not None)
+    return value.lower() == sentence.lower() or (get_value_regex(value).search(sentence) is not None)
 
 
 def replace_value_in_sentence(sentence: str, frag: str, repl: str) -> str:
     if sentence.lower() == frag.lower():
         return repl
-    if frag[0] == '-':
-        # Necessary to replace negative numbers properly
-        regex = re.compile(re.escape(frag) + r'\b', re.IGNORECASE)
-    else:
-        regex = re.compile(r'\b' + re.escape(frag) + r'\b', re.IGNORECASE)
+    # Negative numbers do not start at a word boundary
+    regex = get_value_regex(frag, left_boundary=frag[0] != '-')
     return regex.sub(repl=repl, string=sentence, count=1)
 
 
 def replace_temp_value_in_sentence(sentence: str, frag: str, repl: str) -> str:
-    regex = re.compile(frag, re.IGNORECASE)
-    return regex.sub(repl=repl, string=sentence, count=1)
+    return get_temp_regex(frag).sub(repl=repl, string=sentence, count=1)
 
 
 def find_first_temp(sentence: str) -> str:
-    regex = re.compile(r'/temp[0-9]+/')
-    return regex.search(sentence).group()
+    return temp_regex.search(sentence).group()
 
 
 def find_json(text: str) -> dict:
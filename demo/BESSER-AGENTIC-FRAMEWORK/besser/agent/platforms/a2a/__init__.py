@@ -13,4 +13,80 @@ name: ``a2a.port``
 type: ``int``
 
 default value: ``8000``
-"""
\ No newline at end of file
+"""
+
+A2A_TASKS_MAX_FINISHED = Property(SECTION_A2A, 'a2a.tasks.max_finished', int, 1000)
+"""
+The maximum number of finished (DONE or ERROR) tasks kept by the platform. When there are more, the ones that finished
+first are removed, so the memory usage of a long-running agent does not grow with the number of executed tasks.
+Unfinished tasks are always kept.
+
+name: ``a2a.tasks.max_finished``
+
+type: ``int``
+
+default value: ``1000``
+"""
+
+A2A_TASKS_TTL = Property(SECTION_A2A, 'a2a.tasks.ttl', float, 3600.0)
+"""
+The time (in seconds) a finished task is kept by the platform, so its status and result can be requested.
+
+name: ``a2a.tasks.ttl``
+
+type: ``float``
+
+default value: ``3600.0``
+"""
+
+A2A_TASKS_PATH = Property(SECTION_A2A, 'a2a.tasks.path', str, None)
+"""
+The path of the SQLite database file where the platform tasks are stored, so they are kept after the agent is restarted
+(the tasks that were running are marked as failed). Several agents can share the same file. If it is not set, the tasks
+are only kept in memory.
+
+name: ``a2a.tasks.path``
+
+type: ``str``
+
+default value: ``None``
+"""
+
+A2A_SSE_QUEUE_SIZE = Property(SECTION_A2A, 'a2a.sse.queue_size', int, 100)
+"""
+The maximum number of task updates waiting to be sent to each SSE client. When a client is slower than the task
+updates, the updates exceeding it are dropped or coalesced (see ``a2a.sse.overflow_policy``), so a slow client does not
+make the agent memory grow.
+
+name: ``a2a.sse.queue_size``
+
+type: ``int``
+
+default value: ``100``
+"""
+
+A2A_SSE_OVERFLOW_POLICY = Property(SECTION_A2A, 'a2a.sse.overflow_policy', str, 'coalesce')
+"""
+What to do with the task updates of a slow SSE client (see
+:class:`~besser.agent.platforms.a2a.subscriber_queue.OverflowPolicy`): ``coalesce`` replaces the pending status updates
+of a task with the latest one (and drops the oldest updates if the queue is still full), and ``drop_oldest`` drops the
+oldest updates when the queue is full.
+
+name: ``a2a.sse.overflow_policy``
+
+type: ``str``
+
+default value: ``coalesce``
+"""
+
+A2A_SSE_HEARTBEAT_INTERVAL = Property(SECTION_A2A, 'a2a.sse.heartbeat_interval', float, 15.0)
+"""
+The time (in seconds) without task updates after which a heartbeat (an SSE comment) is sent to the SSE clients, so
+proxies do not close idle connections and disconnected clients are detected. Set it to 0 to disable the heartbeats.
+
+name: ``a2a.sse.heartbeat_interval``
+
+type: ``float``
+
+default value: ``15.0``
+"""
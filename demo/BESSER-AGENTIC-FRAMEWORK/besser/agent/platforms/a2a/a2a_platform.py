@@ -18,6 +18,7 @@ from besser.agent.platforms.a2a.message_router import A2ARouter
 from besser.agent.platforms.a2a.error_handler import AgentNotFound
 from besser.agent.platforms.platform import Platform
 from besser.agent.platforms.a2a.task_protocol import list_all_tasks, create_task, get_status, execute_task, TaskStatus
+from besser.agent.platforms.a2a.task_store import TaskStore, SQLiteTaskStore
 
 
 if TYPE_CHECKING:
@@ -47,7 +48,9 @@ class A2APlatform(Platform):
         _agent (Agent): The agent this platform belongs to
         agent_card (AgentCard): Contains metadata about the agent's capabilities, interface, connection and so on
         router (A2ARouter): Handles routing of messages between agents and agent to endpoints via RPC
-        tasks (dict): Storage for registering tasks, managing and monitoring their states
+        tasks (TaskStore): Storage for registering tasks, managing and monitoring their states. Finished tasks are
+            evicted (see ``a2a.tasks.max_finished`` and ``a2a.tasks.ttl``), and stored in a SQLite database if
+            ``a2a.tasks.path`` is set
         _port (int): Port number on which this platform will be hosted
         _app (web.Application): Web application to run this platform
     """
@@ -81,7 +84,15 @@ class A2APlatform(Platform):
         self._port: int = self._agent.get_property(a2a.A2A_WEBSOCKET_PORT)
         self._app: web.Application = web.Application()
         self.router: A2ARouter = A2ARouter()
-        self.tasks = {}
+        tasks_path = self._agent.get_property(a2a.A2A_TASKS_PATH)
+        if tasks_path:
+            self.tasks: TaskStore = SQLiteTaskStore(tasks_path,
+                                                    namespace=agent.name,
+                                                    max_finished=self._agent.get_property(a2a.A2A_TASKS_MAX_FINISHED),
+                                                    ttl=self._agent.get_property(a2a.A2A_TASKS_TTL))
+        else:
+            self.tasks: TaskStore = TaskStore(max_finished=self._agent.get_property(a2a.A2A_TASKS_MAX_FINISHED),
+                                              ttl=self._agent.get_property(a2a.A2A_TASKS_TTL))
         self.agent_card: AgentCard = AgentCard(name=agent._name,
                                                version=version,
                                                id=id, 
@@ -124,6 +135,7 @@ class A2APlatform(Platform):
         self.running = False
         sync_coro_call(self._app.shutdown())
         sync_coro_call(self._app.cleanup())
+        self.tasks.close()
         logger.info(f'{self._agent.name}\'s A2APlatform stopped')
     
     def _send(self, session: Session, payload: Payload) -> None:
@@ -214,8 +226,8 @@ class A2APlatform(Platform):
     def get_status(self, task_id: str) -> dict:
         return get_status(task_id, task_storage=self.tasks)
 
-    def list_tasks(self) -> list:
-        return list_all_tasks(task_storage=self.tasks)
+    def list_tasks(self, status: str = None, method: str = None, offset: int = 0, limit: int = None) -> list:
+        return list_all_tasks(task_storage=self.tasks, status=status, method=method, offset=offset, limit=limit)
 
     async def execute_task(self, task_id: str) -> dict:
         return await execute_task(task_id, self.router, task_storage=self.tasks)
@@ -249,93 +261,69 @@ class A2APlatform(Platform):
         # Track under parent task (orchestrator agent's task)
         if parent_task:
             orchestration_task = self.tasks[parent_task["task_id"]]
-            orchestration_task.status = TaskStatus.RUNNING
-            orchestration_task.is_orchestration = True
+            if orchestration_task.status != TaskStatus.RUNNING:
+                orchestration_task.set_status(TaskStatus.RUNNING)
             
             if orchestration_task.result is None:
                 orchestration_task.result = {}
             if "subtasks" not in orchestration_task.result:
                 orchestration_task.result["subtasks"] = []
             
-            orchestration_task.result["subtasks"].append({
+            subtask_entry = {
             "task_id": subtask_info["task_id"],
             "agent_id": target_agent_id,
             "method": method,
             "status": subtask_info.get("status").value if isinstance(subtask_info.get("status"), Enum) else subtask_info.get("status", TaskStatus.PENDING),
             "result": subtask_info.get("result"),
             "error": subtask_info.get("error")
-            })
+            }
+            orchestration_task.result["subtasks"].append(subtask_entry)
+            orchestration_task.subtasks[subtask_info["task_id"]] = subtask_entry # O(1) lookup by subtask id
 
             await orchestration_task.notify_subscribers({
                 "type": "subtask_created",
                 "subtask_id": subtask_info["task_id"],
                 "parent_task_id": parent_task["task_id"]
             })
-        
-        # Launch a watcher coroutine to update parent status in real time
-        async def watch_subtask() -> dict:
-            last_status = None # for SSE
-            last_result = None # for SSE
-            last_error = None # for SSE
-
-            while True:
-                t = target_platform.tasks[subtask_info["task_id"]]
 
-                # for SSE - notify if something changes in the task status/result/upon error
-                if (t.status != last_status) or (t.result != last_result) or (t.error != last_error):
-                    last_status, last_result, last_error = t.status, t.result, t.error
+            # Launch a watcher coroutine to update parent status in real time. It sleeps until the subtask status
+            # changes (no polling), and finishes when the subtask is DONE or failed (ERROR).
+            t = target_platform.tasks[subtask_info["task_id"]] # kept here, since finished tasks can be evicted from the store
 
-                    for st in orchestration_task.result.get("subtasks", []):
-                        if st["task_id"] == subtask_info["task_id"]:
-                            st["status"] = t.status.value if isinstance(t.status, Enum) else t.status
-                            st["result"] = t.result
-                            st["error"] = t.error
-                            break
-                    
-                    # Notify subscribers of any change for SSE
-                    await orchestration_task.notify_subscribers({
-                        "type": "subtask_update",
-                        "parent_task_id": orchestration_task.id,
-                        "subtask": {
-                            **st,
-                            "status": st["status"]  # already a string
-                        }
-                    })
-                    await t.notify_subscribers({
-                        "type": "task_update",
-                        "task_id": t.id,
-                        "status": t.status,
-                        "result": t.result,
-                        "error": t.error
-                    })
-                
-                creation_done = orchestration_task.result.get("creation_done", False)
-                subtasks = orchestration_task.result.get("subtasks", [])
+            async def watch_subtask() -> dict:
+                last_status = None # for SSE
 
-                all_done = len(subtasks) > 0 and all(st["status"] in [TaskStatus.DONE, TaskStatus.ERROR] for st in subtasks)
-                
-                if not creation_done:
-                    # During multiple sequential execution, creation_done is set to True for milliseconds before next task is being added to the list of tasks
-                    # To avoid this false flag and make the following if condition True, we need to wait untill no more tasks are pending to be added.
-                    await asyncio.sleep(0.5)
-                    continue
+                while True:
+                    # for SSE - notify if the task status changed
+                    if t.status != last_status:
+                        last_status = t.status
+                        subtask_entry["status"] = t.status.value if isinstance(t.status, Enum) else t.status
+                        subtask_entry["result"] = t.result
+                        subtask_entry["error"] = t.error
 
-                if creation_done and all_done and orchestration_task.status != TaskStatus.DONE:
-                    # await asyncio.sleep(0.1) # give time for the watcher of the last task to post the subtask_update
-                    if orchestration_task.status == TaskStatus.DONE:
-                        break # If multiple subtask watchers enter this IF condition simultaneously, then only the first watcher can set the status to DONE and proceed forward to post task_final, others will exit here. This done to avoid multiple task_final report in the SSE endpoint.
-                    orchestration_task.status = TaskStatus.DONE
-                    await orchestration_task.notify_subscribers({
-                        "type": "task_final",
-                        "task_id": orchestration_task.id,
-                        "status": orchestration_task.status if not isinstance(orchestration_task.status, Enum) else orchestration_task.status.value,
-                        "result": orchestration_task.result,
-                        "error": orchestration_task.error,
-                    })
-                    break
-                await asyncio.sleep(0.01)
+                        # Notify subscribers of any change for SSE
+                        await orchestration_task.notify_subscribers({
+                            "type": "subtask_update",
+                            "parent_task_id": orchestration_task.id,
+                            "subtask": {
+                                **subtask_entry,
+                                "status": subtask_entry["status"]  # already a string
+                            }
+                        })
+                        await t.notify_subscribers({
+                            "type": "task_update",
+                            "task_id": t.id,
+                            "status": t.status,
+                            "result": t.result,
+                            "error": t.error
+                        })
+                    if t.finished:
+                        return subtask_entry
+                    await asyncio.shield(t.changed())
 
-        asyncio.create_task(watch_subtask()) # invoke watcher for each subtask. Each watcher will be executed in async manner.
+            # Invoke watcher for each subtask. Each watcher will be executed in async manner.
+            # The orchestration task (see register_orchestration_as_task) waits for all of them before finishing.
+            orchestration_task.subtask_watchers[subtask_info["task_id"]] = asyncio.create_task(watch_subtask())
 
         return subtask_info
     
@@ -358,8 +346,8 @@ class A2APlatform(Platform):
         async def runner(**params: dict) -> dict:
             task_info = self.create_task(name, params) # A separate task for orchestration agent
             orchestration_task = self.tasks[task_info["task_id"]]
-            orchestration_task.status = TaskStatus.RUNNING
-            orchestration_task.result = {"subtasks": [], "creation": False}
+            orchestration_task.result = {"subtasks": []}
+            orchestration_task.set_status(TaskStatus.RUNNING)
             
             async def orchestration_coroutine(self_inner, p: dict):
                 # call the user-provided coroutine_func and await results for all subtasks.
@@ -373,24 +361,9 @@ class A2APlatform(Platform):
                 # run the orchestration coroutine function
                 result = await coroutine_func(self_inner, p, registry, tracked_call, orchestration_task)
                 
-                #------------------------------------------------------------------------------------------------------ 
-                # 1. Inform the SSE module that all tasks are created when the final task is created (after return from coroutine function)
-                # 2. Inform the user too (currently not done as it is not useful for the user)
-                # 3. This will prevent SSE from assuming all tasks are done and print the "task_final" report
-                orchestration_task.result["creation_done"] = True
-                # await orchestration_task.notify_subscribers({
-                #     "type": "creation_done",
-                #     "task_id": orchestration_task.id,
-                #     "result": orchestration_task.result
-                # })
-                #------------------------------------------------------------------------------------------------------
-                
-                # Wait for all subtasks (internal Agent's tasks) to finish and update Orchestration Agent's task status
-                subtasks = orchestration_task.result.get("subtasks", [])
-                if subtasks:
-                    while any(registry.get(st["agent_id"]).tasks[st["task_id"]].status not in [TaskStatus.DONE, TaskStatus.ERROR]
-                            for st in subtasks):
-                        await asyncio.sleep(0.05)
+                # Wait for all subtasks (internal Agent's tasks) to finish and their tracked entries to be updated.
+                # The orchestration task status is then updated by execute_task, which notifies "task_final" once.
+                await orchestration_task.wait_subtasks()
                 
                 # Following for loop is required only if the user provides a return from the orchestration function.
                 # In that case, result will not be {}, and this for loop will get executed, else this will be skipped.
@@ -399,18 +372,14 @@ class A2APlatform(Platform):
                 for key, val in result.items():
                     if isinstance(val, dict) and "task_id" in val:
                         # find live subtask entry
-                        for st in orchestration_task.result.get("subtasks", []):
-                            if st["task_id"] == val["task_id"]:
-                                final_result[key] = st
-                                break
+                        if val["task_id"] in orchestration_task.subtasks:
+                            final_result[key] = orchestration_task.subtasks[val["task_id"]]
                     elif key != "subtasks": # to avoid overwriting the tracked subtasks info
                         final_result[key] = val
                 
                 # Update orchestration task result with final results from coroutine_func
                 orchestration_task.result.update(final_result)
 
-                orchestration_task.status = TaskStatus.DONE
-
                 # Remove subtasks from result as soon as execution is done to avoid clutter and repetition.
                 # Currently, the following is commented out as the agent's link to task monitoring endpoint is cut off 
                 # immediately after its execution is finished and before the task status gets updated in the endpoint. 
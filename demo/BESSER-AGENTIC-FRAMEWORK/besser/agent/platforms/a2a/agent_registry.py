@@ -1,20 +1,25 @@
+from __future__ import annotations
+
 # from typing import TYPE_CHECKING
 # if TYPE_CHECKING:
 #     from besser.agent.platforms.a2a.a2a_platform import A2APlatform
 from aiohttp import web
 
 from besser.agent.exceptions.logger import logger
+from besser.agent.platforms.a2a.client import A2AClient
 from besser.agent.platforms.a2a.error_handler import AgentNotFound
 
 class AgentRegistry:
     '''
-    Keeps track of registered A2A agents by ID.
+    Keeps track of registered A2A agents by ID, and of the remote A2A servers (peers) whose agents can be called.
     Attributes:
     _agents: dictionary of registered agents
+    _peers: dictionary of the pooled clients of the peers, by peer name
     '''
 
     def __init__(self):
         self._agents: dict[str, 'A2APlatform'] = {}
+        self._peers: dict[str, A2AClient] = {}
 
     def register(self, agent_id: str, platform: 'A2APlatform') -> None:
         """
@@ -65,3 +70,54 @@ class AgentRegistry:
         if not target_platform:
             raise AgentNotFound(f'Agent ID "{target_agent_id}" not found')
         return await target_platform.router.handle(method, params)
+
+    # Remote agents (peers), i.e. agents registered in other A2A servers
+    def add_peer(self, name: str, base_url: str, **client_kwargs) -> A2AClient:
+        """
+        Register a remote A2A server (peer) and return its client. Its connections are pooled and kept alive, so all
+        the calls to its agents reuse them. client_kwargs are given to A2AClient (e.g., timeout or max_connections).
+        If the peer is already registered with the same URL, its client is returned.
+        """
+        peer = self._peers.get(name)
+        if peer is not None and peer.base == base_url.rstrip("/"):
+            return peer
+        if peer is not None:
+            logger.warning(f'Peer "{name}" moved from {peer.base} to {base_url}')
+        logger.info(f'Registering peer {name} at {base_url}')
+        self._peers[name] = A2AClient(base_url, **client_kwargs)
+        return self._peers[name]
+
+    def get_peer(self, name: str) -> A2AClient:
+        """
+        Get the client of a registered peer
+        """
+        if name not in self._peers:
+            raise AgentNotFound(f'Peer "{name}" not found')
+        return self._peers[name]
+
+    def list_peers(self) -> list:
+        """
+        Return the name and URL of all registered peers.
+        """
+        return [{"name": name, "base": client.base} for name, client in self._peers.items()]
+
+    async def call_peer_method(self, peer: str, agent_id: str, method: str, params: dict) -> dict:
+        """
+        Call a method of an agent of a peer and return its result.
+        """
+        return await self.get_peer(peer).acall(method, params, agent_id=agent_id)
+
+    async def call_peer_methods(self, peer: str, calls: list[dict], return_exceptions: bool = False) -> list:
+        """
+        Call several methods of agents of a peer in a single round-trip (a JSON-RPC batch) and return their results,
+        in the same order. Each call is a dict with the keys agent_id, method and params (see A2AClient.abatch).
+        """
+        return await self.get_peer(peer).abatch(calls, return_exceptions=return_exceptions)
+
+    async def close_peers(self) -> None:
+        """
+        Close the connections to all the peers.
+        """
+        for client in self._peers.values():
+            await client.aclose()
+            client.close()
@@ -1,30 +1,201 @@
-import requests
+import itertools
 import time
+
+import aiohttp
+import requests
 import httpx
 
+from besser.agent.platforms.a2a.error_handler import JSONRPCError
+
+_request_ids = itertools.count(int(time.time() * 1000))
+
+
+def _next_id() -> int:
+    """
+    Get a new JSON-RPC request id (unique within the process).
+    """
+    return next(_request_ids)
+
+
+def _rpc_result(data: dict):
+    """
+    Get the result of a JSON-RPC response, raising its error as a JSONRPCError.
+    """
+    if data.get("error") is not None:
+        error = data["error"]
+        if isinstance(error, dict):
+            raise JSONRPCError(code=error.get("code", -32000), message=error.get("message", "Server error"),
+                               data=error.get("data"))
+        raise JSONRPCError(message=str(error))
+    return data.get("result")
+
+
 class A2AClient:
-    def __init__(self, base_url: str, timeout: int = 20):
+    """
+    A2AClient calls the methods of the agents of an A2A server (see create_app in server.py) with JSON-RPC over HTTP.
+
+    Its connections are pooled and kept alive, so consecutive calls to the same server do not open new connections.
+    The asynchronous methods (acall, abatch) share an aiohttp session with at most max_connections connections, created
+    in the event loop of the first call. Several calls can be sent in a single HTTP request with abatch (a JSON-RPC
+    batch), so an orchestrator can fan out to many agents of a server with one round-trip.
+    The synchronous methods (call, card) share a requests session.
+
+    Args:
+        base_url (str): URL of the A2A server (e.g., http://localhost:8000)
+        timeout (float, optional): Maximum time (in seconds) a request can take. Defaults to 20
+        connect_timeout (float, optional): Maximum time (in seconds) to connect to the server. Defaults to timeout
+        max_connections (int, optional): Maximum number of simultaneous connections to the server. Defaults to 100
+        agent_id (str, optional): Agent called when no agent_id is given in a call. Defaults to None (the server's
+            "default" agent)
+
+    Attributes:
+        base (str): URL of the A2A server
+        timeout (float): Maximum time (in seconds) a request can take
+        connect_timeout (float): Maximum time (in seconds) to connect to the server
+        max_connections (int): Maximum number of simultaneous connections to the server
+        agent_id (str): Agent called when no agent_id is given in a call
+        _session (aiohttp.ClientSession): The pooled session of the asynchronous calls, created when it is needed
+        _sync_session (requests.Session): The pooled session of the synchronous calls, created when it is needed
+    """
+    def __init__(self, base_url: str, timeout: float = 20, connect_timeout: float = None, max_connections: int = 100,
+                 agent_id: str = None):
         self.base = base_url.rstrip("/")
         self.timeout = timeout
+        self.connect_timeout = connect_timeout if connect_timeout is not None else timeout
+        self.max_connections = max_connections
+        self.agent_id = agent_id
+        self._session: aiohttp.ClientSession | None = None
+        self._sync_session: requests.Session | None = None
 
-    def call(self, method: str, params: dict | None = None, id: int | None = None):
-        payload = {"jsonrpc":"2.0","method":method,"params":params or {}, "id": id or int(time.time()*1000)}
-        r = requests.post(f"{self.base}/run", json=payload, timeout=self.timeout)
+    def request_payload(self, method: str, params: dict | None = None, agent_id: str = None, id: int | None = None) -> dict:
+        """
+        Build the JSON-RPC request to call a method of an agent.
+        """
+        payload = {"jsonrpc": "2.0", "method": method, "params": params or {}, "id": id if id is not None else _next_id()}
+        agent_id = agent_id or self.agent_id
+        if agent_id is not None:
+            payload["agent_id"] = agent_id
+        return payload
+
+    def call(self, method: str, params: dict | None = None, id: int | None = None, agent_id: str = None):
+        """
+        Call a method of an agent and return its result (synchronous). JSON-RPC errors are raised as JSONRPCError.
+        """
+        if self._sync_session is None:
+            self._sync_session = requests.Session()
+        r = self._sync_session.post(f"{self.base}/a2a", json=self.request_payload(method, params, agent_id, id),
+                                    timeout=(self.connect_timeout, self.timeout))
         r.raise_for_status()
-        data = r.json()
-        if "error" in data:
-            raise RuntimeError(data["error"])
-        return data["result"]
+        return _rpc_result(r.json())
 
-    def card(self):
-        r = requests.get(f"{self.base}/agent-card", timeout=self.timeout)
+    def card(self, agent_id: str = None):
+        """
+        Get the agent card of an agent (synchronous).
+        """
+        if self._sync_session is None:
+            self._sync_session = requests.Session()
+        r = self._sync_session.get(self._card_url(agent_id), timeout=(self.connect_timeout, self.timeout))
         r.raise_for_status()
         return r.json()
 
+    async def session(self) -> aiohttp.ClientSession:
+        """
+        Get the pooled session of the asynchronous calls (created in the current event loop if needed).
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=self.connect_timeout)
+            )
+        return self._session
+
+    async def acall(self, method: str, params: dict | None = None, agent_id: str = None, id: int | None = None):
+        """
+        Call a method of an agent and return its result. JSON-RPC errors are raised as JSONRPCError.
+        """
+        session = await self.session()
+        async with session.post(f"{self.base}/a2a", json=self.request_payload(method, params, agent_id, id)) as r:
+            r.raise_for_status()
+            return _rpc_result(await r.json(content_type=None))
+
+    async def abatch(self, calls: list[dict], return_exceptions: bool = False) -> list:
+        """
+        Call several methods (of one or more agents of the server) in a single HTTP request (a JSON-RPC batch).
+
+        Each call is a dict with the keys method, params (optional) and agent_id (optional). The results are returned
+        in the same order. JSON-RPC errors are raised as JSONRPCError (the first one) or, if return_exceptions is True,
+        returned in the place of the result of the call that failed.
+        """
+        if not calls:
+            return []
+        payloads = [self.request_payload(c["method"], c.get("params"), c.get("agent_id")) for c in calls]
+        session = await self.session()
+        async with session.post(f"{self.base}/a2a", json=payloads) as r:
+            r.raise_for_status()
+            data = await r.json(content_type=None)
+        if isinstance(data, dict):
+            # The whole batch was rejected (e.g., the server does not support batches)
+            try:
+                _rpc_result(data)
+                raise JSONRPCError(-32600, "Invalid Request")
+            except JSONRPCError as error:
+                if not return_exceptions:
+                    raise
+                return [error] * len(calls)
+        responses = {response.get("id"): response for response in data}
+        results = []
+        for payload in payloads:
+            try:
+                response = responses.get(payload["id"])
+                if response is None:
+                    raise JSONRPCError(-32603, f"No response for the call {payload['method']} (id {payload['id']})")
+                results.append(_rpc_result(response))
+            except JSONRPCError as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    async def acard(self, agent_id: str = None):
+        """
+        Get the agent card of an agent.
+        """
+        session = await self.session()
+        async with session.get(self._card_url(agent_id)) as r:
+            r.raise_for_status()
+            return await r.json(content_type=None)
+
+    async def aclose(self) -> None:
+        """
+        Close the connections of the asynchronous calls.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def close(self) -> None:
+        """
+        Close the connections of the synchronous calls.
+        """
+        if self._sync_session is not None:
+            self._sync_session.close()
+            self._sync_session = None
+
+    async def __aenter__(self) -> 'A2AClient':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+        self.close()
+
+    def _card_url(self, agent_id: str = None) -> str:
+        agent_id = agent_id or self.agent_id
+        return f"{self.base}/agents/{agent_id}/agent-card" if agent_id else f"{self.base}/agent-card"
+
     async def stream(self, method: str, params: dict | None = None):
         async with httpx.AsyncClient(timeout=None) as client:
             async with client.stream("POST", f"{self.base}", json={"jsonrpc":"2.0","method":method,"params":params or {}, "id":int(time.time()*1000)}) as r:
                 async for line in r.aiter_lines():
                     if line.strip():
                         yield line
-                        
\ No newline at end of file
+
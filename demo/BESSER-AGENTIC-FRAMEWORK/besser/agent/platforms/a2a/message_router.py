@@ -1,5 +1,6 @@
 # from typing import TYPE_CHECKING
 
+import asyncio
 import inspect
 
 from aiohttp import web
@@ -45,44 +46,71 @@ class A2ARouter:
     
     async def aiohttp_handler(self, request: Request) -> web.json_response:
         """
-        Handle HTTP requests from the server
+        Handle HTTP requests from the server.
+        The body can be a single JSON-RPC request or a batch (a list of requests), whose requests are executed
+        concurrently and answered in a single response (a list with the response of each request).
         """
-        request_id = None
         try:
             body = await request.json()
-            request_id = body.get("id")
         except Exception:
             logger.error(PARSE_ERROR)
             return web.json_response({
                 "jsonrpc": "2.0", 
                 "error": PARSE_ERROR,
-                "id": request_id
+                "id": None
                 })
         
+        if isinstance(body, list):
+            return web.json_response(await self.handle_batch(body))
+        return web.json_response(await self.handle_rpc(body))
+
+    async def handle_batch(self, batch: list) -> list | dict:
+        """
+        Execute a JSON-RPC batch (its requests are executed concurrently) and return the list of responses, in the same
+        order. An empty batch is an invalid request.
+        """
+        if not batch:
+            logger.error(INVALID_REQUEST)
+            return {"jsonrpc": "2.0", "error": INVALID_REQUEST, "id": None}
+        return list(await asyncio.gather(*(self.handle_rpc(body) for body in batch)))
+
+    async def handle_rpc(self, body: dict) -> dict:
+        """
+        Execute a JSON-RPC request and return its JSON-RPC response (with the result or the error).
+        """
+        if not isinstance(body, dict):
+            logger.error(INVALID_REQUEST)
+            return {
+                "jsonrpc": "2.0", 
+                "error": INVALID_REQUEST, 
+                "id": None
+                }
+        request_id = body.get("id")
+        
         if "method" not in body or not isinstance(body["method"], str):
             logger.error(INVALID_REQUEST)
-            return web.json_response({
+            return {
                 "jsonrpc": "2.0", 
                 "error": INVALID_REQUEST, 
-                "id": body.get("id")
-                })
+                "id": request_id
+                }
         
         method = body['method']
         params = body.get('params', {})
 
         try:
             result = await self.handle(method, params)
-            return web.json_response({
+            return {
             "jsonrpc": "2.0",
             "result": result,
             "id": request_id
-            })
+            }
         except JSONRPCError as e:
-            return web.json_response({
+            return {
                 "jsonrpc": "2.0", 
                 "error": {"code": e.code, "message": e.message}, 
                 "id": request_id
-                })
+                }
         
         except TaskError as e:
             error_map = {
@@ -91,20 +119,20 @@ class A2ARouter:
             "TASK_NOT_FOUND": TASK_NOT_FOUND
             }
             logger.error(error_map.get(e.code, INTERNAL_ERROR))
-            return web.json_response({
+            return {
                 "jsonrpc": "2.0", 
                 "error": error_map.get(e.code, INTERNAL_ERROR), 
                 "id": request_id
-                })
+                }
         except Exception as e:
             # print(f"Error: \n{e}")
             logger.error(f"Internal error: {str(e)}")
-            return web.json_response({
+            return {
                 "jsonrpc": "2.0",
                 "error": {**INTERNAL_ERROR, 
                             "message": str(e)},
                 "id": request_id
-            })
+            }
     
     def register_task_methods(self, platform: 'A2APlatform') -> None:
         """
@@ -113,6 +141,7 @@ class A2ARouter:
         self.register("create_task_and_run", platform.rpc_create_task)
         self.register("task_create", platform.create_task)
         self.register("task_status", platform.get_status)
+        self.register("task_list", platform.list_tasks)
     
     # 
     def register_orchestration_methods(self, platform: 'A2APlatform', registry: AgentRegistry) -> None:
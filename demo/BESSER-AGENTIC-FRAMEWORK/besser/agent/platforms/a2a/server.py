@@ -4,10 +4,12 @@ import json
 import asyncio
 
 from besser.agent.exceptions.logger import logger
-from besser.agent.platforms.a2a.error_handler import error_middleware
+from besser.agent.platforms import a2a
+from besser.agent.platforms.a2a.error_handler import error_middleware, error_response, INVALID_REQUEST
 from besser.agent.platforms.a2a.a2a_platform import A2APlatform
 from besser.agent.platforms.a2a.agent_registry import AgentRegistry
 from besser.agent.platforms.a2a.error_handler import AgentNotFound
+from besser.agent.platforms.a2a.subscriber_queue import SubscriberQueue
 
 async def get_list_of_agents(request: Request) -> web.json_response:
     """
@@ -35,16 +37,29 @@ async def get_agent_card_by_id(request: Request) -> web.json_response:
 
 async def get_task_status_in_agent(request: Request) -> web.json_response:
     """
-    Get list of tasks present in the platform/agent
+    Get list of tasks present in the platform/agent.
+    The tasks can be filtered by status and method, and paginated with offset and limit (given as query parameters),
+    e.g. /agents/<agent_id>/tasks?status=RUNNING&offset=0&limit=50
     """
     platform = get_agent_id_platform(request)
-    return web.json_response(platform.list_tasks())
+    query = request.rel_url.query
+    try:
+        offset = int(query.get("offset", 0))
+        limit = int(query["limit"]) if "limit" in query else None
+    except ValueError:
+        raise web.HTTPBadRequest(text="offset and limit must be integers")
+    return web.json_response(platform.list_tasks(status=query.get("status"),
+                                                 method=query.get("method"),
+                                                 offset=offset,
+                                                 limit=limit))
 
 async def a2a_handler(request: Request) -> web.json_response:
     """
     Handle the incoming HTTP request, from the agent_id, check if agent and platform are valid and the request to the http handler
     """
     body = await request.json()
+    if isinstance(body, list):
+        return web.json_response(await handle_batch(request.app["registry"], body))
     # if you want to make agent_id mandatory in the input, remove "default" and raise exception/error.
     # In the case of multi-agent setup, the client (user) must specify which agent to talk to through agent_id.
     # If agent_id is not specified, it defaults to "default" and changes to a single-agent setup.
@@ -57,9 +72,32 @@ async def a2a_handler(request: Request) -> web.json_response:
     
     return await platform.router.aiohttp_handler(request)
 
+async def handle_batch(registry: AgentRegistry, batch: list) -> list | dict:
+    """
+    Execute a JSON-RPC batch, whose requests can be addressed to different agents of the registry (through their
+    agent_id), concurrently. Return the list of responses, in the same order.
+    """
+    if not batch:
+        logger.error(INVALID_REQUEST)
+        return {"jsonrpc": "2.0", "error": INVALID_REQUEST, "id": None}
+
+    async def handle_rpc(body) -> dict:
+        if not isinstance(body, dict):
+            return {"jsonrpc": "2.0", "error": INVALID_REQUEST, "id": None}
+        agent_id = body.get("agent_id", "default")
+        try:
+            platform = registry.get(agent_id)
+        except ValueError:
+            return error_response(AgentNotFound(message=f'Agent ID "{agent_id}" not found'), body.get("id"))
+        return await platform.router.handle_rpc(body)
+
+    return list(await asyncio.gather(*(handle_rpc(body) for body in batch)))
+
 async def sse_event_handler(request: Request) -> web.StreamResponse: #we use web.StreamResponse as it should be streaming. web.json_response only for REST endpoints.
     """
-    Handle the incoming SSE request, and stream the status continuously
+    Handle the incoming SSE request, and stream the status continuously.
+    Updates are sent as compact JSON. The client gets a bounded queue (see SubscriberQueue), so a slow client makes its
+    updates be dropped/coalesced instead of growing memory, and a heartbeat comment is sent when there are no updates.
     """
     agent_id = request.match_info["agent_id"]
     task_id = request.match_info["task_id"]
@@ -80,34 +118,54 @@ async def sse_event_handler(request: Request) -> web.StreamResponse: #we use web
     )
     await response.prepare(request)
 
-    q = task.subscribe()
+    agent = platform._agent
+    heartbeat_interval = agent.get_property(a2a.A2A_SSE_HEARTBEAT_INTERVAL) or None
+    q = task.subscribe(SubscriberQueue(maxsize=agent.get_property(a2a.A2A_SSE_QUEUE_SIZE),
+                                       overflow_policy=agent.get_property(a2a.A2A_SSE_OVERFLOW_POLICY)))
     try:
         while True:
-            msg = await q.get()
-            await response.write(f"data: {json.dumps(msg, indent=2)}\n\n".encode())
-            await response.drain()
+            try:
+                msg = await asyncio.wait_for(q.get(), timeout=heartbeat_interval)
+            except asyncio.TimeoutError:
+                await response.write(b": heartbeat\n\n")
+                continue
+            await response.write(f"data: {json.dumps(msg, separators=(',', ':'), default=str)}\n\n".encode())
     except asyncio.CancelledError:
         logger.info(f"SSE connection closed by client for the task {task_id} in {agent_id}")
     except Exception as e:
         logger.error(f"SSE dumps failed with: {repr(e)}")
     finally:
         task.unsubscribe(q)
-        logger.info(f"Unsubscribed SSE queue for the task {task_id} in {agent_id}")
+        logger.info(f"Unsubscribed SSE queue for the task {task_id} in {agent_id} (updates: {q.stats})")
 
     return response
 
-# Multi-agent registry (peers). This block is for future use, when agents exist on multiple servers and need to communicate among themselves..
+# Multi-agent registry (peers): agents that exist on other servers, which can be called through the registry
+# (see AgentRegistry.add_peer, AgentRegistry.call_peer_method and AgentRegistry.call_peer_methods)
 #---------------------------------------------------------------------------
 async def list_peers(request: Request) -> web.json_response:
-    return web.json_response(request.app.setdefault("peers", []))
+    """
+    Get the list of peers (remote A2A servers) of the registry
+    """
+    registry: AgentRegistry = request.app["registry"]
+    return web.json_response(registry.list_peers())
 
 async def add_peer(request: Request) -> web.json_response:
+    """
+    Register a peer (remote A2A server) in the registry. Body: {"name": "X", "base": "http://host:port"}
+    """
     body = await request.json()
-    # body: {"name": "X", "base": "http://host:port"}
-    peers = request.app.setdefault("peers", [])
-    if not any(p["base"] == body["base"] for p in peers):
-        peers.extend([{"name": body.get("name", body["base"]), "base": body["base"]}])
-    return web.json_response({"ok": True, "peers": peers})
+    if not isinstance(body, dict) or not isinstance(body.get("base"), str):
+        raise web.HTTPBadRequest(text='The peer must be given as {"name": "X", "base": "http://host:port"}')
+    registry: AgentRegistry = request.app["registry"]
+    registry.add_peer(body.get("name", body["base"]), body["base"])
+    return web.json_response({"ok": True, "peers": registry.list_peers()})
+
+async def close_peers(app: web.Application) -> None:
+    """
+    Close the connections to the peers when the application stops
+    """
+    await app["registry"].close_peers()
 #---------------------------------------------------------------------------
 
 def create_app(platform: A2APlatform = None, registry: AgentRegistry = None) -> web.Application:
@@ -134,4 +192,7 @@ def create_app(platform: A2APlatform = None, registry: AgentRegistry = None) ->
     app.router.add_get("/agents/{agent_id}/agent-card", get_agent_card_by_id)
     app.router.add_get("/agents/{agent_id}/tasks", get_task_status_in_agent)
     app.router.add_get("/agents/{agent_id}/events/{task_id}", sse_event_handler)
+    app.router.add_get("/peers", list_peers)
+    app.router.add_post("/peers", add_peer)
+    app.on_cleanup.append(close_peers)
     return app
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from enum import Enum
+
+
+class OverflowPolicy(str, Enum):
+    """
+    Constants for what a subscriber queue does with a new message when it is full
+    """
+    DROP_OLDEST = "drop_oldest"
+    """The oldest pending message is dropped."""
+
+    COALESCE = "coalesce"
+    """The latest pending status update of the same task is replaced by the new one (the subscriber skips the
+    intermediate snapshots). If there is none, the oldest pending message is dropped. While the queue is not full, no
+    update is replaced."""
+
+
+def coalesce_key(message: dict) -> tuple | None:
+    """
+    Get the key of the messages that can replace each other in a subscriber queue (the status updates and snapshots of
+    the same task), or None if the message can not be replaced (e.g., "subtask_created" or "task_final").
+    """
+    message_type = message.get("type")
+    if message_type == "task_update":
+        return message_type, message.get("task_id")
+    if message_type == "subtask_update":
+        return message_type, (message.get("subtask") or {}).get("task_id")
+    if message_type == "task_snapshot":
+        return (message_type,)
+    return None
+
+
+class SubscriberQueue:
+    """
+    SubscriberQueue is the bounded queue of the messages (task updates) sent to a task subscriber (e.g., an SSE client).
+
+    Publishing a message never blocks: when the subscriber is slower than the task updates, the queue does not grow
+    beyond maxsize, but drops or coalesces messages according to its overflow policy. The number of dropped and
+    coalesced messages is kept as metrics.
+
+    Args:
+        maxsize (int, optional): Maximum number of pending messages. Defaults to 100
+        overflow_policy (OverflowPolicy or str, optional): What to do with a new message when the queue is full.
+            Defaults to OverflowPolicy.COALESCE
+
+    Attributes:
+        maxsize (int): Maximum number of pending messages
+        overflow_policy (OverflowPolicy): What to do with a new message when the queue is full
+        published (int): Number of published messages
+        dropped (int): Number of messages dropped because the queue was full
+        coalesced (int): Number of messages replaced by a newer status update of the same task
+        _messages (deque[list[dict]]): The pending messages, each one in a list so it can be replaced in place
+        _pending_keys (dict[tuple, list[dict]]): The pending messages that can be coalesced, by coalesce key
+        _available (asyncio.Event): Set when there are pending messages
+    """
+
+    def __init__(self, maxsize: int = 100, overflow_policy: OverflowPolicy | str = OverflowPolicy.COALESCE):
+        self.maxsize: int = max(1, maxsize)
+        self.overflow_policy: OverflowPolicy = OverflowPolicy(overflow_policy)
+        self.published: int = 0
+        self.dropped: int = 0
+        self.coalesced: int = 0
+        self._messages: deque[list[dict]] = deque()
+        self._pending_keys: dict[tuple, list[dict]] = {}
+        self._available: asyncio.Event = asyncio.Event()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        The queue metrics: number of published, dropped, coalesced and pending messages.
+        """
+        return {"published": self.published, "dropped": self.dropped, "coalesced": self.coalesced,
+                "pending": len(self._messages)}
+
+    def qsize(self) -> int:
+        return len(self._messages)
+
+    def empty(self) -> bool:
+        return not self._messages
+
+    def full(self) -> bool:
+        return len(self._messages) >= self.maxsize
+
+    def publish(self, message: dict) -> None:
+        """
+        Add a message to the queue without blocking, applying the overflow policy if needed.
+        """
+        self.published += 1
+        key = coalesce_key(message) if self.overflow_policy == OverflowPolicy.COALESCE else None
+        if key is not None and self.full() and key in self._pending_keys:
+            # Only when full, so the subscriber gets every intermediate status as long as it keeps up
+            self._pending_keys[key][0] = message
+            self.coalesced += 1
+            return
+        if self.full():
+            dropped = self._messages.popleft()
+            self._forget(dropped)
+            self.dropped += 1
+        slot = [message]
+        self._messages.append(slot)
+        if key is not None:
+            self._pending_keys[key] = slot
+        self._available.set()
+
+    # asyncio.Queue compatible methods
+    put_nowait = publish
+
+    async def put(self, message: dict) -> None:
+        self.publish(message)
+
+    def get_nowait(self) -> dict:
+        if not self._messages:
+            raise asyncio.QueueEmpty
+        slot = self._messages.popleft()
+        self._forget(slot)
+        if not self._messages:
+            self._available.clear()
+        return slot[0]
+
+    async def get(self) -> dict:
+        """
+        Wait for the next message and remove it from the queue.
+        """
+        while not self._messages:
+            await self._available.wait()
+        return self.get_nowait()
+
+    def _forget(self, slot: list[dict]) -> None:
+        """
+        Remove the coalesce key of a message that is no longer pending.
+        """
+        key = coalesce_key(slot[0])
+        if key is not None and self._pending_keys.get(key) is slot:
+            del self._pending_keys[key]
@@ -3,8 +3,11 @@ import time
 import inspect
 import asyncio
 from enum import Enum
+from typing import Callable
 
 from besser.agent.platforms.a2a.error_handler import TaskError
+from besser.agent.platforms.a2a.subscriber_queue import SubscriberQueue
+from besser.agent.platforms.a2a.task_store import TaskStore
 from besser.agent.exceptions.logger import logger
 
 class TaskStatus(str, Enum):
@@ -16,9 +19,15 @@ class TaskStatus(str, Enum):
     DONE = "DONE"
     ERROR = "ERROR"
 
+FINAL_STATUSES = (TaskStatus.DONE, TaskStatus.ERROR)
+
 class Task:
     """
-    Task initialises each task submitted to the agent that is added to the queue to be executed
+    Task initialises each task submitted to the agent that is added to the queue to be executed.
+    Status changes (see set_status) are pushed to the registered listeners and wake up the coroutines waiting for them
+    (see changed and wait), so no one needs to poll the task status.
+    In the case of orchestration tasks, the tracked subtasks are indexed by id in subtasks (the same entries listed in
+    result["subtasks"]) and their watchers in subtask_watchers.
     """
     def __init__(self, method: str, params: dict):
         self.id = str(uuid.uuid4())
@@ -26,25 +35,110 @@ class Task:
         self.params = params
         self.status = TaskStatus.PENDING
         self.created = time.time()
+        self.finished_at = None
         self.result = None
         self.error = None
         self.subscribers = set()
+        self._closed_subscriber_stats = {"dropped": 0, "coalesced": 0}
+        self.subtasks = {}  # Stores subtask_id -> tracked subtask entry (orchestration tasks)
+        self.subtask_watchers = {}  # Stores subtask_id -> asyncio.Task keeping the subtask entry up to date
+        self._listeners = []
+        self._changed = None
+
+    @property
+    def finished(self) -> bool:
+        """
+        Whether the task is DONE or failed (ERROR).
+        """
+        return self.status in FINAL_STATUSES
+
+    def set_status(self, status: TaskStatus) -> None:
+        """
+        Set the task status (result and error must be set before) and push the change to the listeners and to the
+        coroutines awaiting changed().
+        """
+        self.status = status
+        if self.finished and self.finished_at is None:
+            self.finished_at = time.time()
+        for listener in list(self._listeners):
+            try:
+                listener(self)
+            except Exception as e:
+                logger.error(f"Task {self.id} status listener failed: {e}")
+        if self._changed is not None:
+            if not self._changed.done():
+                self._changed.set_result(status)
+            self._changed = None
+
+    def add_listener(self, listener: Callable[['Task'], None]) -> None:
+        """
+        Register a function called with the task every time its status changes.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[['Task'], None]) -> None:
+        """
+        Unregister a status change listener.
+        """
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def changed(self) -> asyncio.Future:
+        """
+        Return a future resolved with the new status on the next status change of the task.
+        """
+        if self._changed is None:
+            self._changed = asyncio.get_running_loop().create_future()
+        return self._changed
+
+    async def wait(self) -> 'Task':
+        """
+        Wait until the task is DONE or failed (ERROR) and return it.
+        """
+        while not self.finished:
+            await asyncio.shield(self.changed())
+        return self
+
+    async def wait_subtask(self, subtask_id: str) -> dict:
+        """
+        Wait until a tracked subtask is DONE or failed (ERROR) and its entry updated, and return the subtask entry.
+        """
+        if subtask_id not in self.subtasks:
+            raise TaskError("TASK_NOT_FOUND", f"Subtask {subtask_id} not found")
+        watcher = self.subtask_watchers.get(subtask_id)
+        if watcher is not None:
+            await asyncio.shield(watcher)
+        return self.subtasks[subtask_id]
+
+    async def wait_subtasks(self) -> list:
+        """
+        Wait until all the tracked subtasks are DONE or failed (ERROR) and their entries updated.
+        Subtasks created while waiting are waited as well.
+        """
+        while True:
+            pending = [w for w in self.subtask_watchers.values() if not w.done()]
+            if not pending:
+                return list(self.subtasks.values())
+            await asyncio.wait(pending)
     
-    def subscribe(self, q: asyncio.Queue = None) -> asyncio.Queue:
+    def subscribe(self, q: SubscriberQueue | asyncio.Queue = None) -> SubscriberQueue | asyncio.Queue:
         """
-        Return an asyncio.Queue that will receive updates for this task.
+        Return a queue that will receive updates for this task (by default, a bounded SubscriberQueue that coalesces
+        the status updates when the subscriber is slow).
         Caller should read until cancelled/closed.
         """
         if q is None:
-            q = asyncio.Queue()
+            q = SubscriberQueue()
         self.subscribers.add(q)
 
         if hasattr(self, "result") and self.result:
-            q.put_nowait({"type": "task_snapshot", "task": self.result})
+            self._publish(q, {"type": "task_snapshot", "task": self.result})
         
         return q
     
-    def unsubscribe(self, q: asyncio.Queue) -> None:
+    def unsubscribe(self, q: SubscriberQueue | asyncio.Queue) -> None:
         """
         Remove tasks that do not need any monitoring.
         """
@@ -52,21 +146,48 @@ class Task:
             self.subscribers.remove(q)
         except KeyError:
             # It's safe to ignore if the subscriber is not present; no action needed.
-            pass
+            return
+        if isinstance(q, SubscriberQueue):
+            self._closed_subscriber_stats["dropped"] += q.dropped
+            self._closed_subscriber_stats["coalesced"] += q.coalesced
+
+    @property
+    def subscriber_stats(self) -> dict:
+        """
+        Number of updates dropped and coalesced (see SubscriberQueue) for all the subscribers of the task, and number
+        of current subscribers.
+        """
+        stats = {**self._closed_subscriber_stats, "subscribers": len(self.subscribers)}
+        for q in self.subscribers:
+            if isinstance(q, SubscriberQueue):
+                stats["dropped"] += q.dropped
+                stats["coalesced"] += q.coalesced
+        return stats
 
     async def notify_subscribers(self, message: dict) -> None:
         """
-        Push non-blocking message to all subscribers in queues (awaits put).
+        Push non-blocking message to all subscribers in queues. A slow subscriber never blocks the task: its queue
+        drops or coalesces updates when it is full (see SubscriberQueue).
         """
         for q in list(self.subscribers):
-            try:
-                await q.put(message)
-            # except asyncio.QueueFull:
-            except Exception:
-                # if a subscriber is slow, drop updates or consider backpressure
-                pass
+            self._publish(q, message)
+
+    def _publish(self, q: SubscriberQueue | asyncio.Queue, message: dict) -> None:
+        """
+        Push a message to a subscriber queue without blocking.
+        """
+        if isinstance(q, SubscriberQueue):
+            q.publish(message)
+            return
+        try:
+            q.put_nowait(message)
+        except asyncio.QueueFull:
+            # bounded asyncio.Queue given by the subscriber: drop the oldest update
+            q.get_nowait()
+            q.put_nowait(message)
+            self._closed_subscriber_stats["dropped"] += 1
 
-tasks = {}  # Stores task_id and status -> Task
+tasks = TaskStore()  # Stores task_id -> Task (finished tasks are evicted, see TaskStore)
 
 def create_task(method: str, params: dict, task_storage: dict = None) -> dict:
     """
@@ -99,11 +220,17 @@ def get_status(task_id: str, task_storage: dict = None) -> dict:
             "error": t.error
             }
 
-def list_all_tasks(task_storage: dict = None) -> list:
+def list_all_tasks(task_storage: dict = None, status: str = None, method: str = None, offset: int = 0, limit: int = None) -> list:
     """
-    Return status info for all tasks.
+    Return status info for all tasks, optionally filtered by status and/or method, and paginated (offset and limit).
     """
     store = task_storage if task_storage is not None else tasks
+    if isinstance(store, TaskStore):
+        selected = store.list(status=status, method=method, offset=offset, limit=limit)
+    else:
+        selected = [t for t in store.values()
+                    if (status is None or t.status == status) and (method is None or t.method == method)]
+        selected = selected[offset:None if limit is None else offset + limit]
     return [
         {
             "task_id": t.id,
@@ -111,7 +238,7 @@ def list_all_tasks(task_storage: dict = None) -> list:
             "result": t.result,
             "error": t.error
         }
-        for t in store.values()
+        for t in selected
     ]
 
 async def execute_task(task_id: str, router, task_storage: dict = None, coroutine_func=None, params=None) -> dict:
@@ -128,7 +255,7 @@ async def execute_task(task_id: str, router, task_storage: dict = None, coroutin
     t = store.get(task_id)
     
     try:
-        t.status = TaskStatus.RUNNING
+        t.set_status(TaskStatus.RUNNING)
         if coroutine_func:
             result = await coroutine_func(router, params or t.params)
         else:
@@ -137,21 +264,21 @@ async def execute_task(task_id: str, router, task_storage: dict = None, coroutin
         if inspect.iscoroutine(result):
             result = await result
         t.result = result
-        t.status = TaskStatus.DONE
+        t.set_status(TaskStatus.DONE)
     except Exception as e:
-        t.status = TaskStatus.ERROR
         t.error = str(e)
+        t.set_status(TaskStatus.ERROR)
         raise TaskError("TASK_FAILED", t.error)
 
     # notify subscribers of final state
-    if getattr(t, "is_orchestration", False) is False:
-        await t.notify_subscribers({
-            "type": "task_final",
-            "task_id": t.id,
-            "status": t.status,
-            "result": t.result,
-            "error": t.error
-        })
+    # (orchestration tasks only finish once all their subtasks have finished, so this is sent once, after their updates)
+    await t.notify_subscribers({
+        "type": "task_final",
+        "task_id": t.id,
+        "status": t.status,
+        "result": t.result,
+        "error": t.error
+    })
     
     return {
         "task_id": t.id,
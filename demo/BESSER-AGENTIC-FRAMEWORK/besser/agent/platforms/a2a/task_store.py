@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterator
+
+from besser.agent.exceptions.logger import logger
+
+if TYPE_CHECKING:
+    from besser.agent.platforms.a2a.task_protocol import Task
+
+
+class TaskStore:
+    """
+    TaskStore keeps the tasks of an agent (or of the task protocol) in memory, indexed by id, status and method.
+
+    Unfinished tasks are always kept. Finished tasks (DONE or ERROR) are evicted when there are more than max_finished
+    of them (the ones that finished first are evicted first) or when they finished more than ttl seconds ago, so the
+    memory usage of a long-running agent does not grow with the number of tasks it has executed.
+
+    It can be used as a (read-only) dictionary of tasks by id, e.g. store[task_id], store.get(task_id) or
+    task_id in store. Tasks are added with store[task_id] = task or store.add(task).
+
+    Args:
+        max_finished (int, optional): Maximum number of finished tasks kept. Defaults to 1000. None means unbounded.
+        ttl (float, optional): Time (in seconds) a finished task is kept. Defaults to 3600. None means forever.
+
+    Attributes:
+        _max_finished (int): Maximum number of finished tasks kept
+        _ttl (float): Time (in seconds) a finished task is kept
+        _tasks (dict[str, Task]): The tasks by id
+        _by_status (dict[str, dict[str, None]]): The ids of the tasks with each status, in the order they got it
+        _by_method (dict[str, dict[str, None]]): The ids of the tasks of each method, in insertion order
+        _finished (OrderedDict[str, float]): The finish time of the finished tasks, in finish order
+        _statuses (dict[str, str]): The indexed status of each task
+        _evictions (int): Number of evicted tasks
+    """
+
+    def __init__(self, max_finished: int = 1000, ttl: float = 3600.0):
+        self._max_finished: int = max_finished
+        self._ttl: float = ttl
+        self._tasks: dict[str, Task] = {}
+        self._by_status: dict[str, dict[str, None]] = {}
+        self._by_method: dict[str, dict[str, None]] = {}
+        self._finished: OrderedDict[str, float] = OrderedDict()
+        self._statuses: dict[str, str] = {}
+        self._evictions: int = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        The store metrics: number of tasks, of finished tasks and of evicted tasks.
+        """
+        return {"size": len(self._tasks), "finished": len(self._finished), "evictions": self._evictions}
+
+    def __getitem__(self, task_id: str) -> Task:
+        return self._tasks[task_id]
+
+    def __setitem__(self, task_id: str, task: Task) -> None:
+        if task_id != task.id:
+            raise KeyError(f"Task {task.id} can not be stored as {task_id}")
+        self.add(task)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._tasks
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._tasks))
+
+    def get(self, task_id: str, default: Task = None) -> Task | None:
+        """
+        Get a task by id, or default if it is not stored (or has been evicted).
+        """
+        return self._tasks.get(task_id, default)
+
+    def values(self) -> list[Task]:
+        """
+        Get all the stored tasks, in insertion order.
+        """
+        return list(self._tasks.values())
+
+    def add(self, task: Task) -> None:
+        """
+        Store a task. Its status changes are followed to keep the indexes up to date and evict it once finished.
+        """
+        if task.id in self._tasks:
+            return
+        self._tasks[task.id] = task
+        self._by_method.setdefault(task.method, {})[task.id] = None
+        self._index_status(task)
+        task.add_listener(self._on_status_change)
+        self._evict()
+
+    def remove(self, task_id: str) -> Task | None:
+        """
+        Remove a task from the store and return it (None if it is not stored).
+        """
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return None
+        task.remove_listener(self._on_status_change)
+        self._unindex(task)
+        return task
+
+    def list(self, status: str = None, method: str = None, offset: int = 0, limit: int = None) -> list[Task]:
+        """
+        Get the stored tasks, optionally filtered by status and/or method, and paginated. Without a status filter, the
+        tasks are sorted by creation; with it, by the time they got the status.
+        """
+        self._evict()
+        if status is None and method is None:
+            ids = self._tasks
+        elif method is None:
+            ids = self._by_status.get(_status_value(status), {})
+        elif status is None:
+            ids = self._by_method.get(method, {})
+        else:
+            status = _status_value(status)
+            ids = [task_id for task_id in self._by_method.get(method, {}) if self._statuses.get(task_id) == status]
+        offset = max(0, offset or 0)
+        end = None if limit is None else offset + max(0, limit)
+        return [self._tasks[task_id] for task_id in list(ids)[offset:end]]
+
+    def count(self, status: str = None, method: str = None) -> int:
+        """
+        Get the number of stored tasks, optionally filtered by status and/or method.
+        """
+        self._evict()
+        if status is None and method is None:
+            return len(self._tasks)
+        if method is None:
+            return len(self._by_status.get(_status_value(status), {}))
+        if status is None:
+            return len(self._by_method.get(method, {}))
+        return len(self.list(status=status, method=method))
+
+    def close(self) -> None:
+        """
+        Release the resources of the store.
+        """
+
+    def _on_status_change(self, task: Task) -> None:
+        """
+        Update the status index of a task after a status change, and evict the expired finished tasks.
+        """
+        if task.id not in self._tasks:
+            return
+        self._index_status(task)
+        self._evict()
+
+    def _index_status(self, task: Task) -> None:
+        status = _status_value(task.status)
+        previous = self._statuses.get(task.id)
+        if previous != status:
+            if previous is not None:
+                self._by_status[previous].pop(task.id, None)
+            self._by_status.setdefault(status, {})[task.id] = None
+            self._statuses[task.id] = status
+        if task.finished and task.id not in self._finished:
+            self._finished[task.id] = task.finished_at or time.time()
+        elif not task.finished:
+            self._finished.pop(task.id, None)
+
+    def _unindex(self, task: Task) -> None:
+        status = self._statuses.pop(task.id, None)
+        if status is not None:
+            self._by_status[status].pop(task.id, None)
+        method_ids = self._by_method.get(task.method)
+        if method_ids is not None:
+            method_ids.pop(task.id, None)
+            if not method_ids:
+                del self._by_method[task.method]
+        self._finished.pop(task.id, None)
+
+    def _evict(self) -> None:
+        """
+        Evict the finished tasks exceeding max_finished and the ones that finished more than ttl seconds ago.
+        """
+        expiration = None if self._ttl is None else time.time() - self._ttl
+        while self._finished:
+            task_id, finished_at = next(iter(self._finished.items()))
+            too_many = self._max_finished is not None and len(self._finished) > self._max_finished
+            if not too_many and (expiration is None or finished_at >= expiration):
+                break
+            self.remove(task_id)
+            self._evictions += 1
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    SQLiteTaskStore is a TaskStore that also stores the tasks in a SQLite database, so they survive a restart of the
+    agent. Tasks are written when they are added and every time their status changes (results and errors must be
+    JSON serializable, otherwise their string representation is stored), and deleted from the database when they are
+    evicted.
+
+    The tasks that were not finished when the agent stopped can not be resumed: they are loaded as failed (ERROR).
+
+    Several stores (e.g., the ones of all the agents of a registry) can share the same database with different
+    namespaces.
+
+    Args:
+        path (str): Path of the SQLite database file
+        namespace (str, optional): Name that identifies the tasks of this store in the database. Defaults to 'default'
+        max_finished (int, optional): Maximum number of finished tasks kept. Defaults to 1000. None means unbounded.
+        ttl (float, optional): Time (in seconds) a finished task is kept. Defaults to 3600. None means forever.
+
+    Attributes:
+        _path (str): Path of the SQLite database file
+        _namespace (str): Name that identifies the tasks of this store in the database
+        _connection (sqlite3.Connection or None): The connection to the database, opened when it is needed
+    """
+
+    def __init__(self, path: str, namespace: str = "default", max_finished: int = 1000, ttl: float = 3600.0):
+        super().__init__(max_finished=max_finished, ttl=ttl)
+        self._path: str = path
+        self._namespace: str = namespace
+        self._connection: sqlite3.Connection | None = None
+        self._load()
+
+    def add(self, task: Task) -> None:
+        if task.id in self._tasks:
+            return
+        super().add(task)
+        if task.id in self._tasks:
+            self._store(task)
+
+    def remove(self, task_id: str) -> Task | None:
+        task = super().remove(task_id)
+        if task is not None:
+            self._delete([task_id])
+        return task
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _on_status_change(self, task: Task) -> None:
+        super()._on_status_change(task)
+        if task.id in self._tasks:
+            self._store(task)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Connect to the database (if not connected yet), creating the tasks table if necessary.
+        """
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS a2a_tasks ("
+                    "namespace TEXT NOT NULL, id TEXT NOT NULL, method TEXT NOT NULL, params TEXT, "
+                    "status TEXT NOT NULL, created REAL NOT NULL, finished REAL, result TEXT, error TEXT, "
+                    "PRIMARY KEY (namespace, id))"
+                )
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS a2a_tasks_finished ON a2a_tasks (namespace, finished)"
+                )
+        return self._connection
+
+    def _load(self) -> None:
+        """
+        Load the tasks of the namespace from the database.
+        """
+        from besser.agent.platforms.a2a.task_protocol import Task, TaskStatus
+
+        try:
+            rows = self._connect().execute(
+                "SELECT id, method, params, status, created, finished, result, error FROM a2a_tasks "
+                "WHERE namespace = ? ORDER BY created", (self._namespace,)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"A2A tasks could not be loaded from {self._path}: {e}")
+            return
+        for task_id, method, params, status, created, finished, result, error in rows:
+            task = Task(method, json.loads(params) if params else {})
+            task.id = task_id
+            task.created = created
+            task.result = json.loads(result) if result else None
+            task.error = error
+            task.status = TaskStatus(status)
+            task.finished_at = finished
+            interrupted = not task.finished
+            if interrupted:
+                task.error = "Task interrupted by an agent restart"
+                task.status = TaskStatus.ERROR
+                task.finished_at = time.time()
+            super().add(task)
+            if interrupted and task.id in self._tasks:
+                self._store(task)
+        logger.info(f"Loaded {len(self._tasks)} A2A tasks of {self._namespace} from {self._path}")
+
+    def _store(self, task: Task) -> None:
+        """
+        Write a task in the database. Errors are logged, since the tasks are still kept in memory.
+        """
+        try:
+            with self._connect():
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO a2a_tasks "
+                    "(namespace, id, method, params, status, created, finished, result, error) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self._namespace, task.id, task.method, json.dumps(task.params, default=str),
+                     _status_value(task.status), task.created, task.finished_at,
+                     json.dumps(task.result, default=str) if task.result is not None else None,
+                     None if task.error is None else str(task.error))
+                )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.error(f"A2A task {task.id} could not be stored in {self._path}: {e}")
+
+    def _delete(self, task_ids: list[str]) -> None:
+        """
+        Delete tasks from the database.
+        """
+        try:
+            with self._connect():
+                self._connection.executemany(
+                    "DELETE FROM a2a_tasks WHERE namespace = ? AND id = ?",
+                    [(self._namespace, task_id) for task_id in task_ids]
+                )
+        except sqlite3.Error as e:
+            logger.error(f"A2A tasks could not be deleted from {self._path}: {e}")
+
+
+def _status_value(status) -> str:
+    """
+    Get the string value of a task status (TaskStatus or str).
+    """
+    return getattr(status, "value", status)
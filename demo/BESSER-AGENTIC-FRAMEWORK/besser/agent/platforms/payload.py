@@ -1,7 +1,14 @@
+import base64
 import json
+import struct
 
 from enum import Enum
 
+BINARY_FRAME_MAGIC = b'BAF1'
+"""bytes: The first bytes of a binary payload frame (see :meth:`Payload.encode`)."""
+
+_BINARY_FRAME_HEADER = struct.Struct('!4sI')
+
 
 class PayloadAction(Enum):
     """Enumeration of the different possible actions embedded into a :class:`Payload`."""
@@ -69,30 +76,84 @@ class PayloadAction(Enum):
     (see :class:`besser.agent.nlp.rag.rag.RAGMessage`).
     """
 
+    AGENT_REPLY_STREAM = 'agent_reply_stream'
+    """PayloadAction: Indicates that the payload's purpose is to send a chunk of an agent reply that is still being
+    generated (e.g., by an LLM). The payload message is a dictionary containing the stream id and the chunk. When the
+    reply is complete, it is sent as a regular reply (e.g., :obj:`AGENT_REPLY_STR` or :obj:`AGENT_REPLY_RAG`), which
+    replaces the chunks received so far."""
+
     AGENT_REPLY_AUDIO = 'agent_reply_audio'
     """PayloadAction: Indicates that the payload's purpose is to send an agent reply containing an audio, which is a
-    dictionary containing the audio data (as a base 64 String) and the metadata to reconstruct the audio array, composed
-    of sample_rate, dtype and shape."""
+    dictionary containing the audio data (as a base 64 String, or as raw bytes in a binary frame) and the metadata to
+    reconstruct the audio array, composed of sample_rate, dtype and shape."""
 
     FETCH_USER_MESSAGES = 'fetch_user_messages'
     """PayloadAction: Request to fetch old messages for a given user."""
 
+    HISTORY_BATCH = 'history_batch'
+    """PayloadAction: Indicates that the payload's purpose is to send a page of old messages of a user (as a reply to
+    :obj:`FETCH_USER_MESSAGES`). The payload message is a list of dictionaries, each one containing the message content
+    and whether it was sent by the user or not."""
+
+
+BINARY_DATA_FIELDS: dict[str, str or None] = {
+    PayloadAction.USER_VOICE.value: None,
+    PayloadAction.USER_FILE.value: 'base64',
+    PayloadAction.AGENT_REPLY_FILE.value: 'base64',
+    PayloadAction.AGENT_REPLY_IMAGE.value: None,
+    PayloadAction.AGENT_REPLY_AUDIO.value: 'audio_data_base64',
+}
+"""dict[str, str or None]: Where the binary data (:attr:`Payload.data`) of a payload goes in its JSON message, as a base64
+string, by payload action: the name of the message field, or None if the message is the base64 string itself."""
+
 
 class Payload:
     """Represents a payload object used for encoding and decoding messages between an agent and any other external agent.
+
+    The binary content of a payload (e.g., the audio of :obj:`~PayloadAction.USER_VOICE` or
+    :obj:`~PayloadAction.AGENT_REPLY_AUDIO`, or the file of :obj:`~PayloadAction.AGENT_REPLY_FILE`) can be kept apart
+    from the message, as raw bytes (:attr:`data`). Then, the payload can be encoded as a binary frame, which contains
+    a small header (the :data:`BINARY_FRAME_MAGIC` bytes and the length of the JSON-encoded action and message) followed
+    by the raw bytes, avoiding the base64 encoding (and its size overhead) of the JSON payloads. When it is encoded as
+    JSON, the data is added to the message as a base64 string (see :data:`BINARY_DATA_FIELDS`), the same way
+    as the payloads without data, so clients that do not support binary frames receive the same JSON payloads.
+    Conversely, a payload whose message contains a base64 string can be split into header and data with
+    :meth:`split_data`.
+
+    Args:
+        action (PayloadAction): the payload action
+        message (str or dict): the payload message
+        history (bool): whether the payload contains history messages or not
+        data (bytes): the binary content of the payload, if it is not included in the message
+
+    Attributes:
+        action (str): The payload action
+        message (str or dict): The payload message
+        history (bool): Whether the payload contains history messages or not
+        data (bytes or None): The binary content of the payload, if it is not included in the message
     """
 
     @staticmethod
     def decode(payload_str):
-        """Decode a JSON payload string into a :class:`Payload` object.
+        """Decode a JSON payload string or a binary payload frame into a :class:`Payload` object.
 
         Args:
-            payload_str (str or dict): A JSON-encoded payload string.
+            payload_str (str or bytes): A JSON-encoded payload string, or a binary payload frame (see :meth:`encode`).
 
         Returns:
             Payload or None: A Payload object if the decoding is successful,
             None otherwise.
         """
+        data = None
+        if isinstance(payload_str, (bytes, bytearray, memoryview)):
+            frame = memoryview(payload_str)
+            if frame[:len(BINARY_FRAME_MAGIC)] == BINARY_FRAME_MAGIC:
+                _, header_size = _BINARY_FRAME_HEADER.unpack_from(frame)
+                header_end = _BINARY_FRAME_HEADER.size + header_size
+                payload_str = frame[_BINARY_FRAME_HEADER.size:header_end].tobytes()
+                data = frame[header_end:].tobytes()
+            else:
+                payload_str = frame.tobytes()
         payload_dict = json.loads(payload_str)
         payload_action = payload_dict['action']
         payload_message = payload_dict['message']
@@ -100,13 +161,87 @@ class Payload:
 
         for action in PayloadAction:
             if action.value == payload_action:
-                return Payload(action, payload_message, history=history)
+                return Payload(action, payload_message, history=history, data=data)
         return None
 
-    def __init__(self, action: PayloadAction, message: str or dict = None, history: bool = False):
+    def __init__(self, action: PayloadAction, message: str or dict = None, history: bool = False, data: bytes = None):
         self.action: str = action.value
         self.message: str or dict = message
         self.history: bool = history
+        self.data: bytes or None = data
+
+    def encode(self, binary: bool = False) -> str or bytes:
+        """Encode the payload, as a JSON string or as a binary frame.
+
+        Args:
+            binary (bool): whether to encode the payload as a binary frame (only if it has binary :attr:`data`, otherwise
+                it is always encoded as JSON)
+
+        Returns:
+            str or bytes: the JSON-encoded payload, or the binary frame
+        """
+        if not binary or self.data is None:
+            return json.dumps(self, cls=PayloadEncoder)
+        header = json.dumps({'action': self.action, 'message': self.message, 'history': self.history}).encode('utf-8')
+        return b''.join((_BINARY_FRAME_HEADER.pack(BINARY_FRAME_MAGIC, len(header)), header, self.data))
+
+    def split_data(self, data: bytes = None) -> 'Payload':
+        """Get the payload with the base64 string of its message (see :data:`BINARY_DATA_FIELDS`) moved to
+        :attr:`data`, as raw bytes, so it can be encoded as a binary frame.
+
+        Agent replies keep their content in the message (e.g., so the agent processors receive all of it), and are only
+        split when they are sent to a client that supports binary frames.
+
+        Args:
+            data (bytes): the raw bytes of the base64 string, if they are already known. Then, the base64 string is
+                not decoded
+
+        Returns:
+            Payload: a new payload with the binary content in :attr:`data`, or this payload if it has no base64 string
+            in its message (or already has binary data)
+        """
+        if self.data is not None or self.action not in BINARY_DATA_FIELDS or self.message is None:
+            return self
+        field = BINARY_DATA_FIELDS[self.action]
+        message = self.message
+        try:
+            if field is None:
+                if not isinstance(message, str):
+                    return self
+                if data is None:
+                    data = base64.b64decode(message, validate=True)
+                message = None
+            else:
+                if isinstance(message, str):
+                    message = json.loads(message)
+                if not isinstance(message, dict) or not isinstance(message.get(field), str):
+                    return self
+                if data is None:
+                    data = base64.b64decode(message[field], validate=True)
+                message = {key: value for key, value in message.items() if key != field}
+        except ValueError:
+            # Not a base64 string (e.g., modified by an agent processor), it is sent as it is
+            return self
+        return Payload(PayloadAction(self.action), message, history=self.history, data=data)
+
+    def get_data(self) -> bytes or None:
+        """Get the binary content of the payload, either from :attr:`data` or decoding the base64 string of the message
+        (see :data:`BINARY_DATA_FIELDS`).
+
+        Returns:
+            bytes or None: the binary content of the payload, or None if it has no binary content
+        """
+        if self.data is not None:
+            return self.data
+        if self.action not in BINARY_DATA_FIELDS or self.message is None:
+            return None
+        field = BINARY_DATA_FIELDS[self.action]
+        message = self.message
+        if field is None:
+            return base64.b64decode(message)
+        if isinstance(message, str):
+            message = json.loads(message)
+        return base64.b64decode(message[field])
 
 
 class PayloadEncoder(json.JSONEncoder):
@@ -129,10 +264,22 @@ class PayloadEncoder(json.JSONEncoder):
             dict: the serialized payload
         """
         if isinstance(obj, Payload):
+            message = obj.message
+            data = getattr(obj, 'data', None)
+            if data is not None:
+                # The binary data is included in the message as a base64 string
+                data_base64 = base64.b64encode(data).decode('utf-8')
+                field = BINARY_DATA_FIELDS.get(obj.action)
+                if field is None:
+                    message = data_base64
+                elif isinstance(message, str):
+                    message = json.dumps({**json.loads(message), field: data_base64})
+                else:
+                    message = {**(message or {}), field: data_base64}
             # Convert the Payload object to a dictionary
             payload_dict = {
                 'action': obj.action,
-                'message': obj.message,
+                'message': message,
                 'history': getattr(obj, 'history', None),
             }
             return payload_dict
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 from besser.agent.platforms.payload import Payload
 
@@ -61,3 +61,20 @@ class Platform(ABC):
             message (str): the message to send to the user
         """
         pass
+
+    def reply_stream(self, session: 'Session', chunks: Iterable[str]) -> str:
+        """Send an agent reply, i.e. a text message, to a specific user while it is being generated.
+
+        Platforms supporting it send every chunk as soon as it is available. By default, the chunks are joined and the
+        complete message is sent with :meth:`reply`.
+
+        Args:
+            session (Session): the user session
+            chunks (Iterable[str]): the chunks of the message to send to the user
+
+        Returns:
+            str: the complete message
+        """
+        message = ''.join(chunks)
+        self.reply(session, message)
+        return message
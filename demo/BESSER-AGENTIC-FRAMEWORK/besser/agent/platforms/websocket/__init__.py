@@ -123,3 +123,29 @@ type: ``str``
 
 default value: ``medium``
 """
+
+WEBSOCKET_HISTORY_PAGE_SIZE = Property(SECTION_WEBSOCKET, 'websocket.history_page_size', int, 100)
+"""
+The number of messages sent in each payload when a client fetches a user's chat history.
+
+name: ``websocket.history_page_size``
+
+type: ``int``
+
+default value: ``100``
+"""
+
+WEBSOCKET_BINARY_FRAMES = Property(SECTION_WEBSOCKET, 'websocket.binary_frames', bool, True)
+"""
+Whether to send the binary content of the agent replies (audios, images and files) as binary WebSocket frames, i.e.
+raw bytes instead of base64 strings within JSON payloads (see :meth:`~besser.agent.platforms.payload.Payload.encode`).
+It is only done for the clients that support them (they connect with the ``binary_frames=1`` query parameter, like the
+Streamlit UI), the other clients keep receiving JSON payloads. Binary frames sent by the clients (e.g., voice messages)
+are always accepted.
+
+name: ``websocket.binary_frames``
+
+type: ``bool``
+
+default value: ``True``
+"""
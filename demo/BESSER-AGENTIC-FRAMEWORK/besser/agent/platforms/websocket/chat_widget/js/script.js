@@ -59,7 +59,12 @@ function renderChatWidget(args) {
     ws.onmessage = (event) => {
       try {
         const payload = JSON.parse(event.data);
-        displayMessage(payload, 'agent-message');
+        if (payload.action === 'agent_reply_stream') {
+          displayStreamChunk(payload);
+        } else {
+          endStream();
+          displayMessage(payload, 'agent-message');
+        }
       } catch (error) {
         console.error('Error parsing message:', error);
       }
@@ -425,6 +430,27 @@ function displayMessage(payload, className) {
     chatMessages.scrollTop = chatMessages.scrollHeight; // Scroll to latest message
 }
 
+// Agent reply being received in chunks. The complete reply, received at the end, replaces it
+let streamingElement = null;
+
+function displayStreamChunk(payload) {
+    const chatMessages = document.getElementById('chat-messages');
+    if (!streamingElement) {
+        streamingElement = getMessageStr('');
+        streamingElement.classList.add('agent-message');
+        chatMessages.appendChild(streamingElement);
+    }
+    streamingElement.textContent += payload.message.chunk;
+    chatMessages.scrollTop = chatMessages.scrollHeight; // Scroll to latest message
+}
+
+function endStream() {
+    if (streamingElement) {
+        streamingElement.remove();
+        streamingElement = null;
+    }
+}
+
 function toggleChatWindow() {
     const chatWindow = document.getElementById('chat-window');
     if (chatWindow.classList.contains('visible')) {
@@ -10,6 +10,7 @@ from besser.agent.core.file import File
 from besser.agent.core.message import Message, MessageType
 from besser.agent.platforms.payload import Payload, PayloadAction, PayloadEncoder
 from besser.agent.platforms.websocket.streamlit_ui.audio_queue import enqueue_audio_playback
+from besser.agent.platforms.websocket.streamlit_ui.streaming_reply import StreamingReply
 from besser.agent.platforms.websocket.streamlit_ui.initialization import (
     ensure_websocket_connection,
     reconnect_websocket,
@@ -18,6 +19,7 @@ from besser.agent.platforms.websocket.streamlit_ui.vars import (
     TYPING_TIME,
     HISTORY,
     QUEUE,
+    STREAMING_REPLY,
     ASSISTANT,
     USER,
     WEBSOCKET_READY,
@@ -63,10 +65,16 @@ def write_message(message: Message, key_count: int, stream: bool = False):
                 st.audio(message.content, format="audio/wav")
 
         elif message.type == MessageType.FILE:
-            file: File = File.from_dict(message.content)
-            file_name = file.name
-            file_type = file.type
-            file_data = base64.b64decode(file.base64.encode('utf-8'))
+            if message.content.get('data') is not None:
+                # File received (or sent) as raw bytes in a binary frame
+                file_name = message.content['name']
+                file_type = message.content['type']
+                file_data = message.content['data']
+            else:
+                file: File = File.from_dict(message.content)
+                file_name = file.name
+                file_type = file.type
+                file_data = base64.b64decode(file.base64.encode('utf-8'))
             st.download_button(label='Download ' + file_name, file_name=file_name, data=file_data, mime=file_type, key=key)
 
         elif message.type == MessageType.IMAGE:
@@ -130,6 +138,20 @@ def write_message(message: Message, key_count: int, stream: bool = False):
             write_or_stream(message.content, stream=(stream and isinstance(message.content, str)))
 
 
+def write_streaming_reply(reply: StreamingReply):
+    """Show an agent reply while its chunks are being received. It returns when the complete reply is received."""
+    with st.chat_message(ASSISTANT):
+        st.write_stream(reply.stream())
+
+
+def _write_chat_message(message: Message, key_count: int, stream: bool):
+    reply: StreamingReply = st.session_state.get(STREAMING_REPLY)
+    if reply is not None and message is reply.message and not reply.done:
+        write_streaming_reply(reply)
+    else:
+        write_message(message, key_count, stream=stream)
+
+
 def _send_user_profile_if_needed(ws) -> None:
     """Send the selected user profile name to the agent once per Streamlit session."""
     profile_name = st.session_state.get("user_profile")
@@ -179,13 +201,13 @@ def load_chat():
 
     key_count = 0
     for message in st.session_state[HISTORY]:
-        write_message(message, key_count, stream=False)
+        _write_chat_message(message, key_count, stream=False)
         key_count += 1
 
     while not st.session_state[QUEUE].empty():
         message = st.session_state[QUEUE].get()
         st.session_state[HISTORY].append(message)
-        write_message(message, key_count, stream=True)
+        _write_chat_message(message, key_count, stream=True)
         key_count += 1
     if websocket_ready:
         ws = ensure_websocket_connection()
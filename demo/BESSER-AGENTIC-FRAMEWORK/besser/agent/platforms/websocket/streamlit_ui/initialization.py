@@ -13,6 +13,7 @@ from besser.agent.platforms.websocket.streamlit_ui.vars import (
     SUBMIT_TEXT,
     HISTORY,
     QUEUE,
+    STREAMING_REPLY,
     WEBSOCKET,
     SESSION_MONITORING,
     SUBMIT_AUDIO,
@@ -47,7 +48,7 @@ def _start_websocket(host: str, port: str):
     try:
         if st.session_state.get("username"):
             ws = websocket.WebSocketApp(
-                f"ws://{host}:{port}/",
+                f"ws://{host}:{port}/?binary_frames=1",
                 header={"X-User-ID": st.session_state["username"]},
                 on_open=on_open,
                 on_message=on_message,
@@ -58,7 +59,7 @@ def _start_websocket(host: str, port: str):
             )
         else:
             ws = websocket.WebSocketApp(
-                f"ws://{host}:{port}/",
+                f"ws://{host}:{port}/?binary_frames=1",
                 on_open=on_open,
                 on_message=on_message,
                 on_error=on_error,
@@ -129,6 +130,9 @@ def initialize():
     if QUEUE not in st.session_state:
         st.session_state[QUEUE] = queue.Queue()
 
+    if STREAMING_REPLY not in st.session_state:
+        st.session_state[STREAMING_REPLY] = None
+
     if "fetched_user_messages" not in st.session_state:
         st.session_state["fetched_user_messages"] = False
 
@@ -1,11 +1,10 @@
-import base64
 import json
 import queue
 from datetime import datetime
 
 import streamlit as st
+from websocket import ABNF
 
-from besser.agent.core.file import File
 from besser.agent.core.message import MessageType, Message
 from besser.agent.platforms.payload import PayloadEncoder, PayloadAction, Payload
 from besser.agent.platforms.websocket.streamlit_ui.audio_queue import stop_audio_playback
@@ -31,13 +30,12 @@ def sidebar():
         if st.session_state[SUBMIT_AUDIO]:
             st.session_state[SUBMIT_AUDIO] = False
             voice_bytes = voice_bytes_io.read()
-            # Encode the audio bytes to a base64 string
             voice_message = Message(t=MessageType.AUDIO, content=voice_bytes, is_user=True, timestamp=datetime.now())
             st.session_state.history.append(voice_message)
-            voice_base64 = base64.b64encode(voice_bytes).decode('utf-8')
-            payload = Payload(action=PayloadAction.USER_VOICE, message=voice_base64)
+            # The audio bytes are sent as they are, in a binary frame
+            payload = Payload(action=PayloadAction.USER_VOICE, data=voice_bytes)
             try:
-                ws.send(json.dumps(payload, cls=PayloadEncoder))
+                ws.send(payload.encode(binary=True), opcode=ABNF.OPCODE_BINARY)
             except Exception as e:
                 st.error('Your message could not be sent. The connection is already closed')
 
@@ -50,14 +48,14 @@ def sidebar():
         if st.session_state[SUBMIT_FILE]:
             st.session_state[SUBMIT_FILE] = False
             bytes_data = uploaded_file.read()
-            file_object = File(file_base64=base64.b64encode(bytes_data).decode('utf-8'), file_name=uploaded_file.name,
-                               file_type=uploaded_file.type)
-            payload = Payload(action=PayloadAction.USER_FILE, message=file_object.get_json_string())
-            file_message = Message(t=MessageType.FILE, content=file_object.to_dict(), is_user=True,
+            file_info = {'name': uploaded_file.name, 'type': uploaded_file.type}
+            # The file bytes are sent as they are, in a binary frame
+            payload = Payload(action=PayloadAction.USER_FILE, message=file_info, data=bytes_data)
+            file_message = Message(t=MessageType.FILE, content={**file_info, 'data': bytes_data}, is_user=True,
                                    timestamp=datetime.now())
             st.session_state.history.append(file_message)
             try:
-                ws.send(json.dumps(payload, cls=PayloadEncoder))
+                ws.send(payload.encode(binary=True), opcode=ABNF.OPCODE_BINARY)
             except Exception as e:
                 st.error('Your message could not be sent. The connection is already closed')
 
@@ -0,0 +1,73 @@
+import threading
+from datetime import datetime
+from typing import Iterator
+
+from besser.agent.core.message import Message, MessageType
+
+
+class StreamingReply:
+    """An agent reply that is being received in chunks (see
+    :obj:`~besser.agent.platforms.payload.PayloadAction.AGENT_REPLY_STREAM`).
+
+    The reply message is added to the chat as soon as the first chunk arrives, and its content grows with every chunk.
+    When the complete reply arrives, it replaces the message content.
+
+    Args:
+        stream_id (str): the id of the stream
+
+    Attributes:
+        id (str): The id of the stream
+        message (Message): The reply message, shown in the chat
+        done (bool): Whether the complete reply has been received or not
+        _updated (threading.Event): Set every time the reply is updated
+    """
+
+    def __init__(self, stream_id: str):
+        self.id: str = stream_id
+        self.message: Message = Message(t=MessageType.STR, content='', is_user=False, timestamp=datetime.now())
+        self.done: bool = False
+        self._updated: threading.Event = threading.Event()
+
+    def add_chunk(self, chunk: str) -> None:
+        """Add a chunk to the reply.
+
+        Args:
+            chunk (str): the chunk
+        """
+        self.message.content += chunk
+        self._updated.set()
+
+    def finish(self, message: Message) -> None:
+        """Set the complete reply.
+
+        Args:
+            message (Message): the complete reply
+        """
+        self.message.type = message.type
+        self.message.content = message.content
+        self.message.timestamp = message.timestamp
+        self.done = True
+        self._updated.set()
+
+    def stream(self, timeout: float = 1.0) -> Iterator[str]:
+        """Iterate over the reply text, from the beginning, as it is received (to show it with
+        :func:`streamlit.write_stream`). The iteration ends when the complete reply is received.
+
+        Args:
+            timeout (float): the maximum time (in seconds) to wait for a new chunk before checking again whether the
+                reply is complete
+
+        Returns:
+            Iterator[str]: the reply text, chunk by chunk
+        """
+        position = 0
+        while True:
+            self._updated.clear()
+            content = self.message.content
+            if self.done or not isinstance(content, str):
+                return
+            if len(content) > position:
+                yield content[position:]
+                position = len(content)
+            else:
+                self._updated.wait(timeout)
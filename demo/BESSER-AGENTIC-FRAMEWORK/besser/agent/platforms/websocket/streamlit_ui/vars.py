@@ -3,6 +3,7 @@ ASSISTANT = 'assistant'
 BUTTONS = 'buttons'
 HISTORY = 'history'
 QUEUE = 'queue'
+STREAMING_REPLY = 'streaming_reply'
 SESSION_MONITORING = 'session_monitoring'
 SUBMIT_FILE = 'submit_file'
 SUBMIT_TEXT = 'submit_text'
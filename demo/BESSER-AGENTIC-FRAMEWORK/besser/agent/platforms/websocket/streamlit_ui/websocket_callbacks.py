@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import base64
 import json
 from datetime import datetime
 from io import StringIO
@@ -12,7 +11,8 @@ from besser.agent.core.message import MessageType, Message
 from besser.agent.exceptions.logger import logger
 from besser.agent.platforms.payload import PayloadAction, Payload
 from besser.agent.platforms.websocket.streamlit_ui.session_management import get_streamlit_session
-from besser.agent.platforms.websocket.streamlit_ui.vars import QUEUE, HISTORY, WEBSOCKET_READY
+from besser.agent.platforms.websocket.streamlit_ui.streaming_reply import StreamingReply
+from besser.agent.platforms.websocket.streamlit_ui.vars import QUEUE, HISTORY, STREAMING_REPLY, WEBSOCKET_READY
 
 try:
     import cv2
@@ -29,9 +29,34 @@ except ImportError:
 def on_message(ws, payload_str):
     # https://github.com/streamlit/streamlit/issues/2838
     streamlit_session = get_streamlit_session()
+    # payload_str is a JSON string, or a binary frame (bytes) if the payload has binary data (e.g., audio or images)
     payload: Payload = Payload.decode(payload_str)
     content = None
     is_user = False
+    if payload.action == PayloadAction.HISTORY_BATCH.value:
+        # A page of old messages is added to the history at once, with a single rerun
+        try:
+            for history_message in payload.message:
+                streamlit_session._session_state[HISTORY].append(
+                    Message(t=MessageType.STR, content=history_message['content'],
+                            is_user=history_message['is_user'], timestamp=datetime.now())
+                )
+        except Exception as e:
+            logger.error(f"Error adding messages to the history: {e}")
+        streamlit_session._handle_rerun_script_request()
+        return
+    if payload.action == PayloadAction.AGENT_REPLY_STREAM.value:
+        reply: StreamingReply = streamlit_session._session_state[STREAMING_REPLY]
+        if reply is not None and reply.id == payload.message['id']:
+            # The chat is already showing the reply, it reads the new chunk without rerunning the script
+            reply.add_chunk(payload.message['chunk'])
+            return
+        reply = StreamingReply(payload.message['id'])
+        reply.add_chunk(payload.message['chunk'])
+        streamlit_session._session_state[STREAMING_REPLY] = reply
+        streamlit_session._session_state[QUEUE].put(reply.message)
+        streamlit_session._handle_rerun_script_request()
+        return
     if payload.action == PayloadAction.AGENT_REPLY_STR.value:
         content = payload.message
         t = MessageType.STR
@@ -46,13 +71,12 @@ def on_message(ws, payload_str):
         content = payload.message
         t = MessageType.HTML
     elif payload.action == PayloadAction.AGENT_REPLY_FILE.value:
-        content = payload.message
+        # With a binary frame, the file content is kept as raw bytes
+        content = {**payload.message, 'data': payload.data} if payload.data is not None else payload.message
         t = MessageType.FILE
     elif payload.action == PayloadAction.AGENT_REPLY_AUDIO.value:
-        # Encode the string back to bytes (using utf-8 or ascii)
-        base64_bytes = payload.message['audio_data_base64'].encode('utf-8')
-        # Decode the Base64 bytes to get the original raw audio bytes
-        audio_bytes = base64.b64decode(base64_bytes)
+        # Get the original raw audio bytes (from the binary frame, or decoding the Base64 string)
+        audio_bytes = payload.get_data()
         # Convert the raw bytes back to a NumPy array using np.frombuffer
         reconstructed_array_flat = np.frombuffer(audio_bytes, dtype=np.dtype(payload.message['metadata']['dtype']))
         # Verify size consistency
@@ -78,7 +102,7 @@ def on_message(ws, payload_str):
         content = tts_dict
         t = MessageType.AUDIO
     elif payload.action == PayloadAction.AGENT_REPLY_IMAGE.value:
-        decoded_data = base64.b64decode(payload.message)  # Decode base64 back to bytes
+        decoded_data = payload.get_data()  # Raw bytes of the binary frame, or base64 decoded back to bytes
         np_data = np.frombuffer(decoded_data, np.uint8)  # Convert bytes to numpy array
         img = cv2.imdecode(np_data, cv2.IMREAD_COLOR)  # Decode numpy array back to image
         content = img
@@ -107,7 +131,12 @@ def on_message(ws, payload_str):
     if content is not None:
         message = Message(t=t, content=content, is_user=is_user, timestamp=datetime.now())
         try:
-            if payload.history:
+            reply: StreamingReply = streamlit_session._session_state[STREAMING_REPLY]
+            if reply is not None and not is_user and not payload.history:
+                # The complete reply replaces the streamed chunks, which are already in the chat
+                reply.finish(message)
+                streamlit_session._session_state[STREAMING_REPLY] = None
+            elif payload.history:
                 streamlit_session._session_state[HISTORY].append(message)
             else:
                 streamlit_session._session_state[QUEUE].put(message)
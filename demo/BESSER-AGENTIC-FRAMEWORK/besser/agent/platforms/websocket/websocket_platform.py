@@ -5,13 +5,14 @@ import inspect
 import json
 import os
 import time
+import uuid
 from datetime import datetime
 from urllib.parse import parse_qs, urlsplit
 
 import numpy as np
 import subprocess
 import threading
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Iterable
 
 from pandas import DataFrame
 from websockets.exceptions import ConnectionClosedError
@@ -24,7 +25,7 @@ from besser.agent.exceptions.exceptions import PlatformMismatchError, StreamlitD
 from besser.agent.exceptions.logger import logger
 from besser.agent.nlp.rag.rag import RAGMessage
 from besser.agent.platforms import websocket
-from besser.agent.platforms.payload import Payload, PayloadAction, PayloadEncoder
+from besser.agent.platforms.payload import Payload, PayloadAction
 from besser.agent.platforms.platform import Platform
 from besser.agent.platforms.websocket.streamlit_ui import streamlit_ui
 from besser.agent.core.file import File
@@ -39,6 +40,10 @@ from besser.agent.platforms.websocket.streamlit_ui import (
 
 
 def _extract_user_id_from_request(request) -> str | None:
+    return _extract_query_param_from_request(request, "user_id")
+
+
+def _extract_query_param_from_request(request, name: str) -> str | None:
     if not request:
         return None
     for attr in ("path", "raw_path", "uri"):
@@ -55,9 +60,9 @@ def _extract_user_id_from_request(request) -> str | None:
         if not query:
             continue
         params = parse_qs(query)
-        user_values = params.get("user_id")
-        if user_values:
-            return user_values[0]
+        values = params.get(name)
+        if values:
+            return values[0]
     return None
 
 
@@ -105,6 +110,8 @@ class WebSocketPlatform(Platform):
         _port (int): The WebSocket port (e.g. `8765`)
         _use_ui (bool): Whether to use the built-in UI or not
         _connections (dict[str, ServerConnection]): The list of active connections (i.e. users connected to the agent)
+        _binary_connections (set[str]): The active connections that receive binary frames (see
+            ``websocket.binary_frames``)
         _websocket_server (WebSocketServer or None): The WebSocket server instance
         _message_handler (Callable[[ServerConnection], None]): The function that handles the user connections
             (sessions) and incoming messages
@@ -123,6 +130,7 @@ class WebSocketPlatform(Platform):
         self._use_ui: bool = use_ui
         self._authenticate_users = authenticate_users
         self._connections: dict[str, ServerConnection] = {}
+        self._binary_connections: set[str] = set()
         self._websocket_server: WebSocketServer = None
 
         def message_handler(conn: ServerConnection) -> None:
@@ -139,6 +147,11 @@ class WebSocketPlatform(Platform):
             query_user = _extract_user_id_from_request(request)
             session_key = header_user or query_user or str(conn.id)
             self._connections[str(session_key)] = conn
+            if _extract_query_param_from_request(request, "binary_frames") == "1" \
+                    and self._agent.get_property(websocket.WEBSOCKET_BINARY_FRAMES):
+                self._binary_connections.add(str(session_key))
+            else:
+                self._binary_connections.discard(str(session_key))
             session = self._agent.get_or_create_session(session_key, self)
             try:
 
@@ -149,19 +162,19 @@ class WebSocketPlatform(Platform):
 
                     if payload.action == PayloadAction.FETCH_USER_MESSAGES.value:
                         try:
-                            chat_history = session.get_chat_history(until_timestamp=current_time)
-                            for message in chat_history:
-                                history_payload = None
-                                if message.is_user:
-                                    history_payload = Payload(action=PayloadAction.USER_MESSAGE,
-                                                              message=message.content,
-                                                              history=True
-                                                              )
-                                else:
-                                    history_payload = Payload(action=PayloadAction.AGENT_REPLY_STR,
-                                                              message=message.content,
-                                                              history=True
-                                                              )
+                            # The history is sent in pages, one payload per page
+                            for chat_history in session.iter_chat_history(
+                                    page_size=self._agent.get_property(websocket.WEBSOCKET_HISTORY_PAGE_SIZE),
+                                    until_timestamp=current_time
+                            ):
+                                history_payload = Payload(
+                                    action=PayloadAction.HISTORY_BATCH,
+                                    message=[
+                                        {'is_user': bool(message.is_user), 'content': message.content}
+                                        for message in chat_history
+                                    ],
+                                    history=True
+                                )
                                 self._send(session.id, history_payload)
                         except Exception as e:
                             logger.error(f"Error fetching chat history: {e}")
@@ -172,8 +185,8 @@ class WebSocketPlatform(Platform):
                             human=True)
                         self._agent.receive_event(event)
                     elif payload.action == PayloadAction.USER_VOICE.value:
-                        # Decode the base64 string to get audio bytes
-                        audio_bytes = base64.b64decode(payload.message.encode('utf-8'))
+                        # Raw audio bytes of a binary frame, or decoded from the base64 string of a JSON payload
+                        audio_bytes = payload.get_data()
                         message = self._agent.nlp_engine.speech2text(session, audio_bytes)
                         event: ReceiveMessageEvent = ReceiveMessageEvent.create_event_from(
                             message=message,
@@ -181,8 +194,13 @@ class WebSocketPlatform(Platform):
                             human=True)
                         self._agent.receive_event(event)
                     elif payload.action == PayloadAction.USER_FILE.value:
+                        if payload.data is not None:
+                            file_info = payload.message if isinstance(payload.message, dict) else json.loads(payload.message)
+                            file = File(file_name=file_info['name'], file_type=file_info['type'], file_data=payload.data)
+                        else:
+                            file = File.decode(payload.message)
                         event: ReceiveFileEvent = ReceiveFileEvent(
-                            file=File.decode(payload.message),
+                            file=file,
                             session_id=session.id,
                             human=True)
                         self._agent.receive_event(event)
@@ -213,6 +231,7 @@ class WebSocketPlatform(Platform):
                     session_id = str(session.id)
                     if session_id in self._connections:
                         del self._connections[session_id]
+                    self._binary_connections.discard(session_id)
                 logger.info('Session finished')
                 # self._agent.delete_session(session.id)
                 # del self._connections[session.id]
@@ -331,7 +350,27 @@ class WebSocketPlatform(Platform):
     def _send(self, session_id, payload: Payload) -> None:
         if session_id in self._connections:
             conn = self._connections[session_id]
-            conn.send(json.dumps(payload, cls=PayloadEncoder))
+            conn.send(payload.encode(binary=session_id in self._binary_connections))
+
+    def _reply_data(self, session: Session, payload: Payload, data: bytes = None) -> None:
+        """Run the agent processors on a reply with binary content (e.g., a file or an audio), and send it.
+
+        The payload message contains the binary content as a base64 string, the way the agent processors and the
+        clients that do not support binary frames receive it. The clients that support binary frames receive the raw
+        bytes instead, which are not decoded from the base64 string if they are already known (and no agent processor
+        could have modified the message).
+
+        Args:
+            session (Session): the user session
+            payload (Payload): the reply payload, with the binary content as a base64 string in its message
+            data (bytes): the raw bytes of the binary content, if they are already known
+        """
+        if any(processor.agent_messages for processor in self._agent.processors):
+            payload.message = self._agent.process(session=session, message=payload.message, is_user_message=False)
+            data = None
+        if session.id in self._binary_connections:
+            payload = payload.split_data(data)
+        self._send(session.id, payload)
 
     def reply(self, session: Session, message: str) -> None:
         if session.platform is not self:
@@ -343,6 +382,52 @@ class WebSocketPlatform(Platform):
         payload.message = self._agent.process(session=session, message=payload.message, is_user_message=False)
         self._send(session.id, payload)
 
+    def _send_stream(self, session: Session, chunks: Iterable[str], finish: Callable[[str], None]) -> str:
+        """Send the chunks of an agent reply that is being generated, and then the complete reply.
+
+        Args:
+            session (Session): the user session
+            chunks (Iterable[str]): the chunks of the reply
+            finish (Callable[[str], None]): the function that sends (and saves) the complete reply. It is also called
+                if the generation of the chunks fails, with the chunks received so far
+
+        Returns:
+            str: the complete reply
+        """
+        stream_id = str(uuid.uuid4())
+        parts: list[str] = []
+        try:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                parts.append(chunk)
+                payload = Payload(action=PayloadAction.AGENT_REPLY_STREAM,
+                                  message={'id': stream_id, 'chunk': chunk})
+                self._send(session.id, payload)
+        finally:
+            # The complete reply replaces the chunks in the client
+            if parts:
+                finish(''.join(parts))
+        return ''.join(parts)
+
+    def reply_stream(self, session: Session, chunks: Iterable[str]) -> str:
+        """Send an agent reply to a specific user while it is being generated.
+
+        Every chunk is sent as soon as it is available. Then, the complete reply is processed, saved and sent as in
+        :meth:`reply`, and the client replaces the chunks with it. Note that the agent processors only receive the
+        complete reply.
+
+        Args:
+            session (Session): the user session
+            chunks (Iterable[str]): the chunks of the message to send to the user
+
+        Returns:
+            str: the complete message
+        """
+        if session.platform is not self:
+            raise PlatformMismatchError(self, session)
+        return self._send_stream(session, chunks, lambda message: self.reply(session, message))
+
     def reply_markdown(self, session: Session, message: str) -> None:
         """Send an agent reply to a specific user, containing text in Markdown format.
 
@@ -385,13 +470,13 @@ class WebSocketPlatform(Platform):
         session.save_message(Message(t=MessageType.FILE, content=file.get_json_string(), is_user=False, timestamp=datetime.now()))
         payload = Payload(action=PayloadAction.AGENT_REPLY_FILE,
                           message=file.to_dict())
-        payload.message = self._agent.process(session=session, message=payload.message, is_user_message=False)
-        self._send(session.id, payload)
+        self._reply_data(session, payload)
 
     def reply_image(self, session: Session, img: np.ndarray) -> None:
         """Send an image reply to a specific user.
 
-        Before being sent, the image is encoded as jpg and then as a base64 string. This must be known before dedocing
+        Before being sent, the image is encoded as jpg. It is sent as raw bytes to the clients that support binary frames
+        (see ``websocket.binary_frames``), and as a base64 string to the others. This must be known before dedocing
         the image on the client side.
 
         Args:
@@ -405,8 +490,7 @@ class WebSocketPlatform(Platform):
         session.save_message(Message(t=MessageType.FILE, content=base64_img, is_user=False, timestamp=datetime.now()))
         payload = Payload(action=PayloadAction.AGENT_REPLY_IMAGE,
                           message=base64_img)
-        payload.message = self._agent.process(session=session, message=payload.message, is_user_message=False)
-        self._send(session.id, payload)
+        self._reply_data(session, payload, data=buffer.tobytes())
 
     def reply_dataframe(self, session: Session, df: DataFrame) -> None:
         """Send a DataFrame agent reply, i.e. a table, to a specific user.
@@ -494,11 +578,36 @@ class WebSocketPlatform(Platform):
         payload.message = self._agent.process(session=session, message=payload.message, is_user_message=False)
         self._send(session.id, payload)
 
+    def reply_rag_stream(self, session: Session, rag_message: RAGMessage, chunks: Iterable[str]) -> str:
+        """Send a rag reply to a specific user while its answer is being generated (see
+        :meth:`~besser.agent.nlp.rag.rag.RAG.run_stream`).
+
+        Every chunk of the answer is sent as soon as it is available. Then, the complete rag message is sent as in
+        :meth:`reply_rag`, and the client replaces the chunks with it.
+
+        Args:
+            session (Session): the user session
+            rag_message (RAGMessage): the rag message to send to the user
+            chunks (Iterable[str]): the chunks of the rag message answer
+
+        Returns:
+            str: the complete answer
+        """
+        if session.platform is not self:
+            raise PlatformMismatchError(self, session)
+
+        def finish(answer: str) -> None:
+            rag_message.answer = answer
+            self.reply_rag(session, rag_message)
+
+        return self._send_stream(session, chunks, finish)
+
     def reply_speech(self, session: Session, message: str, audio_speed: float = None) -> None:
         """Send an audio reply to a specific user.
 
-        The text message is converted to speech and sent to the user. Before being sent, the audio is encoded as a
-        Base64 string. This must be taken into account when decoding the audio on the client side.
+        The text message is converted to speech and sent to the user. The raw audio is sent as a binary frame to the
+        clients that support them (see ``websocket.binary_frames``), and encoded as a Base64 string for the others.
+        This must be taken into account when decoding the audio on the client side.
 
         Args:
             session (Session): the user session
@@ -548,16 +657,16 @@ class WebSocketPlatform(Platform):
         base64_bytes = base64.b64encode(audio_bytes)
         base64_string_audio = base64_bytes.decode('utf-8')
 
+        metadata = {
+            "sample_rate": sample_rate,
+            "dtype": str(dtype),
+            "shape": shape
+        }
         message = {
             "audio_data_base64": base64_string_audio,
-            "metadata": {
-                "sample_rate": sample_rate,
-                "dtype": str(dtype),
-                "shape": shape
-            }
+            "metadata": metadata
         }
 
         session.save_message(Message(t=MessageType.AUDIO, content=message, is_user=False, timestamp=datetime.now()))
         payload = Payload(action=PayloadAction.AGENT_REPLY_AUDIO, message=message)
-        payload.message = self._agent.process(session=session, message=payload.message, is_user_message=False)
-        self._send(session.id, payload)
+        self._reply_data(session, payload, data=audio_bytes)
@@ -0,0 +1,56 @@
+# Benchmark of concurrent LLM requests from many sessions, with blocking requests and with the NLPEngine LLM client.
+# It uses the local LLMMock, so no network access is needed. Run it from the repository root:
+#   python -m besser.agent.test.benchmarks.llm_client_benchmark
+
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from besser.agent import nlp
+from besser.agent.core.agent import Agent
+from besser.agent.nlp.llm.llm_mock import LLMMock
+
+NUM_SESSIONS = 64  # Each session runs in its own thread, as in the agent platforms
+NUM_DISTINCT_PROMPTS = 16  # Many sessions send the same prompt (e.g., the same button option or greeting)
+LATENCY = 0.2  # Simulated time (in seconds) of an LLM request
+MAX_CONCURRENCY = 16
+
+
+def main():
+    rng = random.Random(42)
+    prompts = [f'prompt {rng.randrange(NUM_DISTINCT_PROMPTS)}' for _ in range(NUM_SESSIONS)]
+    agent = Agent('benchmark_agent')
+    agent.set_property(nlp.NLP_LLM_MAX_CONCURRENCY, MAX_CONCURRENCY)
+    llm = LLMMock(agent, latency=LATENCY)
+
+    start = time.perf_counter()
+    for prompt in prompts[:8]:
+        time.sleep(LATENCY)  # A blocking request: the session thread can not do anything else meanwhile
+    print(f'blocking requests, one session: {(time.perf_counter() - start) / 8 * 1000:.0f} ms/request')
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=NUM_SESSIONS) as executor:
+        answers = list(executor.map(llm.predict, prompts))
+    assert answers == prompts
+    print(f'{NUM_SESSIONS} sessions, sync facade: {time.perf_counter() - start:.2f} s, '
+          f'{llm.num_requests} requests sent to the provider')
+
+    agent.set_property(nlp.NLP_LLM_COALESCE_REQUESTS, False)
+    agent.nlp_engine.stop()
+    llm.num_requests = 0
+
+    async def send_all():
+        return await asyncio.gather(*(llm.apredict(prompt) for prompt in prompts))
+
+    start = time.perf_counter()
+    answers = asyncio.run(send_all())
+    assert answers == prompts
+    print(f'{NUM_SESSIONS} sessions, async without coalescing (max. {MAX_CONCURRENCY} concurrent requests): '
+          f'{time.perf_counter() - start:.2f} s, {llm.num_requests} requests sent to the provider')
+    print(f'LLMClient stats: {agent.nlp_engine.llm_client.stats}')
+    agent.nlp_engine.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+# Micro-benchmark of the per-message text preprocessing cost, with and without the NLPEngine text preprocessor.
+# Run it from the repository root:
+#   python -m besser.agent.test.benchmarks.text_preprocessing_benchmark
+
+import random
+import re
+import time
+
+from besser.agent import nlp
+from besser.agent.core.agent import Agent
+from besser.agent.nlp.preprocessing.text_preprocessing import process_text, tokenize
+from besser.agent.nlp.preprocessing.text_preprocessor import TextPreprocessor
+from besser.agent.nlp.utils import value_in_sentence
+
+NUM_MESSAGES = 2000
+NUM_DISTINCT_MESSAGES = 200  # Users often send the same messages (e.g., button options, "yes", "no"...)
+NUM_CLASSIFIERS = 3  # Number of intent classifiers that process each message (e.g., in a multi-state prediction)
+NUM_ENTITY_VALUES = 500
+
+WORDS = ['hello', 'I', 'would', 'like', 'to', 'book', 'a', 'flight', 'from', 'Barcelona', 'Luxembourg', 'tomorrow',
+         'playing', 'games', 'please', 'thanks', 'yes', 'no', 'weather', 'in']
+
+
+def random_message(rng: random.Random) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 12)))
+
+
+def per_message_us(start: float, num_messages: int) -> float:
+    return (time.perf_counter() - start) / num_messages * 1e6
+
+
+def main():
+    rng = random.Random(42)
+    distinct_messages = [random_message(rng) for _ in range(NUM_DISTINCT_MESSAGES)]
+    messages = [rng.choice(distinct_messages) for _ in range(NUM_MESSAGES)]
+    agent = Agent('benchmark_agent')
+    agent.set_property(nlp.NLP_PRE_PROCESSING, True)
+    nlp_engine = agent.nlp_engine
+    language = nlp_engine.get_property(nlp.NLP_LANGUAGE)
+
+    start = time.perf_counter()
+    for message in messages:
+        for _ in range(NUM_CLASSIFIERS):
+            tokenize(process_text(message, nlp_engine), language)
+    print(f'process_text + tokenize (no memoization): {per_message_us(start, NUM_MESSAGES):.1f} us/message')
+
+    text_preprocessor = TextPreprocessor(nlp_engine, cache_size=nlp.NLP_PREPROCESSING_CACHE_SIZE.default_value)
+    start = time.perf_counter()
+    for message in messages:
+        for _ in range(NUM_CLASSIFIERS):
+            text_preprocessor.tokenize(text_preprocessor.process_text(message), language)
+    print(f'process_text + tokenize (TextPreprocessor): {per_message_us(start, NUM_MESSAGES):.1f} us/message')
+    print(f'TextPreprocessor stats: {text_preprocessor.stats}')
+
+    values = [f'value{i}' for i in range(NUM_ENTITY_VALUES)]
+    num_messages = NUM_MESSAGES // 10
+    start = time.perf_counter()
+    for message in messages[:num_messages]:
+        for value in values:
+            regex = re.compile(r'\b' + re.escape(value) + r'\b', re.IGNORECASE)
+            value.lower() == message.lower() or regex.search(message)
+    print(f'value_in_sentence x {NUM_ENTITY_VALUES} values (regex compiled per call): '
+          f'{per_message_us(start, num_messages):.1f} us/message')
+    start = time.perf_counter()
+    for message in messages[:num_messages]:
+        for value in values:
+            value_in_sentence(value, message)
+    print(f'value_in_sentence x {NUM_ENTITY_VALUES} values (regex cache): '
+          f'{per_message_us(start, num_messages):.1f} us/message')
+
+
+if __name__ == '__main__':
+    main()
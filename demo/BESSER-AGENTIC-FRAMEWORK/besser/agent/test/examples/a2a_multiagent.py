@@ -77,17 +77,12 @@ async def final_summation(mysum: int, num1: int):
     return f"{mysum+num1}"
 #------------------------------------------------------------------
 
-async def await_subtask_result(orchestration_task, subtask, poll_interval=0.1):
+async def await_subtask_result(orchestration_task, subtask):
     '''
     This is an internal and private helper function to await a subtask's result within an orchestration task.
     '''
-    while True:
-        for st in orchestration_task.result.get("subtasks", []):
-            if st["task_id"] == subtask["task_id"]:
-                if st["status"] in ["DONE", "ERROR"]:
-                    return st.get("result")
-                break
-        await asyncio.sleep(poll_interval)
+    st = await orchestration_task.wait_subtask(subtask["task_id"])
+    return st.get("result")
 
 # Give an ID for each user-defined method and register the methods on whichever platform that needs to access those methods. 
 a2a_platform1.router.register("echo_message", echo)
@@ -248,7 +243,7 @@ async def orchestrate_echo_sum_display_seq_tracked(platform, params, registry, t
         {"num1": params["num1"], "num2": params["num2"]}, 
         registry
     )
-    sum_result = await await_subtask_result(orchestration_task, sum_task, poll_interval=0.2)
+    sum_result = await await_subtask_result(orchestration_task, sum_task)
     
     await tracked_call(
         "FinalSumAgent", 
@@ -4,8 +4,10 @@ import re
 from openai import OpenAI
 from deep_translator import GoogleTranslator
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 from besser.BUML.metamodel.state_machine.agent import AgentReply
+from besser.generators.agents.personalization_cache import get_personalization_cache
 import json
 
 
@@ -64,23 +66,188 @@ if not OPENAI_API_KEY:
 client = OpenAI(api_key=OPENAI_API_KEY)
 
 
-def call_openai_chat(system_prompt, user_prompt, model="gpt-5"):
+# Personalization requests are split into batches of at most this number of texts, so large agents do not exceed the
+# model context, and the batches are sent concurrently by this number of workers
+PERSONALIZATION_BATCH_SIZE = int(os.getenv("BESSER_PERSONALIZATION_BATCH_SIZE", "20"))
+PERSONALIZATION_WORKERS = int(os.getenv("BESSER_PERSONALIZATION_WORKERS", "8"))
+
+JSON_ITEMS_INSTRUCTIONS = (
+    "The texts are given as a JSON object with an \"items\" list, where each item has an \"id\" and a \"text\". "
+    "Return only a JSON object with the same structure: an \"items\" list containing, for every input item, its "
+    "original \"id\" and the rewritten \"text\". Do not add explanations."
+)
+
+
+def call_openai_chat(system_prompt, user_prompt, model="gpt-5", response_format=None):
     """
     Calls OpenAI ChatCompletion with a system prompt and user prompt (openai>=1.0.0).
+    `response_format` (e.g. {"type": "json_object"}) is forwarded to the API when provided.
     Returns the response text only.
     """
+    kwargs = {"response_format": response_format} if response_format else {}
     response = client.chat.completions.create(
         model=model,
         messages=[
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
-        ]
+        ],
+        **kwargs
     )
     # response.choices[0].message.content is the message content in the new client
     print("OpenAI response:", response.choices[0].message.content.strip())
     return response.choices[0].message.content.strip()
 
 
+def call_openai_json_batch(system_prompt, texts, model="gpt-5"):
+    """
+    Sends `texts` to the model as a JSON list of items with ids, in a single request, and maps the rewritten texts
+    back to the input order by id.
+    Returns a list with the rewritten texts, with None for the items missing in the response.
+    """
+    user_prompt = json.dumps(
+        {"items": [{"id": i, "text": text} for i, text in enumerate(texts)]},
+        ensure_ascii=False,
+    )
+    response_text = call_openai_chat(system_prompt, user_prompt, model=model, response_format={"type": "json_object"})
+    rewritten = {}
+    for item in json.loads(response_text).get("items", []):
+        if isinstance(item, dict) and isinstance(item.get("text"), str):
+            try:
+                rewritten[int(item.get("id"))] = item["text"]
+            except (TypeError, ValueError):
+                continue
+    return [rewritten.get(i) for i in range(len(texts))]
+
+
+def build_system_prompt(instructions):
+    """
+    Builds the system prompt that applies the given transformation `instructions` (in order) to every text.
+    """
+    if len(instructions) == 1:
+        steps = instructions[0]
+    else:
+        steps = "Apply the following transformations to each text, in this order:\n" + "\n".join(
+            f"{i + 1}. {instruction}" for i, instruction in enumerate(instructions)
+        )
+    return (
+        "You are an editing engine that personalizes the replies of a conversational agent, preserving their "
+        f"original meaning and intent.\n{steps}\n{JSON_ITEMS_INSTRUCTIONS}"
+    )
+
+
+def transform_texts(texts, transformation, parameters, instructions, model="gpt-5"):
+    """
+    Applies the transformation `instructions` to each text in `texts`.
+
+    Texts whose result is in the personalization cache are not sent to the model. The rest are split into batches of
+    PERSONALIZATION_BATCH_SIZE texts that are sent concurrently. Empty or non-string texts, and the texts of a batch
+    that fails, are returned unchanged.
+    Returns a list of transformed texts in the same order as input.
+    """
+    system_prompt = build_system_prompt(instructions)
+    valid_texts = [text for text in texts if isinstance(text, str) and text.strip()]
+
+    def run_batch(batch):
+        try:
+            return call_openai_json_batch(system_prompt, batch, model=model)
+        except Exception as exc:
+            print(f"Personalization step '{transformation}' failed for a batch of {len(batch)} texts:", exc)
+            traceback.print_exc()
+            return [None] * len(batch)
+
+    def run(pending):
+        batches = [
+            pending[i:i + PERSONALIZATION_BATCH_SIZE] for i in range(0, len(pending), PERSONALIZATION_BATCH_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, min(PERSONALIZATION_WORKERS, len(batches)))) as executor:
+            return [result for batch_results in executor.map(run_batch, batches) for result in batch_results]
+
+    results = iter(get_personalization_cache().transform(
+        valid_texts, transformation, {**parameters, "prompt": system_prompt}, model, run
+    ))
+    return [next(results) if isinstance(text, str) and text.strip() else text for text in texts]
+
+
+def translation_instructions(target_language):
+    return f"Translate the text into {target_language}."
+
+
+def style_instructions(style):
+    if style == 'formal':
+        return (
+            "Transform the text into a formal, polished version: use a formal tone and vocabulary suitable for "
+            "professional or academic contexts, ensure grammar, punctuation, and syntax are correct and refined, "
+            "remove colloquial expressions, contractions, or slang, keep the length and structure close to the "
+            "original unless improvement requires rephrasing, and maintain clarity and natural flow."
+        )
+    return (
+        "Transform the text into an informal, friendly version: use a casual and approachable tone, you may use "
+        "contractions, everyday expressions, or light slang if appropriate, keep grammar correct but natural, not "
+        "overly strict, make it sound like something someone would say in conversation, and keep the length and "
+        "structure close to the original unless rewording improves flow."
+    )
+
+
+def complexity_instructions(complexity):
+    if complexity == "simple":
+        return (
+            "Simplify the text to make it easier to understand while retaining its meaning. "
+            "If it already fits the A1-A2 complexity level, no changes are required."
+        )
+    if complexity == "medium":
+        return (
+            "Adjust the text to a medium level of complexity, suitable for a general audience. "
+            "If it already fits the B1-B2 complexity level, no changes are required."
+        )
+    return (
+        "Enhance the text to make it more sophisticated and complex while retaining its meaning. "
+        "If it already fits the C1-C2 complexity level, no changes are required."
+    )
+
+
+def sentence_length_instructions(preference):
+    if preference == "concise":
+        return (
+            "Rewrite the text to be concise while keeping the original meaning intact. "
+            "Remove redundancy, trim filler, and keep sentences short."
+        )
+    return (
+        "Rewrite the text to be more detailed and verbose while preserving meaning. "
+        "You may add clarifying context or additional descriptive phrasing."
+    )
+
+
+def profile_instructions(profile_context):
+    return (
+        "Personalize the text for a single user based on the following user profile (JSON). The reply and semantics "
+        "should only be changed when the original content would contradict profile data. Keep information accurate "
+        f"and do not use any kind of formatting.\nUser profile: {profile_context}"
+    )
+
+
+def profile_context_and_model(config):
+    """
+    Returns the (possibly truncated) user profile JSON and the model name for profile content adaptation,
+    or (None, model) if the configuration has no user profile.
+    """
+    model_name = config.get('llm')
+    if not isinstance(model_name, str) or not model_name.strip():
+        model_name = 'gpt-5'
+    else:
+        model_name = model_name.strip()
+
+    user_profile = config.get('userProfileModel')
+    if not isinstance(user_profile, dict):
+        return None, model_name
+
+    profile_json = json.dumps(user_profile, ensure_ascii=False)
+    max_profile_chars = 6000
+    if len(profile_json) > max_profile_chars:
+        profile_context = profile_json[:max_profile_chars] + '... (truncated)'
+    else:
+        profile_context = profile_json
+    return profile_context, model_name
+
 
 def translate_text_batch(texts, target_language, model="gpt-5"):
     """
@@ -90,26 +257,10 @@ def translate_text_batch(texts, target_language, model="gpt-5"):
     if not isinstance(texts, (list, tuple)):
         raise TypeError("texts must be a list or tuple of strings")
 
-    # Define the system prompt for translation
-    system_prompt = (
-        "You are a translation engine. "
-        "Translate each numbered text below into {}. "
-        "Return only the translated texts as a numbered list, matching the input order, with no additional explanation."
-    ).format(target_language)
-
-    # Combine all texts into a single prompt with numbering for clarity
-    user_prompt = "\n".join(f"{i+1}. {text}" for i, text in enumerate(texts))
-
-    # Call the model once with all texts
-    response_text = call_openai_chat(system_prompt, user_prompt, model=model)
+    return transform_texts(
+        list(texts), "translate", {"language": target_language}, [translation_instructions(target_language)], model
+    )
 
-    # Try to split the returned text back into a list of outputs
-    results = [
-        line.split(". ", 1)[1] if ". " in line else line
-        for line in response_text.splitlines()
-        if line.strip()
-    ]
-    return results
 
 def translate_text_api(text, target_language):
     """
@@ -133,7 +284,6 @@ def translate_text_api(text, target_language):
         raise RuntimeError(f"GoogleTranslator failed: {e}") from e
 
 
-
 def style_text_batch(texts, style, model="gpt-5"):
     """
     Rewrites each text in `texts` to the requested `style` while preserving meaning and content.
@@ -147,38 +297,8 @@ def style_text_batch(texts, style, model="gpt-5"):
     if style not in ('formal', 'informal'):
         raise ValueError("style must be 'formal' or 'informal'")
 
-    if style == 'formal':
-        system_prompt = (
-            "you are a professional editor specializing in formal writing. "
-            "for each numbered text below, transform it into a formal, polished version while preserving its original meaning and intent. "
-            "requirements: - use formal tone and vocabulary suitable for professional or academic contexts "
-            "- ensure grammar, punctuation, and syntax are correct and refined "
-            "- remove colloquial expressions, contractions, or slang "
-            "- keep the length and structure close to the original unless improvement requires rephrasing "
-            "- maintain clarity and natural flow. "
-            "return the rewritten texts as a numbered list, matching the input order, with no explanations."
-        )
-    else:  # informal
-        system_prompt = (
-            "you are a professional writer specializing in natural, conversational language. "
-            "for each numbered text below, transform it into an informal, friendly version while keeping its original meaning and intent. "
-            "requirements: - use a casual and approachable tone "
-            "- you may use contractions, everyday expressions, or light slang if appropriate "
-            "- keep grammar correct but natural, not overly strict "
-            "- make it sound like something someone would say in conversation "
-            "- keep the length and structure close to the original unless rewording improves flow. "
-            "return the rewritten texts as a numbered list, matching the input order, with no explanations."
-        )
-
-    # Combine all texts into a single prompt with numbering for clarity
-    user_prompt = "\n".join(f"{i+1}. {text}" for i, text in enumerate(texts))
-
-    # Call the model once with all texts
-    response_text = call_openai_chat(system_prompt, user_prompt, model=model)
-
-    # Try to split the returned text back into a list of outputs
-    results = [line.split(". ", 1)[1].replace("'", "\\'") if ". " in line else line for line in response_text.splitlines() if line.strip()]
-    return results
+    results = transform_texts(list(texts), "style", {"style": style}, [style_instructions(style)], model)
+    return [result.replace("'", "\\'") if isinstance(result, str) else result for result in results]
 
 
 def configure_agent(agent, config):
@@ -210,9 +330,27 @@ def configure_agent(agent, config):
             elif 'agentLanguage' in config and config['agentLanguage'] != 'none' and config['agentLanguage'] != 'original':
                 print("Translating using API...")
                 training_sentences.append(sentence)
-    if 'agentLanguage' in config and config['agentLanguage'] != 'none' and config['agentLanguage'] != 'original':
-        target_language = config['agentLanguage']
-        translated_sentences = translate_text_batch(training_sentences, target_language)
+    messages = []
+    for state in getattr(agent, 'states', []):
+
+        for body_attr in ['body', 'fallback_body']:
+            body = getattr(state, body_attr, None)
+            if body and body.actions:
+                for action in body.actions:
+                    if isinstance(action, AgentReply):  
+                        # process each message individually
+                        # action.message = replace_reply(action.message, config)
+                        messages.append(action.message)
+
+    # The training sentences and the replies are personalized concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        translation = None
+        if 'agentLanguage' in config and config['agentLanguage'] != 'none' and config['agentLanguage'] != 'original':
+            translation = executor.submit(translate_text_batch, training_sentences, config['agentLanguage'])
+        personalization = executor.submit(replace_reply_batch, messages, config)
+        personalized_messages = personalization.result()
+        translated_sentences = translation.result() if translation is not None else None
+    if translated_sentences is not None:
         ti = 0
         for intent in getattr(agent, 'intents', []):
             for idx, sentence in enumerate(getattr(intent, 'training_sentences', [])):
@@ -238,19 +376,6 @@ def configure_agent(agent, config):
                 translated_sentence = translate_text_api(sentence, target_language)
                 intent.training_sentences[idx] = translated_sentence.replace("'", "\\'")
     """
-    messages = []
-    for state in getattr(agent, 'states', []):
-
-        for body_attr in ['body', 'fallback_body']:
-            body = getattr(state, body_attr, None)
-            if body and body.actions:
-                for action in body.actions:
-                    if isinstance(action, AgentReply):  
-                        # process each message individually
-                        # action.message = replace_reply(action.message, config)
-                        messages.append(action.message)
-
-    personalized_messages = replace_reply_batch(messages, config)
     for state in getattr(agent, 'states', []):
         for body_attr in ['body', 'fallback_body']:
             body = getattr(state, body_attr, None)
@@ -262,116 +387,65 @@ def configure_agent(agent, config):
                         action.message = action.message.replace("'", "\\'")
 
 
-
-
 def replace_reply_batch(messages: list[str], config: dict) -> list[str]:
+    """
+    Personalizes the agent replies according to `config`.
+
+    The enabled transformations (style, complexity, sentence length, profile content and translation) are fused into
+    a single prompt, so each batch of replies is personalized in one request (see transform_texts).
+    Returns a list of personalized replies in the same order as input.
+    """
     config = flatten_agent_config_structure(config or {})
-    personalized_messages = messages
+    instructions = []
+    parameters = {}
 
-    if 'agentLanguage' in config and config['agentLanguage'] != 'none' and False:
-        target_language = config['agentLanguage']
-        # personalized_message = translate_text(personalized_message, target_language)
-    elif 'agentLanguage' in config and config['agentLanguage'] != 'none' and config['agentLanguage'] != 'original' and False:
-        target_language = config['agentLanguage']
-        for i, msg in enumerate(personalized_messages):
-            personalized_messages[i] = translate_text_api(msg, target_language)
     if 'agentStyle' in config and config['agentStyle'] != 'original':
-        style = config['agentStyle']
-        personalized_messages = style_text_batch(personalized_messages, style)
+        style = (config['agentStyle'] or '').lower()
+        if style not in ('formal', 'informal'):
+            raise ValueError("style must be 'formal' or 'informal'")
+        instructions.append(style_instructions(style))
+        parameters['style'] = style
     if 'languageComplexity' in config and config['languageComplexity'] != 'original':
         complexity = config['languageComplexity']
-        personalized_messages = complexity_text_batch(personalized_messages, complexity)
+        if complexity not in {"simple", "medium", "complex"}:
+            raise ValueError("Invalid complexity level. Choose from 'simple', 'medium', or 'complex'.")
+        instructions.append(complexity_instructions(complexity))
+        parameters['complexity'] = complexity
     if 'sentenceLength' in config and config['sentenceLength'] != 'original':
-        length_pref = config['sentenceLength']
-        personalized_messages = sentence_length_batch(personalized_messages, length_pref)
-    if isinstance(config.get('userProfileModel'), dict):
-        personalized_messages = replace_content_profile_batch(personalized_messages, config)
+        length_pref = (config['sentenceLength'] or '').strip().lower()
+        if length_pref not in {"concise", "verbose"}:
+            raise ValueError("Invalid sentence length preference. Choose 'Concise' or 'Verbose'.")
+        instructions.append(sentence_length_instructions(length_pref))
+        parameters['sentence_length'] = length_pref
+    profile_context, model_name = profile_context_and_model(config)
+    if profile_context is not None:
+        instructions.append(profile_instructions(profile_context))
+        parameters['profile'] = profile_context
     if 'agentLanguage' in config and config['agentLanguage'] != 'none' and config['agentLanguage'] != 'original':
         target_language = config['agentLanguage']
-        personalized_messages = translate_text_batch(personalized_messages, target_language)
-        
-    return personalized_messages
+        instructions.append(translation_instructions(target_language))
+        parameters['language'] = target_language
+
+    if not instructions:
+        return list(messages)
+    return transform_texts(list(messages), "personalize", parameters, instructions, model_name)
 
 
 def replace_content_profile_batch(messages: list[str], config: dict) -> list[str]:
     """Adapt reply content so it aligns with the supplied user profile model."""
     flattened_config = flatten_agent_config_structure(config or {})
-    user_profile = flattened_config.get('userProfileModel')
-    if not isinstance(user_profile, dict):
+    profile_context, model_name = profile_context_and_model(flattened_config)
+    if profile_context is None:
         return messages
 
-    profile_json = json.dumps(user_profile, ensure_ascii=False)
-    max_profile_chars = 6000
-    if len(profile_json) > max_profile_chars:
-        profile_context = profile_json[:max_profile_chars] + '... (truncated)'
-    else:
-        profile_context = profile_json
-
-    model_name = flattened_config.get('llm')
-    if not isinstance(model_name, str) or not model_name.strip():
-        model_name = 'gpt-5'
-    else:
-        model_name = model_name.strip()
-
-    system_prompt = (
-        "You personalize agent replies for a single user based on a provided profile. "
-        "The reply and semantics should only be changed, when original content would contradict profile data. Keep information accurate, and return only "
-        "the rewritten reply text and do not use any kind of formatting."
-    )
-
-    personalized_messages: list[str] = list(messages)
-    valid_entries: list[tuple[int, str]] = []
-    for idx, original_text in enumerate(messages):
-        if isinstance(original_text, str) and original_text.strip():
-            valid_entries.append((idx, original_text))
-        else:
-            personalized_messages[idx] = original_text
-
-    if not valid_entries:
-        return personalized_messages
-
-    numbered_replies = "\n".join(
-        f"{i + 1}. {text}" for i, (_, text) in enumerate(valid_entries)
-    )
-    user_prompt = (
-        f"User profile (JSON):\n{profile_context}\n\n"
-        "Original agent replies (numbered):\n"
-        f"{numbered_replies}\n\n"
-        "Rewrite each reply so it aligns with the profile only when necessary.\n"
-        "Return the rewritten replies as a numbered list matching the inputs and do not use any formatting."
+    results = transform_texts(
+        list(messages), "profile_content", {"profile": profile_context}, [profile_instructions(profile_context)],
+        model_name
     )
-
-    try:
-        response_text = call_openai_chat(system_prompt, user_prompt, model=model_name)
-        results = [
-            line.split(". ", 1)[1] if ". " in line else line
-            for line in response_text.splitlines()
-            if line.strip()
-        ]
-
-        if len(results) != len(valid_entries):
-            print(
-                "Content profile adaptation returned unexpected count; falling back to originals."
-            )
-            results = [text for _, text in valid_entries]
-
-        for (msg_idx, original_text), rewritten in zip(valid_entries, results):
-            final_text = rewritten if rewritten else original_text
-            if isinstance(final_text, str):
-                final_text = final_text.replace("'", "\\'")
-            personalized_messages[msg_idx] = final_text
-    except Exception as exc:
-        print("Content profile adaptation failed:", exc)
-        traceback.print_exc()
-        for msg_idx, original_text in valid_entries:
-            fallback_text = (
-                original_text.replace("'", "\\'")
-                if isinstance(original_text, str)
-                else original_text
-            )
-            personalized_messages[msg_idx] = fallback_text
-
-    return personalized_messages
+    return [
+        result.replace("'", "\\'") if isinstance(result, str) else result
+        for result in results
+    ]
 
 def append_speech(match):
     text = match.group(1)
@@ -389,42 +463,9 @@ def complexity_text_batch(texts, complexity, model="gpt-5"):
     if not isinstance(texts, (list, tuple)):
         raise TypeError("texts must be a list or tuple of strings")
 
-    # Define the system prompt based on the complexity level
-    if complexity == "simple":
-        system_prompt = (
-            "You are a text simplification engine. "
-            "Simplify the following texts to make them easier to understand while retaining their meaning. "
-            "If a text already fits the A1-A2 complexity level, no changes are required. "
-            "Return the simplified texts as a numbered list."
-        )
-    elif complexity == "medium":
-        system_prompt = (
-            "You are a text adjustment engine. "
-            "Adjust the following texts to a medium level of complexity, suitable for a general audience. "
-            "If a text already fits the B1-B2 complexity level, no changes are required. "
-            "Return the adjusted texts as a numbered list."
-        )
-    elif complexity == "complex":
-        system_prompt = (
-            "You are a text enhancement engine. "
-            "Enhance the following texts to make them more sophisticated and complex while retaining their meaning. "
-            "If a text already fits the C1-C2 complexity level, no changes are required. "
-            "Return the enhanced texts as a numbered list."
-        )
-
-    # Combine all texts into a single prompt with numbering for clarity
-    user_prompt = "\n".join(f"{i+1}. {text}" for i, text in enumerate(texts))
-
-    # Call the model once with all texts
-    response_text = call_openai_chat(system_prompt, user_prompt, model=model)
-
-    # Try to split the returned text back into a list of outputs
-    results = [
-        line.split(". ", 1)[1] if ". " in line else line
-        for line in response_text.splitlines()
-        if line.strip()
-    ]
-    return results
+    return transform_texts(
+        list(texts), "complexity", {"complexity": complexity}, [complexity_instructions(complexity)], model
+    )
 
 
 def sentence_length_batch(texts, preference, model="gpt-5"):
@@ -440,26 +481,7 @@ def sentence_length_batch(texts, preference, model="gpt-5"):
     if not isinstance(texts, (list, tuple)):
         raise TypeError("texts must be a list or tuple of strings")
 
-    if normalized_pref == "concise":
-        system_prompt = (
-            "You are an editing engine focused on brevity. "
-            "Rewrite each numbered text to be concise while keeping the original meaning intact. "
-            "Remove redundancy, trim filler, and keep sentences short. "
-            "Return the rewritten texts as a numbered list in the same order."
-        )
-    else:  # verbose
-        system_prompt = (
-            "You are an editing engine focused on elaboration. "
-            "Rewrite each numbered text to be more detailed and verbose while preserving meaning. "
-            "You may add clarifying context or additional descriptive phrasing. "
-            "Return the rewritten texts as a numbered list in the same order."
-        )
-
-    user_prompt = "\n".join(f"{i+1}. {text}" for i, text in enumerate(texts))
-    response_text = call_openai_chat(system_prompt, user_prompt, model=model)
-    results = [
-        line.split(". ", 1)[1] if ". " in line else line
-        for line in response_text.splitlines()
-        if line.strip()
-    ]
-    return results
\ No newline at end of file
+    return transform_texts(
+        list(texts), "sentence_length", {"preference": normalized_pref}, [sentence_length_instructions(normalized_pref)],
+        model
+    )
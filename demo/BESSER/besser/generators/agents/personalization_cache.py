@@ -0,0 +1,179 @@
+"""Content-addressed on-disk cache of agent personalization results.
+
+Every personalization step (style, complexity, sentence length, profile content and translation) transforms a list
+of messages with an LLM. The result of a transformation of a single message only depends on the message text, the
+transformation, its parameters (including the prompt) and the model, so it is stored under the hash of all of them.
+The cache lives on disk and is shared by all the generation requests of the backend (and by its worker processes),
+so regenerating an agent only sends the new or modified messages to the model.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Callable, Optional
+
+PERSONALIZATION_CACHE_DIR_ENV = "BESSER_PERSONALIZATION_CACHE_DIR"
+DEFAULT_PERSONALIZATION_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "besser", "personalization")
+
+
+def personalization_key(text: str, transformation: str, parameters: dict, model: str) -> str:
+    """Get the content address of the result of a personalization transformation of a message.
+
+    Args:
+        text (str): The original message.
+        transformation (str): The transformation name (e.g., 'style').
+        parameters (dict): The transformation parameters (e.g., the style and the system prompt).
+        model (str): The model that runs the transformation.
+
+    Returns:
+        str: The SHA-256 hash of the message, transformation, parameters and model.
+    """
+    content = json.dumps(
+        {"text": text, "transformation": transformation, "parameters": parameters, "model": model},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class PersonalizationCache:
+    """Content-addressed store of personalization results.
+
+    Each result is a small JSON file named after its key (see :func:`personalization_key`), inside a subdirectory
+    named after the first 2 characters of the key. Files are written atomically, so concurrent generations can share
+    the cache directory.
+
+    Args:
+        directory (str): The cache directory. It is created if it does not exist.
+
+    Attributes:
+        directory (str): The cache directory.
+        hits (int): Number of results found in the cache.
+        misses (int): Number of results not found in the cache.
+    """
+
+    def __init__(self, directory: str):
+        self.directory: str = directory
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a result from the cache.
+
+        Args:
+            key (str): The result key.
+
+        Returns:
+            str | None: The cached result, or None if it is not in the cache (or it can not be read).
+        """
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                result = json.load(f)["result"]
+        except (OSError, ValueError, KeyError, TypeError):
+            result = None
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def put(self, key: str, result: str) -> None:
+        """Store a result in the cache. Errors are ignored, since the cache is only an optimization.
+
+        Args:
+            key (str): The result key.
+            result (str): The result.
+        """
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"result": result}, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            print(f"Personalization result could not be cached: {e}")
+
+    def transform(
+        self,
+        texts: list,
+        transformation: str,
+        parameters: dict,
+        model: str,
+        run: Callable[[list], list],
+    ) -> list:
+        """Apply a transformation to a list of messages, only sending the messages that are not cached to the model.
+
+        Args:
+            texts (list): The messages to transform.
+            transformation (str): The transformation name.
+            parameters (dict): The transformation parameters (including the prompt).
+            model (str): The model that runs the transformation.
+            run (Callable[[list], list]): The function that transforms a list of messages with the model, returning
+                the transformed messages in the same order (or None for the messages it could not transform).
+
+        Returns:
+            list: The transformed messages, in the same order. The messages the model could not transform are
+            returned unchanged (and not cached), as well as all of them if it does not return one result per message.
+        """
+        keys = [personalization_key(text, transformation, parameters, model) for text in texts]
+        results = {}
+        for key in dict.fromkeys(keys):
+            result = self.get(key)
+            if result is not None:
+                results[key] = result
+        missing = {key: text for key, text in zip(keys, texts) if key not in results}
+        if missing:
+            transformed = run(list(missing.values()))
+            if len(transformed) == len(missing):
+                for key, result in zip(missing, transformed):
+                    if result is None:
+                        results[key] = missing[key]
+                        continue
+                    results[key] = result
+                    if isinstance(result, str):
+                        self.put(key, result)
+            else:
+                print(
+                    f"Personalization step '{transformation}' returned {len(transformed)} results for "
+                    f"{len(missing)} messages; keeping the original messages."
+                )
+                results.update(missing)
+        print(
+            f"Personalization step '{transformation}': {len(texts) - len(missing)} cached, "
+            f"{len(missing)} sent to the model."
+        )
+        return [results[key] for key in keys]
+
+
+_default_cache: Optional[PersonalizationCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_personalization_cache() -> PersonalizationCache:
+    """Get the personalization cache shared by all the agent generations of the process.
+
+    Its directory is taken from the ``BESSER_PERSONALIZATION_CACHE_DIR`` environment variable, or defaults to
+    ``~/.cache/besser/personalization``.
+
+    Returns:
+        PersonalizationCache: The shared personalization cache.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            directory = os.getenv(PERSONALIZATION_CACHE_DIR_ENV) or DEFAULT_PERSONALIZATION_CACHE_DIR
+            _default_cache = PersonalizationCache(directory)
+        return _default_cache